@@ -1,9 +1,29 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import random
+import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+# From this many cases on, find_similar takes its candidates from MinHash/LSH buckets (one entry
+# per band and case, signatures of bands x rows MinHash values) instead of the exact inverted index.
+# A case of Jaccard similarity s shares a bucket with the query with probability 1 - (1 - s**4)**24:
+# 0.9986 at s=0.7, 0.96 at 0.6, 0.79 at 0.5, 0.46 at 0.4 and 0.09 at 0.25. Weak matches near
+# min_similarity are mostly missed; in exchange a query scores ~130 candidates instead of every case
+# sharing a feature (0.33 ms instead of 28 ms per query at 100k synthetic lagna charts).
+DEFAULT_LSH_MIN_RECORDS = 2000
+DEFAULT_LSH_BANDS = 24
+DEFAULT_LSH_ROWS = 4
+# save() appends changed cases to the journal; the snapshot is rewritten once the journal holds
+# at least this many entries and more entries than there are cases.
+DEFAULT_COMPACT_MIN_ENTRIES = 1000
+
+_MERSENNE_PRIME = (1 << 61) - 1
 
 
 def _utc_now_iso() -> str:
@@ -52,43 +72,220 @@ def build_feature_set(lagna_json: Dict[str, Any]) -> List[str]:
     return sorted(features)
 
 
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class _MinHashLSH:
+    """MinHash signatures of feature sets, banded into hash buckets.
+
+    Two sets with Jaccard similarity s share at least one bucket with probability
+    1 - (1 - s**rows)**bands, so similar cases are found by a few dict lookups while
+    dissimilar ones are rarely even considered. Buckets hold a case index, or a list of
+    them once several cases fall into the same bucket.
+    """
+
+    def __init__(self, bands: int = DEFAULT_LSH_BANDS, rows: int = DEFAULT_LSH_ROWS, seed: int = 1) -> None:
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        count = bands * rows
+        self._params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(count)]
+        self._feature_rows: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: Dict[int, Union[int, List[int]]] = {}
+
+    def _row(self, feature: str) -> Tuple[int, ...]:
+        row = self._feature_rows.get(feature)
+        if row is None:
+            value = _feature_hash(feature)
+            row = tuple((a * value + b) % _MERSENNE_PRIME for a, b in self._params)
+            self._feature_rows[feature] = row
+        return row
+
+    def _band_keys(self, features: Iterable[str]) -> List[int]:
+        signature = tuple(map(min, zip(*(self._row(feature) for feature in features))))
+        rows = self.rows
+        return [hash((band,) + signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, idx: int, features: FrozenSet[str]) -> None:
+        if not features:
+            return
+        buckets = self._buckets
+        for key in self._band_keys(features):
+            current = buckets.get(key)
+            if current is None:
+                buckets[key] = idx
+            elif isinstance(current, list):
+                current.append(idx)
+            else:
+                buckets[key] = [current, idx]
+
+    def remove(self, idx: int, features: FrozenSet[str]) -> None:
+        if not features:
+            return
+        buckets = self._buckets
+        for key in self._band_keys(features):
+            current = buckets.get(key)
+            if current == idx:
+                del buckets[key]
+            elif isinstance(current, list) and idx in current:
+                current.remove(idx)
+                if len(current) == 1:
+                    buckets[key] = current[0]
+
+    def candidates(self, features: FrozenSet[str]) -> Set[int]:
+        found: Set[int] = set()
+        buckets = self._buckets
+        for key in self._band_keys(features):
+            current = buckets.get(key)
+            if current is None:
+                continue
+            if isinstance(current, list):
+                found.update(current)
+            else:
+                found.add(current)
+        return found
+
+
 class ReinforcementMemory:
-    """Persistence layer for capturing chart-specific follow ups and outcomes."""
+    """Persistence layer for capturing chart-specific follow ups and outcomes.
+
+    Cases live in a JSON snapshot (`path`) plus an append-only journal next to it
+    (`<stem>.journal.jsonl`, one case per line). save() only appends the cases changed since
+    the previous save and folds the journal back into the snapshot once it has grown past
+    the number of cases. Similar-case lookup goes through an inverted index from chart
+    feature to cases, or through MinHash/LSH buckets once the memory holds
+    `lsh_min_records` cases or more.
+    """
 
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        lsh_min_records: Optional[int] = DEFAULT_LSH_MIN_RECORDS,
+        compact_min_entries: int = DEFAULT_COMPACT_MIN_ENTRIES,
+    ) -> None:
         self._path = path
+        self._journal_path = path.with_name(path.stem + ".journal.jsonl")
+        self._lsh_min_records = lsh_min_records
+        self._compact_min_entries = compact_min_entries
         self._records: List[Dict[str, Any]] = []
+        self._by_key: Dict[Tuple[Any, Any], int] = {}
+        self._features: List[FrozenSet[str]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._lsh: Optional[_MinHashLSH] = None
+        self._dirty: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self._journal_entries = 0
+        self._journal_torn = False
         self._load()
 
+    @staticmethod
+    def _key_of(record: Dict[str, Any]) -> Tuple[Any, Any]:
+        return record.get("user_id"), record.get("session_id")
+
     def _load(self) -> None:
-        if not self._path.exists():
+        if not self._path.exists() and not self._journal_path.exists():
             self._path.parent.mkdir(parents=True, exist_ok=True)
-            self._records = []
             return
+        records: List[Dict[str, Any]] = []
         try:
             with self._path.open("r", encoding="utf-8") as handle:
                 payload = json.load(handle)
         except (json.JSONDecodeError, OSError):
-            self._records = []
-            return
+            payload = []
         if isinstance(payload, list):
             records = [item for item in payload if isinstance(item, dict)]
         else:
-            records = payload.get("cases") if isinstance(payload, dict) else []
-            if not isinstance(records, list):
-                records = []
-            records = [item for item in records if isinstance(item, dict)]
-        self._records = records
+            cases = payload.get("cases") if isinstance(payload, dict) else []
+            if isinstance(cases, list):
+                records = [item for item in cases if isinstance(item, dict)]
+        for record in records:
+            self._put(record)
+        try:
+            with self._journal_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    self._journal_torn = not line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line of an interrupted save
+                    if isinstance(record, dict):
+                        self._put(record)
+                        self._journal_entries += 1
+        except OSError:
+            pass
+        self._maybe_enable_lsh()
+
+    def _put(self, record: Dict[str, Any]) -> None:
+        """Insert the record, or replace the stored one with the same (user_id, session_id)"""
+        key = self._key_of(record)
+        idx = self._by_key.get(key)
+        if idx is None:
+            idx = len(self._records)
+            self._by_key[key] = idx
+            self._records.append(record)
+            self._features.append(frozenset())
+        else:
+            self._records[idx] = record
+        self._reindex(idx, record.get("chart_features") or [])
+
+    def _reindex(self, idx: int, features: Iterable[str]) -> None:
+        old = self._features[idx]
+        new = frozenset(sys.intern(item) if isinstance(item, str) else item for item in features if item)
+        if new == old:
+            return
+        for feature in old - new:
+            postings = self._postings.get(feature)
+            if postings is not None:
+                postings.discard(idx)
+                if not postings:
+                    del self._postings[feature]
+        for feature in new - old:
+            self._postings.setdefault(feature, set()).add(idx)
+        if self._lsh is not None:
+            self._lsh.remove(idx, old)
+            self._lsh.add(idx, new)
+        self._features[idx] = new
+
+    def _maybe_enable_lsh(self) -> None:
+        if self._lsh is not None or self._lsh_min_records is None or len(self._records) < self._lsh_min_records:
+            return
+        self._lsh = _MinHashLSH()
+        for idx, features in enumerate(self._features):
+            self._lsh.add(idx, features)
 
     @property
     def records(self) -> Sequence[Dict[str, Any]]:
         return tuple(self._records)
 
     def save(self) -> None:
+        """Append the cases changed since the last save to the journal; compact when it is due"""
+        if not self._dirty:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._journal_path.open("a", encoding="utf-8") as handle:
+            if self._journal_torn:
+                handle.write("\n")
+                self._journal_torn = False
+            handle.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in self._dirty.values()))
+        self._journal_entries += len(self._dirty)
+        self._dirty.clear()
+        if self._journal_entries >= max(self._compact_min_entries, len(self._records)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the snapshot with every case and empty the journal"""
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        payload = {"cases": self._records}
-        with self._path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, ensure_ascii=False, indent=2)
+        self._dirty.clear()
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"cases": self._records}, handle, ensure_ascii=False)
+        os.replace(tmp_path, self._path)
+        # replaying the journal over the new snapshot is harmless, so a crash here loses nothing
+        with self._journal_path.open("w", encoding="utf-8"):
+            pass
+        self._journal_entries = 0
+        self._journal_torn = False
 
     def upsert_case(
         self,
@@ -103,11 +300,8 @@ class ReinforcementMemory:
         difference_notes: Optional[str] = None,
     ) -> Dict[str, Any]:
         key = (user_id, session_id)
-        target: Optional[Dict[str, Any]] = None
-        for record in self._records:
-            if record.get("user_id") == key[0] and record.get("session_id") == key[1]:
-                target = record
-                break
+        idx = self._by_key.get(key)
+        target: Optional[Dict[str, Any]] = self._records[idx] if idx is not None else None
         timestamp = _utc_now_iso()
         follow_up_entries: List[Dict[str, str]] = []
         for item in follow_ups:
@@ -135,7 +329,8 @@ class ReinforcementMemory:
                 "created_at": timestamp,
                 "updated_at": timestamp,
             }
-            self._records.append(target)
+            self._put(target)
+            self._maybe_enable_lsh()
         else:
             target.update(
                 {
@@ -148,6 +343,8 @@ class ReinforcementMemory:
                     "updated_at": timestamp,
                 }
             )
+            self._reindex(idx, target["chart_features"])
+        self._dirty[key] = target
         return target
 
     def find_similar(
@@ -156,26 +353,39 @@ class ReinforcementMemory:
         *,
         limit: int = 3,
         min_similarity: float = 0.25,
+        exact: bool = False,
     ) -> List[Tuple[float, Dict[str, Any]]]:
-        feature_set = {item for item in features if item}
+        """Stored cases by Jaccard similarity of their chart features, best first.
+
+        Exact below `lsh_min_records` cases; above it only the cases sharing an LSH bucket
+        with `features` are scored, which may miss weakly similar ones (see DEFAULT_LSH_BANDS).
+        `exact=True`, `limit=0` or `min_similarity<=0` always score through the inverted index.
+        """
+        feature_set = frozenset(item for item in features if item)
         if not feature_set:
             return []
-        scored: List[Tuple[float, Dict[str, Any]]] = []
-        for record in self._records:
-            record_features = {item for item in record.get("chart_features", []) if item}
-            if not record_features:
-                continue
-            overlap = len(feature_set & record_features)
-            union = len(feature_set | record_features)
-            if union == 0:
-                continue
-            score = overlap / union
+        size = len(feature_set)
+        if self._lsh is not None and limit and min_similarity > 0 and not exact:
+            overlaps = {idx: len(feature_set & self._features[idx]) for idx in self._lsh.candidates(feature_set)}
+        else:
+            overlaps = Counter()
+            for feature in feature_set:
+                postings = self._postings.get(feature)
+                if postings:
+                    overlaps.update(postings)
+            if min_similarity <= 0:
+                overlaps = {idx: overlaps.get(idx, 0) for idx, record_features in enumerate(self._features)
+                            if record_features}
+        scored: List[Tuple[float, int]] = []
+        for idx, overlap in overlaps.items():
+            score = overlap / (size + len(self._features[idx]) - overlap)
             if score >= min_similarity:
-                scored.append((score, record))
-        scored.sort(key=lambda item: item[0], reverse=True)
+                scored.append((score, idx))
+        # ties keep insertion order
+        scored.sort(key=lambda item: (-item[0], item[1]))
         if limit:
             scored = scored[:limit]
-        return scored
+        return [(score, self._records[idx]) for score, idx in scored]
 
 
 def format_similarity_context(matches: Sequence[Tuple[float, Dict[str, Any]]]) -> str:
@@ -11,7 +11,7 @@ import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Literal, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Literal, Sequence, Tuple, Union
 from autogen_agentchat.base import TaskResult
 from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
 from autogen_core.models import SystemMessage, UserMessage
@@ -36,6 +36,7 @@ logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(message)s")
 DEFAULT_TEAM_RETRIES = 5
 DEFAULT_TEAM_BACKOFF = 1.0
 DEFAULT_TEAM_JITTER = 0.75
+DEFAULT_TEAM_CONCURRENCY = 3
 
 logger = logging.getLogger(LOGGER_NAME)
 
@@ -51,6 +52,10 @@ class TokenUsage:
         self.prompt += getattr(models_usage, "prompt_tokens", 0)
         self.completion += getattr(models_usage, "completion_tokens", 0)
 
+    def add(self, other: "TokenUsage") -> None:
+        self.prompt += other.prompt
+        self.completion += other.completion
+
     @property
     def total(self) -> int:
         return self.prompt + self.completion
@@ -67,6 +72,20 @@ class TeamRunResult:
     raw_messages: List[Any] = field(default_factory=list)
 
 
+@dataclass
+class TeamSpec:
+    """A node of the team graph run by `_run_team_graph`.
+
+    `task` is either the prompt itself or a callable building it from the results of the
+    teams listed in `after`. `on_complete` runs as soon as the team's result is available.
+    """
+    label: str
+    factory: Callable[[], Any]
+    task: Union[str, Callable[[Dict[str, TeamRunResult]], str]]
+    after: Tuple[str, ...] = ()
+    on_complete: Optional[Callable[[TeamRunResult], None]] = None
+
+
 @dataclass
 class ReviewDecision:
     status: Literal["proceed", "follow_up"]
@@ -672,7 +691,7 @@ async def _run_team(team, *, label: str, task: str, verbose_tokens: bool) -> Tea
             )
         except Exception as exc:  # noqa: BLE001
             last_error = exc
-            logger.warning("%s team attempt %d/%d failed – retrying", label, attempt, DEFAULT_TEAM_RETRIES, exc)
+            logger.warning("%s team attempt %d/%d failed – retrying: %s", label, attempt, DEFAULT_TEAM_RETRIES, exc)
             try:
                 await team.reset()
             except Exception as reset_exc:  # noqa: BLE001
@@ -688,6 +707,74 @@ async def _run_team(team, *, label: str, task: str, verbose_tokens: bool) -> Tea
 
 
 
+def _order_team_specs(specs: Sequence[TeamSpec]) -> List[TeamSpec]:
+    by_label = {spec.label: spec for spec in specs}
+    if len(by_label) != len(specs):
+        raise ValueError("Team labels must be unique")
+    for spec in specs:
+        missing = [dep for dep in spec.after if dep not in by_label]
+        if missing:
+            raise ValueError(f"{spec.label} team depends on unknown teams: {', '.join(missing)}")
+    ordered: List[TeamSpec] = []
+    done: set[str] = set()
+    pending = list(specs)
+    while pending:
+        ready = [spec for spec in pending if all(dep in done for dep in spec.after)]
+        if not ready:
+            raise ValueError("Team dependencies form a cycle: " + ", ".join(spec.label for spec in pending))
+        for spec in ready:
+            ordered.append(spec)
+            done.add(spec.label)
+            pending.remove(spec)
+    return ordered
+
+
+async def _run_team_graph(
+    specs: Sequence[TeamSpec],
+    *,
+    verbose_tokens: bool,
+    max_concurrency: int = DEFAULT_TEAM_CONCURRENCY,
+    usage: Optional[TokenUsage] = None,
+) -> Dict[str, TeamRunResult]:
+    """Run the teams as soon as the teams they depend on have finished, at most
+    `max_concurrency` at a time. Each team keeps the retry/backoff of `_run_team`; if one
+    still fails, the others are cancelled and its error is raised. Token usage of every
+    team is added to `usage` when given."""
+    limit = asyncio.Semaphore(max(1, max_concurrency))
+    results: Dict[str, TeamRunResult] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(spec: TeamSpec) -> TeamRunResult:
+        if spec.after:
+            await asyncio.gather(*(tasks[dep] for dep in spec.after))
+        task = spec.task(results) if callable(spec.task) else spec.task
+        async with limit:
+            result = await _run_team(spec.factory(), label=spec.label, task=task, verbose_tokens=verbose_tokens)
+        results[spec.label] = result
+        if usage is not None:
+            usage.add(result.usage)
+        if spec.on_complete is not None:
+            spec.on_complete(result)
+        return result
+
+    start = time.perf_counter()
+    for spec in _order_team_specs(specs):
+        tasks[spec.label] = asyncio.create_task(run(spec), name=f"team:{spec.label}")
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for pending in tasks.values():
+            pending.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    logger.info(
+        "Teams finished in %.2fs (sequential would take %.2fs)",
+        time.perf_counter() - start,
+        sum(result.elapsed for result in results.values()),
+    )
+    return results
+
+
 def _write_metrics_log(metrics: Dict[str, Any]) -> None:
     log_path = Path("logs/run_metrics.jsonl")
     log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -706,6 +793,7 @@ async def run_case(
     user_output: Path,
     verbose_tokens: bool,
     precheck: Optional[Dict[str, Any]] = None,
+    team_concurrency: int = DEFAULT_TEAM_CONCURRENCY,
 ) -> Dict[str, Any]:
     if not case_dir.exists():
         raise FileNotFoundError(f"Case folder not found: {case_dir}")
@@ -756,24 +844,39 @@ async def run_case(
         selected_periods,
     )
 
-    lagna_result = await _run_team(BirthChartTeam(), label='Lagna', task=lagna_task, verbose_tokens=verbose_tokens)
-    follow_up_pairs = _extract_follow_up_pairs(lagna_result.raw_messages)
-    psy_summary_text = _capture_psy_summary(lagna_result.raw_messages)
-    top_reference = similar_matches[0][1] if similar_matches else None
-    difference_notes = _describe_feature_delta(current_features, top_reference)
-    reinforcement_memory.upsert_case(
-        user_id=user_id,
-        session_id=session_id,
-        origin_case=str(case_dir),
-        features=current_features,
-        question=question,
-        psy_summary=psy_summary_text,
-        follow_ups=follow_up_pairs,
-        difference_notes=difference_notes,
+    def _remember_lagna(lagna_result: TeamRunResult) -> None:
+        follow_up_pairs = _extract_follow_up_pairs(lagna_result.raw_messages)
+        psy_summary_text = _capture_psy_summary(lagna_result.raw_messages)
+        top_reference = similar_matches[0][1] if similar_matches else None
+        difference_notes = _describe_feature_delta(current_features, top_reference)
+        reinforcement_memory.upsert_case(
+            user_id=user_id,
+            session_id=session_id,
+            origin_case=str(case_dir),
+            features=current_features,
+            question=question,
+            psy_summary=psy_summary_text,
+            follow_ups=follow_up_pairs,
+            difference_notes=difference_notes,
+        )
+        reinforcement_memory.save()
+
+    # The three analysis teams only read the case files, so none waits for another;
+    # the master writer below is the only step that needs all of them.
+    team_usage = TokenUsage()
+    team_results = await _run_team_graph(
+        [
+            TeamSpec('Lagna', BirthChartTeam, lagna_task, on_complete=_remember_lagna),
+            TeamSpec('D-Series', DSeriesTeam, dseries_task),
+            TeamSpec('Dasha', DashaTeam, dasha_task),
+        ],
+        verbose_tokens=verbose_tokens,
+        max_concurrency=team_concurrency,
+        usage=team_usage,
     )
-    reinforcement_memory.save()
-    dseries_result = await _run_team(DSeriesTeam(), label='D-Series', task=dseries_task, verbose_tokens=verbose_tokens)
-    dasha_result = await _run_team(DashaTeam(), label="Dasha", task=dasha_task, verbose_tokens=verbose_tokens)
+    lagna_result = team_results['Lagna']
+    dseries_result = team_results['D-Series']
+    dasha_result = team_results['Dasha']
 
     master_writer = create_master_writer_agent()
     final_prompt = (
@@ -807,16 +910,8 @@ async def run_case(
     logger.info("Detailed report written to %s", detailed_output)
     logger.info("User report written to %s", user_output)
 
-    total_usage = TokenUsage(
-        prompt=lagna_result.usage.prompt
-        + dseries_result.usage.prompt
-        + dasha_result.usage.prompt
-        + writer_usage.prompt,
-        completion=lagna_result.usage.completion
-        + dseries_result.usage.completion
-        + dasha_result.usage.completion
-        + writer_usage.completion,
-    )
+    total_usage = TokenUsage(prompt=team_usage.prompt, completion=team_usage.completion)
+    total_usage.add(writer_usage)
 
     summary_table = [
         ("Lagna", lagna_result.usage.total, lagna_result.elapsed),
@@ -921,6 +1016,12 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="If set, will ask the user follow-up questions (via console input) until the reviewer approves to proceed.",
     )
+    parser.add_argument(
+        "--team-concurrency",
+        type=int,
+        default=DEFAULT_TEAM_CONCURRENCY,
+        help="Maximum number of analysis teams running at the same time (1 runs them one after another).",
+    )
     return parser.parse_args()
 
 
@@ -991,6 +1092,7 @@ async def _async_main() -> None:
         user_output=user_output_path,
         verbose_tokens=args.verbose_tokens,
         precheck=precheck_payload,
+        team_concurrency=args.team_concurrency,
     )
 
     print("\n=== Final Forecast ===\n")
@@ -0,0 +1,136 @@
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from astro_orchestrator.reinforcement import memory  # noqa: E402
+
+CASE = dict(origin_case='case', question='q', psy_summary='p', follow_ups=[{'question': 'x', 'answer': 'y'}])
+
+
+def _fill(mem, feature_sets):
+    for i, features in enumerate(feature_sets):
+        mem.upsert_case(user_id=f'u{i}', session_id='s', features=features, **CASE)
+
+
+def _ids(matches):
+    return [(score, record['user_id']) for score, record in matches]
+
+
+def _lagna(rng):
+    signs = ['aries', 'taurus', 'gemini', 'cancer', 'leo', 'virgo', 'libra', 'scorpio', 'sagittarius',
+             'capricorn', 'aquarius', 'pisces']
+    asc = rng.randrange(12)
+    planets = []
+    for name in ('sun', 'moon', 'mars', 'mercury', 'jupiter', 'venus', 'saturn', 'rahu', 'ketu'):
+        sign = rng.randrange(12)
+        planets.append({'name': name, 'sign': signs[sign], 'house': (sign - asc) % 12 + 1,
+                        'dignity': rng.choice(['neutral', 'friendly', 'enemy', 'own', 'exalted']),
+                        'nakshatra': f'n{(sign * 9 + rng.randrange(9)) // 4}', 'retrograde': rng.random() < 0.15})
+    return {'ascendantSign': signs[asc], 'planets': planets, 'yogas': rng.sample([f'y{i}' for i in range(25)], 3)}
+
+
+def test_exact_lookups_match_a_full_scan_with_lsh_enabled(tmp_path):
+    rng = random.Random(3)
+    vocabulary = [f'f{i}' for i in range(5000)]
+    cases = [rng.sample(vocabulary, 8) for _ in range(400)]
+    exact = memory.ReinforcementMemory(tmp_path / 'exact.json', lsh_min_records=None)
+    banded = memory.ReinforcementMemory(tmp_path / 'banded.json', lsh_min_records=1)
+    _fill(exact, cases)
+    _fill(banded, cases)
+    assert banded._lsh is not None and exact._lsh is None
+    for _ in range(60):
+        # Jaccard 0.25 - 0.33 with one stored case, next to nothing with the others
+        query = rng.sample(rng.choice(cases), 4) + [f'new{rng.random()}' for _ in range(rng.randrange(4, 9))]
+        expected = _ids(exact.find_similar(query))
+        assert expected and _ids(banded.find_similar(query, exact=True)) == expected
+        assert _ids(banded.find_similar(query, limit=0)) == _ids(exact.find_similar(query, limit=0))
+        assert _ids(banded.find_similar(query, min_similarity=0)) == _ids(exact.find_similar(query, min_similarity=0))
+
+
+def test_lsh_finds_strong_matches(tmp_path):
+    rng = random.Random(5)
+    vocabulary = [f'f{i}' for i in range(5000)]
+    cases = [rng.sample(vocabulary, 8) for _ in range(400)]
+    banded = memory.ReinforcementMemory(tmp_path / 'banded.json', lsh_min_records=1)
+    _fill(banded, cases)
+    for target in rng.sample(cases, 60):
+        # Jaccard 7/9 with the target
+        query = target[:7] + ['other']
+        [(score, record)] = banded.find_similar(query, limit=1)
+        assert record['chart_features'] == target and score == 7 / 9
+
+
+def test_lookup_stays_under_a_millisecond_at_100k_cases(tmp_path):
+    rng = random.Random(11)
+    charts = [_lagna(rng) for _ in range(100_000)]
+    mem = memory.ReinforcementMemory(tmp_path / 'memory.json')
+    _fill(mem, [memory.build_feature_set(chart) for chart in charts])
+    assert mem._lsh is not None
+    queries = [memory.build_feature_set(_lagna(rng)) for _ in range(100)]
+    queries += [memory.build_feature_set(rng.choice(charts))[:-rng.randrange(1, 6)] for _ in range(100)]
+    candidates = sum(len(mem._lsh.candidates(frozenset(query))) for query in queries) / len(queries)
+    assert candidates < 1000
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for query in queries:
+            mem.find_similar(query)
+        best = min(best, (time.perf_counter() - start) / len(queries))
+    assert best < 1e-3
+    # cases the query was cut from are found
+    for chart in charts[:50]:
+        features = memory.build_feature_set(chart)
+        assert mem.find_similar(features[:-2], limit=1)[0][1]['chart_features'] == features
+
+
+def test_journal_replay_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / 'memory.json'
+    mem = memory.ReinforcementMemory(path, compact_min_entries=100)
+    _fill(mem, [['A', 'B'], ['B', 'C']])
+    mem.save()
+    with mem._journal_path.open('a', encoding='utf-8') as handle:
+        handle.write('{"user_id": "torn", "chart_')
+
+    again = memory.ReinforcementMemory(path, compact_min_entries=100)
+    assert [r['user_id'] for r in again.records] == ['u0', 'u1']
+    assert again.find_similar(['A', 'B'])[0][1]['user_id'] == 'u0'
+    again.upsert_case(user_id='after', session_id='s', features=['Q'], **CASE)
+    again.save()
+
+    reloaded = memory.ReinforcementMemory(path)
+    assert [r['user_id'] for r in reloaded.records] == ['u0', 'u1', 'after']
+    assert reloaded.find_similar(['Q'])[0][1]['user_id'] == 'after'
+
+
+def test_compact_folds_the_journal_into_the_snapshot(tmp_path):
+    path = tmp_path / 'memory.json'
+    mem = memory.ReinforcementMemory(path, compact_min_entries=100)
+    _fill(mem, [['A'], ['B']])
+    mem.save()
+    mem.upsert_case(user_id='u0', session_id='s', features=['C'], **CASE)
+    mem.save()
+    assert len(mem._journal_path.read_text(encoding='utf-8').splitlines()) == 3
+
+    mem.compact()
+    assert mem._journal_path.read_text(encoding='utf-8') == ''
+    snapshot = json.loads(path.read_text(encoding='utf-8'))['cases']
+    assert [(c['user_id'], c['chart_features']) for c in snapshot] == [('u0', ['C']), ('u1', ['B'])]
+    reloaded = memory.ReinforcementMemory(path)
+    assert reloaded.records == mem.records
+    assert reloaded.find_similar(['A']) == []
+
+
+def test_save_compacts_once_the_journal_outgrows_the_cases(tmp_path):
+    path = tmp_path / 'memory.json'
+    mem = memory.ReinforcementMemory(path, compact_min_entries=3)
+    _fill(mem, [['A'], ['B']])
+    mem.save()
+    assert not path.exists()
+    mem.upsert_case(user_id='u0', session_id='s', features=['C'], **CASE)
+    mem.save()
+    assert mem._journal_path.read_text(encoding='utf-8') == ''
+    assert len(json.loads(path.read_text(encoding='utf-8'))['cases']) == 2
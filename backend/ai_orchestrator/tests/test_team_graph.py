@@ -0,0 +1,150 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+pytest.importorskip('autogen_agentchat')
+pytest.importorskip('autogen_ext')
+
+from autogen_agentchat.base import TaskResult  # noqa: E402
+from autogen_agentchat.messages import TextMessage  # noqa: E402
+from autogen_core.models import RequestUsage  # noqa: E402
+
+from astro_orchestrator import runtime  # noqa: E402
+from astro_orchestrator.runtime import TeamSpec, TokenUsage  # noqa: E402
+
+
+class Tracker:
+    """Records what the stub teams of one test did, in order"""
+
+    def __init__(self):
+        self.events = []
+        self.active = 0
+        self.peak = 0
+
+    def index(self, event):
+        return self.events.index(event)
+
+
+class StubTeam:
+    """Stand-in for an autogen team: after `delay` seconds it answers a task with one message
+    "<label>:<task>" that used 10 prompt and 5 completion tokens. The first `failures` runs raise."""
+
+    def __init__(self, tracker, label, delay=0.01, failures=0):
+        self.tracker, self.label, self.delay, self.failures = tracker, label, delay, failures
+
+    async def run_stream(self, task):
+        tracker = self.tracker
+        tracker.events.append(('start', self.label))
+        tracker.active += 1
+        tracker.peak = max(tracker.peak, tracker.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError(f'{self.label} failed')
+            message = TextMessage(content=f'{self.label}:{task}', source=self.label,
+                                  models_usage=RequestUsage(prompt_tokens=10, completion_tokens=5))
+            yield TaskResult(messages=[message])
+            tracker.events.append(('end', self.label))
+        except asyncio.CancelledError:
+            tracker.events.append(('cancelled', self.label))
+            raise
+        finally:
+            tracker.active -= 1
+
+    async def reset(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(runtime, 'DEFAULT_TEAM_BACKOFF', 0)
+    monkeypatch.setattr(runtime, 'DEFAULT_TEAM_JITTER', 0)
+    monkeypatch.setattr(runtime, 'DEFAULT_TEAM_RETRIES', 2)
+
+
+def _spec(tracker, label, task=None, after=(), **team):
+    team_obj = StubTeam(tracker, label, **team)
+    return TeamSpec(label, lambda: team_obj, task if task is not None else label.lower(), after=tuple(after))
+
+
+def _run(specs, **kwargs):
+    return asyncio.run(runtime._run_team_graph(specs, verbose_tokens=False, **kwargs))
+
+
+@pytest.mark.parametrize('cap', [1, 2, 5])
+def test_at_most_max_concurrency_teams_run_at_once(cap):
+    tracker = Tracker()
+    results = _run([_spec(tracker, f'T{i}', delay=0.03) for i in range(5)], max_concurrency=cap)
+    assert sorted(results) == [f'T{i}' for i in range(5)]
+    assert tracker.peak == cap
+
+
+def test_teams_start_after_the_teams_they_depend_on():
+    tracker = Tracker()
+    specs = [_spec(tracker, 'D', after=('B', 'C')), _spec(tracker, 'B', delay=0.03),
+             _spec(tracker, 'C', after=('A',)), _spec(tracker, 'A')]
+    assert [spec.label for spec in runtime._order_team_specs(specs)] == ['B', 'A', 'C', 'D']
+    _run(specs, max_concurrency=4)
+    assert tracker.index(('end', 'A')) < tracker.index(('start', 'C'))
+    assert max(tracker.index(('end', 'B')), tracker.index(('end', 'C'))) < tracker.index(('start', 'D'))
+    # B does not wait for A and C, which do not depend on it
+    assert tracker.index(('start', 'B')) < tracker.index(('end', 'A'))
+
+
+def test_dependency_results_reach_callable_tasks():
+    tracker = Tracker()
+    seen = []
+
+    def merge(results):
+        seen.append(sorted(results))
+        return results['B'].summary + '|' + results['C'].summary
+
+    results = _run([_spec(tracker, 'B'), _spec(tracker, 'C', delay=0.02), _spec(tracker, 'D', merge, after=('B', 'C'))])
+    assert results['D'].summary == 'D:B:b|C:c'
+    assert seen == [['B', 'C']]
+
+
+def test_a_failing_team_cancels_the_others_and_raises():
+    tracker = Tracker()
+    specs = [_spec(tracker, 'X', failures=99), _spec(tracker, 'Y', delay=5), _spec(tracker, 'Z', after=('X',))]
+    with pytest.raises(RuntimeError, match='X failed'):
+        _run(specs)
+    assert tracker.events.count(('start', 'X')) == runtime.DEFAULT_TEAM_RETRIES
+    assert ('cancelled', 'Y') in tracker.events and ('end', 'Y') not in tracker.events
+    assert ('start', 'Z') not in tracker.events
+
+
+def test_retried_teams_still_complete():
+    tracker = Tracker()
+    results = _run([_spec(tracker, 'X', failures=1)])
+    assert results['X'].summary == 'X:x'
+    assert tracker.events.count(('start', 'X')) == 2
+
+
+def test_invalid_graphs_are_rejected_before_any_team_runs():
+    tracker = Tracker()
+    cycle = [_spec(tracker, 'P', after=('Q',)), _spec(tracker, 'Q', after=('P',)), _spec(tracker, 'R')]
+    with pytest.raises(ValueError, match='cycle: P, Q'):
+        _run(cycle)
+    with pytest.raises(ValueError, match='P team depends on unknown teams: Q, S'):
+        _run([_spec(tracker, 'P', after=('Q', 'S'))])
+    with pytest.raises(ValueError, match='unique'):
+        _run([_spec(tracker, 'P'), _spec(tracker, 'P')])
+    assert tracker.events == []
+
+
+def test_token_usage_of_every_team_is_added_up():
+    tracker = Tracker()
+    usage = TokenUsage(prompt=1, completion=2)
+    completed = []
+    specs = [_spec(tracker, 'A', failures=1), _spec(tracker, 'B'), _spec(tracker, 'C', after=('A', 'B'))]
+    specs[0].on_complete = lambda result: completed.append((result.label, result.usage.total))
+    results = _run(specs, usage=usage)
+    assert all((r.usage.prompt, r.usage.completion) == (10, 5) for r in results.values())
+    assert (usage.prompt, usage.completion, usage.total) == (31, 17, 48)
+    assert completed == [('A', 15)]
@@ -49,11 +49,12 @@ async def analyze_horoscope(
         from astro_orchestrator import runtime
         
         # Get horoscope data from storage
-        from horoscope_service import get_user_horoscope
+        from horoscope_service import get_horoscope_sections
         
-        horoscope_data = await get_user_horoscope(
+        horoscope_data = await get_horoscope_sections(
             user_email=current_user.email,
-            request_id=request.request_id
+            request_id=request.request_id,
+            sections=["meta"]
         )
         
         if not horoscope_data:
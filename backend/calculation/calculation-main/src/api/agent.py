@@ -1,5 +1,17 @@
+"""Delivery of computed horoscopes to the agent webhook (AGENT_WEBHOOK_URL).
+
+AgentDispatcher is a long lived dispatcher started with the app: it owns one keep-alive httpx client and a
+bounded queue drained by a few worker tasks. Each target (scheme, host and port of the webhook URL) has its own
+concurrency limit and request rate, so a burst of new horoscopes turns into a steady stream of requests over a
+few connections. A failed delivery is not retried inline: the next attempt is stored with the agent event
+(events.schedule_retry, exponential backoff with jitter) and a scheduler task re-queues due retries from the
+events database, also after a restart.
+"""
 from __future__ import annotations
-import os, asyncio, httpx
+import os, asyncio, logging, random, time, httpx
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 from .models import StoredHoroscope, AgentDispatchResult
 from . import events, app as api_app
 from . import service as _service
@@ -10,48 +22,239 @@ AGENT_URL = os.getenv('AGENT_WEBHOOK_URL')
 AGENT_API_KEY = os.getenv('AGENT_API_KEY')
 MAX_AGENT_ATTEMPTS = int(os.getenv('AGENT_MAX_ATTEMPTS', '5'))
 BASE_BACKOFF = float(os.getenv('AGENT_BASE_BACKOFF', '1.0'))  # seconds
+MAX_BACKOFF = float(os.getenv('AGENT_MAX_BACKOFF', '30.0'))  # seconds
+AGENT_TIMEOUT = float(os.getenv('AGENT_TIMEOUT', '10'))  # seconds
+AGENT_WORKERS = int(os.getenv('AGENT_DISPATCH_WORKERS', '4'))
+AGENT_QUEUE_SIZE = int(os.getenv('AGENT_QUEUE_SIZE', '1000'))
+AGENT_TARGET_CONCURRENCY = int(os.getenv('AGENT_TARGET_CONCURRENCY', '2'))  # requests in flight per target
+AGENT_TARGET_RATE = float(os.getenv('AGENT_TARGET_RATE', '10'))  # requests per second per target; 0 = unlimited
+AGENT_RETRY_POLL_SECONDS = float(os.getenv('AGENT_RETRY_POLL_SECONDS', '1.0'))
+
+
+def backoff_delay(attempts: int, base: float = BASE_BACKOFF, cap: float = MAX_BACKOFF) -> float:
+    """Delay before the attempt after `attempts` failed ones: exponential backoff with jitter"""
+    return min(base * (2 ** (attempts - 1)), cap) + random.uniform(0, 0.25)
+
+
+@dataclass
+class _Job:
+    request_id: str
+    url: str
+    payload: Dict[str, Any]
+    attempts: int = 0  # attempts made so far
+
+
+class _Target:
+    """Concurrency and rate limit of one webhook target"""
+    def __init__(self, concurrency: int, rate: float):
+        self.slots = asyncio.Semaphore(max(1, concurrency))
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.slots.acquire()
+        if self.interval:
+            async with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.slots.release()
+
+
+class AgentDispatcher:
+    """Queued webhook deliveries with a shared client, per-target limits and persisted retries.
+    dispatch() waits for the final outcome of a delivery (delivered, or failed after max_attempts)."""
+    def __init__(self, url: Optional[str] = None, api_key: Optional[str] = None, workers: int = AGENT_WORKERS,
+                 queue_size: int = AGENT_QUEUE_SIZE, target_concurrency: int = AGENT_TARGET_CONCURRENCY,
+                 target_rate: float = AGENT_TARGET_RATE, max_attempts: int = MAX_AGENT_ATTEMPTS,
+                 base_backoff: float = BASE_BACKOFF, retry_poll: float = AGENT_RETRY_POLL_SECONDS,
+                 timeout: float = AGENT_TIMEOUT, store: Optional[events.EventStore] = None):
+        self.url = url
+        self.api_key = api_key
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.target_concurrency = target_concurrency
+        self.target_rate = target_rate
+        self.max_attempts = max(1, max_attempts)
+        self.base_backoff = base_backoff
+        self.retry_poll = retry_poll
+        self.timeout = timeout
+        self.store = store
+        self._client: Optional[httpx.AsyncClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._targets: Dict[str, _Target] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats_counts = {'delivered': 0, 'failed': 0, 'retriesScheduled': 0, 'requests': 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and self._loop is asyncio.get_running_loop()
+
+    def _events(self):
+        return self.store if self.store is not None else events.get_store()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        limits = httpx.Limits(max_connections=max(self.workers, self.target_concurrency),
+                              max_keepalive_connections=max(self.workers, self.target_concurrency))
+        self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._targets = {}
+        self._tasks = [asyncio.create_task(self._worker(), name=f'agent-dispatch-{i}') for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._retry_scheduler(), name='agent-dispatch-retries'))
+
+    async def stop(self) -> None:
+        """Stop the workers and close the client; queued deliveries are rescheduled in the events database"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        store = self._events()
+        while self._queue is not None and not self._queue.empty():
+            job = self._queue.get_nowait()
+            store.schedule_retry(job.request_id, 'queued', 'rescheduled at shutdown', job.attempts, time.time())
+        for futures in self._waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(AgentDispatchResult(success=False, detail='dispatcher stopped', attempts=0))
+        self._waiters.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def dispatch(self, request_id: str, payload: Dict[str, Any]) -> AgentDispatchResult:
+        """Queue a delivery of payload (recorded as a new agent event) and wait for its outcome"""
+        if not self.url:
+            return AgentDispatchResult(success=False, detail='AGENT_WEBHOOK_URL not set', attempts=0)
+        await self.start()
+        await asyncio.to_thread(self._events().record_event, request_id, payload)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(request_id, []).append(future)
+        await self._queue.put(_Job(request_id, self.url, payload))
+        return await future
+
+    def _target(self, url: str) -> _Target:
+        parts = urlsplit(url)
+        key = f'{parts.scheme}://{parts.netloc}'
+        target = self._targets.get(key)
+        if target is None:
+            target = self._targets[key] = _Target(self.target_concurrency, self.target_rate)
+        return target
+
+    def _finish(self, request_id: str, result: AgentDispatchResult) -> None:
+        for future in self._waiters.pop(request_id, []):
+            if not future.done():
+                future.set_result(result)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._deliver(job)
+            except asyncio.CancelledError:
+                self._queue.put_nowait(job)  # rescheduled by stop()
+                raise
+            except Exception as e:  # noqa: BLE001
+                self._delivery_error(job, e)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, job: _Job) -> None:
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        store = self._events()
+        async with self._target(job.url):
+            job.attempts += 1
+            self.stats_counts['requests'] += 1
+            try:
+                resp = await self._client.post(job.url, json=job.payload, headers=headers)
+                status = 'error' if resp.status_code >= 300 else 'delivered'
+                detail = f'status {resp.status_code}: {resp.text[:200]}'
+            except Exception as e:  # noqa
+                status, detail = 'exception', str(e) or type(e).__name__
+        if status == 'delivered':
+            detail = f'delivered in {job.attempts} attempt(s)'
+            store.update_event(job.request_id, 'delivered', detail, job.attempts)
+            self.stats_counts['delivered'] += 1
+            self._finish(job.request_id, AgentDispatchResult(success=True, detail=detail, attempts=job.attempts))
+        elif job.attempts >= self.max_attempts:
+            store.update_event(job.request_id, 'failed', detail, job.attempts)
+            self.stats_counts['failed'] += 1
+            self._finish(job.request_id, AgentDispatchResult(success=False, detail=detail, attempts=job.attempts))
+        else:
+            next_attempt = time.time() + backoff_delay(job.attempts, self.base_backoff)
+            store.schedule_retry(job.request_id, status, detail, job.attempts, next_attempt)
+            self.stats_counts['retriesScheduled'] += 1
+
+    def _delivery_error(self, job: _Job, error: Exception) -> None:
+        """An error outside the webhook request (e.g. the events database): the waiters get a failed result now
+        and the delivery is retried later like a failed request, unless it used up its attempts"""
+        detail = f'dispatch error: {error or type(error).__name__}'
+        retry = job.attempts < self.max_attempts
+        try:
+            store = self._events()
+            if retry:
+                next_attempt = time.time() + backoff_delay(max(1, job.attempts), self.base_backoff)
+                store.schedule_retry(job.request_id, 'exception', detail, job.attempts, next_attempt)
+                self.stats_counts['retriesScheduled'] += 1
+            else:
+                store.update_event(job.request_id, 'failed', detail, job.attempts)
+                self.stats_counts['failed'] += 1
+        except Exception as e:  # noqa: BLE001
+            logging.warning('agent dispatch: could not record the error of %s: %s', job.request_id, e)
+        if retry:
+            detail += ' (retry scheduled)'
+        self._finish(job.request_id, AgentDispatchResult(success=False, detail=detail, attempts=job.attempts))
+
+    async def _retry_scheduler(self) -> None:
+        while True:
+            free = self.queue_size - self._queue.qsize() if self.queue_size > 0 else 100
+            if free > 0:
+                try:
+                    due = await asyncio.to_thread(self._events().claim_due_retries, None, free)
+                except Exception as e:  # noqa: BLE001
+                    logging.warning('agent dispatch: claiming due retries failed: %s', e)
+                    due = []
+                for request_id, attempts, payload in due:
+                    await self._queue.put(_Job(request_id, self.url, payload, attempts))
+            await asyncio.sleep(self.retry_poll)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.stats_counts, queued=self._queue.qsize() if self._queue is not None else 0,
+                    running=bool(self._tasks), targets=len(self._targets), waiting=len(self._waiters))
+
+
+_dispatcher = AgentDispatcher(AGENT_URL, AGENT_API_KEY)
+
+
+def get_dispatcher() -> AgentDispatcher:
+    return _dispatcher
+
 
 async def dispatch_to_agent(stored: StoredHoroscope) -> AgentDispatchResult:
+    request_id = stored.response.meta['requestId']
     if not AGENT_URL:
         # Still record an event so UI shows something and user understands why relay is inert
         try:
-            payload = _build_agent_payload(stored)
-            events.record_event(stored.response.meta['requestId'], payload)
-            events.update_event(stored.response.meta['requestId'], 'skipped_no_url', 'AGENT_WEBHOOK_URL not set', 0)
+            payload = await asyncio.to_thread(_build_agent_payload, stored)
+            await events.arecord_event(request_id, payload)
+            await events.aupdate_event(request_id, 'skipped_no_url', 'AGENT_WEBHOOK_URL not set', 0)
         except Exception:  # noqa
             pass
         return AgentDispatchResult(success=False, detail='AGENT_WEBHOOK_URL not set', attempts=0)
-    payload = _build_agent_payload(stored)
-    # record pending event if not already
-    events.record_event(stored.response.meta['requestId'], payload)
-    headers = {'Content-Type': 'application/json'}
-    if AGENT_API_KEY:
-        headers['Authorization'] = f'Bearer {AGENT_API_KEY}'
-    attempts = 0
-    last_err = None
-    async with httpx.AsyncClient(timeout=10) as client:
-        while attempts < MAX_AGENT_ATTEMPTS:
-            # Exponential backoff with jitter (skip sleep first attempt)
-            if attempts > 0:
-                delay = BASE_BACKOFF * (2 ** (attempts-1))
-                import random
-                delay = min(delay, 30.0) + random.uniform(0, 0.25)
-                await asyncio.sleep(delay)
-            attempts += 1
-            try:
-                resp = await client.post(AGENT_URL, json=payload, headers=headers)
-                if resp.status_code < 300:
-                    detail = f'delivered in {attempts} attempt(s)'
-                    events.update_event(stored.response.meta['requestId'], 'delivered', detail, attempts)
-                    return AgentDispatchResult(success=True, detail=detail, attempts=attempts)
-                last_err = f'status {resp.status_code}: {resp.text[:200]}'
-                events.update_event(stored.response.meta['requestId'], 'error', last_err, attempts)
-            except Exception as e:  # noqa
-                last_err = str(e)
-                events.update_event(stored.response.meta['requestId'], 'exception', last_err, attempts)
-    # exhausted
-    events.update_event(stored.response.meta['requestId'], 'failed', last_err or 'unknown error', attempts)
-    return AgentDispatchResult(success=False, detail=last_err or 'unknown error', attempts=attempts)
+    payload = await asyncio.to_thread(_build_agent_payload, stored)
+    return await _dispatcher.dispatch(request_id, payload)
 
 
 def _build_agent_payload(stored: StoredHoroscope):
@@ -106,7 +309,12 @@ def _build_agent_payload(stored: StoredHoroscope):
         payload['bundle'] = bundle_snip
     # Attach additional computed snapshots (lightweight basic versions) so agent has cross-endpoint data
     try:
-        from .app import get_yogas, get_strength, deep_strength, _compute_summary_internal
+        # All balas in one pass (shadbala, bhava bala, vimsopaka, vaiseshikamsa)
+        payload['strength'] = api_app.chart_strength(r.meta['requestId'])
+    except Exception as e:  # noqa
+        payload['strengthError'] = str(e)
+    try:
+        from .app import get_yogas, deep_strength, _compute_summary_internal
         rid = r.meta['requestId']
         # Always include basic + full yogas
         payload['yogasBasic'] = get_yogas(rid, mode='basic')
@@ -114,7 +322,6 @@ def _build_agent_payload(stored: StoredHoroscope):
             payload['yogasFull'] = get_yogas(rid, mode='full')
         except Exception as _e:  # noqa
             payload['yogasFullError'] = str(_e)
-        payload['strength'] = get_strength(rid)
         # Deep strength always (without aspects/prastara for size unless full)
         ds = deep_strength(rid, includeAspects=False, includePrastara=False)
         payload['deepStrength'] = ds
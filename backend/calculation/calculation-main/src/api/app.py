@@ -5,9 +5,9 @@ from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 import sys, logging, os
 from typing import Any, Dict
-from collections import OrderedDict
-from . import models, service, agent, events
-from datetime import datetime, UTC, timedelta
+from . import models, service, agent, events, engine, cache, dashas, varshaphal
+from datetime import datetime, UTC
+import functools
 import importlib
 import inspect
 
@@ -39,7 +39,7 @@ def _to_native(obj):  # noqa
     if isinstance(obj, dict):
         return { str(k): _to_native(v) for k,v in obj.items() }
     return obj
-import csv, os
+import os
 
 # Ensure our repo's src is at the front of sys.path and Swiss Ephemeris path is correct
 try:
@@ -63,8 +63,6 @@ except Exception as _e:
 
 from jhora import const as _jconst
 from jhora import utils as _jut
-from jhora.horoscope.dhasa.annual import mudda as _mudda
-from jhora.horoscope.dhasa.annual import patyayini as _patyayini
 from jhora.horoscope.dhasa import sudharsana_chakra as _sudharsana
 from jhora.horoscope.dhasa.graha import vimsottari as _vimsottari
 from jhora.horoscope.chart import ashtakavarga as _ashtakavarga
@@ -77,9 +75,6 @@ from jhora.horoscope.chart import house as _house
 from jhora.horoscope.chart import sphuta as _sphuta
 from jhora.horoscope.chart import strength as _strength
 from jhora.horoscope.match import compatibility as _compatibility
-from jhora.horoscope.transit import tajaka as _tajaka
-from jhora.horoscope.transit import tajaka_yoga as _tajaka_yoga
-from jhora.horoscope.transit import saham as _saham
 from jhora.horoscope.prediction import general as _general
 from jhora.horoscope.prediction import longevity as _longevity
 from jhora.horoscope.prediction import naadi_marriage as _naadi_marriage
@@ -101,65 +96,39 @@ except Exception as _e:
     logging.warning(f"Failed to set outer planets default: {_e}")
 
 app = FastAPI(title='PyJHora API', version='0.1')
-_RESP_CACHE: OrderedDict[str, dict] = OrderedDict()
-_RESP_CACHE_MAX = 256
-_RESP_CACHE_TTL = timedelta(hours=1)
-_RESP_CACHE_LOCK = asyncio.Lock()
-_PLACES: list[dict[str, Any]] | None = None
-
-def _cache_prune_locked(now: datetime | None = None) -> None:
-    if not _RESP_CACHE:
-        return
-    now = now or datetime.now(UTC)
-    expired: list[str] = []
-    for key, entry in list(_RESP_CACHE.items()):
-        ts = entry.get('ts')
-        if not ts:
-            continue
-        try:
-            ts_dt = datetime.fromisoformat(ts)
-        except Exception:
-            expired.append(key)
-            continue
-        if now - ts_dt > _RESP_CACHE_TTL:
-            expired.append(key)
-    for key in expired:
-        _RESP_CACHE.pop(key, None)
-
-async def _cache_set(key: str, value: dict[str, Any]) -> None:
-    data = dict(value)
-    data.setdefault('ts', datetime.now(UTC).isoformat())
-    async with _RESP_CACHE_LOCK:
-        _cache_prune_locked()
-        _RESP_CACHE[key] = data
-        _RESP_CACHE.move_to_end(key)
-        while len(_RESP_CACHE) > _RESP_CACHE_MAX:
-            _RESP_CACHE.popitem(last=False)
-
-async def _cache_get(key: str) -> dict[str, Any] | None:
-    async with _RESP_CACHE_LOCK:
-        entry = _RESP_CACHE.get(key)
-        if not entry:
-            return None
-        _cache_prune_locked()
-        entry = _RESP_CACHE.get(key)
-        if not entry:
-            return None
-        _RESP_CACHE.move_to_end(key)
-        return entry
-
-
-def _cache_set_sync(key: str, value: dict[str, Any]) -> None:
-    """Synchronous convenience wrapper for cache writes in threadpool contexts."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-    if loop and loop.is_running():
-        fut = asyncio.run_coroutine_threadsafe(_cache_set(key, value), loop)
-        fut.result()
-    else:
-        asyncio.run(_cache_set(key, value))
+_RESP_CACHE = cache.ResponseCache()
+_DASHAS = dashas.DashaService()
+
+def _response_cached(namespace: str):
+    """Cache the endpoint's response in _RESP_CACHE, keyed by namespace, endpoint and its arguments.
+    Responses depend only on the stored request (its id is the request hash) and the query parameters;
+    errors are not cached. Works for sync (threadpool) and async endpoints alike."""
+    def decorator(fn):
+        sig = inspect.signature(fn)
+        def key_of(args, kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = bound.arguments
+            return (namespace, params.get('request_id'), fn.__name__,
+                    tuple(sorted((k, v) for k, v in params.items() if k != 'request_id')))
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                key = key_of(args, kwargs)
+                value = _RESP_CACHE.get(key, _CACHE_MISS)
+                if value is _CACHE_MISS:
+                    value = await fn(*args, **kwargs)
+                    _RESP_CACHE.set(key, value)
+                return value
+            return async_wrapper
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = key_of(args, kwargs)
+            return _RESP_CACHE.get_or_set(key, lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorator
+
+_CACHE_MISS = object()
 
 def _cache_key(path: str):
     return path
@@ -174,49 +143,6 @@ def _safe_float(value: Any, default: float | None = None) -> float | None:
     except Exception:
         return default
 
-def _load_places() -> list[dict[str, Any]]:
-    global _PLACES
-    if _PLACES is not None:
-        return _PLACES
-    csv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'jhora', 'data', 'world_cities_with_tz.csv'))
-    items: list[dict[str, Any]] = []
-    if not os.path.exists(csv_path):
-        logging.warning(f"Place database missing at {csv_path}")
-        _PLACES = []
-        return _PLACES
-    try:
-        with open(csv_path, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                # Expected columns without header: country, city, lat, lon, tzName, tzOffset
-                if not row or len(row) < 4:
-                    continue
-                try:
-                    lat = _safe_float(row[2])
-                    lon = _safe_float(row[3])
-                except Exception:
-                    continue
-                tz = _safe_float(row[5]) if len(row) > 5 else _safe_float(row[4]) if len(row) > 4 else None
-                country = (row[0] or '').strip()
-                name = (row[1] or '').strip()
-                label = name
-                if country and country.lower() not in name.lower():
-                    label = f"{name}, {country}"
-                if not label:
-                    continue
-                items.append({
-                    'label': label,
-                    'country': country,
-                    'latitude': lat,
-                    'longitude': lon,
-                    'tzOffsetHours': tz,
-                })
-    except Exception as e:
-        logging.error(f"Failed to load place database: {e}")
-        items = []
-    _PLACES = items
-    return _PLACES
-
 _PLANET_NAMES = list(getattr(_jut, 'PLANET_NAMES', ['Sun','Moon','Mars','Mercury','Jupiter','Venus','Saturn','Rahu','Ketu']))
 if len(_PLANET_NAMES) < 9:
     _PLANET_NAMES.extend(['Rahu','Ketu'])
@@ -253,35 +179,6 @@ _NAKSHATRA_NAMES = [
     'Uttara Bhadrapada',
     'Revati',
 ]
-_MODULE_CACHE: dict[str, Any] = {}
-_GRAHA_DASHA_MAP: dict[str, tuple[str, str]] = {
-    'ashtottari': ('jhora.horoscope.dhasa.graha.ashtottari', 'get_ashtottari_dhasa_bhukthi'),
-    'yogini': ('jhora.horoscope.dhasa.graha.yogini', 'get_yogini_dhasa_bhukthi'),
-    'shodashottari': ('jhora.horoscope.dhasa.graha.shodasottari', 'get_dhasa_bhukthi'),
-    'dwadasottari': ('jhora.horoscope.dhasa.graha.dwadasottari', 'get_dhasa_bhukthi'),
-    'panchottari': ('jhora.horoscope.dhasa.graha.panchottari', 'get_dhasa_bhukthi'),
-    'shatabdika': ('jhora.horoscope.dhasa.graha.sataatbika', 'get_dhasa_bhukthi'),
-    'chaturashiti_sama': ('jhora.horoscope.dhasa.graha.chathuraaseethi_sama', 'get_dhasa_bhukthi'),
-    'dwisaptati_sama': ('jhora.horoscope.dhasa.graha.dwisatpathi', 'get_dhasa_bhukthi'),
-    'shashtihayani': ('jhora.horoscope.dhasa.graha.shastihayani', 'get_dhasa_bhukthi'),
-}
-_RASI_DASHA_MAP: dict[str, tuple[str, str]] = {
-    'sthira': ('jhora.horoscope.dhasa.raasi.sthira', 'get_dhasa_antardhasa'),
-    'narayana': ('jhora.horoscope.dhasa.raasi.narayana', 'narayana_dhasa_for_rasi_chart'),
-    'drig': ('jhora.horoscope.dhasa.raasi.drig', 'get_dhasa_antardhasa'),
-    'yogardha': ('jhora.horoscope.dhasa.raasi.yogardha', 'get_dhasa_antardhasa'),
-    'paryaaya': ('jhora.horoscope.dhasa.raasi.paryaaya', 'get_dhasa_antardhasa'),
-    'brahma': ('jhora.horoscope.dhasa.raasi.brahma', 'get_dhasa_antardhasa'),
-    'mandooka': ('jhora.horoscope.dhasa.raasi.mandooka', 'get_dhasa_antardhasa'),
-    'sudasa': ('jhora.horoscope.dhasa.raasi.sudasa', 'get_dhasa_antardhasa'),
-    'kalachakra': ('jhora.horoscope.dhasa.raasi.kalachakra', 'get_dhasa_antardhasa'),
-    'navamsa': ('jhora.horoscope.dhasa.raasi.navamsa', 'get_dhasa_antardhasa'),
-    'trikona': ('jhora.horoscope.dhasa.raasi.trikona', 'get_dhasa_antardhasa'),
-    'chakra': ('jhora.horoscope.dhasa.raasi.chakra', 'get_dhasa_antardhasa'),
-    'kendraadhi_rasi': ('jhora.horoscope.dhasa.raasi.kendradhi_rasi', 'get_dhasa_antardhasa'),
-    'shoola': ('jhora.horoscope.dhasa.raasi.shoola', 'get_dhasa_antardhasa'),
-}
-
 def _planet_label(value: Any) -> str:
     if isinstance(value, str):
         return 'Ascendant' if value == getattr(_jconst, '_ascendant_symbol', 'L') else value
@@ -341,13 +238,6 @@ def _format_sphuta_value(value: Any) -> str:
         return f"{sign} {_format_degree(value[1])}"
     return str(value)
 
-def _load_module(path: str):
-    mod = _MODULE_CACHE.get(path)
-    if mod is None:
-        mod = importlib.import_module(path)
-        _MODULE_CACHE[path] = mod
-    return mod
-
 def _get_birth_details(stored: models.StoredHoroscope):
     dob_vals, tob_vals, place = _extract_birth_context(stored)
     try:
@@ -426,47 +316,15 @@ def _format_period_entry(dhasa: Any, bhukti: Any | None, start: Any, duration: A
             entry['duration'] = duration
     return entry
 
-def _invoke_graha_dasha(system: str, stored: models.StoredHoroscope, include_antardhasa: bool = True):
-    config = _GRAHA_DASHA_MAP.get(system)
-    if not config:
-        raise HTTPException(404, f'Unknown graha dasha system: {system}')
-    module = _load_module(config[0])
-    fn = getattr(module, config[1], None)
-    if not fn:
-        raise HTTPException(500, f'Dasha calculator not available for {system}')
-    dob, tob, place = _get_birth_details(stored)
-    _, jd, _ = _ensure_horoscope_context(stored)
-    kwargs: dict[str, Any] = {}
-    for name in inspect.signature(fn).parameters:
-        if name in {'jd', 'jd_at_dob', 'jd_at_years'}:
-            kwargs[name] = jd
-        elif name == 'place':
-            kwargs[name] = place
-        elif name == 'dob':
-            kwargs[name] = dob
-        elif name == 'tob':
-            kwargs[name] = tob
-        elif name == 'include_antardhasa':
-            kwargs[name] = include_antardhasa
-        elif name == 'divisional_chart_factor':
-            kwargs[name] = 1
-        elif name == 'chart_method':
-            kwargs[name] = 1
-        elif name == 'years':
-            kwargs[name] = 1
-        elif name == 'months':
-            kwargs[name] = 1
-        elif name == 'sixty_hours':
-            kwargs[name] = 1
-        elif name == 'star_position_from_moon':
-            kwargs[name] = 1
-        elif name == 'use_tribhagi_variation':
-            kwargs[name] = False
-        elif name == 'seed_star':
-            kwargs[name] = 8
-        elif name == 'dhasa_starting_planet':
-            kwargs[name] = 1
-    return fn(**kwargs)
+def _compute_dasha(system: str, request_id: str, stored: models.StoredHoroscope, include_antardhasa: bool = True,
+                   **options: Any):
+    """Raw periods of a dasha system from the shared, memoized dasha service"""
+    try:
+        return _DASHAS.compute(request_id, stored, system, include_antardhasa=include_antardhasa, **options)
+    except dashas.UnknownDashaSystem:
+        raise HTTPException(404, f'Unknown dasha system: {system}')
+    except dashas.DashaFunctionUnavailable as e:
+        raise HTTPException(501, str(e))
 
 def _format_graha_periods(raw: list[Any], include_antardhasa: bool, limit: int) -> list[dict[str, Any]]:
     periods: list[dict[str, Any]] = []
@@ -483,40 +341,6 @@ def _format_graha_periods(raw: list[Any], include_antardhasa: bool, limit: int)
             break
     return periods
 
-def _invoke_rasi_dasha(system: str, stored: models.StoredHoroscope, include_antardhasa: bool = True):
-    config = _RASI_DASHA_MAP.get(system)
-    if not config:
-        raise HTTPException(404, f'Unknown rasi dasha system: {system}')
-    module = _load_module(config[0])
-    fn = getattr(module, config[1], None)
-    if not fn:
-        raise HTTPException(500, f'Dasha calculator not available for {system}')
-    dob, tob, place = _get_birth_details(stored)
-    _, jd, _ = _ensure_horoscope_context(stored)
-    kwargs: dict[str, Any] = {}
-    for name in inspect.signature(fn).parameters:
-        if name in {'jd', 'jd_at_dob', 'jd_at_years'}:
-            kwargs[name] = jd
-        elif name == 'place':
-            kwargs[name] = place
-        elif name == 'dob':
-            kwargs[name] = dob
-        elif name == 'tob':
-            kwargs[name] = tob
-        elif name == 'include_antardhasa':
-            kwargs[name] = include_antardhasa
-        elif name == 'divisional_chart_factor':
-            kwargs[name] = 1
-        elif name == 'chart_method':
-            kwargs[name] = 1
-        elif name == 'years':
-            kwargs[name] = 1
-        elif name == 'months':
-            kwargs[name] = 1
-        elif name == 'sixty_hours':
-            kwargs[name] = 1
-    return fn(**kwargs)
-
 def _format_rasi_periods(raw: list[Any], include_antardhasa: bool, limit: int) -> list[dict[str, Any]]:
     periods: list[dict[str, Any]] = []
     for item in raw:
@@ -534,8 +358,7 @@ def _format_rasi_periods(raw: list[Any], include_antardhasa: bool, limit: int) -
 
 def _handle_rasi_dasha(system: str, request_id: str, limit: int, include_antardhasa: bool):
     stored = _get_stored_or_404(request_id)
-    raw = _invoke_rasi_dasha(system, stored, include_antardhasa=include_antardhasa)
-    raw_list = raw if isinstance(raw, list) else list(raw)
+    raw_list = _compute_dasha(system, request_id, stored, include_antardhasa=include_antardhasa)
     periods = _format_rasi_periods(raw_list, include_antardhasa, limit)
     return {
         'requestId': request_id,
@@ -570,11 +393,7 @@ def _serialize_tajaka_chart(chart: list[Any]):
         })
     return entries, asc_sign, asc_long
 
-def _panchavargiya_summary(jd_year: float, place: Any) -> dict[str, Any]:
-    try:
-        scores = _strength.pancha_vargeeya_bala(jd_year, place)
-    except Exception:
-        return {}
+def _panchavargiya_summary(scores: dict[int, float]) -> dict[str, Any]:
     threshold = getattr(_jconst, 'pancha_vargeeya_bala_strength_threshold', 10)
     summary: dict[str, Any] = {}
     for idx, value in scores.items():
@@ -603,6 +422,36 @@ app.add_middleware(
 async def _load_world_city_index() -> None:
     await service.preload_world_city_index()
 
+@app.on_event('startup')
+async def _start_horoscope_engine() -> None:
+    horo_engine = engine.get_engine()
+    if horo_engine is not None:
+        await horo_engine.start()
+
+@app.on_event('shutdown')
+async def _stop_horoscope_engine() -> None:
+    horo_engine = engine.get_engine()
+    if horo_engine is not None:
+        await asyncio.to_thread(horo_engine.shutdown)
+
+@app.on_event('shutdown')
+async def _close_request_store() -> None:
+    await asyncio.to_thread(service.close_request_store)
+
+@app.on_event('startup')
+async def _start_agent_dispatcher() -> None:
+    # resumes the retries persisted in the events database
+    if agent.AGENT_URL:
+        await agent.get_dispatcher().start()
+
+@app.on_event('shutdown')
+async def _stop_agent_dispatcher() -> None:
+    await agent.get_dispatcher().stop()
+
+@app.on_event('shutdown')
+async def _close_agent_events() -> None:
+    await asyncio.to_thread(events.close)
+
 @app.post('/api/config/outer_planets')
 async def set_outer_planets(enabled: bool):
     """Toggle inclusion of Uranus/Neptune/Pluto in underlying library.
@@ -664,6 +513,7 @@ def _get_stored_or_404(request_id: str):
     stored = service.get_stored(request_id)
     if not stored or not stored.internalHoroscope:
         raise HTTPException(404, f"requestId '{request_id}' not found. Create one via POST /api/horoscope.")
+    service.activate_calculation_context(stored)
     return stored
 
 
@@ -728,26 +578,28 @@ async def health():
             info['worldCityIndexError'] = str(err)
     except Exception:
         info['worldCityIndexReady'] = False
+    horo_engine = engine.get_engine()
+    info['horoscopeEngine'] = horo_engine.stats() if horo_engine is not None else {'mode': 'thread'}
+    info['horoscopeStore'] = service.horoscope_store_stats()
+    info['responseCache'] = _RESP_CACHE.stats()
+    info['dashaCache'] = _DASHAS.stats()
+    try:
+        info['requestStore'] = await asyncio.to_thread(service.request_store_stats)
+    except Exception as e:
+        info['requestStore'] = {'error': str(e)}
     return info
 
 @app.get('/api/places')
 def search_places(q: str, limit: int = 20):
-    """Simple offline place search backed by world_cities_with_tz.csv"""
+    """Offline place search (world_cities_with_tz.csv) through the shared prefix / trigram place index"""
     if not q or len(q.strip()) < 2:
         return {'items': []}
-    places = _load_places()
-    ql = q.strip().lower()
-    results = []
-    for p in places:
-        try:
-            label = p.get('label','')
-            if ql in label.lower():
-                results.append(p)
-            if len(results) >= limit:
-                break
-        except Exception:
-            continue
-    return {'items': results}
+    try:
+        index = service.place_index()
+    except Exception as e:
+        logging.warning(f"Place database unavailable: {e}")
+        return {'items': []}
+    return {'items': index.search(q, limit=limit)}
 
 @app.get('/api/flags/planets')
 async def planet_flags(request_id: str):
@@ -1142,7 +994,7 @@ async def _agent_dispatch_task(request_id: str):
 @app.post('/api/horoscope', response_model=models.HoroscopeResponse)
 async def create_horoscope(req: models.HoroscopeRequest, background: BackgroundTasks):
     try:
-        stored = await asyncio.to_thread(service.compute_horoscope, req)
+        stored = await engine.compute_horoscope(req)
     except Exception as e:
         # Provide clearer diagnostics during development/testing
         import traceback, logging
@@ -1168,7 +1020,7 @@ async def get_horoscope(request_id: str, request: Request, response: Response):
         return None  # Not Modified
     if etag:
         response.headers['ETag'] = etag
-    await _cache_set(key, {'etag': etag})
+    _RESP_CACHE.set(key, {'etag': etag})
     return data
 
 
@@ -1217,8 +1069,8 @@ async def render_horoscope_chart(request_id: str, request: Request, response: Re
     try:
         from . import render as _render
         # Use in-memory cache to avoid recomputing SVGs repeatedly
-        cache_key = _cache_key(f"render:{request_id}:{chart}:{style}:{size}")
-        cached = await _cache_get(cache_key)
+        cache_key = _cache_key(f"render:{request_id}:{chart}:{style}:{theme}:{size}")
+        cached = _RESP_CACHE.get(cache_key)
         inm = request.headers.get('If-None-Match')
         if cached and isinstance(cached, dict) and cached.get('etag'):
             # If client has same ETag, short-circuit
@@ -1239,10 +1091,7 @@ async def render_horoscope_chart(request_id: str, request: Request, response: Re
             svg = _render.render_chart_svg(chart_obj, style=style, theme=theme, size=size)
             etag = _build_etag({'rid': request_id, 'chart': chart, 'style': style, 'size': size, 'hash': svg[:200]})
             # store in cache
-            try:
-                await _cache_set(cache_key, {'etag': etag, 'svg': svg})
-            except Exception:
-                pass
+            _RESP_CACHE.set(cache_key, {'etag': etag, 'svg': svg})
             if inm and inm == etag:
                 return Response(status_code=304)
             resp = Response(content=svg, media_type='image/svg+xml')
@@ -1253,10 +1102,7 @@ async def render_horoscope_chart(request_id: str, request: Request, response: Re
             positions = _render.chart_to_positions(chart_obj, size=size)
             svg = _render.render_chart_svg(chart_obj, style=style, theme=theme, size=size)
             etag = _build_etag({'rid': request_id, 'chart': chart, 'style': style, 'size': size, 'hash': svg[:200]})
-            try:
-                await _cache_set(cache_key, {'etag': etag, 'svg': svg, 'positions': positions})
-            except Exception:
-                pass
+            _RESP_CACHE.set(cache_key, {'etag': etag, 'svg': svg, 'positions': positions})
             if inm and inm == etag:
                 return Response(status_code=304)
             response.headers['ETag'] = str(etag or '')
@@ -1272,15 +1118,11 @@ async def list_horoscopes(limit: int = 200):
 @app.delete('/api/horoscope/{request_id}')
 async def delete_horoscope(request_id: str):
     existed = await service.delete_request(request_id)
-    # Also remove any agent events rows (optional) - implement soft ignore if events module lacks API
+    _RESP_CACHE.delete_matching(lambda key: request_id in (key if isinstance(key, tuple) else key.split(':')))
+    _DASHAS.invalidate(request_id)
+    # Also remove the agent events of the request (queued to the events writer)
     try:
-        import sqlite3, os
-        from . import events as _events
-        # direct DB cleanup by request_id
-        conn = sqlite3.connect(_events.DB_PATH)
-        with conn:
-            conn.execute("DELETE FROM agent_events WHERE request_id=?", (request_id,))
-        conn.close()
+        await events.adelete_events(request_id)
     except Exception:
         pass
     if not existed:
@@ -1298,6 +1140,7 @@ async def relay_agent(relay: models.AgentRelayRequest):
     return result.model_dump()
 
 @app.get('/api/dhasa/chara', response_model=models.CharaDhasaResponse)
+@_response_cached('dasha')
 async def get_chara_dhasa(request_id: str, limit: int = 120, include_antardhasa: bool = True, method: int = 1):
     """Return Jaimini Chara Dasha periods.
     method: 1 => Parasara/PVN Rao (two cycles), 2 => KN Rao (single cycle).
@@ -1305,21 +1148,10 @@ async def get_chara_dhasa(request_id: str, limit: int = 120, include_antardhasa:
     Response uses rasi short names from utils.PLANET_SHORT_NAMES mapping for consistency.
     """
     stored = _get_stored_or_404(request_id)
-    h = stored.internalHoroscope
-    # Build dob / tob / place
-    from jhora.panchanga import drik as _drik
-    dob = _drik.Date(h.Date.year, h.Date.month, h.Date.day)  # type: ignore[attr-defined]
-    try:
-        bt_tuple = tuple(int(x) for x in h.birth_time)  # type: ignore[attr-defined]
-    except Exception:
-        bt_tuple = (getattr(h,'birth_hour',0), getattr(h,'birth_minute',0), getattr(h,'birth_second',0))
-    place = h.Place  # type: ignore[attr-defined]
-    try:
-        from jhora.horoscope.dhasa.raasi import chara as _chara
-    except Exception as e:
-        raise HTTPException(500, f'chara dasha module missing: {e}')
     try:
-        raw = _chara.get_dhasa_antardhasa(dob, bt_tuple, place, include_antardhasa=bool(include_antardhasa), chara_method=int(method))
+        raw = _compute_dasha('chara', request_id, stored, include_antardhasa=bool(include_antardhasa), chara_method=int(method))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f'chara computation failed: {e}')
     periods: list[models.CharaDhasaItem] = []
@@ -1360,6 +1192,7 @@ async def get_chara_dhasa(request_id: str, limit: int = 120, include_antardhasa:
 
 
 @app.get('/api/dhasa/vimsottari')
+@_response_cached('dasha')
 def dhasa_vimsottari(request_id: str, limit: int = 120, include_antardhasa: bool = True, depth: int = 2, full_tree: bool = False, max_nodes: int = 2000, raw: bool = True):
     """
     Get Vimsottari Dhasa with configurable depth.
@@ -1373,19 +1206,20 @@ def dhasa_vimsottari(request_id: str, limit: int = 120, include_antardhasa: bool
     # For depth > 2, use new hierarchical function
     if depth > 2:
         try:
-            result = _vimsottari.get_vimsottari_dhasa_levels(jd, place, depth=depth)
+            # only the returned maha dhasas (and their sub periods) are formatted
+            table = _vimsottari.vimsottari_period_table(jd, place)
             return {
                 'requestId': request_id,
                 'system': 'Vimsottari',
                 'depth': depth,
-                'periods': result[:limit] if limit else result
+                'periods': table.to_nested(depth, limit=limit if limit else None)
             }
         except Exception as e:
             # Fallback to old method if new function fails
             pass
     
     # Original implementation for depth <= 2
-    bal, res = _vimsottari.get_vimsottari_dhasa_bhukthi(jd, place, include_antardhasa=include_antardhasa)
+    bal, res = _compute_dasha('vimsottari', request_id, stored, include_antardhasa=include_antardhasa)
     
     periods = []
     pnames = getattr(_jut,'PLANET_NAMES',['Sun','Moon','Mars','Mercury','Jupiter','Venus','Saturn','Rahu','Ketu'])
@@ -1406,28 +1240,51 @@ def dhasa_vimsottari(request_id: str, limit: int = 120, include_antardhasa: bool
     }
 
 
+@app.get('/api/dhasa/vimsottari/current')
+def dhasa_vimsottari_current(request_id: str, dateTime: str | None = None, depth: int = 3):
+    """Vimsottari periods (MD, AD, PD, ...) running at dateTime (ISO, local to the birth place; default now).
+    Looked up by binary search in the horoscope's period table, which is built once and shared with
+    /api/dhasa/vimsottari."""
+    if depth < 1 or depth > 5:
+        raise HTTPException(400, 'depth must be between 1 and 5')
+    stored = _get_stored_or_404(request_id)
+    h = stored.internalHoroscope
+    jd = getattr(h,'julian_day',None)
+    place = getattr(h,'Place',None)
+    from datetime import timedelta as _td, timezone as _tz
+    from jhora.panchanga import drik as _drik
+    try:
+        tzinfo = _tz(_td(hours=float(getattr(place, 'timezone', 0.0) or 0.0)))
+        if dateTime:
+            dt_local = datetime.fromisoformat(dateTime.strip().replace('Z', '+00:00').replace(' ', 'T'))
+            dt_local = dt_local.replace(tzinfo=tzinfo) if dt_local.tzinfo is None else dt_local.astimezone(tzinfo)
+        else:
+            dt_local = datetime.now(tzinfo)
+        at_jd = _jut.julian_day_number(_drik.Date(dt_local.year, dt_local.month, dt_local.day),
+                                       (dt_local.hour, dt_local.minute, dt_local.second))
+    except Exception as e:
+        raise HTTPException(400, f'invalid dateTime: {e}')
+    table = _vimsottari.vimsottari_period_table(jd, place)
+    levels = ['maha', 'antara', 'pratyantara', 'sookshma', 'prana']
+    periods = [{'level': levels[i], 'lord': lord, 'lordName': _planet_label(lord),
+                'start': _format_jd_datetime(start), 'end': _format_jd_datetime(end)}
+               for i, (lord, start, end) in enumerate(table.periods_at(at_jd, depth))]
+    return {'requestId': request_id, 'system': 'Vimsottari', 'dateTime': dt_local.isoformat(),
+            'depth': depth, 'periods': periods}
+
+
 @app.get('/api/dhasa/ashtottari')
+@_response_cached('dasha')
 def dhasa_ashtottari(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     """Return Ashtottari Dasha periods.
     include_antardhasa chooses whether to expand bhukti (antardhasa) layer.
     Response uses rasi short names from utils.PLANET_SHORT_NAMES mapping for consistency.
     """
     stored = _get_stored_or_404(request_id)
-    h = stored.internalHoroscope
-    # Build dob / tob / place
-    from jhora.panchanga import drik as _drik
-    dob = _drik.Date(h.Date.year, h.Date.month, h.Date.day)  # type: ignore[attr-defined]
-    try:
-        bt_tuple = tuple(int(x) for x in h.birth_time)  # type: ignore[attr-defined]
-    except Exception:
-        bt_tuple = (getattr(h,'birth_hour',0), getattr(h,'birth_minute',0), getattr(h,'birth_second',0))
-    place = h.Place  # type: ignore[attr-defined]
     try:
-        from jhora.horoscope.dhasa.graha import ashtottari
-    except Exception as e:
-        raise HTTPException(500, f'ashtottari dasha module missing: {e}')
-    try:
-        raw = ashtottari.get_ashtottari_dhasa_bhukthi(dob, bt_tuple, place, include_antardhasa=bool(include_antardhasa))
+        raw = _compute_dasha('ashtottari', request_id, stored, include_antardhasa=bool(include_antardhasa))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f'ashtottari computation failed: {e}')
     periods: list[models.CharaDhasaItem] = []
@@ -1467,10 +1324,13 @@ def dhasa_ashtottari(request_id: str, limit: int = 120, include_antardhasa: bool
     return models.CharaDhasaResponse(requestId=request_id, periods=periods, total=len(raw), returned=len(periods), includeAntardhasa=bool(include_antardhasa), method=1)
 
 @app.get('/api/dhasa/graha/{system}')
+@_response_cached('dasha')
 def dhasa_graha(system: str, request_id: str, limit: int = 120, include_antardhasa: bool = True):
     stored = _get_stored_or_404(request_id)
-    raw = _invoke_graha_dasha(system, stored, include_antardhasa=include_antardhasa)
-    raw_list = raw if isinstance(raw, list) else list(raw)
+    if system not in dashas.GRAHA_SYSTEMS:
+        raise HTTPException(404, f'Unknown graha dasha system: {system}')
+    raw = _compute_dasha(system, request_id, stored, include_antardhasa=include_antardhasa)
+    raw_list = dashas.periods_of(system, raw)
     periods = _format_graha_periods(raw_list, include_antardhasa, limit)
     return {
         'requestId': request_id,
@@ -1481,92 +1341,109 @@ def dhasa_graha(system: str, request_id: str, limit: int = 120, include_antardha
         'includeAntardhasa': include_antardhasa,
     }
 
+@app.get('/api/dhasa/multi')
+@_response_cached('dasha')
+def dhasa_multi(request_id: str, systems: str = 'vimsottari,ashtottari,yogini,chara,narayana', limit: int = 120,
+                include_antardhasa: bool = True):
+    """Several dasha systems in one call (comma separated names, see dashas.SYSTEMS) for side by side views.
+    All systems share the horoscope's birth context and the memoized dasha service; a system that fails
+    is reported in its 'error' field instead of failing the whole response."""
+    names = [name.strip() for name in systems.split(',') if name.strip()]
+    unknown = [name for name in names if name not in dashas.SYSTEMS]
+    if unknown:
+        raise HTTPException(404, f"Unknown dasha system(s): {', '.join(unknown)}")
+    stored = _get_stored_or_404(request_id)
+    results: dict[str, Any] = {}
+    for name, raw in _DASHAS.compute_many(request_id, stored, names, include_antardhasa=include_antardhasa).items():
+        if isinstance(raw, Exception):
+            results[name] = {'system': name, 'error': str(raw)}
+            continue
+        raw_list = dashas.periods_of(name, raw)
+        formatter = _format_graha_periods if dashas.SYSTEMS[name].kind == 'graha' else _format_rasi_periods
+        periods = formatter(raw_list, include_antardhasa, limit)
+        results[name] = {'system': name, 'periods': periods, 'returned': len(periods), 'total': len(raw_list)}
+    return {'requestId': request_id, 'includeAntardhasa': include_antardhasa, 'systems': results}
+
 @app.get('/api/dhasa/sthira')
+@_response_cached('dasha')
 def dhasa_sthira(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('sthira', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/narayana')
+@_response_cached('dasha')
 def dhasa_narayana(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('narayana', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/drig')
+@_response_cached('dasha')
 def dhasa_drig(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('drig', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/yogardha')
+@_response_cached('dasha')
 def dhasa_yogardha(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('yogardha', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/paryaaya')
+@_response_cached('dasha')
 def dhasa_paryaaya(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('paryaaya', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/brahma')
+@_response_cached('dasha')
 def dhasa_brahma(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('brahma', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/mandooka')
+@_response_cached('dasha')
 def dhasa_mandooka(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('mandooka', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/sudasa')
+@_response_cached('dasha')
 def dhasa_sudasa(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('sudasa', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/kalachakra')
+@_response_cached('dasha')
 def dhasa_kalachakra(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('kalachakra', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/navamsa')
+@_response_cached('dasha')
 def dhasa_navamsa(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('navamsa', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/trikona')
+@_response_cached('dasha')
 def dhasa_trikona(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('trikona', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/chakra')
+@_response_cached('dasha')
 def dhasa_chakra(request_id: str, limit: int = 120, include_antardhasa: bool = False):
     return _handle_rasi_dasha('chakra', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/kendraadhi_rasi')
+@_response_cached('dasha')
 def dhasa_kendraadhi_rasi(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('kendraadhi_rasi', request_id, limit, include_antardhasa)
 
 @app.get('/api/dhasa/rasi/shoola')
+@_response_cached('dasha')
 def dhasa_shoola(request_id: str, limit: int = 120, include_antardhasa: bool = True):
     return _handle_rasi_dasha('shoola', request_id, limit, include_antardhasa)
 
-@app.get('/api/tajaka/annual')
-def tajaka_annual(request_id: str, year: int):
-    stored = _get_stored_or_404(request_id)
-    _, jd, place = _ensure_horoscope_context(stored)
-    year_offset = _normalize_tajaka_year(year, stored)
-    try:
-        chart, start_info = _tajaka.annual_chart(jd, place, divisional_chart_factor=1, years=year_offset)
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(500, f'Failed to compute Tajaka annual chart: {exc}') from exc
-    planets, asc_sign, asc_long = _serialize_tajaka_chart(chart)
+def _tajaka_annual_section(data: varshaphal.TajakaYear) -> dict[str, Any]:
+    planets, asc_sign, asc_long = _serialize_tajaka_chart(data.chart)
     muntha_info = None
-    try:
-        if asc_sign is not None:
-            muntha_sign = _tajaka.muntha_house(int(asc_sign), year_offset)
-            muntha_info = {
-                'sign': _sign_label(muntha_sign),
-                'house': _relative_house(muntha_sign, asc_sign)
-            }
-    except Exception:
-        muntha_info = None
-    try:
-        lord_idx = _tajaka.lord_of_the_year(jd, place, year_offset)
-        lord_name = _planet_label(lord_idx)
-    except Exception:
-        lord_name = None
-    try:
-        jd_year = _drik.next_solar_date(jd, place, years=year_offset)
-    except Exception:
-        jd_year = jd
+    if data.muntha_sign is not None and asc_sign is not None:
+        muntha_info = {
+            'sign': _sign_label(data.muntha_sign),
+            'house': _relative_house(data.muntha_sign, asc_sign)
+        }
     start_str = None
+    start_info = data.start_info
     if start_info and len(start_info) >= 2:
         date_tuple = start_info[0]
         time_str = start_info[1]
@@ -1579,64 +1456,47 @@ def tajaka_annual(request_id: str, year: int):
             'longitudeDMS': _format_degree(asc_long)
         }
     return {
-        'requestId': request_id,
-        'year': year,
-        'yearOffset': year_offset,
         'planets': planets,
         'ascendant': ascendant_info,
         'muntha': muntha_info,
-        'lordOfYear': lord_name,
+        'lordOfYear': _planet_label(data.lord_of_year) if data.lord_of_year is not None else None,
         'chartStart': start_str,
-        'panchavargiya_bala': _panchavargiya_summary(jd_year, place),
+        'panchavargiya_bala': _panchavargiya_summary(data.panchavargiya),
     }
 
-@app.get('/api/tajaka/yogas')
-def tajaka_yogas(request_id: str, year: int):
-    stored = _get_stored_or_404(request_id)
-    _, jd, place = _ensure_horoscope_context(stored)
-    year_offset = _normalize_tajaka_year(year, stored)
-    try:
-        chart, _ = _tajaka.annual_chart(jd, place, divisional_chart_factor=1, years=year_offset)
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(500, f'Failed to compute Tajaka yogas: {exc}') from exc
+def _tajaka_yoga_entries(raw: dict[str, Any]) -> list[dict[str, Any]]:
     yogas: list[dict[str, Any]] = []
-    p_to_h = _jut.get_planet_house_dictionary_from_planet_positions(chart)
-    if _tajaka_yoga.ishkavala_yoga(p_to_h):
+    if raw.get('ishkavala'):
         yogas.append(_yoga_entry('Ishkavala', [], 'Planets occupy Kendras/Panapharas'))
-    if _tajaka_yoga.induvara_yoga(p_to_h):
+    if raw.get('induvara'):
         yogas.append(_yoga_entry('Induvara', [], 'Planets occupy Apoklimas'))
     try:
-        ithasala_pairs = _tajaka_yoga.get_ithasala_yoga_planet_pairs(chart)
-        for p1, p2, detail in ithasala_pairs:
+        for p1, p2, detail in raw.get('ithasala') or []:
             yogas.append(_yoga_entry('Ithasala', [p1, p2], str(detail)))
     except Exception:
         pass
     try:
-        eesarpha_pairs = _tajaka_yoga.get_eesarpha_yoga_planet_pairs(chart)
-        for p1, p2 in eesarpha_pairs:
+        for p1, p2 in raw.get('eesarpha') or []:
             yogas.append(_yoga_entry('Eesarpha', [p1, p2]))
     except Exception:
         pass
     try:
-        nakta = _tajaka_yoga.get_nakta_yoga_planet_triples(chart)
-        for triple in nakta or []:
+        for triple in raw.get('nakta') or []:
             yogas.append(_yoga_entry('Nakta', list(triple)))
     except Exception:
         pass
     try:
-        yamaya = _tajaka_yoga.get_yamaya_yoga_planet_triples(chart)
-        for triple in yamaya or []:
+        for triple in raw.get('yamaya') or []:
             yogas.append(_yoga_entry('Yamaya', list(triple)))
     except Exception:
         pass
     try:
-        manahoo = _tajaka_yoga.get_manahoo_yoga_planet_pairs(chart)
-        for p1, p2, house in manahoo or []:
+        for p1, p2, house in raw.get('manahoo') or []:
             yogas.append(_yoga_entry('Manahoo', [p1, p2], f'Mars/Saturn house {_sign_label(house)}'))
     except Exception:
         pass
     try:
-        ky = _tajaka_yoga.get_kamboola_yoga_planet_pairs(chart)
+        ky = raw.get('kamboola')
         if ky and ky[0]:
             detail = ', '.join([f"{_planet_label(x)}-{_planet_label(y)}" for x, y in ky[1]])
             planets = [p for pair in ky[1] for p in pair]
@@ -1644,36 +1504,32 @@ def tajaka_yogas(request_id: str, year: int):
     except Exception:
         pass
     try:
-        radda = _tajaka_yoga.get_radda_yoga_planet_pairs(chart)
-        for p1, p2 in radda or []:
+        for p1, p2 in raw.get('radda') or []:
             yogas.append(_yoga_entry('Radda', [p1, p2]))
     except Exception:
         pass
     try:
-        jd_year = _drik.next_solar_date(jd, place, years=year_offset)
-        dky = _tajaka_yoga.get_duhphali_kutta_yoga_planet_pairs(jd_year, place)
-        for p1, p2 in dky or []:
+        for p1, p2 in raw.get('duhphali_kutta') or []:
             yogas.append(_yoga_entry('Duhphali Kutta', [p1, p2]))
     except Exception:
         pass
-    return {'requestId': request_id, 'yogas': yogas}
+    return yogas
 
-@app.get('/api/dhasa/annual/mudda')
-def annual_mudda_dhasa(request_id: str, year: int, include_antardhasa: bool = True):
-    stored = _get_stored_or_404(request_id)
-    _, jd, place = _ensure_horoscope_context(stored)
-    year_offset = _normalize_tajaka_year(year, stored)
-    try:
-        dashas = _mudda.varsha_vimsottari_mahadasa(jd, place, year_offset)
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(500, f'Failed to compute Mudda dasha: {exc}') from exc
+def _saham_entries(sahams: dict[str, float]) -> dict[str, Any]:
+    entries: dict[str, Any] = {}
+    for name, longitude in sahams.items():
+        sign, long_in_sign = _drik.dasavarga_from_long(longitude)
+        entries[name] = {
+            'sign': _sign_label(sign),
+            'longitudeDMS': _format_degree(long_in_sign),
+            'rawLongitude': longitude,
+        }
+    return entries
+
+def _mudda_period_entries(data: varshaphal.TajakaYear, include_antardhasa: bool) -> list[dict[str, Any]]:
     periods: list[dict[str, Any]] = []
-    for d_lord, start_jd, duration in dashas:
+    for d_lord, start_jd, duration, bhuktis in data.mudda:
         if include_antardhasa:
-            try:
-                bhuktis = _mudda.varsha_vimsottari_bhukti(d_lord, start_jd)
-            except Exception:
-                bhuktis = []
             for b_lord, b_start, b_duration in bhuktis:
                 entry = {
                     'dhasaLord': _planet_label(d_lord),
@@ -1693,29 +1549,11 @@ def annual_mudda_dhasa(request_id: str, year: int, include_antardhasa: bool = Tr
                 'durationYears': round(float(duration) / 365.25, 3),
             }
             periods.append(entry)
-    return {
-        'requestId': request_id,
-        'yearOffset': year_offset,
-        'system': 'mudda',
-        'includeAntardhasa': include_antardhasa,
-        'periods': periods,
-    }
+    return periods
 
-@app.get('/api/dhasa/annual/patyayini')
-def annual_patyayini_dhasa(request_id: str, year: int, include_antardhasa: bool = True):
-    stored = _get_stored_or_404(request_id)
-    _, jd, place = _ensure_horoscope_context(stored)
-    year_offset = _normalize_tajaka_year(year, stored)
-    try:
-        jd_year = _drik.next_solar_date(jd, place, years=year_offset)
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(500, f'Failed to compute annual date: {exc}') from exc
-    try:
-        dhasas = _patyayini.patyayini_dhasa(jd_year, place)
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(500, f'Failed to compute Patyayini dasha: {exc}') from exc
+def _patyayini_period_entries(data: varshaphal.TajakaYear, include_antardhasa: bool) -> list[dict[str, Any]]:
     periods: list[dict[str, Any]] = []
-    for d_lord, bhuktis, dd in dhasas:
+    for d_lord, bhuktis, dd in data.patyayini:
         if include_antardhasa:
             parsed: list[tuple[Any, datetime | None, str]] = []
             for b_lord, start_str in bhuktis:
@@ -1743,16 +1581,132 @@ def annual_patyayini_dhasa(request_id: str, year: int, include_antardhasa: bool
         else:
             entry = {
                 'dhasaLord': _planet_label(d_lord),
-                'start': _format_jd_datetime(jd_year),
+                'start': _format_jd_datetime(data.jd_year),
                 'durationDays': round(float(dd), 2),
             }
             periods.append(entry)
+    return periods
+
+def _tajaka_year_or_500(request_id: str, year: int, section: str):
+    stored = _get_stored_or_404(request_id)
+    _, jd, place = _ensure_horoscope_context(stored)
+    year_offset = _normalize_tajaka_year(year, stored)
+    return year_offset, varshaphal.year_data(jd, place, year_offset, (section,))
+
+@app.get('/api/tajaka/annual')
+@_response_cached('tajaka')
+def tajaka_annual(request_id: str, year: int):
+    year_offset, data = _tajaka_year_or_500(request_id, year, 'annual')
+    if data.chart is None:
+        raise HTTPException(500, f"Failed to compute Tajaka annual chart: {data.errors.get('chart')}")
+    return {
+        'requestId': request_id,
+        'year': year,
+        'yearOffset': year_offset,
+        **_tajaka_annual_section(data),
+    }
+
+@app.get('/api/tajaka/yogas')
+@_response_cached('tajaka')
+def tajaka_yogas(request_id: str, year: int):
+    _, data = _tajaka_year_or_500(request_id, year, 'yogas')
+    if data.chart is None:
+        raise HTTPException(500, f"Failed to compute Tajaka yogas: {data.errors.get('chart')}")
+    return {'requestId': request_id, 'yogas': _tajaka_yoga_entries(data.yogas)}
+
+@app.get('/api/dhasa/annual/mudda')
+@_response_cached('dasha')
+def annual_mudda_dhasa(request_id: str, year: int, include_antardhasa: bool = True):
+    year_offset, data = _tajaka_year_or_500(request_id, year, 'mudda')
+    if 'mudda' in data.errors:
+        raise HTTPException(500, f"Failed to compute Mudda dasha: {data.errors['mudda']}")
+    return {
+        'requestId': request_id,
+        'yearOffset': year_offset,
+        'system': 'mudda',
+        'includeAntardhasa': include_antardhasa,
+        'periods': _mudda_period_entries(data, include_antardhasa),
+    }
+
+@app.get('/api/dhasa/annual/patyayini')
+@_response_cached('dasha')
+def annual_patyayini_dhasa(request_id: str, year: int, include_antardhasa: bool = True):
+    year_offset, data = _tajaka_year_or_500(request_id, year, 'patyayini')
+    if data.jd_year is None:
+        raise HTTPException(500, f"Failed to compute annual date: {data.errors.get('jd_year')}")
+    if 'patyayini' in data.errors:
+        raise HTTPException(500, f"Failed to compute Patyayini dasha: {data.errors['patyayini']}")
     return {
         'requestId': request_id,
         'yearOffset': year_offset,
         'system': 'patyayini',
         'includeAntardhasa': include_antardhasa,
-        'periods': periods,
+        'periods': _patyayini_period_entries(data, include_antardhasa),
+    }
+
+_VARSHAPHAL_ERROR_KEYS = {'annual': 'chart', 'yogas': 'chart', 'sahams': 'chart', 'mudda': 'mudda',
+                          'patyayini': 'patyayini'}
+
+def _varshaphal_year_entry(data: varshaphal.TajakaYear, year: int, sections: tuple[str, ...],
+                           include_antardhasa: bool) -> dict[str, Any]:
+    entry: dict[str, Any] = {'year': year, 'yearOffset': data.year_offset}
+    if data.jd_year is not None:
+        entry['chartStartJd'] = data.jd_year
+    errors: dict[str, str] = {}
+    for section in sections:
+        message = data.errors.get(_VARSHAPHAL_ERROR_KEYS[section])
+        if section == 'sahams':
+            message = message or data.errors.get('sahams')
+        elif section == 'patyayini' and data.jd_year is None:
+            message = data.errors.get('jd_year')
+        if message is not None:
+            errors[section] = message
+            entry[section] = None
+        elif section == 'annual':
+            entry[section] = _tajaka_annual_section(data)
+        elif section == 'yogas':
+            entry[section] = _tajaka_yoga_entries(data.yogas)
+        elif section == 'sahams':
+            entry[section] = _saham_entries(data.sahams)
+        elif section == 'mudda':
+            entry[section] = _mudda_period_entries(data, include_antardhasa)
+        else:
+            entry[section] = _patyayini_period_entries(data, include_antardhasa)
+    if errors:
+        entry['errors'] = errors
+    return entry
+
+@app.get('/api/tajaka/varshaphal')
+@_response_cached('tajaka')
+async def tajaka_varshaphal(request_id: str, start_year: int = 1, end_year: int = 100,
+                            sections: str = ','.join(varshaphal.SECTIONS), include_antardhasa: bool = True,
+                            parallel: bool = True):
+    """Annual charts, yogas, sahams and mudda/patyayini periods of a range of years in one call.
+    Years are offsets from birth, or calendar years (>= 1600) as in /api/tajaka/annual."""
+    stored = _get_stored_or_404(request_id)
+    _, jd, place = _ensure_horoscope_context(stored)
+    first = _normalize_tajaka_year(start_year, stored)
+    last = _normalize_tajaka_year(end_year, stored)
+    if last < first:
+        raise HTTPException(400, 'end_year must not be before start_year')
+    if last - first + 1 > varshaphal.VARSHAPHAL_MAX_YEARS:
+        raise HTTPException(400, f'at most {varshaphal.VARSHAPHAL_MAX_YEARS} years per request')
+    wanted = tuple(dict.fromkeys(s.strip().lower() for s in sections.split(',') if s.strip()))
+    unknown = [s for s in wanted if s not in varshaphal.SECTIONS]
+    if unknown or not wanted:
+        raise HTTPException(400, f"sections must be a comma separated subset of {', '.join(varshaphal.SECTIONS)}")
+    birth_year = _stored_birth_year(stored)
+    calendar_years = bool(birth_year) and start_year >= 1600
+    years = await varshaphal.compute_years(jd, place, range(first, last + 1), wanted,
+                                           context=getattr(stored, 'calculationContext', None), parallel=parallel)
+    return {
+        'requestId': request_id,
+        'startYearOffset': first,
+        'endYearOffset': last,
+        'sections': list(wanted),
+        'includeAntardhasa': include_antardhasa,
+        'years': [_varshaphal_year_entry(data, birth_year + data.year_offset if calendar_years else data.year_offset,
+                                         wanted, include_antardhasa) for data in years],
     }
 
 def chart_analysis(request_id: str, divisional_chart_factor: int = 1):
@@ -1785,22 +1739,24 @@ def chart_analysis(request_id: str, divisional_chart_factor: int = 1):
         }
     }
 
+@app.get('/api/chart/strength')
 def chart_strength(request_id: str):
+    """
+    Get Shadbala, Bhava Bala, Vimsopaka Bala and Vaiseshikamsa Bala, computed together from one strength context.
+    """
     stored = _get_stored_or_404(request_id)
     h = stored.internalHoroscope
     jd = getattr(h,'julian_day',None)
     place = getattr(h,'Place',None)
     
-    # Shadbala
-    sb = _strength.shad_bala(jd, place)
-    
-    # Bhava Bala
-    bb = _strength.bhava_bala(jd, place)
+    balas = _strength.all_balas(jd, place)
     
     return {
         'requestId': request_id,
-        'shadbala': _to_native(sb),
-        'bhavabala': _to_native(bb)
+        'shadbala': _to_native(balas['shad_bala']),
+        'bhavabala': _to_native(balas['bhava_bala']),
+        'vimsopaka': _to_native(balas['vimsopaka_bala']),
+        'vaiseshikamsa': _to_native(balas['vaiseshikamsa_bala'])
     }
 
 def chart_yoga(request_id: str, language: str = 'en'):
@@ -1893,8 +1849,9 @@ def _ensure_horoscope_context(stored: models.StoredHoroscope):
 def analyze_shadbala(request_id: str):
     stored = _get_stored_or_404(request_id)
     _, jd, place = _ensure_horoscope_context(stored)
+    context = _strength.StrengthContext(jd, place)
     try:
-        sb = _strength.shad_bala(jd, place)
+        sb = _strength.shad_bala(jd, place, context=context)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(500, f'Failed to compute shadbala: {exc}') from exc
     labels = ['sthana','kaala','dig','cheshta','naisargika','drik']
@@ -1910,7 +1867,7 @@ def analyze_shadbala(request_id: str):
         'percent': _to_native(sb[8]) if len(sb) > 8 else None,
     }
     try:
-        ishta_vals = _strength._ishta_phala(jd, place)  # type: ignore[attr-defined]
+        ishta_vals = _strength._ishta_phala(jd, place, context=context)  # type: ignore[attr-defined]
         if isinstance(ishta_vals, (list, tuple)):
             ishta = [_to_native(v) for v in ishta_vals]
             kashta = [_to_native(max(0.0, 60.0 - float(v))) for v in ishta_vals]
@@ -2045,6 +2002,7 @@ def analyze_sphuta(request_id: str):
     return payload
 
 @app.get('/api/dhasa/sudharsana_chakra')
+@_response_cached('dasha')
 async def dhasa_sudharsana_chakra(request_id: str, divisional_chart_factor: int = 1):
     """Return Sudharsana Chakra (Dhasa chart) for a request.
     This is a lightweight view suitable for direct display in UIs.
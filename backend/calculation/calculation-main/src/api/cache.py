@@ -0,0 +1,187 @@
+"""Expiring LRU cache of API responses (rendered charts, dasha and tajaka tables).
+
+Entries are spread over a fixed number of shards by key hash; each shard has its own lock, an OrderedDict in
+access order for LRU eviction and a heap of (expiry time, key) so expired entries are dropped from the top
+of the heap instead of scanning the whole cache. Expiry uses time.monotonic, so wall clock changes do not
+expire (or resurrect) entries. Every operation is a plain method call guarded by a threading lock: the cache
+can be used from the event loop and from the threads running the sync endpoints alike.
+"""
+from __future__ import annotations
+import heapq, itertools, os, threading, time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from .store import pickled_size
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('HORO_RESPONSE_CACHE_MAX_ENTRIES', '2048'))
+RESPONSE_CACHE_MAX_BYTES = int(float(os.getenv('HORO_RESPONSE_CACHE_MAX_MB', '64')) * 1024 * 1024)
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('HORO_RESPONSE_CACHE_TTL_SECONDS', '3600'))
+RESPONSE_CACHE_SHARDS = int(os.getenv('HORO_RESPONSE_CACHE_SHARDS', '8'))
+
+
+class _Shard:
+    __slots__ = ('lock', 'entries', 'heap', 'bytes')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[Hashable, Tuple[Any, int, float]] = OrderedDict()  # key -> (value, size, expires)
+        self.heap: List[Tuple[float, int, Hashable]] = []  # (expires, seq, key); stale items are skipped
+        self.bytes = 0
+
+
+class ResponseCache:
+    """Thread safe LRU bounded by entry count and total size, with a per entry time to live.
+
+    The bounds are split evenly over the shards. An entry larger than a shard's byte budget is not stored.
+    ttl=0 disables expiry; max_entries=0 / max_bytes=0 disable that bound.
+    """
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 ttl: float = RESPONSE_CACHE_TTL_SECONDS, shards: int = RESPONSE_CACHE_SHARDS,
+                 sizeof: Callable[[Any], int] = pickled_size, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl = max(0.0, float(ttl))
+        n = max(1, int(shards))
+        self._shards = [_Shard() for _ in range(n)]
+        self._shard_entries = -(-self.max_entries // n) if self.max_entries else 0
+        self._shard_bytes = -(-self.max_bytes // n) if self.max_bytes else 0
+        self._sizeof = sizeof
+        self._clock = clock
+        self._seq = itertools.count()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {'lru': 0, 'size': 0, 'ttl': 0}
+
+    def _shard(self, key: Hashable) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _count(self, hits: int = 0, misses: int = 0, **evictions: int) -> None:
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+            for reason, n in evictions.items():
+                self.evictions[reason] += n
+
+    @staticmethod
+    def _remove(shard: _Shard, key: Hashable) -> Any:
+        value, size, _ = shard.entries.pop(key)
+        shard.bytes -= size
+        return value
+
+    def _expire(self, shard: _Shard, now: float) -> int:
+        """Drop the expired entries at the top of the shard's heap; returns the number removed"""
+        heap, removed = shard.heap, 0
+        while heap and heap[0][0] <= now:
+            expires, _, key = heapq.heappop(heap)
+            entry = shard.entries.get(key)
+            if entry is not None and entry[2] == expires:  # otherwise the key was overwritten or deleted
+                self._remove(shard, key)
+                removed += 1
+        if len(heap) > 2 * len(shard.entries) + 64:
+            # overwritten and deleted keys leave stale heap items behind; rebuild from the live entries
+            shard.heap = [(exp, next(self._seq), k) for k, (_, _, exp) in shard.entries.items() if exp != float('inf')]
+            heapq.heapify(shard.heap)
+        return removed
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        shard = self._shard(key)
+        now = self._clock()
+        with shard.lock:
+            expired = self._expire(shard, now)
+            entry = shard.entries.get(key)
+            if entry is not None:
+                shard.entries.move_to_end(key)
+        self._count(hits=entry is not None, misses=entry is None, ttl=expired)
+        return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> bool:
+        """Store value under key; returns False if it is too large to be cached"""
+        size = self._sizeof(value)  # outside the lock
+        if self._shard_bytes and size > self._shard_bytes:
+            self.delete(key)
+            return False
+        ttl = self.ttl if ttl is None else max(0.0, float(ttl))
+        shard = self._shard(key)
+        now = self._clock()
+        expires = now + ttl if ttl else float('inf')
+        lru = over_size = 0
+        with shard.lock:
+            expired = self._expire(shard, now)
+            if key in shard.entries:
+                self._remove(shard, key)
+            shard.entries[key] = (value, size, expires)
+            shard.bytes += size
+            if ttl:
+                heapq.heappush(shard.heap, (expires, next(self._seq), key))
+            while len(shard.entries) > 1:
+                if self._shard_entries and len(shard.entries) > self._shard_entries:
+                    lru += 1
+                elif self._shard_bytes and shard.bytes > self._shard_bytes:
+                    over_size += 1
+                else:
+                    break
+                self._remove(shard, next(iter(shard.entries)))
+        if expired or lru or over_size:
+            self._count(ttl=expired, lru=lru, size=over_size)
+        return True
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any], ttl: float | None = None) -> Any:
+        """Cached value of key, computing and storing factory() on a miss.
+        factory runs outside the locks; concurrent misses on the same key may each compute it."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value, ttl)
+        return value
+
+    def delete(self, key: Hashable) -> bool:
+        shard = self._shard(key)
+        with shard.lock:
+            if key not in shard.entries:
+                return False
+            self._remove(shard, key)
+            return True
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every key for which predicate(key) is true (e.g. all responses of a deleted request)"""
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                for key in [k for k in shard.entries if predicate(k)]:
+                    self._remove(shard, key)
+                    removed += 1
+        return removed
+
+    def __contains__(self, key: Hashable) -> bool:
+        shard = self._shard(key)
+        now = self._clock()
+        with shard.lock:
+            entry = shard.entries.get(key)
+            return entry is not None and entry[2] > now
+
+    def __len__(self) -> int:
+        return sum(len(s.entries) for s in self._shards)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.heap.clear()
+                shard.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        entries = nbytes = 0
+        for shard in self._shards:
+            with shard.lock:
+                entries += len(shard.entries)
+                nbytes += shard.bytes
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {'entries': entries, 'bytes': nbytes, 'maxEntries': self.max_entries, 'maxBytes': self.max_bytes,
+                    'ttlSeconds': self.ttl, 'shards': len(self._shards), 'hits': self.hits, 'misses': self.misses,
+                    'hitRate': round(self.hits / lookups, 4) if lookups else None,
+                    'evictions': dict(self.evictions)}
+
+
+_MISSING = object()
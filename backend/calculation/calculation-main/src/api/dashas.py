@@ -0,0 +1,205 @@
+"""Dasha periods of stored horoscopes, computed once per (request hash, system, options).
+
+The /api/dhasa/* endpoints used to call the jhora dasha function of their system on every request and then
+format `limit` rows of the result. DashaService keeps the raw periods of each (request, system, options) in an
+expiring LRU (cache.ResponseCache), so changing limit or the output format does not recompute anything, and
+resolves the birth context (julian day, place, date and time of birth) of a request once for all systems.
+compute_many() evaluates several systems in one pass under the same context and ephemeris memo, for
+dashboards that show dashas side by side.
+
+The dasha functions get the birth context, include_antardhasa and the options of the caller; every other
+parameter keeps the function's own default (e.g. the seed star of each graha system, the D-6 chart of
+paryaaya and the D-9 chart of navamsa dasha), so the endpoints return what the jhora functions return.
+"""
+from __future__ import annotations
+import inspect, os, threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple, Tuple
+
+from . import cache, models
+
+DASHA_CACHE_MAX_ENTRIES = int(os.getenv('HORO_DASHA_CACHE_MAX_ENTRIES', '4096'))
+DASHA_CACHE_MAX_BYTES = int(float(os.getenv('HORO_DASHA_CACHE_MAX_MB', '64')) * 1024 * 1024)
+DASHA_CACHE_TTL_SECONDS = float(os.getenv('HORO_DASHA_CACHE_TTL_SECONDS', '21600'))
+
+
+class DashaSystem(NamedTuple):
+    module: str
+    function: str
+    kind: str  # 'graha' (periods of planets) or 'rasi' (periods of signs)
+    periods_index: int | None = None  # the function returns a tuple; periods are this item of it
+
+
+SYSTEMS: Dict[str, DashaSystem] = {
+    'vimsottari': DashaSystem('jhora.horoscope.dhasa.graha.vimsottari', 'get_vimsottari_dhasa_bhukthi', 'graha', 1),
+    'ashtottari': DashaSystem('jhora.horoscope.dhasa.graha.ashtottari', 'get_ashtottari_dhasa_bhukthi', 'graha'),
+    'yogini': DashaSystem('jhora.horoscope.dhasa.graha.yogini', 'get_dhasa_bhukthi', 'graha'),
+    'shodashottari': DashaSystem('jhora.horoscope.dhasa.graha.shodasottari', 'get_dhasa_bhukthi', 'graha'),
+    'dwadasottari': DashaSystem('jhora.horoscope.dhasa.graha.dwadasottari', 'get_dhasa_bhukthi', 'graha'),
+    'panchottari': DashaSystem('jhora.horoscope.dhasa.graha.panchottari', 'get_dhasa_bhukthi', 'graha'),
+    'shatabdika': DashaSystem('jhora.horoscope.dhasa.graha.sataatbika', 'get_dhasa_bhukthi', 'graha'),
+    'chaturashiti_sama': DashaSystem('jhora.horoscope.dhasa.graha.chathuraaseethi_sama', 'get_dhasa_bhukthi', 'graha'),
+    'dwisaptati_sama': DashaSystem('jhora.horoscope.dhasa.graha.dwisatpathi', 'get_dhasa_bhukthi', 'graha'),
+    'shashtihayani': DashaSystem('jhora.horoscope.dhasa.graha.shastihayani', 'get_dhasa_bhukthi', 'graha'),
+    'chara': DashaSystem('jhora.horoscope.dhasa.raasi.chara', 'get_dhasa_antardhasa', 'rasi'),
+    'sthira': DashaSystem('jhora.horoscope.dhasa.raasi.sthira', 'get_dhasa_antardhasa', 'rasi'),
+    'narayana': DashaSystem('jhora.horoscope.dhasa.raasi.narayana', 'narayana_dhasa_for_rasi_chart', 'rasi'),
+    'drig': DashaSystem('jhora.horoscope.dhasa.raasi.drig', 'drig_dhasa_bhukthi', 'rasi'),
+    'yogardha': DashaSystem('jhora.horoscope.dhasa.raasi.yogardha', 'get_dhasa_antardhasa', 'rasi'),
+    'paryaaya': DashaSystem('jhora.horoscope.dhasa.raasi.paryaaya', 'get_dhasa_antardhasa', 'rasi'),
+    'brahma': DashaSystem('jhora.horoscope.dhasa.raasi.brahma', 'get_dhasa_antardhasa', 'rasi'),
+    'mandooka': DashaSystem('jhora.horoscope.dhasa.raasi.mandooka', 'get_dhasa_antardhasa', 'rasi'),
+    'sudasa': DashaSystem('jhora.horoscope.dhasa.raasi.sudasa', 'sudasa_dhasa_bhukthi', 'rasi'),
+    'kalachakra': DashaSystem('jhora.horoscope.dhasa.raasi.kalachakra', 'get_dhasa_bhukthi', 'rasi'),
+    'navamsa': DashaSystem('jhora.horoscope.dhasa.raasi.navamsa', 'get_dhasa_antardhasa', 'rasi'),
+    'trikona': DashaSystem('jhora.horoscope.dhasa.raasi.trikona', 'get_dhasa_antardhasa', 'rasi'),
+    'chakra': DashaSystem('jhora.horoscope.dhasa.raasi.chakra', 'get_dhasa_antardhasa', 'rasi'),
+    'kendraadhi_rasi': DashaSystem('jhora.horoscope.dhasa.raasi.kendradhi_rasi', 'kendradhi_rasi_dhasa', 'rasi'),
+    'shoola': DashaSystem('jhora.horoscope.dhasa.raasi.shoola', 'shoola_dhasa_bhukthi', 'rasi'),
+}
+GRAHA_SYSTEMS = tuple(name for name, s in SYSTEMS.items() if s.kind == 'graha')
+RASI_SYSTEMS = tuple(name for name, s in SYSTEMS.items() if s.kind == 'rasi')
+
+
+class UnknownDashaSystem(KeyError):
+    pass
+
+
+class DashaFunctionUnavailable(LookupError):
+    """The jhora module or function configured for a system in SYSTEMS does not exist"""
+    pass
+
+
+@dataclass(frozen=True)
+class BirthContext:
+    """Inputs shared by all dasha systems of one horoscope"""
+    jd: float
+    place: Any
+    dob: Any  # drik.Date
+    tob: Tuple[int, int, int]
+
+
+def birth_context(stored: models.StoredHoroscope) -> BirthContext:
+    from jhora.panchanga import drik
+    h = getattr(stored, 'internalHoroscope', None)
+    jd = getattr(h, 'julian_day', None)
+    place = getattr(h, 'Place', None)
+    dob = getattr(h, 'Date', None)
+    if jd is None or place is None or dob is None:
+        raise ValueError('stored horoscope is missing its julian day, place or birth date')
+    tob = getattr(h, 'birth_time', None)
+    if isinstance(tob, str):
+        tob = [int(p) for p in tob.split(':')[:3]]
+    if not isinstance(tob, (list, tuple)):
+        tob = (getattr(h, 'birth_hour', 0), getattr(h, 'birth_minute', 0), getattr(h, 'birth_second', 0))
+    tob = tuple(int(v) for v in (list(tob) + [0, 0, 0])[:3])
+    return BirthContext(jd, place, drik.Date(int(dob[0]), int(dob[1]), int(dob[2])), tob)
+
+
+def _periods_function(system: str) -> Tuple[DashaSystem, Callable[..., Any]]:
+    config = SYSTEMS.get(system)
+    if config is None:
+        raise UnknownDashaSystem(system)
+    import importlib
+    try:
+        return config, getattr(importlib.import_module(config.module), config.function)
+    except (ImportError, AttributeError) as e:
+        raise DashaFunctionUnavailable(f'{system}: {config.module}.{config.function} is not available ({e})') from e
+
+
+def _call(system: str, context: BirthContext, include_antardhasa: bool, options: Dict[str, Any]):
+    config, fn = _periods_function(system)
+    kwargs: Dict[str, Any] = {}
+    for name in inspect.signature(fn).parameters:
+        if name in options:
+            kwargs[name] = options[name]
+        elif name in {'jd', 'jd_at_dob', 'jd_at_years'}:
+            kwargs[name] = context.jd
+        elif name == 'place':
+            kwargs[name] = context.place
+        elif name == 'dob':
+            kwargs[name] = context.dob
+        elif name == 'tob':
+            kwargs[name] = context.tob
+        elif name == 'include_antardhasa':
+            kwargs[name] = include_antardhasa
+    result = fn(**kwargs)
+    if config.periods_index is not None:
+        return tuple(result)
+    return result if isinstance(result, list) else list(result)
+
+
+def periods_of(system: str, raw: Any) -> list:
+    """The list of periods in a raw result (vimsottari returns (balance, periods))"""
+    index = SYSTEMS[system].periods_index
+    return list(raw[index]) if index is not None else raw
+
+
+class DashaService:
+    """Memo of raw dasha periods keyed by (request hash, system, include_antardhasa, options).
+
+    Options are keyword arguments of the dasha function (e.g. chara_method) overriding the defaults.
+    Concurrent requests for the same key share a single computation. Entries of a request are dropped with
+    invalidate(request_id) when the horoscope is deleted.
+    """
+    def __init__(self, max_entries: int = DASHA_CACHE_MAX_ENTRIES, max_bytes: int = DASHA_CACHE_MAX_BYTES,
+                 ttl: float = DASHA_CACHE_TTL_SECONDS):
+        self._results = cache.ResponseCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        self._contexts = cache.ResponseCache(max_entries=max_entries, max_bytes=0, ttl=ttl, sizeof=lambda _: 0)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+        self.computed = 0
+
+    def context(self, request_id: str, stored: models.StoredHoroscope) -> BirthContext:
+        return self._contexts.get_or_set(request_id, lambda: birth_context(stored))
+
+    def compute(self, request_id: str, stored: models.StoredHoroscope, system: str,
+                include_antardhasa: bool = True, **options: Any) -> Any:
+        """Raw result of the system's dasha function (memoized); raises UnknownDashaSystem/DashaFunctionUnavailable"""
+        if system not in SYSTEMS:
+            raise UnknownDashaSystem(system)
+        key = (request_id, system, bool(include_antardhasa), tuple(sorted(options.items())))
+        value = self._results.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                value = self._results.get(key, _MISSING)  # computed by the request we waited for
+                if value is _MISSING:
+                    value = _call(system, self.context(request_id, stored), bool(include_antardhasa), options)
+                    self._results.set(key, value)
+                    with self._lock:
+                        self.computed += 1
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def compute_many(self, request_id: str, stored: models.StoredHoroscope, systems: Iterable[str],
+                     include_antardhasa: bool = True) -> Dict[str, Any]:
+        """Raw results of several systems in one pass: {system: result}; a failing system maps to its exception"""
+        results: Dict[str, Any] = {}
+        for system in dict.fromkeys(systems):
+            try:
+                results[system] = self.compute(request_id, stored, system, include_antardhasa)
+            except Exception as e:  # noqa: BLE001
+                results[system] = e
+        return results
+
+    def invalidate(self, request_id: str) -> int:
+        self._contexts.delete(request_id)
+        return self._results.delete_matching(lambda key: key[0] == request_id)
+
+    def clear(self) -> None:
+        self._results.clear()
+        self._contexts.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        info = self._results.stats()
+        info['computed'] = self.computed
+        return info
+
+
+_MISSING = object()
@@ -0,0 +1,157 @@
+"""Process pool execution of horoscope computations.
+
+Building a horoscope (all divisional charts, dashas, strengths) is CPU bound pure Python, so running it on
+the event loop's thread pool only ever uses one core. With HORO_ENGINE=process the requests are shipped to a
+pool of warm worker processes instead. Each worker imports jhora and sets the Swiss ephemeris path once in its
+initializer, receives the request as plain JSON (plus the outer planets policy of the API node) and returns the
+pickled StoredHoroscope. Storing and persisting the result stays in the API process (service.register_stored),
+which gets the length of that pickle as the size of the entry.
+"""
+from __future__ import annotations
+import os, asyncio, logging, pickle, threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict
+
+from . import models, service
+
+ENGINE_MODE = os.getenv('HORO_ENGINE', 'thread').strip().lower()  # 'thread' (default) or 'process'
+ENGINE_WORKERS = int(os.getenv('HORO_ENGINE_WORKERS', '0')) or (os.cpu_count() or 1)
+# spawn is the safe default: forking a multi threaded API process can deadlock on locks held by other threads
+ENGINE_START_METHOD = os.getenv('HORO_ENGINE_START_METHOD', 'spawn')
+
+def _worker_init(ephe_path: str) -> None:
+    import swisseph as swe
+    from jhora import const
+    from jhora.panchanga import drik
+    from jhora.horoscope import main  # noqa: F401  (warm import of the chart / dasha modules)
+    swe.set_ephe_path(ephe_path)
+    os.environ['SE_EPHE_PATH'] = ephe_path
+    const._ephe_path = ephe_path
+    drik._init_thread_ephemeris()
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+def _worker_compute(payload: Dict[str, Any], include_outer_planets: bool) -> bytes:
+    from jhora import const
+    # outer planets policy is toggled at runtime on the API node; it is part of the request hash
+    const._INCLUDE_URANUS_TO_PLUTO = include_outer_planets
+    req = models.HoroscopeRequest.model_validate(payload)
+    # pickled here rather than by the pool, so the API process knows its size without pickling it again
+    return pickle.dumps(service.build_stored_horoscope(req), protocol=pickle.HIGHEST_PROTOCOL)
+
+def _register_pickled(rhash: str, data: bytes) -> models.StoredHoroscope:
+    return service.register_stored(rhash, pickle.loads(data), size=len(data))
+
+class HoroscopeEngine:
+    """Runs service.build_stored_horoscope in a pool of warm worker processes.
+    Identical requests that are already in flight share a single computation."""
+    def __init__(self, workers: int = ENGINE_WORKERS, start_method: str = ENGINE_START_METHOD):
+        self.workers = max(1, int(workers))
+        self.start_method = start_method
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                from jhora import const
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context(self.start_method),
+                                                 initializer=_worker_init, initargs=(const._ephe_path,))
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+                self.restarts += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        """Spawn the workers and wait until every one of them has run its initializer."""
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(pool, _worker_ping) for _ in range(self.workers)])
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    async def submit(self, fn, *args: Any) -> Any:
+        """Run the picklable module level function fn(*args) in a worker process"""
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._ensure_pool()
+            try:
+                return await loop.run_in_executor(pool, fn, *args)
+            except BrokenProcessPool:
+                # a worker died (OOM, segfault in the C extension); start a fresh pool and retry once
+                logging.warning('horoscope engine pool broken; restarting workers')
+                self._discard_pool(pool)
+                if attempt:
+                    raise
+
+    async def _run(self, req: models.HoroscopeRequest) -> bytes:
+        from jhora import const
+        payload = req.model_dump(mode='json')
+        include_outer = bool(getattr(const, '_INCLUDE_URANUS_TO_PLUTO', False))
+        return await self.submit(_worker_compute, payload, include_outer)
+
+    async def compute(self, req: models.HoroscopeRequest) -> models.StoredHoroscope:
+        rhash = service.prepare_request(req)
+        stored = service.get_cached(rhash)
+        if stored is not None:
+            return stored
+        pending = self._inflight.get(rhash)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[rhash] = fut
+        try:
+            data = await self._run(req)
+            # unpickling and persisting the request snapshot block: not on the event loop
+            stored = await asyncio.to_thread(_register_pickled, rhash, data)
+            self.completed += 1
+            fut.set_result(stored)
+            return stored
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as exc:
+            self.failed += 1
+            fut.set_exception(exc)
+            fut.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(rhash, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'mode': 'process', 'workers': self.workers, 'running': self._pool is not None,
+                'inflight': len(self._inflight), 'completed': self.completed, 'failed': self.failed,
+                'restarts': self.restarts}
+
+_ENGINE: HoroscopeEngine | None = None
+
+def get_engine() -> HoroscopeEngine | None:
+    """The process pool engine when HORO_ENGINE=process, otherwise None (compute in the thread pool)."""
+    global _ENGINE
+    if ENGINE_MODE != 'process':
+        return None
+    if _ENGINE is None:
+        _ENGINE = HoroscopeEngine()
+    return _ENGINE
+
+async def compute_horoscope(req: models.HoroscopeRequest) -> models.StoredHoroscope:
+    engine = get_engine()
+    if engine is None:
+        return await asyncio.to_thread(service.compute_horoscope, req)
+    return await engine.compute(req)
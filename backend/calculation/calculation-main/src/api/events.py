@@ -1,8 +1,24 @@
+"""Agent dispatch events (one row per dispatch of a horoscope to the agent webhook) in a local SQLite database.
+
+EventStore keeps one WAL-mode connection per process. Inserts, status updates and deletes are queued and
+applied by a background writer thread, which commits everything queued so far in a single transaction, so
+recording an event never waits for the disk. Reads wait (up to read_timeout) for the writes queued before them,
+so a caller always sees its own events, and then share the connection behind a lock. The a* coroutines
+(arecord_event, alist_events, ...) run the blocking parts in a worker thread, for use from the async agent
+dispatch loop.
+
+Failed deliveries are retried later: schedule_retry() stores the time of the next attempt with the event, and
+the agent dispatcher claims the due retries (claim_due_retries) - so they survive a restart of the server.
+"""
 from __future__ import annotations
-import sqlite3, os, json, time
-from typing import List, Dict, Any, Optional
+import asyncio, atexit, json, os, queue, sqlite3, threading, time
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
 DB_PATH = os.getenv('AGENT_EVENTS_DB', 'agent_events.db')
+# Most writes applied in one transaction by the writer thread
+WRITE_BATCH_SIZE = int(os.getenv('AGENT_EVENTS_WRITE_BATCH', '256'))
+# Longest wait of a read for the writes queued before it (seconds)
+READ_TIMEOUT = float(os.getenv('AGENT_EVENTS_READ_TIMEOUT', '30'))
 
 _INIT_SQL = """
 CREATE TABLE IF NOT EXISTS agent_events (
@@ -13,64 +29,252 @@ CREATE TABLE IF NOT EXISTS agent_events (
   attempts INTEGER NOT NULL DEFAULT 0,
   status TEXT NOT NULL,
   detail TEXT,
-  payload TEXT NOT NULL
+  payload TEXT NOT NULL,
+  next_attempt REAL
 );
-CREATE INDEX IF NOT EXISTS idx_agent_events_request ON agent_events(request_id);
+DROP INDEX IF EXISTS idx_agent_events_request;
+CREATE INDEX IF NOT EXISTS idx_agent_events_request_id ON agent_events(request_id, id DESC);
 """
 
-def _conn():
-    return sqlite3.connect(DB_PATH)
+_INSERT_SQL = "INSERT INTO agent_events(request_id, created_at, status, payload) VALUES (?,?,?,?)"
+_UPDATE_SQL = ("UPDATE agent_events SET status=?, detail=?, attempts=?, last_attempt=?, next_attempt=? "
+               "WHERE request_id=?")
+_DELETE_SQL = "DELETE FROM agent_events WHERE request_id=?"
+_LATEST_PAYLOAD_SQL = "SELECT payload FROM agent_events WHERE request_id=? ORDER BY id DESC LIMIT 1"
 
-def init_db():
-    with _conn() as c:
-        c.executescript(_INIT_SQL)
+_Write = Tuple[str, Sequence[Any]]
 
-def record_event(request_id: str, payload: Dict[str, Any]):
-    with _conn() as c:
-        c.execute("INSERT INTO agent_events(request_id, created_at, status, payload) VALUES (?,?,?,?)",
-                  (request_id, time.time(), 'pending', json.dumps(payload)))
 
-def update_event(request_id: str, status: str, detail: str, attempts: int):
-    with _conn() as c:
-        c.execute("UPDATE agent_events SET status=?, detail=?, attempts=?, last_attempt=? WHERE request_id=?",
-                  (status, detail, attempts, time.time(), request_id))
+class EventStore:
+    """Agent events of one database file; the connection and the writer thread start on first use."""
+    def __init__(self, path: str = DB_PATH, batch_size: int = WRITE_BATCH_SIZE, read_timeout: float = READ_TIMEOUT):
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.read_timeout = read_timeout
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()  # guards the connection
+        self._queue: queue.SimpleQueue[_Write | None] = queue.SimpleQueue()
+        self._applied = threading.Condition()
+        self._queued_count = 0  # writes queued so far
+        self._applied_count = 0  # writes applied (or dropped after an error) so far
+        self._writer: threading.Thread | None = None
+        self.batches = 0
+        self.errors = 0
+        self.last_error: str | None = None
 
-def list_events(limit: int=100, offset: int = 0) -> List[Dict[str, Any]]:
-    """List recent events with lightweight size metric (payloadSize bytes). Supports offset for pagination."""
-    if offset < 0: offset = 0
-    with _conn() as c:
-        rows = c.execute("SELECT request_id, created_at, last_attempt, attempts, status, detail, LENGTH(payload) FROM agent_events ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset)).fetchall()
-    out=[]
-    for r in rows:
-        out.append({
-            'requestId': r[0],
-            'request_id': r[0],  # alias for legacy frontend code
-            'createdAt': r[1],
-            'lastAttempt': r[2],
-            'attempts': r[3],
-            'status': r[4],
-            'detail': r[5],
-            'payloadSize': r[6]
-        })
-    return out
+    def _connection(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.executescript(_INIT_SQL)
+                columns = {r[1] for r in conn.execute('PRAGMA table_info(agent_events)')}
+                if 'next_attempt' not in columns:  # database of an older version
+                    conn.execute('ALTER TABLE agent_events ADD COLUMN next_attempt REAL')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_agent_events_next_attempt ON agent_events(next_attempt) '
+                             'WHERE next_attempt IS NOT NULL')
+                self._conn = conn
+            return self._conn
 
-def get_payload(request_id: str) -> Optional[Dict[str, Any]]:
-    # Always pick the most recent event for this request
-    with _conn() as c:
-        row = c.execute("SELECT payload FROM agent_events WHERE request_id=? ORDER BY id DESC LIMIT 1", (request_id,)).fetchone()
-    if not row: return None
-    try:
-        return json.loads(row[0])
-    except Exception:
-        return None
+    def init_db(self) -> None:
+        self._connection()
 
-def get_payload_info(request_id: str) -> Optional[Dict[str, Any]]:
-    """Return size and mode info without transferring full payload (except limited keys)."""
-    with _conn() as c:
-        row = c.execute("SELECT payload FROM agent_events WHERE request_id=? ORDER BY id DESC LIMIT 1", (request_id,)).fetchone()
-    if not row:
-        return None
-    raw = row[0]
+    # writes
+
+    def _start_writer(self) -> None:
+        """Start the writer thread if it is not running (first write, or after it died); holds self._applied"""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name='agent-events-writer', daemon=True)
+            self._writer.start()
+
+    def _submit(self, sql: str, params: Sequence[Any]) -> None:
+        with self._applied:
+            if self._writer is None or not self._writer.is_alive():
+                self._connection()
+                self._start_writer()
+            self._queued_count += 1
+            self._queue.put((sql, params))
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._apply(batch)
+                    return
+                batch.append(item)
+            self._apply(batch)
+
+    def _apply(self, batch: List[_Write]) -> None:
+        try:
+            with self._lock:
+                conn = None
+                try:
+                    conn = self._connection()
+                    conn.execute('BEGIN')
+                    for sql, params in batch:
+                        conn.execute(sql, params)
+                    conn.execute('COMMIT')
+                except Exception as e:  # noqa: BLE001
+                    self.last_error = str(e)
+                    if conn is None:  # the database could not be opened: the batch is dropped
+                        self.errors += len(batch)
+                    else:
+                        self._apply_one_by_one(conn, batch)
+                self.batches += 1
+        finally:
+            with self._applied:
+                self._applied_count += len(batch)
+                self._applied.notify_all()
+
+    def _apply_one_by_one(self, conn: sqlite3.Connection, batch: List[_Write]) -> None:
+        """After a failed transaction: apply the writes separately so a single bad write does not drop the others"""
+        try:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+        except Exception as e:  # noqa: BLE001
+            self.last_error = str(e)
+        for sql, params in batch:
+            try:
+                conn.execute(sql, params)
+            except Exception as e:  # noqa: BLE001
+                self.errors += 1
+                self.last_error = str(e)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until the writes queued before this call are in the database; False on timeout.
+        A writer thread that died with writes still queued is restarted."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._applied:
+            target = self._queued_count
+            while self._applied_count < target:
+                if self._writer is not None:  # None after close()
+                    self._start_writer()
+                remaining = 1.0 if deadline is None else deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._applied.wait(min(remaining, 1.0))
+            return True
+
+    def record_event(self, request_id: str, payload: Dict[str, Any]) -> None:
+        self._submit(_INSERT_SQL, (request_id, time.time(), 'pending', json.dumps(payload)))
+
+    def update_event(self, request_id: str, status: str, detail: str, attempts: int) -> None:
+        self._submit(_UPDATE_SQL, (status, detail, attempts, time.time(), None, request_id))
+
+    def schedule_retry(self, request_id: str, status: str, detail: str, attempts: int, next_attempt: float) -> None:
+        """Update the event like update_event and mark it for another attempt at next_attempt (epoch seconds)"""
+        self._submit(_UPDATE_SQL, (status, detail, attempts, time.time(), next_attempt, request_id))
+
+    def delete_events(self, request_id: str) -> None:
+        self._submit(_DELETE_SQL, (request_id,))
+
+    # reads
+
+    def _wait_for_writes(self) -> None:
+        """Reads see the writes queued before them; raises TimeoutError after read_timeout seconds"""
+        if not self.flush(self.read_timeout):
+            raise TimeoutError(f'agent events: queued writes not applied within {self.read_timeout}s '
+                               f'(last error: {self.last_error})')
+
+    def _fetch(self, sql: str, params: Sequence[Any], one: bool = False):
+        self._wait_for_writes()
+        with self._lock:
+            cur = self._connection().execute(sql, params)
+            return cur.fetchone() if one else cur.fetchall()
+
+    def list_events(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """List recent events with lightweight size metric (payloadSize bytes). Supports offset for pagination."""
+        if offset < 0: offset = 0
+        rows = self._fetch("SELECT request_id, created_at, last_attempt, attempts, status, detail, LENGTH(payload) "
+                           "FROM agent_events ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
+        out = []
+        for r in rows:
+            out.append({
+                'requestId': r[0],
+                'request_id': r[0],  # alias for legacy frontend code
+                'createdAt': r[1],
+                'lastAttempt': r[2],
+                'attempts': r[3],
+                'status': r[4],
+                'detail': r[5],
+                'payloadSize': r[6]
+            })
+        return out
+
+    def get_payload(self, request_id: str) -> Optional[Dict[str, Any]]:
+        # Always pick the most recent event for this request
+        row = self._fetch(_LATEST_PAYLOAD_SQL, (request_id,), one=True)
+        if not row: return None
+        try:
+            return json.loads(row[0])
+        except Exception:
+            return None
+
+    def get_payload_info(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Return size and mode info without transferring full payload (except limited keys)."""
+        row = self._fetch(_LATEST_PAYLOAD_SQL, (request_id,), one=True)
+        if not row:
+            return None
+        return _payload_info(request_id, row[0])
+
+    def claim_due_retries(self, now: float | None = None, limit: int = 100) -> List[Tuple[str, int, Dict[str, Any]]]:
+        """(request_id, attempts so far, payload) of the latest events whose retry is due, oldest first.
+        Claimed events get status 'retrying' and are not returned again unless rescheduled."""
+        now = time.time() if now is None else now
+        self._wait_for_writes()
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN')
+            try:
+                rows = conn.execute(
+                    "SELECT e.request_id, e.attempts, e.payload FROM agent_events e WHERE e.next_attempt IS NOT NULL "
+                    "AND e.next_attempt<=? AND e.id=(SELECT MAX(id) FROM agent_events WHERE request_id=e.request_id) "
+                    "ORDER BY e.next_attempt LIMIT ?", (now, limit)).fetchall()
+                conn.executemany("UPDATE agent_events SET status='retrying', next_attempt=NULL WHERE request_id=?",
+                                 [(r[0],) for r in rows])
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        claimed = []
+        for request_id, attempts, raw in rows:
+            try:
+                claimed.append((request_id, attempts, json.loads(raw)))
+            except Exception:
+                self.update_event(request_id, 'failed', 'stored payload is not valid JSON', attempts)
+        return claimed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._applied:
+            pending = self._queued_count - self._applied_count
+        return {'path': self.path, 'pendingWrites': pending, 'batches': self.batches, 'errors': self.errors,
+                'lastError': self.last_error}
+
+    def close(self) -> None:
+        """Apply the queued writes, stop the writer thread and close the connection"""
+        with self._applied:
+            writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _payload_info(request_id: str, raw: Optional[str]) -> Dict[str, Any]:
     size = len(raw) if raw else 0
     mode = 'unknown'
     top_keys: List[str] = []
@@ -96,4 +300,76 @@ def get_payload_info(request_id: str) -> Optional[Dict[str, Any]]:
         'topLevelKeys': top_keys
     }
 
-init_db()
\ No newline at end of file
+
+_store = EventStore(DB_PATH)
+
+
+def get_store() -> EventStore:
+    return _store
+
+
+def init_db():
+    _store.init_db()
+
+def record_event(request_id: str, payload: Dict[str, Any]):
+    _store.record_event(request_id, payload)
+
+def update_event(request_id: str, status: str, detail: str, attempts: int):
+    _store.update_event(request_id, status, detail, attempts)
+
+def schedule_retry(request_id: str, status: str, detail: str, attempts: int, next_attempt: float):
+    _store.schedule_retry(request_id, status, detail, attempts, next_attempt)
+
+def claim_due_retries(now: float | None = None, limit: int = 100) -> List[Tuple[str, int, Dict[str, Any]]]:
+    return _store.claim_due_retries(now, limit)
+
+def delete_events(request_id: str):
+    _store.delete_events(request_id)
+
+def flush(timeout: float | None = None) -> bool:
+    return _store.flush(timeout)
+
+def list_events(limit: int=100, offset: int = 0) -> List[Dict[str, Any]]:
+    return _store.list_events(limit, offset)
+
+def get_payload(request_id: str) -> Optional[Dict[str, Any]]:
+    return _store.get_payload(request_id)
+
+def get_payload_info(request_id: str) -> Optional[Dict[str, Any]]:
+    return _store.get_payload_info(request_id)
+
+def close():
+    _store.close()
+
+
+async def arecord_event(request_id: str, payload: Dict[str, Any]):
+    # serializing a full payload takes a while, so it runs in a worker thread too
+    await asyncio.to_thread(_store.record_event, request_id, payload)
+
+async def aupdate_event(request_id: str, status: str, detail: str, attempts: int):
+    _store.update_event(request_id, status, detail, attempts)  # only queues the write
+
+async def aschedule_retry(request_id: str, status: str, detail: str, attempts: int, next_attempt: float):
+    _store.schedule_retry(request_id, status, detail, attempts, next_attempt)
+
+async def aclaim_due_retries(now: float | None = None, limit: int = 100) -> List[Tuple[str, int, Dict[str, Any]]]:
+    return await asyncio.to_thread(_store.claim_due_retries, now, limit)
+
+async def adelete_events(request_id: str):
+    _store.delete_events(request_id)
+
+async def aflush(timeout: float | None = None) -> bool:
+    return await asyncio.to_thread(_store.flush, timeout)
+
+async def alist_events(limit: int=100, offset: int = 0) -> List[Dict[str, Any]]:
+    return await asyncio.to_thread(_store.list_events, limit, offset)
+
+async def aget_payload(request_id: str) -> Optional[Dict[str, Any]]:
+    return await asyncio.to_thread(_store.get_payload, request_id)
+
+async def aget_payload_info(request_id: str) -> Optional[Dict[str, Any]]:
+    return await asyncio.to_thread(_store.get_payload_info, request_id)
+
+
+atexit.register(close)
+init_db()
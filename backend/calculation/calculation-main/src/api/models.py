@@ -199,6 +199,7 @@ class StoredHoroscope(BaseModel):
     agentDispatched: bool = False
     agentResult: Optional[AgentDispatchResult] = None
     internalHoroscope: Any | None = None  # raw Horoscope instance for further computations
+    calculationContext: Any | None = None  # drik.CalculationContext (planet list, ayanamsa, language, house method)
 
 # Dhasa / Panchanga / Match models
 class DhasaPeriod(BaseModel):
@@ -0,0 +1,297 @@
+"""Offline place index over jhora/data/world_cities_with_tz.csv.
+
+One index backs both the /api/places autocomplete and the city lookup used to fill in missing coordinates of
+a horoscope request (service._lookup_world_city). Rows are kept as parallel columns (country, name, latitude,
+longitude, tz offset) and searched through
+  * a sorted array of (word, row) pairs for word prefix queries (bisect, then scan while the prefix matches),
+  * trigram postings (sorted row ids per trigram of the lower cased label) for substring queries, and
+  * a sorted array of (city name, row) pairs for exact city lookups.
+The index is written to a compact binary file (PLACE_INDEX_PATH) tagged with the size and mtime of the CSV,
+so a restart loads a few flat arrays instead of reparsing the CSV; a changed CSV rebuilds the file.
+"""
+from __future__ import annotations
+import csv, logging, math, os, struct, sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PLACE_DATA_PATH = Path(__file__).resolve().parent.parent / 'jhora' / 'data' / 'world_cities_with_tz.csv'
+PLACE_INDEX_PATH = Path(os.getenv('HORO_PLACE_INDEX_PATH', str(Path(__file__).parent / 'place_index.bin')))
+
+_MAGIC = b'PJPLACES'
+_VERSION = 1
+_HEADER = struct.Struct('<8sIB3xqq')  # magic, version, little endian flag, csv size, csv mtime_ns
+_SECTION = struct.Struct('<16sQ')  # name, byte length
+_SEP = '\x00'
+
+# match quality, best first
+EXACT, LABEL_PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in ''.join(c if c.isalnum() else ' ' for c in text).split() if w]
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def country_variants(country: str) -> Tuple[str, ...]:
+    """Spellings of a (lower cased) country accepted after the city name: full, condensed, first word,
+    first two letters and initials ('united states' -> 'unitedstates', 'united', 'un', 'us')."""
+    country = country.strip().lower()
+    if not country:
+        return ()
+    variants = [country, country.replace(' ', ''), country.split(' ')[0], country[:2],
+                ''.join(part[0] for part in country.split() if part)]
+    return tuple(dict.fromkeys(v for v in variants if v))
+
+
+class PlaceIndex:
+    """Columns of the place rows plus the prefix, trigram and city name indices built over them."""
+    def __init__(self, countries: List[str], names: List[str], lat: array, lon: array, tz: array,
+                 prefix_keys: List[str], prefix_rows: array, tri_keys: List[str], tri_offsets: array,
+                 tri_rows: array, city_keys: List[str], city_rows: array):
+        self.countries = countries
+        self.names = names
+        self.lat = lat
+        self.lon = lon
+        self.tz = tz  # NaN when the row has no offset
+        self.prefix_keys = prefix_keys
+        self.prefix_rows = prefix_rows
+        self.tri_keys = tri_keys
+        self.tri_offsets = tri_offsets
+        self.tri_rows = tri_rows
+        self.city_keys = city_keys
+        self.city_rows = city_rows
+        self.labels = [name if not country or country.lower() in name.lower() else f'{name}, {country}'
+                       for country, name in zip(countries, names)]
+        self._labels_lower = [label.lower() for label in self.labels]
+        self._trigram_pos = {key: i for i, key in enumerate(tri_keys)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[str]]) -> 'PlaceIndex':
+        """Build from CSV rows: country, city, latitude, longitude, tz name, tz offset (hours)"""
+        countries: List[str] = []
+        names: List[str] = []
+        lat, lon, tz = array('d'), array('d'), array('d')
+        for row in rows:
+            if len(row) < 4:
+                continue
+            try:
+                lat_v, lon_v = float(row[2]), float(row[3])
+            except (TypeError, ValueError):
+                continue
+            tz_s = row[5] if len(row) > 5 else row[4] if len(row) > 4 else ''
+            try:
+                tz_v = float(tz_s) if tz_s not in (None, '') else math.nan
+            except (TypeError, ValueError):
+                tz_v = math.nan
+            country, name = (row[0] or '').strip(), (row[1] or '').strip()
+            if not name and not country:
+                continue
+            countries.append(country)
+            names.append(name)
+            lat.append(lat_v)
+            lon.append(lon_v)
+            tz.append(tz_v)
+        prefix: List[Tuple[str, int]] = []
+        postings: Dict[str, List[int]] = {}
+        cities: List[Tuple[str, int]] = []
+        for i, (country, name) in enumerate(zip(countries, names)):
+            label = (name if not country or country.lower() in name.lower() else f'{name}, {country}').lower()
+            prefix.extend((w, i) for w in dict.fromkeys(_words(label)))
+            for gram in _trigrams(label):
+                postings.setdefault(gram, []).append(i)
+            place = name.lower()
+            city = place.split(',')[0].strip()
+            cities.append((city, i))
+            if place != city:
+                cities.append((place, i))
+        prefix.sort()
+        cities.sort()
+        tri_keys = sorted(postings)
+        tri_offsets, tri_rows = array('I', [0]), array('I')
+        for key in tri_keys:
+            tri_rows.extend(postings[key])
+            tri_offsets.append(len(tri_rows))
+        return cls(countries, names, lat, lon, tz, [k for k, _ in prefix], array('I', [r for _, r in prefix]),
+                   tri_keys, tri_offsets, tri_rows, [k for k, _ in cities], array('I', [r for _, r in cities]))
+
+    @classmethod
+    def from_csv(cls, path: Path | str) -> 'PlaceIndex':
+        with open(path, newline='', encoding='utf-8', errors='replace') as fh:
+            return cls.from_rows(list(csv.reader(fh)))
+
+    # -- binary form ---------------------------------------------------------------------------------------
+    def _sections(self) -> List[Tuple[str, bytes]]:
+        def text(values: List[str]) -> bytes:
+            return _SEP.join(values).encode('utf-8')
+        return [('country', text(self.countries)), ('name', text(self.names)),
+                ('lat', self.lat.tobytes()), ('lon', self.lon.tobytes()), ('tz', self.tz.tobytes()),
+                ('prefix_keys', text(self.prefix_keys)), ('prefix_rows', self.prefix_rows.tobytes()),
+                ('tri_keys', text(self.tri_keys)), ('tri_offsets', self.tri_offsets.tobytes()),
+                ('tri_rows', self.tri_rows.tobytes()),
+                ('city_keys', text(self.city_keys)), ('city_rows', self.city_rows.tobytes())]
+
+    def save(self, path: Path | str, source_size: int = 0, source_mtime_ns: int = 0) -> None:
+        """Write the index atomically (temporary file + rename)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f'.{os.getpid()}.tmp')
+        with open(tmp, 'wb') as fh:
+            fh.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == 'little', source_size, source_mtime_ns))
+            for name, data in self._sections():
+                fh.write(_SECTION.pack(name.encode('ascii'), len(data)))
+                fh.write(data)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path | str, source_size: int | None = None,
+             source_mtime_ns: int | None = None) -> Optional['PlaceIndex']:
+        """Read an index written by save(); None if the file is missing, unreadable or was built from a
+        different source file (size / mtime do not match)."""
+        try:
+            raw = Path(path).read_bytes()
+        except OSError:
+            return None
+        if len(raw) < _HEADER.size:
+            return None
+        magic, version, little, size, mtime_ns = _HEADER.unpack_from(raw, 0)
+        if magic != _MAGIC or version != _VERSION:
+            return None
+        if (source_size is not None and size != source_size) or \
+                (source_mtime_ns is not None and mtime_ns != source_mtime_ns):
+            return None
+        sections: Dict[str, memoryview] = {}
+        view, pos = memoryview(raw), _HEADER.size
+        while pos < len(raw):
+            name, length = _SECTION.unpack_from(raw, pos)
+            pos += _SECTION.size
+            sections[name.rstrip(b'\x00').decode('ascii')] = view[pos:pos + length]
+            pos += length
+
+        def text(name: str) -> List[str]:
+            data = bytes(sections[name]).decode('utf-8')
+            return data.split(_SEP) if data else []
+
+        def numbers(name: str, typecode: str) -> array:
+            values = array(typecode)
+            values.frombytes(sections[name])
+            if bool(little) != (sys.byteorder == 'little'):
+                values.byteswap()
+            return values
+        try:
+            return cls(text('country'), text('name'), numbers('lat', 'd'), numbers('lon', 'd'), numbers('tz', 'd'),
+                       text('prefix_keys'), numbers('prefix_rows', 'I'), text('tri_keys'),
+                       numbers('tri_offsets', 'I'), numbers('tri_rows', 'I'),
+                       text('city_keys'), numbers('city_rows', 'I'))
+        except (KeyError, ValueError, UnicodeDecodeError):
+            return None
+
+    # -- queries -------------------------------------------------------------------------------------------
+    def _prefix_matches(self, prefix: str) -> set:
+        rows = set()
+        keys = self.prefix_keys
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+            rows.add(self.prefix_rows[i])
+        return rows
+
+    def _trigram_matches(self, text: str) -> set:
+        postings = []
+        for gram in _trigrams(text):
+            pos = self._trigram_pos.get(gram)
+            if pos is None:
+                return set()
+            postings.append(self.tri_rows[self.tri_offsets[pos]:self.tri_offsets[pos + 1]])
+        postings.sort(key=len)
+        rows = set(postings[0])
+        for posting in postings[1:]:
+            rows.intersection_update(posting)
+            if not rows:
+                break
+        labels = self._labels_lower
+        return {r for r in rows if text in labels[r]}
+
+    def _match_quality(self, row: int, text: str) -> int:
+        label = self._labels_lower[row]
+        if label == text or self.names[row].lower() == text:
+            return EXACT
+        if label.startswith(text):
+            return LABEL_PREFIX
+        if any(w.startswith(text) for w in _words(label)):
+            return WORD_PREFIX
+        return SUBSTRING
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Places whose label contains query, best match first: exact name, label prefix, word prefix,
+        substring; ties keep the order of the data file. Queries shorter than three characters only match
+        word prefixes."""
+        text = (query or '').strip().lower()
+        if not text or limit <= 0:
+            return []
+        if len(text) < 3:
+            rows = self._prefix_matches(text)
+        else:
+            rows = self._trigram_matches(text)
+        ranked = sorted(rows, key=lambda r: (self._match_quality(r, text), r))
+        return [self.place(r) for r in ranked[:limit]]
+
+    def place(self, row: int) -> Dict[str, Any]:
+        tz = self.tz[row]
+        return {'label': self.labels[row], 'country': self.countries[row], 'latitude': self.lat[row],
+                'longitude': self.lon[row], 'tzOffsetHours': None if math.isnan(tz) else tz}
+
+    def city_rows_named(self, city: str) -> List[int]:
+        """Rows whose city name (or full place string) equals city, case insensitive, in file order"""
+        city = city.strip().lower()
+        keys, rows = self.city_keys, []
+        for i in range(bisect_left(keys, city), len(keys)):
+            if keys[i] != city:
+                break
+            rows.append(self.city_rows[i])
+        return sorted(set(rows))
+
+    def lookup(self, place: str, tz_offset: float | None = None) -> Optional[Tuple[float, float, float | None]]:
+        """(latitude, longitude, tz offset) of 'City[, ..., Country]'. Among the rows with that city name the
+        one closest to tz_offset wins, then one in the given country, then the first in the data file."""
+        tokens = [t.strip() for t in (place or '').split(',') if t.strip()]
+        if not tokens:
+            return None
+        rows = self.city_rows_named(tokens[0])
+        if not rows:
+            return None
+        country = tokens[-1].lower() if len(tokens) > 1 else None
+
+        def score(row: int):
+            tz = self.tz[row]
+            tz_score = 0.0 if tz_offset is None else (math.inf if math.isnan(tz) else abs(tz - tz_offset))
+            in_country = country is not None and country in country_variants(self.countries[row])
+            return tz_score, not in_country, row
+        row = min(rows, key=score)
+        tz = self.tz[row]
+        return self.lat[row], self.lon[row], None if math.isnan(tz) else tz
+
+
+def load_place_index(csv_path: Path | str = PLACE_DATA_PATH,
+                     index_path: Path | str | None = PLACE_INDEX_PATH) -> PlaceIndex:
+    """The index of csv_path, read from index_path when it was built from the same file, otherwise built from
+    the CSV and written to index_path. Raises FileNotFoundError if the CSV does not exist."""
+    st = os.stat(csv_path)
+    if index_path is not None:
+        index = PlaceIndex.load(index_path, st.st_size, st.st_mtime_ns)
+        if index is not None:
+            return index
+    index = PlaceIndex.from_csv(csv_path)
+    if index_path is not None:
+        try:
+            index.save(index_path, st.st_size, st.st_mtime_ns)
+        except OSError as exc:
+            logging.warning(f'Could not write place index to {index_path}: {exc}')
+    return index
@@ -1,12 +1,11 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Tuple, Mapping
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, UTC
 import sys, os
-import csv
 import asyncio
 import threading
+from contextlib import contextmanager
 # import fcntl
-from types import MappingProxyType
 # Ensure 'src' directory is on path when running via direct uvicorn without start script
 try:
     _BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -16,7 +15,8 @@ except Exception:
     pass
 from jhora.horoscope.main import Horoscope
 from jhora import utils, const
-from . import models
+from jhora.panchanga import drik
+from . import models, places, store
 import hashlib, json, os
 from pathlib import Path
 
@@ -50,75 +50,96 @@ COMMON_DIVISIONALS = [
 # Simple cache {hash: (timestamp, data)}; could be replaced by cachetools TTLCache
 _horo_cache: Dict[str, models.HoroscopeResponse] = {}
 _horo_cache_lock = threading.RLock()
-_store: Dict[str, models.StoredHoroscope] = {}
+# Computed horoscopes, bounded by HORO_STORE_MAX_ENTRIES / HORO_STORE_MAX_MB / HORO_STORE_TTL_SECONDS (see api.store)
+_store = store.MemoryStore(size_sample_every=store.MEMORY_SIZE_SAMPLE_EVERY)
 _store_lock = threading.RLock()
 # Persist only the original request payloads (serializable) so we can recompute lazily after a restart.
-_persisted_requests: Dict[str, Dict[str, Any]] = {}
-_persist_lock = threading.RLock()
-_language_lock = threading.RLock()
-PERSIST_PATH = Path(__file__).parent / 'horo_requests.json'
-WORLD_CITY_DATA_PATH = Path(__file__).resolve().parent.parent / 'jhora' / 'data' / 'world_cities_with_tz.csv'
+_request_store = store.RequestStore(store.STORE_PATH, legacy_snapshot=store.LEGACY_SNAPSHOT_PATH)
 
-WorldCityEntry = tuple[float, float, float | None, str]
-WorldCityLookup = Mapping[str, tuple[WorldCityEntry, ...]]
 
-_WORLD_CITY_LOOKUP: WorldCityLookup | None = None
+class _LanguageGate:
+    """Shared/exclusive gate around the process-wide resource strings of jhora.utils.
+
+    Computations in the base language only read those strings and run concurrently; switching
+    to another language via utils.set_language waits for them and then runs alone.
+
+    This is the serialization left after the per-request drik.CalculationContext: its `language`
+    selects the strings here, but jhora reads them from module globals everywhere, so requests in
+    another language than the base one still run one at a time. Ephemeris calls take turns on
+    drik._ephemeris_lock for the same reason (sidereal mode is global in Swiss Ephemeris).
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            while self._writer:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+_language_gate = _LanguageGate()
+_BASE_LANGUAGE = getattr(const, '_DEFAULT_LANGUAGE', 'en')
+
+
+@contextmanager
+def _language_scope(lang: str):
+    """Run the block with jhora resource strings in `lang`, restoring the base language afterwards."""
+    if lang == _BASE_LANGUAGE:
+        with _language_gate.shared():
+            yield
+        return
+    with _language_gate.exclusive():
+        prev_lang = getattr(const, '_DEFAULT_LANGUAGE', _BASE_LANGUAGE)
+        utils.set_language(lang)
+        try:
+            yield
+        finally:
+            utils.set_language(prev_lang)
+
+
+def activate_calculation_context(stored: models.StoredHoroscope | None) -> None:
+    """Use the stored horoscope's calculation settings for the rest of the current request.
+
+    Each request runs in its own contextvars context (task or threadpool call), so the
+    activation never leaks into concurrent requests. A copy is activated because library
+    calls may update the ayanamsa held by the context.
+    """
+    ctx = getattr(stored, 'calculationContext', None) if stored is not None else None
+    if ctx is not None:
+        drik.set_calculation_context(ctx.copy())
+WORLD_CITY_DATA_PATH = places.PLACE_DATA_PATH
+
+_WORLD_CITY_LOOKUP: places.PlaceIndex | None = None
 _WORLD_CITY_LOAD_ERROR: Exception | None = None
 _WORLD_CITY_LOAD_LOCK = threading.Lock()
 
-def _city_lookup_keys(city: str, country: str | None) -> List[str]:
-    base = city.strip().lower()
-    keys = [base]
-    if country:
-        country_norm = country.strip().lower()
-        if country_norm:
-            condensed = country_norm.replace(' ', '')
-            primary = f"{base},{country_norm}"
-            keys.append(primary)
-            if condensed != country_norm:
-                keys.append(f"{base},{condensed}")
-            keys.append(f"{base},{country_norm.split(' ')[0]}")
-            keys.append(f"{base},{country_norm[:2]}")
-            abbrev = ''.join(part[0] for part in country_norm.split() if part)
-            if abbrev:
-                keys.append(f"{base},{abbrev}")
-    return list(dict.fromkeys(keys))  # preserve order, remove dupes
-
-def _build_world_city_index() -> Dict[str, tuple[WorldCityEntry, ...]]:
-    if not WORLD_CITY_DATA_PATH.exists():
-        raise FileNotFoundError(f"World city dataset missing at {WORLD_CITY_DATA_PATH}")
-
-    lookup: Dict[str, List[WorldCityEntry]] = {}
-    with WORLD_CITY_DATA_PATH.open('r', encoding='ISO-8859-1') as fh:
-        reader = csv.reader(fh)
-        for row in reader:
-            if len(row) < 6:
-                continue
-            country, place, lat_s, lon_s, _tz_name, tz_hours_s = row[:6]
-            try:
-                lat_v = float(lat_s)
-                lon_v = float(lon_s)
-            except (TypeError, ValueError):
-                continue
-            tz_v: float | None
-            try:
-                tz_v = float(tz_hours_s) if tz_hours_s not in (None, '', 'NaN') else None
-            except (TypeError, ValueError):
-                tz_v = None
-            place_clean = place.strip()
-            city = place_clean.split(',')[0].strip().lower()
-            country_norm = country.strip().lower()
-            entry: WorldCityEntry = (lat_v, lon_v, tz_v, country_norm)
-            for key in _city_lookup_keys(city, country_norm):
-                lookup.setdefault(key, []).append(entry)
-            # Include exact place string without trailing country variations
-            if place_clean:
-                lookup.setdefault(place_clean.strip().lower(), []).append(entry)
-
-    return {k: tuple(v) for k, v in lookup.items()}
-
-
-def _ensure_world_city_index() -> WorldCityLookup:
+
+def _ensure_world_city_index() -> places.PlaceIndex:
     global _WORLD_CITY_LOOKUP, _WORLD_CITY_LOAD_ERROR
     if _WORLD_CITY_LOOKUP is not None:
         return _WORLD_CITY_LOOKUP
@@ -130,7 +151,9 @@ def _ensure_world_city_index() -> WorldCityLookup:
         if _WORLD_CITY_LOAD_ERROR is not None:
             raise _WORLD_CITY_LOAD_ERROR
         try:
-            _WORLD_CITY_LOOKUP = MappingProxyType(_build_world_city_index())
+            if not Path(WORLD_CITY_DATA_PATH).exists():
+                raise FileNotFoundError(f"World city dataset missing at {WORLD_CITY_DATA_PATH}")
+            _WORLD_CITY_LOOKUP = places.load_place_index(WORLD_CITY_DATA_PATH)
             _WORLD_CITY_LOAD_ERROR = None
         except Exception as exc:  # noqa: BLE001
             _WORLD_CITY_LOAD_ERROR = exc
@@ -186,83 +209,34 @@ def _reset_world_city_index_cache_for_tests() -> None:
     _WORLD_CITY_LOOKUP = None
     _WORLD_CITY_LOAD_ERROR = None
 
+def place_index() -> places.PlaceIndex:
+    """The shared place index (autocomplete and city lookup); loaded on first use"""
+    return _ensure_world_city_index()
+
 def _lookup_world_city(place: str, tz_offset: float | None) -> tuple[float, float, float | None] | None:
-    _ensure_world_city_index()
-    if not place or not _WORLD_CITY_LOOKUP:
+    index = _ensure_world_city_index()
+    if not place:
         return None
-    tokens = [t.strip() for t in place.split(',') if t.strip()]
-    if not tokens:
-        return None
-    city = tokens[0]
-    country = tokens[-1] if len(tokens) > 1 else None
-    keys: List[str] = []
-    if country:
-        keys.extend(_city_lookup_keys(city, country))
-    keys.append(city.strip().lower())
-    candidates: List[tuple[float, float, float | None, str]] = []
-    for key in keys:
-        items = _WORLD_CITY_LOOKUP.get(key.lower())
-        if items:
-            candidates.extend(items)
-    if not candidates:
-        return None
-    if tz_offset is not None:
-        def _score(entry: tuple[float, float, float | None, str]) -> float:
-            tz_val = entry[2]
-            if tz_val is None:
-                return float('inf')
-            return abs(tz_val - tz_offset)
-        candidates.sort(key=_score)
-    chosen = candidates[0]
-    return chosen[0], chosen[1], chosen[2]
-
-def _load_persisted():
-    global _persisted_requests
-    if PERSIST_PATH.exists():
-        try:
-            data = json.loads(PERSIST_PATH.read_text(encoding='utf-8'))
-            with _persist_lock:
-                _persisted_requests = data
-        except Exception:
-            _persisted_requests = {}
-
-def _json_default(obj: Any):
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    raise TypeError(f'Type {type(obj)!r} not serializable')
-
-def _serialize_persisted_requests() -> str:
-    with _persist_lock:
-        return json.dumps(_persisted_requests, ensure_ascii=False, indent=2, default=_json_default)
-
-
-def _write_persisted_snapshot(snapshot: str) -> None:
-    """Write snapshot to disk atomically using a file lock."""
-    lock_path = PERSIST_PATH.with_suffix(PERSIST_PATH.suffix + '.lock')
-    tmp_path = PERSIST_PATH.with_suffix('.tmp')
-    PERSIST_PATH.parent.mkdir(parents=True, exist_ok=True)
-    # Windows-compatible simple write without fcntl
-    with tmp_path.open('w', encoding='utf-8') as fh:
-        fh.write(snapshot)
-        fh.flush()
-        os.fsync(fh.fileno())
-    os.replace(tmp_path, PERSIST_PATH)
-
-
-async def persist_requests() -> None:
-    snapshot = _serialize_persisted_requests()
-    await asyncio.to_thread(_write_persisted_snapshot, snapshot)
+    return index.lookup(place, tz_offset)
 
+def upsert_persisted_request(key: str, value: Dict[str, Any]) -> None:
+    _request_store.put(key, value)
 
-def persist_requests_sync() -> None:
-    asyncio.run(persist_requests())
+def get_persisted_request(key: str) -> Dict[str, Any] | None:
+    return _request_store.get(key)
 
+def request_store_stats() -> Dict[str, Any]:
+    return _request_store.stats()
 
-def upsert_persisted_request(key: str, value: Dict[str, Any]) -> None:
-    with _persist_lock:
-        _persisted_requests[key] = value
+def horoscope_store_stats() -> Dict[str, Any]:
+    return _store.stats()
 
-_load_persisted()
+def close_request_store() -> None:
+    """Compact the persisted request store (if deletes left enough free space) and close it."""
+    try:
+        _request_store.compact()
+    finally:
+        _request_store.close()
 
 
 def _request_hash(req: models.HoroscopeRequest) -> str:
@@ -894,407 +868,400 @@ def _build_chart_output(horo: Horoscope, factor: int) -> Tuple[models.Divisional
     return chart_out, chart_info
 
 
-def compute_horoscope(req: models.HoroscopeRequest) -> models.StoredHoroscope:
+def prepare_request(req: models.HoroscopeRequest) -> str:
+    """Normalize the request language in place and return its request hash (the requestId)."""
     lang = _normalize_language(getattr(req, 'language', None))
     try:
         req.language = lang
     except Exception:
         pass
-    rhash = _request_hash(req)
+    return _request_hash(req)
+
+def register_stored(rhash: str, stored: models.StoredHoroscope, size: int | None = None) -> models.StoredHoroscope:
+    """Keep a computed horoscope in the in-memory store and persist its request.
+    size: bytes of the horoscope when known (pickle received from a worker process), see store.MemoryStore.set.
+    If another request stored the same hash first, that instance is returned."""
+    with _store_lock:
+        existing = _store.get(rhash)
+        if existing is not None:
+            return existing
+        _store.set(rhash, stored, size)
+    try:
+        upsert_persisted_request(rhash, stored.request.model_dump(mode='json'))
+    except Exception:
+        pass
+    return stored
+
+def compute_horoscope(req: models.HoroscopeRequest) -> models.StoredHoroscope:
+    rhash = prepare_request(req)
     with _store_lock:
-        if rhash in _store:
-            return _store[rhash]
+        # One lookup: a TTL entry may expire between a membership test and the read
+        stored = _store.get(rhash)
+    if stored is not None:
+        return stored
+    return register_stored(rhash, build_stored_horoscope(req, rhash))
+
+def build_stored_horoscope(req: models.HoroscopeRequest, rhash: str | None = None) -> models.StoredHoroscope:
+    """Compute the full horoscope for a request without touching the store or the persisted snapshot.
+    This is the unit of work run by the process pool engine (see api.engine)."""
+    if rhash is None:
+        rhash = prepare_request(req)
+    lang = _normalize_language(req.language)
     if req.birthDateTime is None or req.location is None:
         raise ValueError('birthDateTime and location are required')
-    with _language_lock:
-        prev_lang = getattr(const, '_DEFAULT_LANGUAGE', 'en')
-        changed_lang = prev_lang != lang
-        if changed_lang:
-            try:
-                utils.set_language(lang)
-            except Exception:
-                changed_lang = False
+    # Per-request planet list (Uranus/Neptune/Pluto only when enabled and not SS) and ayanamsa, so concurrent
+    # requests never see each other's settings through the drik/const module globals.
+    ctx = drik.CalculationContext.for_calculation_type(req.calcType, ayanamsa_mode=req.ayanamsaMode, language=lang)
+    requested_ctx = ctx.copy()
+    with _language_scope(ctx.language), drik.calculation_context(ctx):
+        dt = req.birthDateTime
+        # Build date and time inputs
+        d = drik.Date(dt.year, dt.month, dt.day)
+        bt = dt.strftime('%H:%M:%S')
+        place_with_country = req.location.place
+        latitude = req.location.latitude
+        longitude = req.location.longitude
+        tz = req.location.tzOffset
+        # If place string not provided but lat/long are, provide fallback name
+        place_arg = place_with_country or 'CustomLocation'
+        lat_arg = latitude if latitude is not None else None
+        lon_arg = longitude if longitude is not None else None
+        if place_with_country and (lat_arg is None or lon_arg is None):
+            fallback = _lookup_world_city(place_with_country, tz)
+            if fallback:
+                lat_arg = fallback[0]
+                lon_arg = fallback[1]
+                if tz is None and fallback[2] is not None:
+                    tz = fallback[2]
+        # Map requested house system to internal bhaava madhya method if provided
+        from jhora import const as _c
+        bhava_method = _c.bhaava_madhya_method
+        house_system_applied = None
         try:
-            # Ensure the drik planet list includes Uranus/Neptune/Pluto when enabled
-            try:
-                from jhora.panchanga import drik as _drik
-                calc_type = (req.calcType or 'drik').lower()
-                if calc_type == 'ss':
-                    _drik.planet_list = [
-                        const._SUN, const._MOON, const._MARS, const._MERCURY, const._JUPITER,
-                        const._VENUS, const._SATURN, const._RAHU, const._KETU
-                    ]
-                elif getattr(const, '_INCLUDE_URANUS_TO_PLUTO', False):
-                    _drik.set_sideral_planets()
-                else:
-                    _drik.planet_list = [
-                        const._SUN, const._MOON, const._MARS, const._MERCURY, const._JUPITER,
-                        const._VENUS, const._SATURN, const._RAHU, const._KETU
-                    ]
-            except Exception:
-                pass
-            dt = req.birthDateTime
-            # Build date and time inputs
-            from jhora.panchanga import drik
-            d = drik.Date(dt.year, dt.month, dt.day)
-            bt = dt.strftime('%H:%M:%S')
-            place_with_country = req.location.place
-            latitude = req.location.latitude
-            longitude = req.location.longitude
-            tz = req.location.tzOffset
-            # If place string not provided but lat/long are, provide fallback name
-            place_arg = place_with_country or 'CustomLocation'
-            lat_arg = latitude if latitude is not None else None
-            lon_arg = longitude if longitude is not None else None
-            if place_with_country and (lat_arg is None or lon_arg is None):
-                fallback = _lookup_world_city(place_with_country, tz)
-                if fallback:
-                    lat_arg = fallback[0]
-                    lon_arg = fallback[1]
-                    if tz is None and fallback[2] is not None:
-                        tz = fallback[2]
-            # Map requested house system to internal bhaava madhya method if provided
-            from jhora import const as _c
-            bhava_method = _c.bhaava_madhya_method
-            house_system_applied = None
-            try:
-                if req.houseSystem:
-                    key_raw = str(req.houseSystem).strip()
-                    # Available keys in library may be ints (1,2..) or strings ('P','K',...)
-                    available = _c.available_house_systems
-                    selected_key = None
-                    # Common alias fallbacks (highest priority)
-                    # Common alias fallbacks (highest priority). Map many user-friendly names to library keys.
-                    alias_map = {
-                        'default': _c.bhaava_madhya_method,
-                        'equal': 2,
-                        'equal_housing': 2,
-                        'equalmiddle': 1,
-                        'equal_middle': 1,
-                        'sripati': 3,
-                        'sripathi': 3,
-                        'placidus': 4,
-                        'kp': 4,
-                        'koch': 'K',
-                        'porphyrius': 'O',
-                        'porphyry': 'O',
-                        'porphyrius': 'O',
-                        'regiomontanus': 'R',
-                        'campanus': 'C',
-                        'alcabitus': 'B',
-                        'morinus': 'M',
-                        'vehlow': 'V',
-                        'axial': 'X',
-                    }
-                    if key_raw.lower() in alias_map:
-                        selected_key = alias_map[key_raw.lower()]
-
-                    # 1) Exact key match (allow numeric strings)
-                    for k in available.keys():
-                        if str(k).lower() == key_raw.lower():
+            if req.houseSystem:
+                key_raw = str(req.houseSystem).strip()
+                # Available keys in library may be ints (1,2..) or strings ('P','K',...)
+                available = _c.available_house_systems
+                selected_key = None
+                # Common alias fallbacks (highest priority)
+                # Common alias fallbacks (highest priority). Map many user-friendly names to library keys.
+                alias_map = {
+                    'default': _c.bhaava_madhya_method,
+                    'equal': 2,
+                    'equal_housing': 2,
+                    'equalmiddle': 1,
+                    'equal_middle': 1,
+                    'sripati': 3,
+                    'sripathi': 3,
+                    'placidus': 4,
+                    'kp': 4,
+                    'koch': 'K',
+                    'porphyrius': 'O',
+                    'porphyry': 'O',
+                    'porphyrius': 'O',
+                    'regiomontanus': 'R',
+                    'campanus': 'C',
+                    'alcabitus': 'B',
+                    'morinus': 'M',
+                    'vehlow': 'V',
+                    'axial': 'X',
+                }
+                if key_raw.lower() in alias_map:
+                    selected_key = alias_map[key_raw.lower()]
+
+                # 1) Exact key match (allow numeric strings)
+                for k in available.keys():
+                    if str(k).lower() == key_raw.lower():
+                        selected_key = k
+                        break
+                # 2) Match by label/content (e.g., 'equal','sripati','placidus')
+                if selected_key is None:
+                    for k,v in available.items():
+                        if key_raw.lower() == str(v).lower() or key_raw.lower() in str(v).lower():
                             selected_key = k
                             break
-                    # 2) Match by label/content (e.g., 'equal','sripati','placidus')
-                    if selected_key is None:
-                        for k,v in available.items():
-                            if key_raw.lower() == str(v).lower() or key_raw.lower() in str(v).lower():
-                                selected_key = k
-                                break
-                    # 3) (already handled above) fallback if still None -> leave None
-                    # Apply selection if found
-                    if selected_key is not None:
-                        # If selected_key is numeric (string or int-like), coerce to int for library calls
-                        try:
-                            if isinstance(selected_key, str) and selected_key.isdigit():
-                                bhava_method = int(selected_key)
-                            else:
-                                bhava_method = int(selected_key) if isinstance(selected_key, (int,)) else selected_key
-                        except Exception:
-                            bhava_method = selected_key
-                        # Expose both key and human-friendly label to the API consumer
+                # 3) (already handled above) fallback if still None -> leave None
+                # Apply selection if found
+                if selected_key is not None:
+                    # If selected_key is numeric (string or int-like), coerce to int for library calls
+                    try:
+                        if isinstance(selected_key, str) and selected_key.isdigit():
+                            bhava_method = int(selected_key)
+                        else:
+                            bhava_method = int(selected_key) if isinstance(selected_key, (int,)) else selected_key
+                    except Exception:
+                        bhava_method = selected_key
+                    # Expose both key and human-friendly label to the API consumer
+                    try:
+                        # available may have integer or string keys
+                        label = available[selected_key]
+                    except Exception:
+                        # if selected_key is numeric string, try converting
                         try:
-                            # available may have integer or string keys
-                            label = available[selected_key]
+                            label = available[int(selected_key)]
                         except Exception:
-                            # if selected_key is numeric string, try converting
-                            try:
-                                label = available[int(selected_key)]
-                            except Exception:
-                                # fallback: attempt lookup by matching stringified keys
-                                lab = None
-                                for k,v in available.items():
-                                    if str(k).lower() == str(selected_key).lower():
-                                        lab = v; break
-                                label = lab or str(selected_key)
-                        house_system_applied = str(label)
-                        # also keep raw key for consumers that need canonical key
-                        house_system_applied_key = str(selected_key)
-                    else:
-                        house_system_applied = 'DEFAULT'
-                        house_system_applied_key = str(_c.bhaava_madhya_method)
+                            # fallback: attempt lookup by matching stringified keys
+                            lab = None
+                            for k,v in available.items():
+                                if str(k).lower() == str(selected_key).lower():
+                                    lab = v; break
+                            label = lab or str(selected_key)
+                    house_system_applied = str(label)
+                    # also keep raw key for consumers that need canonical key
+                    house_system_applied_key = str(selected_key)
                 else:
                     house_system_applied = 'DEFAULT'
                     house_system_applied_key = str(_c.bhaava_madhya_method)
-            except Exception:
-                bhava_method = _c.bhaava_madhya_method
-                if not house_system_applied:
-                    house_system_applied = 'DEFAULT'
+            else:
+                house_system_applied = 'DEFAULT'
                 house_system_applied_key = str(_c.bhaava_madhya_method)
-            # Ensure bhava_method is an int acceptable to Horoscope (library expects int keys for methods)
+        except Exception:
+            bhava_method = _c.bhaava_madhya_method
+            if not house_system_applied:
+                house_system_applied = 'DEFAULT'
+            house_system_applied_key = str(_c.bhaava_madhya_method)
+        # Ensure bhava_method is an int acceptable to Horoscope (library expects int keys for methods)
+        try:
+            bhava_method_int = int(bhava_method)
+        except Exception:
             try:
-                bhava_method_int = int(bhava_method)
+                bhava_method_int = int(_c.bhaava_madhya_method)
             except Exception:
-                try:
-                    bhava_method_int = int(_c.bhaava_madhya_method)
-                except Exception:
-                    bhava_method_int = 1
-            horo = Horoscope(place_with_country_code=place_arg, latitude=lat_arg, longitude=lon_arg,
-                             timezone_offset=tz, date_in=d, birth_time=bt, ayanamsa_mode=req.ayanamsaMode,
-                             calculation_type=req.calcType, years=req.years, months=req.months,
-                             sixty_hours=req.sixtyHours, pravesha_type=req.praveshaType, language=req.language,
-                             bhava_madhya_method=bhava_method_int)
-            calendar = horo.calendar_info
-            factors = COMMON_DIVISIONALS if req.divisionalFactors is None else req.divisionalFactors
-            chart_infos: Dict[int, Dict[str,str]] = {}
-            # Always build rasi (D1) and include it as part of divisionalCharts so the UI's
-            # "Divisional Charts (Vargas)" section includes D1 alongside other divisionals.
-            rasi_chart_out, info_rasi = _build_chart_output(horo, 1)
-            chart_infos[1] = info_rasi
-            # Start charts_out with the D1 chart so Vargas list contains D1 first.
-            charts_out: List[models.DivisionalChartOut] = [rasi_chart_out]
-            for f in factors:
-                if f == 1:
-                    # already included
-                    continue
-                try:
-                    ch_out, info = _build_chart_output(horo, f)
-                    charts_out.append(ch_out)
-                    chart_infos[f] = info
-                except Exception:
-                    # Skip unsupported factor gracefully
-                    continue
-            resp = models.HoroscopeResponse(
-                requestId=rhash,
-                meta={
-                    "requestId": rhash,
-                    "generatedAt": datetime.now(UTC).isoformat(),
-                    "version": "api-0.2",  # bumped after relative house + ascendant sign enhancements
-                    "compact": req.compact,
-                    "agentMode": getattr(req,'sendToAgentMode','summary'),
-                    "houseSystemRequested": req.houseSystem or 'DEFAULT',
-                    # Human-readable label (preferred for display) and the canonical applied key
-                    "houseSystemApplied": house_system_applied or 'DEFAULT',
-                    "houseSystemAppliedKey": house_system_applied_key if 'house_system_applied_key' in locals() else str(_c.bhaava_madhya_method)
-                },
-                calendar=calendar,
-                rasiChart=rasi_chart_out,
-                divisionalCharts=[] if req.compact else charts_out,
-                # Panchanga: Birth chart panchanga (already calculated in calendar_info)
-                panchanga=calendar,
-                # Current Transits: Calculate current planetary positions
-                currentTransits={}  # Will be populated below
-            )
-            
-            # Calculate current transits (current planetary positions)
+                bhava_method_int = 1
+        ctx.bhava_madhya_method = requested_ctx.bhava_madhya_method = bhava_method_int
+        horo = Horoscope(place_with_country_code=place_arg, latitude=lat_arg, longitude=lon_arg,
+                         timezone_offset=tz, date_in=d, birth_time=bt, ayanamsa_mode=req.ayanamsaMode,
+                         calculation_type=req.calcType, years=req.years, months=req.months,
+                         sixty_hours=req.sixtyHours, pravesha_type=req.praveshaType, language=req.language,
+                         bhava_madhya_method=bhava_method_int)
+        calendar = horo.calendar_info
+        factors = COMMON_DIVISIONALS if req.divisionalFactors is None else req.divisionalFactors
+        chart_infos: Dict[int, Dict[str,str]] = {}
+        # Always build rasi (D1) and include it as part of divisionalCharts so the UI's
+        # "Divisional Charts (Vargas)" section includes D1 alongside other divisionals.
+        rasi_chart_out, info_rasi = _build_chart_output(horo, 1)
+        chart_infos[1] = info_rasi
+        # Start charts_out with the D1 chart so Vargas list contains D1 first.
+        charts_out: List[models.DivisionalChartOut] = [rasi_chart_out]
+        for f in factors:
+            if f == 1:
+                # already included
+                continue
             try:
-                from jhora import utils as _u_transit
-                from jhora.panchanga import drik as _drik_transit
-                from datetime import datetime as _dt_transit, timezone as _tz_transit
+                ch_out, info = _build_chart_output(horo, f)
+                charts_out.append(ch_out)
+                chart_infos[f] = info
+            except Exception:
+                # Skip unsupported factor gracefully
+                continue
+        resp = models.HoroscopeResponse(
+            requestId=rhash,
+            meta={
+                "requestId": rhash,
+                "generatedAt": datetime.now(UTC).isoformat(),
+                "version": "api-0.2",  # bumped after relative house + ascendant sign enhancements
+                "compact": req.compact,
+                "agentMode": getattr(req,'sendToAgentMode','summary'),
+                "houseSystemRequested": req.houseSystem or 'DEFAULT',
+                # Human-readable label (preferred for display) and the canonical applied key
+                "houseSystemApplied": house_system_applied or 'DEFAULT',
+                "houseSystemAppliedKey": house_system_applied_key if 'house_system_applied_key' in locals() else str(_c.bhaava_madhya_method)
+            },
+            calendar=calendar,
+            rasiChart=rasi_chart_out,
+            divisionalCharts=[] if req.compact else charts_out,
+            # Panchanga: Birth chart panchanga (already calculated in calendar_info)
+            panchanga=calendar,
+            # Current Transits: Calculate current planetary positions
+            currentTransits={}  # Will be populated below
+        )
+            
+        # Calculate current transits (current planetary positions)
+        try:
+            from jhora import utils as _u_transit
+            from jhora.panchanga import drik as _drik_transit
+            from datetime import datetime as _dt_transit, timezone as _tz_transit
                 
-                # Get current Julian Day
-                now_utc = _dt_transit.now(_tz_transit.utc)
-                current_jd = _u_transit.julian_day_number(
-                    _drik_transit.Date(now_utc.year, now_utc.month, now_utc.day),
-                    (now_utc.hour, now_utc.minute, now_utc.second)
-                )
+            # Get current Julian Day
+            now_utc = _dt_transit.now(_tz_transit.utc)
+            current_jd = _u_transit.julian_day_number(
+                _drik_transit.Date(now_utc.year, now_utc.month, now_utc.day),
+                (now_utc.hour, now_utc.minute, now_utc.second)
+            )
                 
-                # Calculate transit positions using same place/ayanamsa as birth chart
-                transit_planets = []
-                planet_ids = [const._SUN, const._MOON, const._MARS, const._MERCURY, 
-                             const._JUPITER, const._VENUS, const._SATURN, 
-                             const._RAHU, const._KETU]
+            # Calculate transit positions using same place/ayanamsa as birth chart
+            transit_planets = []
+            planet_ids = [const._SUN, const._MOON, const._MARS, const._MERCURY, 
+                         const._JUPITER, const._VENUS, const._SATURN, 
+                         const._RAHU, const._KETU]
                 
-                planet_names_list = getattr(_u_transit, 'PLANET_NAMES', 
-                    ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu'])
-                raasi_list_transit = getattr(_u_transit, 'RAASI_LIST', [])
+            planet_names_list = getattr(_u_transit, 'PLANET_NAMES', 
+                ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu'])
+            raasi_list_transit = getattr(_u_transit, 'RAASI_LIST', [])
                 
-                for i, pid in enumerate(planet_ids):
-                    try:
-                        # Get sidereal longitude
-                        long_abs = _drik_transit.sidereal_longitude(current_jd, pid)
-                        sign_index = int(long_abs // 30)
-                        intra_deg = long_abs - sign_index * 30
-                        d, m, s = _u_transit.to_dms_prec(intra_deg)
+            for i, pid in enumerate(planet_ids):
+                try:
+                    # Get sidereal longitude
+                    long_abs = _drik_transit.sidereal_longitude(current_jd, pid)
+                    sign_index = int(long_abs // 30)
+                    intra_deg = long_abs - sign_index * 30
+                    d, m, s = _u_transit.to_dms_prec(intra_deg)
                         
-                        planet_name = planet_names_list[i] if i < len(planet_names_list) else f'Planet{i}'
-                        sign_name = raasi_list_transit[sign_index] if 0 <= sign_index < len(raasi_list_transit) else None
+                    planet_name = planet_names_list[i] if i < len(planet_names_list) else f'Planet{i}'
+                    sign_name = raasi_list_transit[sign_index] if 0 <= sign_index < len(raasi_list_transit) else None
                         
-                        transit_planets.append({
-                            'name': planet_name,
-                            'sign': sign_name,
-                            'longitudeDMS': f"{d}° {m}' {int(s)}\"",
-                            'house': sign_index + 1
-                        })
-                    except Exception:
-                        continue
+                    transit_planets.append({
+                        'name': planet_name,
+                        'sign': sign_name,
+                        'longitudeDMS': f"{d}° {m}' {int(s)}\"",
+                        'house': sign_index + 1
+                    })
+                except Exception:
+                    continue
                 
-                resp.currentTransits = {
-                    'date': now_utc.isoformat(),
-                    'planets': transit_planets
-                }
-            except Exception:
-                # If transit calculation fails, leave as None
-                pass
+            resp.currentTransits = {
+                'date': now_utc.isoformat(),
+                'planets': transit_planets
+            }
+        except Exception:
+            # If transit calculation fails, leave as None
+            pass
 
-            # Derive combustion & vargottama and annotate (use a small robust helper)
-            try:
-                import re
-                from jhora import const as _jconst
-
-                def _norm(name: str) -> str:
-                    if not name: return name
-                    n = re.sub(r'[^A-Za-z]','', name).lower()
-                    if 'sun' in n: return 'Sun'
-                    if 'moon' in n: return 'Moon'
-                    if 'mars' in n: return 'Mars'
-                    if 'mercury' in n or 'budh' in n: return 'Mercury'
-                    if 'jupiter' in n or 'guru' in n: return 'Jupiter'
-                    if 'venus' in n or 'sukra' in n: return 'Venus'
-                    if 'saturn' in n or 'sani' in n: return 'Saturn'
-                    if 'rahu' in n or 'raagu' in n: return 'Rahu'
-                    if 'ketu' in n: return 'Ketu'
-                    return name
-
-                # Helper: compute combustion given normalized absolute longitudes and retro flags
-                def _compute_combustion_from_longitudes(longs: dict, retros: dict) -> tuple[list[str], dict]:
-                    """Return (combust_norm_list, details_map) where combust_norm_list contains normalized planet keys (e.g. 'Mars'),
-                    and details_map gives distance, limit and combust boolean for each planet checked."""
-                    base_ranges = getattr(_jconst,'combustion_range_of_planets_from_sun',[12,17,14,10,11,15])
-                    retro_ranges = getattr(_jconst,'combustion_range_of_planets_from_sun_while_in_retrogade',[12,8,12,11,8,16])
-                    order = ['Moon','Mars','Mercury','Jupiter','Venus','Saturn']
-                    # build direct map planet->limit
-                    base_map = { order[i]: base_ranges[i] for i in range(min(len(order), len(base_ranges))) }
-                    retro_map = { order[i]: retro_ranges[i] for i in range(min(len(order), len(retro_ranges))) }
-
-                    def ang_diff(a:float,b:float):
-                        d = abs(a-b) % 360.0
-                        return d if d <= 180.0 else 360.0-d
-
-                    sun = longs.get('Sun')
-                    if sun is None:
-                        return [], {}
-                    combust_norm: list[str] = []
-                    details: dict = {}
-                    for pname in order:
-                        if pname not in longs:
+        # Derive combustion & vargottama and annotate (use a small robust helper)
+        try:
+            import re
+            from jhora import const as _jconst
+
+            def _norm(name: str) -> str:
+                if not name: return name
+                n = re.sub(r'[^A-Za-z]','', name).lower()
+                if 'sun' in n: return 'Sun'
+                if 'moon' in n: return 'Moon'
+                if 'mars' in n: return 'Mars'
+                if 'mercury' in n or 'budh' in n: return 'Mercury'
+                if 'jupiter' in n or 'guru' in n: return 'Jupiter'
+                if 'venus' in n or 'sukra' in n: return 'Venus'
+                if 'saturn' in n or 'sani' in n: return 'Saturn'
+                if 'rahu' in n or 'raagu' in n: return 'Rahu'
+                if 'ketu' in n: return 'Ketu'
+                return name
+
+            # Helper: compute combustion given normalized absolute longitudes and retro flags
+            def _compute_combustion_from_longitudes(longs: dict, retros: dict) -> tuple[list[str], dict]:
+                """Return (combust_norm_list, details_map) where combust_norm_list contains normalized planet keys (e.g. 'Mars'),
+                and details_map gives distance, limit and combust boolean for each planet checked."""
+                base_ranges = getattr(_jconst,'combustion_range_of_planets_from_sun',[12,17,14,10,11,15])
+                retro_ranges = getattr(_jconst,'combustion_range_of_planets_from_sun_while_in_retrogade',[12,8,12,11,8,16])
+                order = ['Moon','Mars','Mercury','Jupiter','Venus','Saturn']
+                # build direct map planet->limit
+                base_map = { order[i]: base_ranges[i] for i in range(min(len(order), len(base_ranges))) }
+                retro_map = { order[i]: retro_ranges[i] for i in range(min(len(order), len(retro_ranges))) }
+
+                def ang_diff(a:float,b:float):
+                    d = abs(a-b) % 360.0
+                    return d if d <= 180.0 else 360.0-d
+
+                sun = longs.get('Sun')
+                if sun is None:
+                    return [], {}
+                combust_norm: list[str] = []
+                details: dict = {}
+                for pname in order:
+                    if pname not in longs:
+                        continue
+                    dist = ang_diff(longs[pname], sun)
+                    limit = retro_map.get(pname) if retros.get(pname, False) else base_map.get(pname)
+                    is_comb = False
+                    if limit is not None:
+                        try:
+                            is_comb = float(dist) <= float(limit)
+                        except Exception:
+                            is_comb = False
+                    details[pname] = {'distance': round(float(dist),6), 'limit': limit, 'combust': bool(is_comb)}
+                    if is_comb:
+                        combust_norm.append(pname)
+                return combust_norm, details
+
+            # Build normalized absolute longitude map using absoluteLongitude when present
+            longitudes: dict[str,float] = {}
+            retro_flags: dict[str,bool] = {}
+            orig_names_for_norm: dict[str,str] = {}
+            for p in resp.rasiChart.planets:
+                try:
+                    abs_long = None
+                    if getattr(p, 'absoluteLongitude', None) is not None:
+                        val = p.absoluteLongitude
+                        if val is not None:
+                            abs_long = float(val)
+                    else:
+                        raw = getattr(p, 'rawLongitudeDeg', None)
+                        if raw is None:
                             continue
-                        dist = ang_diff(longs[pname], sun)
-                        limit = retro_map.get(pname) if retros.get(pname, False) else base_map.get(pname)
-                        is_comb = False
-                        if limit is not None:
-                            try:
-                                is_comb = float(dist) <= float(limit)
-                            except Exception:
-                                is_comb = False
-                        details[pname] = {'distance': round(float(dist),6), 'limit': limit, 'combust': bool(is_comb)}
-                        if is_comb:
-                            combust_norm.append(pname)
-                    return combust_norm, details
-
-                # Build normalized absolute longitude map using absoluteLongitude when present
-                longitudes: dict[str,float] = {}
-                retro_flags: dict[str,bool] = {}
-                orig_names_for_norm: dict[str,str] = {}
-                for p in resp.rasiChart.planets:
-                    try:
-                        abs_long = None
-                        if getattr(p, 'absoluteLongitude', None) is not None:
-                            val = p.absoluteLongitude
-                            if val is not None:
-                                abs_long = float(val)
+                        rawf = float(raw)
+                        ha = getattr(p, 'houseAbs', None)
+                        if ha:
+                            abs_long = (int(ha)-1) * 30.0 + rawf
                         else:
-                            raw = getattr(p, 'rawLongitudeDeg', None)
-                            if raw is None:
-                                continue
-                            rawf = float(raw)
-                            ha = getattr(p, 'houseAbs', None)
-                            if ha:
-                                abs_long = (int(ha)-1) * 30.0 + rawf
+                            # if raw looks absolute use it
+                            if rawf >= 30.0:
+                                abs_long = rawf
                             else:
-                                # if raw looks absolute use it
-                                if rawf >= 30.0:
-                                    abs_long = rawf
-                                else:
-                                    continue
-                    except Exception:
-                        continue
-                    if abs_long is None:
-                        continue
-                    nn = _norm(p.name)
-                    longitudes[nn] = abs_long
-                    retro_flags[nn] = bool(getattr(p,'retrograde', False))
-                    orig_names_for_norm[nn] = p.name
-
-                combust_norm_list, combust_details = _compute_combustion_from_longitudes(longitudes, retro_flags)
-                combustion: list[str] = [ orig_names_for_norm.get(n, n) for n in combust_norm_list ]
-
-                # Vargottama: same sign in D1 and Navamsa (factor 9)
-                d9 = None
-                for dc in resp.divisionalCharts:
-                    if dc.factor == 9:
-                        d9 = dc; break
-                vargottama: list[str] = []
-                if d9:
-                    d1_signs = {p.name: p.sign for p in resp.rasiChart.planets if p.sign}
-                    d9_signs = {p.name: p.sign for p in d9.planets if p.sign}
-                    vargottama = [pn for pn,s in d1_signs.items() if d9_signs.get(pn) == s]
-
-                resp.combustion = combustion
-                resp.vargottama = vargottama
-
-                # annotate planets using normalized match
-                for p in resp.rasiChart.planets:
-                    pn_norm = _norm(p.name)
-                    if pn_norm in combust_norm_list:
+                                continue
+                except Exception:
+                    continue
+                if abs_long is None:
+                    continue
+                nn = _norm(p.name)
+                longitudes[nn] = abs_long
+                retro_flags[nn] = bool(getattr(p,'retrograde', False))
+                orig_names_for_norm[nn] = p.name
+
+            combust_norm_list, combust_details = _compute_combustion_from_longitudes(longitudes, retro_flags)
+            combustion: list[str] = [ orig_names_for_norm.get(n, n) for n in combust_norm_list ]
+
+            # Vargottama: same sign in D1 and Navamsa (factor 9)
+            d9 = None
+            for dc in resp.divisionalCharts:
+                if dc.factor == 9:
+                    d9 = dc; break
+            vargottama: list[str] = []
+            if d9:
+                d1_signs = {p.name: p.sign for p in resp.rasiChart.planets if p.sign}
+                d9_signs = {p.name: p.sign for p in d9.planets if p.sign}
+                vargottama = [pn for pn,s in d1_signs.items() if d9_signs.get(pn) == s]
+
+            resp.combustion = combustion
+            resp.vargottama = vargottama
+
+            # annotate planets using normalized match
+            for p in resp.rasiChart.planets:
+                pn_norm = _norm(p.name)
+                if pn_norm in combust_norm_list:
+                    setattr(p,'isCombust', True)
+                if p.name in vargottama or _norm(p.name) in [re.sub(r'[^A-Za-z]','',v).capitalize() for v in vargottama]:
+                    setattr(p,'isVargottama', True)
+            for dc in resp.divisionalCharts:
+                for p in dc.planets:
+                    if _norm(p.name) in combust_norm_list:
                         setattr(p,'isCombust', True)
-                    if p.name in vargottama or _norm(p.name) in [re.sub(r'[^A-Za-z]','',v).capitalize() for v in vargottama]:
+                    if p.name in vargottama and dc.factor==9:
                         setattr(p,'isVargottama', True)
-                for dc in resp.divisionalCharts:
-                    for p in dc.planets:
-                        if _norm(p.name) in combust_norm_list:
-                            setattr(p,'isCombust', True)
-                        if p.name in vargottama and dc.factor==9:
-                            setattr(p,'isVargottama', True)
-            except Exception:
-                # Do not fail overall if combustion annotation errors
-                pass
-            if req.compact:
-                # Trim calendar to essential keys
-                essential_keys = [k for k in calendar.keys() if any(t in k.lower() for t in ['sunrise','sunset','moonrise','moonset','ayanamsa','tithi','nakshatra'])]
-                resp.calendar = {k: calendar[k] for k in essential_keys}
-                # Minify planet objects (drop heavy optional fields)
-                for p in resp.rasiChart.planets:
-                    p.absoluteLongitude = None
-                    p.nakshatra = None
-                    p.nakshatraPada = None
-                    # keep dignity flags only
-                    p.dignity = p.dignity
-            stored = models.StoredHoroscope(request=req, response=resp, internalHoroscope=horo)
-            with _store_lock:
-                _store[rhash]=stored
-            try:
-                upsert_persisted_request(rhash, req.model_dump(mode='json'))
-                persist_requests_sync()
-            except Exception:
-                pass
-            return stored
-
-        finally:
-            if changed_lang:
-                try:
-                    utils.set_language(prev_lang)
-                except Exception:
-                    pass
+        except Exception:
+            # Do not fail overall if combustion annotation errors
+            pass
+        if req.compact:
+            # Trim calendar to essential keys
+            essential_keys = [k for k in calendar.keys() if any(t in k.lower() for t in ['sunrise','sunset','moonrise','moonset','ayanamsa','tithi','nakshatra'])]
+            resp.calendar = {k: calendar[k] for k in essential_keys}
+            # Minify planet objects (drop heavy optional fields)
+            for p in resp.rasiChart.planets:
+                p.absoluteLongitude = None
+                p.nakshatra = None
+                p.nakshatraPada = None
+                # keep dignity flags only
+                p.dignity = p.dignity
+        return models.StoredHoroscope(request=req, response=resp, internalHoroscope=horo,
+                                      calculationContext=requested_ctx)
 
 def _normalize_language(language: str | None) -> str:
     if not language:
@@ -1346,13 +1313,10 @@ def _format_detail_entries(raw: Dict[str, Any]) -> List[models.DetailedCalculati
 def _collect_calendar_and_info(horo: Horoscope, language: str) -> tuple[Dict[str, Any], Dict[str, Any]]:
     lang = _normalize_language(language)
     from copy import deepcopy
-    with _language_lock:
-        prev_global = getattr(const, '_DEFAULT_LANGUAGE', 'en')
-        prev_lang = getattr(horo, '_language', prev_global)
+    with _language_scope(lang):
+        prev_lang = getattr(horo, '_language', _BASE_LANGUAGE)
         prev_cal_key_list = getattr(horo, 'cal_key_list', None)
         prev_calendar = deepcopy(getattr(horo, 'calendar_info', None))
-        if prev_global != lang:
-            utils.set_language(lang)
         try:
             horo._language = lang
             horo.cal_key_list = utils.resource_strings
@@ -1362,8 +1326,6 @@ def _collect_calendar_and_info(horo: Horoscope, language: str) -> tuple[Dict[str
                 raw_info = raw_info[0]
             info = _to_native(raw_info)
         finally:
-            if prev_global != lang:
-                utils.set_language(prev_global)
             horo._language = prev_lang
             if prev_cal_key_list is not None:
                 horo.cal_key_list = prev_cal_key_list
@@ -1398,21 +1360,28 @@ def build_detailed_calculations(
             errors.append(f'horoscopeInfo: {exc}')
     yogas: List[models.DetailedCalculationItem] | None = None
     total_yogas = yoga_count = None
-    if include_yogas:
+    raja_yogas: List[models.DetailedCalculationItem] | None = None
+    total_ry = ry_count = None
+    matrix = engine = None
+    if include_yogas or include_raja_yogas:
+        # One chart matrix (all vargas from a single ephemeris evaluation) serves both yogas and raja yogas
+        try:
+            from jhora.horoscope.chart import yoga_engine as _yoga_engine  # type: ignore
+            matrix = _yoga_engine.yoga_chart_matrix(horo.julian_day, horo.Place)
+            engine = _yoga_engine.get_engine(lang)
+        except Exception as exc:  # noqa: BLE001
+            errors.append(f'yogas: {exc}')
+    if include_yogas and matrix is not None:
         try:
-            from jhora.horoscope.chart import yoga as _yoga  # type: ignore
-            raw, count, total = _yoga.get_yoga_details_for_all_charts(horo.julian_day, horo.Place, language=lang)
+            raw, count, total = engine.yoga_details_for_all_charts(matrix)
             yogas = _format_detail_entries(raw)
             yoga_count = count
             total_yogas = total
         except Exception as exc:  # noqa: BLE001
             errors.append(f'yogas: {exc}')
-    raja_yogas: List[models.DetailedCalculationItem] | None = None
-    total_ry = ry_count = None
-    if include_raja_yogas:
+    if include_raja_yogas and matrix is not None:
         try:
-            from jhora.horoscope.chart import raja_yoga as _raja  # type: ignore
-            raw, count, total = _raja.get_raja_yoga_details_for_all_charts(horo.julian_day, horo.Place, language=lang)
+            raw, count, total = engine.raja_yoga_details_for_all_charts(matrix)
             raja_yogas = _format_detail_entries(raw)
             ry_count = count
             total_ry = total
@@ -1444,18 +1413,11 @@ async def delete_request(request_id: str) -> bool:
                 del _store[request_id]
             except Exception:
                 pass
-    with _persist_lock:
-        if request_id in _persisted_requests:
+    try:
+        if await asyncio.to_thread(_request_store.delete, request_id):
             existed = True
-            try:
-                del _persisted_requests[request_id]
-            except Exception:
-                pass
-    if existed:
-        try:
-            await persist_requests()
-        except Exception:
-            pass
+    except Exception:
+        pass
     # Remove cache entries referencing this request id
     try:
         with _horo_cache_lock:
@@ -1480,27 +1442,34 @@ def list_requests(limit: int = 200) -> list[dict]:
             'hasDeep': False  # placeholder for future cached deep strength flag
         })
     # Add persisted that are not in memory (lazy recompute available)
-    with _persist_lock:
-        persisted_keys = list(_persisted_requests.keys())
-    for rid in persisted_keys:
-        if any(r['requestId']==rid for r in out):
+    seen = {r['requestId'] for r in out}
+    for rid in _request_store.keys(limit=limit + len(seen)):
+        if len(out) >= limit:
+            break
+        if rid in seen:
             continue
         out.append({'requestId': rid, 'generatedAt': None, 'charts': None, 'hasDeep': False})
     return out[:limit]
 
 
+def get_cached(request_id: str) -> models.StoredHoroscope | None:
+    """In-memory lookup only; unlike get_stored this never recomputes a persisted request."""
+    with _store_lock:
+        return _store.get(request_id)
+
 def get_stored(request_id: str) -> models.StoredHoroscope | None:
     with _store_lock:
         existing = _store.get(request_id)
     if existing:
         return existing
-    # Lazy recompute if we have a persisted request
-    with _persist_lock:
-        data = _persisted_requests.get(request_id)
+    # Lazy recompute if we have a persisted request (after a restart or an eviction from the memory store)
+    data = get_persisted_request(request_id)
     if data:
         try:
             req = models.HoroscopeRequest(**data)
-            return compute_horoscope(req)
+            stored = compute_horoscope(req)
         except Exception:
             return None
+        _store.record_rehydration()
+        return stored
     return None
@@ -0,0 +1,333 @@
+"""Stores of computed horoscopes keyed by request hash.
+
+Only the original request of a computed horoscope is kept on disk (RequestStore), so the horoscope can be
+recomputed lazily after a restart. Requests live in a local SQLite database (WAL journal): an upsert or delete
+is a single row write, nothing is loaded at startup and lookups go through the primary key, so write cost and
+startup time do not grow with the number of stored requests. The legacy horo_requests.json snapshot is
+imported once, when the database is created.
+
+The computed horoscopes themselves are held in a bounded in-memory LRU (MemoryStore); entries evicted from
+it are recomputed from the persisted request on the next access.
+"""
+from __future__ import annotations
+import json, os, pickle, sqlite3, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+STORE_PATH = Path(os.getenv('HORO_STORE_PATH', str(Path(__file__).parent / 'horo_requests.db')))
+LEGACY_SNAPSHOT_PATH = Path(__file__).parent / 'horo_requests.json'
+# VACUUM only when at least this fraction of the database pages is free (deleted requests)
+COMPACT_MIN_FREE_RATIO = float(os.getenv('HORO_STORE_COMPACT_RATIO', '0.25'))
+# Bounds of the in-memory horoscope store; 0 disables a bound
+MEMORY_MAX_ENTRIES = int(os.getenv('HORO_STORE_MAX_ENTRIES', '1024'))
+MEMORY_MAX_BYTES = int(float(os.getenv('HORO_STORE_MAX_MB', '256')) * 1024 * 1024)
+MEMORY_TTL_SECONDS = float(os.getenv('HORO_STORE_TTL_SECONDS', '21600'))  # idle time before an entry expires
+# Entries stored without a known size: measure every n-th one, estimate the others (1 = measure all)
+MEMORY_SIZE_SAMPLE_EVERY = int(os.getenv('HORO_STORE_SIZE_SAMPLE_EVERY', '8'))
+
+_INIT_SQL = """
+CREATE TABLE IF NOT EXISTS horo_requests (
+  request_hash TEXT PRIMARY KEY,
+  payload TEXT NOT NULL,
+  created_at REAL NOT NULL,
+  updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+_UPSERT_SQL = ("INSERT INTO horo_requests(request_hash, payload, created_at, updated_at) VALUES (?,?,?,?) "
+               "ON CONFLICT(request_hash) DO UPDATE SET payload=excluded.payload, updated_at=excluded.updated_at")
+
+
+def _json_default(obj: Any):
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f'Type {type(obj)!r} not serializable')
+
+
+class RequestStore:
+    """Request payloads (JSON objects) keyed by request hash, in insertion order.
+    The connection is opened on first use and shared by all threads behind a lock."""
+    def __init__(self, path: Path | str = STORE_PATH, legacy_snapshot: Path | str | None = None):
+        self.path = Path(path)
+        self.legacy_snapshot = Path(legacy_snapshot) if legacy_snapshot is not None else None
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_INIT_SQL)
+            self._conn = conn
+            self._import_legacy_snapshot()
+        return self._conn
+
+    def _import_legacy_snapshot(self) -> None:
+        conn = self._conn
+        if conn.execute("SELECT 1 FROM store_meta WHERE key='legacy_imported'").fetchone():
+            return
+        data: Dict[str, Any] = {}
+        if self.legacy_snapshot is not None and self.legacy_snapshot.exists():
+            try:
+                data = json.loads(self.legacy_snapshot.read_text(encoding='utf-8'))
+            except Exception:
+                data = {}
+        now = time.time()
+        with conn:
+            conn.execute('BEGIN')
+            conn.executemany("INSERT OR IGNORE INTO horo_requests(request_hash, payload, created_at, updated_at) "
+                             "VALUES (?,?,?,?)",
+                             [(k, json.dumps(v, ensure_ascii=False, default=_json_default), now, now)
+                              for k, v in data.items() if isinstance(v, dict)])
+            conn.execute("INSERT INTO store_meta(key, value) VALUES ('legacy_imported', ?)", (str(len(data)),))
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        raw = json.dumps(payload, ensure_ascii=False, default=_json_default)
+        now = time.time()
+        with self._lock:
+            self._connection().execute(_UPSERT_SQL, (key, raw, now, now))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute("SELECT payload FROM horo_requests WHERE request_hash=?",
+                                             (key,)).fetchone()
+        if not row:
+            return None
+        try:
+            return json.loads(row[0])
+        except Exception:
+            return None
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cur = self._connection().execute("DELETE FROM horo_requests WHERE request_hash=?", (key,))
+        return cur.rowcount > 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._connection().execute("SELECT 1 FROM horo_requests WHERE request_hash=?",
+                                              (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM horo_requests").fetchone()[0]
+
+    def keys(self, limit: int | None = None, offset: int = 0) -> List[str]:
+        """Request hashes in the order they were first stored."""
+        with self._lock:
+            rows = self._connection().execute("SELECT request_hash FROM horo_requests ORDER BY rowid LIMIT ? OFFSET ?",
+                                              (-1 if limit is None else int(limit), max(0, int(offset)))).fetchall()
+        return [r[0] for r in rows]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM horo_requests")
+
+    def compact(self, min_free_ratio: float = COMPACT_MIN_FREE_RATIO) -> bool:
+        """Fold the WAL into the database and VACUUM it when enough pages were freed by deletes.
+        Returns True if the database was vacuumed."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            pages = conn.execute('PRAGMA page_count').fetchone()[0]
+            free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            if not pages or free / pages < min_free_ratio:
+                return False
+            conn.execute('VACUUM')
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connection()
+            count = conn.execute("SELECT COUNT(*) FROM horo_requests").fetchone()[0]
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            pages = conn.execute('PRAGMA page_count').fetchone()[0]
+            free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return {'path': str(self.path), 'requests': count, 'sizeBytes': page_size * pages,
+                'freeBytes': page_size * free}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def pickled_size(value: Any) -> int:
+    """Size estimate of a stored object: the length of its pickle (what the process pool ships around)."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class MemoryStore:
+    """Thread safe LRU of computed horoscopes bounded by entry count, total size and idle time.
+
+    Entries are kept in access order, so the least recently used entry is evicted first and expired entries
+    (idle for longer than ttl seconds) are always at the front. An entry larger than max_bytes on its own is
+    still kept until the next insert. The dict style methods used by the service (get, [], in, pop, clear)
+    count hits and misses; peek() does not.
+
+    set(key, value, size) takes the size when the caller knows it (e.g. the length of the pickle a worker process
+    returned). Otherwise only every size_sample_every-th value is measured with sizeof; the others are given the
+    mean size of the values measured or passed in so far.
+    """
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES, max_bytes: int = MEMORY_MAX_BYTES,
+                 ttl: float = MEMORY_TTL_SECONDS, sizeof: Callable[[Any], int] = pickled_size,
+                 clock: Callable[[], float] = time.monotonic, size_sample_every: int = 1):
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl = max(0.0, float(ttl))
+        self._sizeof = sizeof
+        self._clock = clock
+        self.size_sample_every = max(1, int(size_sample_every))
+        self._sized = 0  # values measured or stored with their size
+        self._sized_bytes = 0
+        self._unsized = 0  # values stored without a size
+        self._entries: OrderedDict[str, Tuple[Any, int, float]] = OrderedDict()  # key -> (value, size, last access)
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {'lru': 0, 'size': 0, 'ttl': 0}
+        self.rehydrations = 0
+
+    def _expired(self, accessed: float, now: float) -> bool:
+        return bool(self.ttl) and now - accessed > self.ttl
+
+    def _remove(self, key: str) -> Any:
+        value, size, _ = self._entries.pop(key)
+        self.bytes -= size
+        return value
+
+    def _evict(self, now: float, keep: str | None = None) -> None:
+        while self._entries:
+            key, (_, _, accessed) = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            if self._expired(accessed, now):
+                reason = 'ttl'
+            elif self.max_entries and len(self._entries) > self.max_entries:
+                reason = 'lru'
+            elif self.max_bytes and self.bytes > self.max_bytes:
+                reason = 'size'
+            else:
+                break
+            self._remove(key)
+            self.evictions[reason] += 1
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[2], now):
+                if entry is not None:
+                    self._remove(key)
+                    self.evictions['ttl'] += 1
+                self.misses += 1
+                return default
+            self._entries[key] = (entry[0], entry[1], now)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def _record_size(self, size: int) -> None:
+        with self._lock:
+            self._sized += 1
+            self._sized_bytes += size
+
+    def _estimate_size(self, value: Any) -> int:
+        with self._lock:
+            self._unsized += 1
+            if self._sized and self._unsized % self.size_sample_every:
+                return self._sized_bytes // self._sized
+        size = self._sizeof(value)  # outside the lock: pickling a horoscope takes a few ms
+        self._record_size(size)
+        return size
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def set(self, key: str, value: Any, size: int | None = None) -> None:
+        """Store value; size in bytes when known, otherwise it is measured or estimated (see the class doc)"""
+        if size is None:
+            size = self._estimate_size(value)
+        else:
+            self._record_size(size)
+        now = self._clock()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, now)
+            self.bytes += size
+            self._evict(now, keep=key)
+
+    def __contains__(self, key: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry[2], now)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """(key, value) of the live entries, most recently used last"""
+        now = self._clock()
+        with self._lock:
+            return [(k, v) for k, (v, _, accessed) in self._entries.items() if not self._expired(accessed, now)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([k for k, _ in self.items()])
+
+    def record_rehydration(self) -> None:
+        """Count a miss that was served by recomputing the horoscope from its persisted request"""
+        with self._lock:
+            self.rehydrations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'maxEntries': self.max_entries,
+                    'maxBytes': self.max_bytes, 'ttlSeconds': self.ttl, 'hits': self.hits, 'misses': self.misses,
+                    'hitRate': round(self.hits / lookups, 4) if lookups else None,
+                    'evictions': dict(self.evictions), 'rehydrations': self.rehydrations}
+
+
+_MISSING = object()
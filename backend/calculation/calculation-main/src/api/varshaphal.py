@@ -0,0 +1,165 @@
+"""Tajaka varshaphal (annual horoscope) of a range of years, computed in one pass per year.
+
+/api/tajaka/annual, /api/tajaka/yogas, /api/dhasa/annual/mudda and /api/dhasa/annual/patyayini used to compute
+the annual chart of their year independently and then re-derive lord of the year, muntha and pancha vargeeya
+bala from it. year_data() computes everything those endpoints show for one year - annual chart, lord of the year,
+muntha, pancha vargeeya bala, tajaka yogas, sahams, mudda and patyayini periods - from a single annual chart and
+returns it as plain picklable data; the endpoints only format it. years_data() evaluates a range of years
+(e.g. age 1-100) for /api/tajaka/varshaphal and compute_years() optionally fans the range out, in chunks of
+consecutive years, over the worker processes of the horoscope engine (HORO_ENGINE=process).
+"""
+from __future__ import annotations
+import asyncio, math, os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence
+
+from jhora import const, utils
+from jhora.panchanga import drik
+from jhora.horoscope.chart import strength
+from jhora.horoscope.dhasa.annual import mudda, patyayini
+from jhora.horoscope.transit import saham, tajaka, tajaka_yoga
+
+from . import engine
+
+SECTIONS = ('annual', 'yogas', 'sahams', 'mudda', 'patyayini')
+VARSHAPHAL_MAX_YEARS = int(os.getenv('HORO_VARSHAPHAL_MAX_YEARS', '120'))
+_CHART_SECTIONS = frozenset(('annual', 'yogas', 'sahams'))
+
+
+@dataclass
+class TajakaYear:
+    """Raw results of one year. Failures are kept as messages in `errors`, keyed by
+    'jd_year' (solar return), 'chart' (annual chart), 'sahams', 'mudda' or 'patyayini'."""
+    year_offset: int
+    jd_year: float | None = None
+    chart: list | None = None
+    start_info: list | None = None
+    lord_of_year: int | None = None
+    muntha_sign: int | None = None
+    panchavargiya: Dict[int, float] = field(default_factory=dict)
+    yogas: Dict[str, Any] = field(default_factory=dict)
+    sahams: Dict[str, float] = field(default_factory=dict)
+    mudda: List[tuple] = field(default_factory=list)  # (lord, start_jd, duration_days, bhuktis)
+    patyayini: list = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def annual_yogas(chart: list, jd_year: float | None, place: Any) -> Dict[str, Any]:
+    """Raw tajaka yogas of an annual chart, keyed by yoga; yogas whose computation failed are left out"""
+    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(chart)
+    calls = [('ishkavala', lambda: tajaka_yoga.ishkavala_yoga(p_to_h)),
+             ('induvara', lambda: tajaka_yoga.induvara_yoga(p_to_h)),
+             ('ithasala', lambda: tajaka_yoga.get_ithasala_yoga_planet_pairs(chart)),
+             ('eesarpha', lambda: tajaka_yoga.get_eesarpha_yoga_planet_pairs(chart)),
+             ('nakta', lambda: tajaka_yoga.get_nakta_yoga_planet_triples(chart)),
+             ('yamaya', lambda: tajaka_yoga.get_yamaya_yoga_planet_triples(chart)),
+             ('manahoo', lambda: tajaka_yoga.get_manahoo_yoga_planet_pairs(chart)),
+             ('kamboola', lambda: tajaka_yoga.get_kamboola_yoga_planet_pairs(chart)),
+             ('radda', lambda: tajaka_yoga.get_radda_yoga_planet_pairs(chart))]
+    if jd_year is not None:
+        calls.append(('duhphali_kutta', lambda: tajaka_yoga.get_duhphali_kutta_yoga_planet_pairs(jd_year, place)))
+    yogas: Dict[str, Any] = {}
+    for name, call in calls:
+        try:
+            yogas[name] = call()
+        except Exception:
+            pass
+    return yogas
+
+
+def annual_sahams(chart: list) -> Dict[str, float]:
+    """Longitudes of the sahams (const._saham_list) of an annual chart"""
+    return {name: getattr(saham, name + '_saham')(chart) for name in const._saham_list}
+
+
+def _mudda_periods(jd: float, place: Any, year_offset: int) -> List[tuple]:
+    periods = []
+    for d_lord, start_jd, duration in mudda.varsha_vimsottari_mahadasa(jd, place, year_offset):
+        try:
+            bhuktis = mudda.varsha_vimsottari_bhukti(d_lord, start_jd)
+        except Exception:
+            bhuktis = []
+        periods.append((d_lord, start_jd, duration, bhuktis))
+    return periods
+
+
+def year_data(jd: float, place: Any, year_offset: int, sections: Iterable[str] = SECTIONS) -> TajakaYear:
+    """
+        Varshaphal of one year
+        @param jd: Julian day number of birth
+        @param place: drik.Place of birth
+        @param year_offset: years from birth (1 = first annual chart)
+        @param sections: subset of SECTIONS to compute
+        @return: TajakaYear
+    """
+    sections = frozenset(sections)
+    data = TajakaYear(year_offset)
+    try:
+        data.jd_year = drik.next_solar_date(jd, place, years=year_offset)
+    except Exception as exc:  # noqa: BLE001
+        data.errors['jd_year'] = str(exc)
+    if sections & _CHART_SECTIONS:
+        try:
+            data.chart, data.start_info = tajaka.annual_chart(jd, place, divisional_chart_factor=1, years=year_offset)
+        except Exception as exc:  # noqa: BLE001
+            data.errors['chart'] = str(exc)
+    if data.chart is not None and 'annual' in sections:
+        asc_sign = next((pos[0] for pid, pos in data.chart if pid == const._ascendant_symbol), None)
+        try:
+            if asc_sign is not None:
+                data.muntha_sign = tajaka.muntha_house(int(asc_sign), year_offset)
+        except Exception:
+            pass
+        try:
+            data.lord_of_year = tajaka.lord_of_the_year(jd, place, year_offset)
+        except Exception:
+            pass
+        try:
+            data.panchavargiya = strength.pancha_vargeeya_bala(data.jd_year if data.jd_year is not None else jd, place)
+        except Exception:
+            pass
+    if data.chart is not None and 'yogas' in sections:
+        data.yogas = annual_yogas(data.chart, data.jd_year, place)
+    if data.chart is not None and 'sahams' in sections:
+        try:
+            data.sahams = annual_sahams(data.chart)
+        except Exception as exc:  # noqa: BLE001
+            data.errors['sahams'] = str(exc)
+    if 'mudda' in sections:
+        try:
+            data.mudda = _mudda_periods(jd, place, year_offset)
+        except Exception as exc:  # noqa: BLE001
+            data.errors['mudda'] = str(exc)
+    if 'patyayini' in sections and data.jd_year is not None:
+        try:
+            data.patyayini = patyayini.patyayini_dhasa(data.jd_year, place)
+        except Exception as exc:  # noqa: BLE001
+            data.errors['patyayini'] = str(exc)
+    return data
+
+
+def years_data(jd: float, place: Any, year_offsets: Sequence[int], sections: Iterable[str] = SECTIONS,
+               context: drik.CalculationContext | None = None) -> List[TajakaYear]:
+    """Varshaphal of several years in the calling thread (or worker process), under (a copy of) the calculation
+    context of the horoscope when given"""
+    sections = tuple(sections)
+    if context is None:
+        drik._init_thread_ephemeris()
+        return [year_data(jd, place, offset, sections) for offset in year_offsets]
+    with drik.calculation_context(context.copy()):
+        return [year_data(jd, place, offset, sections) for offset in year_offsets]
+
+
+async def compute_years(jd: float, place: Any, year_offsets: Sequence[int], sections: Iterable[str] = SECTIONS,
+                        context: drik.CalculationContext | None = None, parallel: bool = True) -> List[TajakaYear]:
+    """years_data() off the event loop. With parallel and the process engine running, the years are split into
+    one chunk of consecutive years per worker process; otherwise they are computed in a worker thread."""
+    year_offsets, sections = list(year_offsets), tuple(sections)
+    horo_engine = engine.get_engine() if parallel else None
+    if horo_engine is None or len(year_offsets) < 2:
+        return await asyncio.to_thread(years_data, jd, place, year_offsets, sections, context)
+    size = math.ceil(len(year_offsets) / horo_engine.workers)
+    chunks = [year_offsets[i:i + size] for i in range(0, len(year_offsets), size)]
+    results = await asyncio.gather(*[horo_engine.submit(years_data, jd, place, chunk, sections, context)
+                                     for chunk in chunks])
+    return [year for chunk in results for year in chunk]
@@ -36,6 +36,7 @@
             1st/10th/7th/4th from base (fire,earth,air/water)
           count N divisions from end of the sign if sign is even
 """
+import numpy as np
 from jhora.panchanga import drik
 from jhora import const,utils
 from jhora.horoscope.chart import house
@@ -62,7 +63,7 @@ def get_amsa_resources(language='en'):
     f = open(json_file,"r",encoding="utf-8")
     msgs = json.load(f)
     return msgs
-def rasi_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,years=1,months=1,sixty_hours=1
+def rasi_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=None,years=1,months=1,sixty_hours=1
                ,calculation_type='drik',pravesha_type=0):
     """
         Get Rasi chart - D1 Chart
@@ -107,11 +108,11 @@ def rasi_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MO
     #print('planet_positions\n',planet_positions)
     planet_positions = [[ascendant_index,(ascendant_constellation, ascendant_longitude)]] + planet_positions
     return planet_positions
-def bhava_houses(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,bhava_starts_with_ascendant=False):
+def bhava_houses(jd,place,ayanamsa_mode=None,bhava_starts_with_ascendant=False):
     bp = bhava_chart_houses(jd, place, ayanamsa_mode,bhava_starts_with_ascendant=bhava_starts_with_ascendant)
     bp = {p:house.get_relative_house_of_planet(bp[const._ascendant_symbol][0],h) for p,(h,_) in bp.items()}
     return bp
-def bhava_chart(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,bhava_madhya_method=const.bhaava_madhya_method):
+def bhava_chart(jd,place,ayanamsa_mode=None,bhava_madhya_method=const.bhaava_madhya_method):
     """
         @return: [[house1_rasi,(house1_start,house1_cusp,house1_end),[planets_in_house1]],(...),
                 [house12_rasi,(house12_start,house12_cusp,house12_end,[planets_in_house12])]]
@@ -178,7 +179,7 @@ def _bhaava_madhya_new(jd,place,planet_positions,bhava_madhya_method=const.bhaav
             _bhava_start = h1*30; _bhava_mid = _bhava_start + ascendant_longitude; _bhava_end = ((h1+1)%12)*30
             bhava_houses.append((_bhava_start%360,_bhava_mid%360,_bhava_end%360))
         return drik._assign_planets_to_houses(planet_positions, bhava_houses,bhava_madhya_method=bhava_madhya_method)
-def bhava_chart_houses(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,years=1,months=1,sixty_hours=1
+def bhava_chart_houses(jd_at_dob,place_as_tuple,ayanamsa_mode=None,years=1,months=1,sixty_hours=1
                 ,calculation_type='drik',bhava_starts_with_ascendant=False):
     """
         Get Bhava chart from Rasi / D1 Chart
@@ -1082,7 +1083,7 @@ def divisional_positions_from_rasi_positions(planet_positions_in_rasi,divisional
             print('Chart division factor',divisional_chart_factor,'not supported')
             return None
     
-def divisional_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,
+def divisional_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=None,divisional_chart_factor=1,
                      chart_method=1,years=1,months=1,sixty_hours=1,calculation_type='drik',pravesha_type=0,
                      base_rasi=None,count_from_end_of_sign=None):
     """
@@ -1125,6 +1126,107 @@ def divisional_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANA
                                   calculation_type=calculation_type,pravesha_type=pravesha_type)
     return divisional_positions_from_rasi_positions(planet_positions_in_rasi, divisional_chart_factor=divisional_chart_factor,
                     chart_method=chart_method, base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)
+""" 
+    Varga matrix: all divisional charts from one rasi position vector.
+    For a given (divisional_chart_factor, chart_method) the divisional sign depends only on the rasi sign and on the
+    amsa (part of 30/factor degrees) of the sign the longitude falls in. That mapping is tabulated once (12 x factor)
+    from the chart functions above and then applied to all planets (and lagna) with array indexing.
+"""
+_varga_sign_tables = {}
+# (divisional_chart_factor,chart_method) whose mapping depends on other planets - Kashinatha hora uses lord of the sign
+_varga_methods_not_tabulated = [(2,5)]
+def _varga_sign_table(divisional_chart_factor,chart_method=1,base_rasi=None,count_from_end_of_sign=None):
+    key = (divisional_chart_factor,chart_method,base_rasi,count_from_end_of_sign,const.TREAT_STANDARD_CHART_AS_CUSTOM)
+    table = _varga_sign_tables.get(key)
+    if table is None:
+        dvf = divisional_chart_factor; f1 = 30.0/dvf
+        pp = [[0,[sign,(amsa+0.5)*f1]] for sign in range(12) for amsa in range(dvf)]
+        dp = divisional_positions_from_rasi_positions(pp, divisional_chart_factor=dvf, chart_method=chart_method,
+                                    base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)
+        if dp is None:
+            return None
+        table = np.array([sign for _,(sign,_) in dp],dtype=int).reshape(12,dvf)
+        _varga_sign_tables[key] = table
+    return table
+class VargaMatrix():
+    """
+        Array backed divisional chart positions derived from one rasi chart
+        planets: planet labels in rasi_chart order ('L',0,1,...8)
+        keys: list of (divisional_chart_factor,chart_method) - one per row
+        signs: numpy int array of shape (len(keys),len(planets)) - raasi of each planet in each varga
+        longitudes: numpy float array of shape (len(keys),len(planets)) - longitude within the raasi
+    """
+    def __init__(self,planet_positions_in_rasi,keys,signs,longitudes):
+        self.rasi_positions = planet_positions_in_rasi
+        self.planets = [planet for planet,_ in planet_positions_in_rasi]
+        self.keys = keys
+        self.signs = signs
+        self.longitudes = longitudes
+    def index(self,divisional_chart_factor,chart_method=None):
+        for row,(dvf,method) in enumerate(self.keys):
+            if dvf==divisional_chart_factor and (chart_method is None or chart_method==method):
+                return row
+        raise KeyError((divisional_chart_factor,chart_method))
+    def chart(self,divisional_chart_factor,chart_method=None):
+        """
+            @return: planet_positions list in the format [[planet,(raasi,planet_longitude)],...]]
+                same as divisional_chart(). First element is that of Lagnam
+        """
+        if divisional_chart_factor==1:
+            return [[planet,pos[:]] for planet,pos in self.rasi_positions]
+        row = self.index(divisional_chart_factor,chart_method)
+        return [[planet,[int(sign),float(long)]] for planet,sign,long in
+                    zip(self.planets,self.signs[row].tolist(),self.longitudes[row].tolist())]
+def varga_matrix_from_rasi_positions(planet_positions_in_rasi,divisional_chart_factors=None,chart_methods=1,
+                                     base_rasi=None,count_from_end_of_sign=None):
+    """
+        Get all requested divisional charts from rasi positions in one vectorized pass
+        @param planet_positions_in_rasi: Rasi chart planet_positions list in the format [[planet,(raasi,planet_longitude)],...]]
+        @param divisional_chart_factors: list of varga factors (1..const.MAX_DHASAVARGA_FACTOR)
+            Default: const.division_chart_factors
+        @param chart_methods: chart method for all factors or dict {divisional_chart_factor:chart_method}. Default=1
+        @param base_rasi, count_from_end_of_sign: See divisional_chart
+        @return: VargaMatrix. Use VargaMatrix.chart(factor) to get divisional_chart() style planet positions
+    """
+    if divisional_chart_factors is None:
+        divisional_chart_factors = const.division_chart_factors
+    rasi_signs = np.array([sign for _,(sign,_) in planet_positions_in_rasi],dtype=int)
+    rasi_longs = np.array([long for _,(_,long) in planet_positions_in_rasi],dtype=float)
+    keys = []; signs = []; longitudes = []
+    for dvf in divisional_chart_factors:
+        chart_method = chart_methods.get(dvf,1) if isinstance(chart_methods,dict) else chart_methods
+        table = None
+        if dvf == 1:
+            d_signs, d_longs = rasi_signs, rasi_longs
+        elif (dvf,chart_method) not in _varga_methods_not_tabulated:
+            table = _varga_sign_table(dvf, chart_method, base_rasi, count_from_end_of_sign)
+        if dvf == 1:
+            pass
+        elif table is not None:
+            amsa = np.minimum((rasi_longs // (30.0/dvf)).astype(int), dvf-1)
+            d_signs = table[rasi_signs, amsa]
+            d_longs = (rasi_longs*dvf)%30
+        else:
+            dp = divisional_positions_from_rasi_positions(planet_positions_in_rasi, divisional_chart_factor=dvf,
+                        chart_method=chart_method, base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)
+            if dp is None:
+                continue
+            d_signs = np.array([sign for _,(sign,_) in dp],dtype=int)
+            d_longs = np.array([long for _,(_,long) in dp],dtype=float)
+        keys.append((dvf,chart_method)); signs.append(d_signs); longitudes.append(d_longs)
+    return VargaMatrix(planet_positions_in_rasi, keys, np.array(signs,dtype=int).reshape(len(keys),-1),
+                       np.array(longitudes,dtype=float).reshape(len(keys),-1))
+def varga_matrix(jd_at_dob,place_as_tuple,ayanamsa_mode=None,divisional_chart_factors=None,
+                 chart_methods=1,years=1,months=1,sixty_hours=1,calculation_type='drik',pravesha_type=0,
+                 base_rasi=None,count_from_end_of_sign=None):
+    """
+        Get many divisional charts with a single rasi chart (ephemeris) evaluation
+        See divisional_chart for the arguments and varga_matrix_from_rasi_positions for the return value
+    """
+    planet_positions_in_rasi = rasi_chart(jd_at_dob, place_as_tuple, ayanamsa_mode,years,months,sixty_hours,
+                                  calculation_type=calculation_type,pravesha_type=pravesha_type)
+    return varga_matrix_from_rasi_positions(planet_positions_in_rasi, divisional_chart_factors, chart_methods,
+                                            base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)
 def _planets_in_retrograde_old(planet_positions):
     """
         Get the list of planets that are in retrograde - based on the planet positions returned by the divisional_chart()
@@ -1200,7 +1302,7 @@ def planets_in_combustion(planet_positions,use_absolute_longitude=True):
         if p_long >= sun_long-combustion_range[p-2] and p_long <= sun_long+combustion_range[p-2]:
             combustion_planets.append(p)
     return combustion_planets
-def vaiseshikamsa_dhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vaiseshikamsa_dhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many dhasa varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1215,7 +1317,7 @@ def vaiseshikamsa_dhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode
             Sreedhaamaamsa – 10.
     """
     return _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.dhasavarga_amsa_vaiseshikamsa)
-def vaiseshikamsa_shadvarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vaiseshikamsa_shadvarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many shad varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1228,7 +1330,7 @@ def vaiseshikamsa_shadvarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=
             Kimsukaamsa – 2, Vyanjanaamsa – 3, Chaamaraamsa – 4, Chatraamsa – 5,  Kundalaamsa – 6.
     """
     return _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.shadvarga_amsa_vaiseshikamsa)
-def vaiseshikamsa_sapthavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vaiseshikamsa_sapthavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many saptha varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1241,7 +1343,7 @@ def vaiseshikamsa_sapthavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mod
             Kimsukaamsa – 2, Vyanjanaamsa – 3, Chaamaraamsa – 4, Chatraamsa – 5, Kundalaamsa – 6, Mukutaamsa – 7.
     """
     return _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.sapthavarga_amsa_vaiseshikamsa)
-def vaiseshikamsa_shodhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vaiseshikamsa_shodhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many shodhasa varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1257,13 +1359,16 @@ def vaiseshikamsa_shodhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_m
             Vidrumaamsa – 13, Indraasanaamsa – 14, Golokaamsa – 15, Sree Vallabhaamsa – 16.
     """
     return _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.shodhasa_varga_amsa_vaiseshikamsa)
-def _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
-                                   amsa_vaiseshikamsa=None):
+def _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=None,
+                                   amsa_vaiseshikamsa=None,rasi_planet_positions=None):
+    """ rasi_planet_positions: rasi_chart(jd_at_dob,place_as_tuple,ayanamsa_mode) if already available """
     p_d = [0 for _ in range(9)]
     p_d_s = [0 for _ in range(9)]
     p_d_c = ['' for _ in range(9)]
+    if rasi_planet_positions is None:
+        rasi_planet_positions = rasi_chart(jd_at_dob, place_as_tuple, ayanamsa_mode)
     for dcf in amsa_vaiseshikamsa.keys():
-        planet_positions = divisional_chart(jd_at_dob, place_as_tuple,ayanamsa_mode,
+        planet_positions = divisional_positions_from_rasi_positions(rasi_planet_positions,
                                             divisional_chart_factor=dcf)[:const._pp_count_upto_ketu]
         for p,(h,_) in planet_positions:
             if p == const._ascendant_symbol:
@@ -1277,13 +1382,18 @@ def _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const
         p_d_c[p] = p_d_c[p][:-1]
         pdc[p] = [p_d[p],p_d_c[p],p_d_s[p]]
     return pdc
-def _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,amsa_vimsopaka=None):
+def _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=None,amsa_vimsopaka=None,
+                               rasi_planet_positions=None):
+    """ rasi_planet_positions: rasi_chart(jd_at_dob,place_as_tuple,ayanamsa_mode) if already available """
     p_d = [0 for _ in range(9)]
     p_d_s = [0 for _ in range(9)]
     p_d_c = ['' for _ in range(9)]
     scores = [5,7,10,15,18]
+    if rasi_planet_positions is None:
+        rasi_planet_positions = rasi_chart(jd_at_dob, place_as_tuple, ayanamsa_mode)
     for dcf in amsa_vimsopaka.keys():
-        planet_positions = divisional_chart(jd_at_dob, place_as_tuple,ayanamsa_mode,divisional_chart_factor=dcf)[:const._pp_count_upto_ketu]
+        planet_positions = divisional_positions_from_rasi_positions(rasi_planet_positions,
+                                            divisional_chart_factor=dcf)[:const._pp_count_upto_ketu]
         h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
         if dcf == 1:
             cr = house._get_compound_relationships_of_planets(h_to_p)
@@ -1306,7 +1416,7 @@ def _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const._DE
         #print(house.planet_list[p],pdc[p])
     return pdc
     
-def vimsopaka_dhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vimsopaka_dhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many dhasa varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1321,7 +1431,7 @@ def vimsopaka_dhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=con
             Sreedhaamaamsa – 10.
     """
     return _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.dhasavarga_amsa_vimsopaka)
-def vimsopaka_shadvarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vimsopaka_shadvarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many shad varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1334,7 +1444,7 @@ def vimsopaka_shadvarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=cons
             Kimsukaamsa – 2, Vyanjanaamsa – 3, Chaamaraamsa – 4, Chatraamsa – 5,  Kundalaamsa – 6.
     """
     return _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.shadvarga_amsa_vimsopaka)
-def vimsopaka_sapthavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vimsopaka_sapthavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many saptha varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1347,7 +1457,7 @@ def vimsopaka_sapthavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=co
             Kimsukaamsa – 2, Vyanjanaamsa – 3, Chaamaraamsa – 4, Chatraamsa – 5, Kundalaamsa – 6, Mukutaamsa – 7.
     """
     return _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.sapthavarga_amsa_vimsopaka)
-def vimsopaka_shodhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vimsopaka_shodhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many shodhasa varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1363,7 +1473,7 @@ def vimsopaka_shodhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=
             Vidrumaamsa – 13, Indraasanaamsa – 14, Golokaamsa – 15, Sree Vallabhaamsa – 16.
     """
     return _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.shodhasa_varga_amsa_vimsopaka)
-def vimsamsavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def vimsamsavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=None):
     """
         Get the count - in how many vimsamsa varga charts the planets are in their own raasi or exalted
         @param jd_at_dob:Julian day number at the date/time of birth
@@ -1419,7 +1529,7 @@ def _varnada_lagna_sanjay_rath_mixed_chart(dob,tob, place,house_index=1,varga_fa
     dl = drik.dasavarga_from_long(vl, divisional_chart_factor=1)
     if _debug_: print('return drik dasavarg',dl)
     return dl    
-def _varnada_lagna_sanjay_rath(dob,tob, place,house_index=1, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
+def _varnada_lagna_sanjay_rath(dob,tob, place,house_index=1, ayanamsa_mode=None,
                                divisional_chart_factor=1,chart_method=1,
                                        base_rasi=None,count_from_end_of_sign=None):
     """ TO DO : Still experimenting """
@@ -1478,7 +1588,7 @@ def _varnada_lagna_jha_pandey_mixed_chart(dob,tob, place,house_index=1,varga_fac
     #print(asc_long,hora_long,count_is_odd,vl)
     dl = drik.dasavarga_from_long(vl, divisional_chart_factor=1)
     return dl
-def _varnada_lagna_jha_pandey(dob,tob, place,house_index=1,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
+def _varnada_lagna_jha_pandey(dob,tob, place,house_index=1,ayanamsa_mode=None,
                               divisional_chart_factor=1,chart_method=1,base_rasi=None,
                               count_from_end_of_sign=None):
     """ TO DO : Still experimenting """
@@ -1506,7 +1616,7 @@ def _varnada_lagna_jha_pandey(dob,tob, place,house_index=1,ayanamsa_mode=const._
     #print(asc_long,hora_long,count_is_odd,vl)
     dl = drik.dasavarga_from_long(vl, divisional_chart_factor=1)
     return dl
-def varnada_lagna_mixed_chart(dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,house_index=1,varga_factor_1=1,
+def varnada_lagna_mixed_chart(dob,tob,place,ayanamsa_mode=None,house_index=1,varga_factor_1=1,
                               chart_method_1=1,varga_factor_2=1,chart_method_2=1,varnada_method=1):
     """
         Get Varnada Lagna
@@ -1543,7 +1653,7 @@ def varnada_lagna_mixed_chart(dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMS
         return _varnada_lagna_jha_pandey_mixed_chart(dob, tob, place, house_index=house_index,
                         varga_factor_1=varga_factor_1, chart_method_1=chart_method_2, varga_factor_2=varga_factor_2,
                         chart_method_2=chart_method_2)
-def varnada_lagna(dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,
+def varnada_lagna(dob,tob,place,ayanamsa_mode=None,divisional_chart_factor=1,
                   chart_method=1,house_index=1,varnada_method=1,base_rasi=None,count_from_end_of_sign=None):
     """
         Get Varnada Lagna
@@ -1595,7 +1705,7 @@ def _varnada_lagna_bv_raman_mixed_chart(dob,tob, place,house_index=1,varga_facto
     _varnada_lagna = utils.count_rasis(1,count,dir=1) if lagna_is_odd else utils.count_rasis(12,count,dir=-1)
     _varnada_lagna -= 1 ## Keep in 0..11 range instead of 1..12
     return _varnada_lagna, asc_long #hl
-def _varnada_lagna_bv_raman(dob,tob,place,house_index=1,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
+def _varnada_lagna_bv_raman(dob,tob,place,house_index=1,ayanamsa_mode=None,
                             divisional_chart_factor=1,chart_method=1,base_rasi=None,count_from_end_of_sign=None):
     """
         Get Varnada Lagna
@@ -1624,7 +1734,7 @@ def _varnada_lagna_bv_raman(dob,tob,place,house_index=1,ayanamsa_mode=const._DEF
 def _varnada_lagna_santhanam_mixed_chart(dob,tob, place,house_index=1,varga_factor_1=1,chart_method_1=1,
                                            varga_factor_2=1,chart_method_2=1):
     return _varnada_lagna_sharma_mixed_chart(dob, tob, place, house_index, varga_factor_1, chart_method_1, varga_factor_2, chart_method_2)
-def _varnada_lagna_santhanam(dob,tob,place,house_index=1,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
+def _varnada_lagna_santhanam(dob,tob,place,house_index=1,ayanamsa_mode=None,
                              divisional_chart_factor=1,chart_method=1,
                                        base_rasi=None,count_from_end_of_sign=None):
     """
@@ -1653,7 +1763,7 @@ def _varnada_lagna_sharma_mixed_chart(dob,tob, place,house_index=1,varga_factor_
     _varnada_lagna = utils.count_rasis(1,count,dir=1) if count_is_odd else utils.count_rasis(12,count,dir=-1)
     _varnada_lagna -= 1 ## Keep in 0..11 range instead of 1..12
     return _varnada_lagna, asc_long #hl
-def _varnada_lagna_sharma(dob,tob,place,house_index=1,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
+def _varnada_lagna_sharma(dob,tob,place,house_index=1,ayanamsa_mode=None,
                           divisional_chart_factor=1,chart_method=1,
                                        base_rasi=None,count_from_end_of_sign=None):
     """
@@ -1684,7 +1794,7 @@ def _varnada_lagna_sharma(dob,tob,place,house_index=1,ayanamsa_mode=const._DEFAU
     #print(count1,count2,count,count_is_odd,_varnada_lagna)
     _varnada_lagna -= 1 ## Keep in 0..11 range instead of 1..12
     return _varnada_lagna, asc_long #hl
-def benefics_and_malefics(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,method=2,
+def benefics_and_malefics(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,method=2,
                           exclude_rahu_ketu=False):
     """
         From BV Raman - Hindu Predictive Astrology - METHOD=1
@@ -1741,7 +1851,7 @@ def benefics_and_malefics(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,di
             malefics += [3] 
     benefics = sorted(set(benefics)) ; malefics = sorted(set(malefics))
     return benefics, malefics
-def benefics(jd,place,method=2,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,exclude_rahu_ketu=False):
+def benefics(jd,place,method=2,ayanamsa_mode=None,exclude_rahu_ketu=False):
     """
         From BV Raman - Hindu Predictive Astrology - METHOD=1
         Jupiter. Venus. Full Moon and well-associated Mercury are benefics. 
@@ -1762,7 +1872,7 @@ def benefics(jd,place,method=2,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,exclud
     """
     return benefics_and_malefics(jd, place, method=method,ayanamsa_mode=ayanamsa_mode,
                                  exclude_rahu_ketu=exclude_rahu_ketu)[0]
-def malefics(jd,place,method=2,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,exclude_rahu_ketu=False):
+def malefics(jd,place,method=2,ayanamsa_mode=None,exclude_rahu_ketu=False):
     """
         From BV Raman - Hindu Predictive Astrology - METHOD=1
         Jupiter. Venus. Full Moon and well-associated Mercury are benefics. 
@@ -1871,7 +1981,7 @@ def solar_upagraha_longitudes(planet_positions,upagraha,divisional_chart_factor=
     """
     solar_longitude = planet_positions[1][1][0]*30+planet_positions[1][1][1]
     return drik.solar_upagraha_longitudes(solar_longitude, upagraha, divisional_chart_factor=divisional_chart_factor)
-def _amsa(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,include_upagrahas=False,
+def _amsa(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,include_upagrahas=False,
           include_special_lagnas=False,include_sphutas=False,chart_method=1,base_rasi=None,count_from_end_of_sign=None):
     "TODO: Still under testing - Exact algorithm not clear"
     y,m,d,fh = utils.jd_to_gregorian(jd); dob = drik.Date(y,m,d); tob = (fh,0,0)
@@ -2034,12 +2144,15 @@ def next_planet_entry_date_divisional_chart(jd,place,planet,divisional_chart_fac
         @param panchanga_date: Date struct (y,m,d)
         @param panchanga_place: Place struct ('place',latitude,longitude,timezone)
         @param direction: 1= next entry, -1 previous entry
-        @param increment_days: incremental steps in days algorithm to check for entry (Default=1 day)
+        @param increment_days: Not used. Search steps are sized by maximum daily motion of the planet
         @param precision: precision in degrees within which longitude entry whould be (default: 0.1 degrees)
         @param raasi: raasi at which planet should enter. 
             If raasi==None: gives entry to next constellation
             If raasi is specified [1..12] gives entry to specified constellation/raasi
         @return Julian day number of planet entry into zodiac
+        NOTE: Divisional chart position can reach a raasi boundary only when the rasi longitude crosses an amsa boundary
+            (multiple of 30/divisional_chart_factor degrees). So only those crossings are found (drik.next_angle_crossing)
+            and the divisional chart is evaluated just before/after each of them.
     """
     if planet==8:
         raghu_raasi = (raasi-1+6)%12+1 if raasi!=None else raasi
@@ -2047,11 +2160,18 @@ def next_planet_entry_date_divisional_chart(jd,place,planet,divisional_chart_fac
                                                       direction=direction,raasi=raghu_raasi)
         p_long = (ret[1]+180)%360
         return ret[0],p_long
-    increment_days=1.0/24.0/60.0/divisional_chart_factor if planet in ['L',1] else 0.1/divisional_chart_factor
+    min_step=1.0/24.0/60.0/divisional_chart_factor if planet in ['L',1] else 0.1/divisional_chart_factor
     planet_index = 0 if planet=='L' else planet+1
-    sla = divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor, 
+    def _varga_long(jd):
+        sla = divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor, 
                 chart_method=chart_method,base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)[planet_index][1]
-    sl = sla[0]*30+sla[1]
+        return sla[0]*30+sla[1]
+    p_id = const._ascendant_symbol if planet=='L' else drik.active_planet_list()[planet]
+    def _rasi_long(jd): # Continuous rasi longitude (rasi_chart rounds the last arc second of a raasi to the next)
+        if planet=='L':
+            sla = drik.ascendant(jd, place); return sla[0]*30+sla[1]
+        return drik.sidereal_longitude(jd-place.timezone/24.0, p_id)
+    sl = _varga_long(jd)
     if raasi==None:
         multiple = (((sl//30)+1)%12)*30
         if direction==-1: multiple = (sl//30)%12*30
@@ -2061,28 +2181,17 @@ def next_planet_entry_date_divisional_chart(jd,place,planet,divisional_chart_fac
                 multiple = ((sl//30+1)%12*30)%360
     else: 
         multiple = (raasi-1)*30
-    #print(sla,multiple)
+    #print(sl,multiple)
+    is_entry = lambda sl: sl < (multiple+precision) and sl>(multiple-precision)
+    max_speed = drik.max_daily_motion(p_id)
+    eps = 1e-8 # days
     while True:
-        if sl < (multiple+precision) and sl>(multiple-precision):
-            break
-        jd += increment_days*direction
-        sla = divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor, 
-                    chart_method=chart_method,base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)[planet_index][1]
-        sl = sla[0]*30+sla[1]
-    #print(sla,utils.jd_to_gregorian(jd))
-    offsets = [t*0.25 for t in range(-5,5)] if planet !='L' else [t*increment_days for t in range(-5,5)]
-    planet_longs = []
-    for t in offsets:
-        sla = divisional_chart(jd+t, place, divisional_chart_factor=divisional_chart_factor, 
-                    chart_method=chart_method,base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)[planet_index][1]
-        sl = sla[0]*30+sla[1]
-        planet_longs.append(sl)
-    planet_hour = utils.inverse_lagrange(offsets, planet_longs, multiple) # Do not move % 360 above
-    jd += planet_hour
-    sla = divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor, 
-                chart_method=chart_method,base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)[planet_index][1]
-    planet_long = sla[0]*30+sla[1]
-    return jd,planet_long
+        jd = drik.next_angle_crossing(_rasi_long, jd, 0.0, direction=direction, max_speed=max_speed,
+                                      min_step=min_step, period=30.0/divisional_chart_factor)
+        for planet_long in [_varga_long(jd+eps*direction), _varga_long(jd-eps*direction)]:
+            if is_entry(planet_long):
+                return jd,planet_long
+        jd += 2*eps*direction
 
 def previous_planet_entry_date_mixed_chart(jd,place,planet,varga_factor_1=None,chart_method_1=None,
                                        varga_factor_2=None,chart_method_2=None,
@@ -2233,7 +2342,7 @@ def lattha_stars_planets(planet_positions,include_abhijith=True):
         #print(p,p_long,p_star,const.latta_stars_of_planets[p],_latta_star)
         _latta_stars.append((p_star,_latta_star))
     return _latta_stars
-def _amsa_d150(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,include_upagrahas=False,
+def _amsa_d150(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,include_upagrahas=False,
           include_special_lagnas=False,include_sphutas=False,chart_method=1,base_rasi=None,count_from_end_of_sign=None):
     #msgs = get_amsa_resources()
     planet_positions = divisional_chart(jd, place, ayanamsa_mode=ayanamsa_mode, divisional_chart_factor=divisional_chart_factor,
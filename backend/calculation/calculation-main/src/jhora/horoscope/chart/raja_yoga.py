@@ -67,25 +67,12 @@ def get_raja_yoga_details_for_all_charts(jd,place,language='en',divisional_chart
         @return: returns a 2D List of raja yoga_name, raja yoga_details
             raja yoga_name in language
             raja yoga_details: [chart_ID, raja_yoga_name, raja_yoga_desription, raja_yoga_benfits] 
+        NOTE: Evaluated by yoga_engine from one chart matrix of all the varga charts
     """
-    msgs = get_raja_yoga_resources(language=language)
-    raja_yoga_results_combined = {}
-    ascendant_index = const._ascendant_symbol
-    planet_positions_navamsa = drik.dhasavarga(jd,place,divisional_chart_factor=9)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house_navamsa,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor=9)
-    planet_positions_navamsa += [[ascendant_index,(asc_house_navamsa,asc_long)]]
-    if divisional_chart_factor==None:
-        for dv in division_chart_factors:
-            raja_yoga_results,_,_ = get_raja_yoga_details(jd,place,divisional_chart_factor=dv,language=language)
-            raja_yoga_results.update(raja_yoga_results_combined)
-            raja_yoga_results_combined = raja_yoga_results
-    else:
-        raja_yoga_results,_,_ = get_raja_yoga_details(jd,place,divisional_chart_factor=divisional_chart_factor,language=language)
-        raja_yoga_results.update(raja_yoga_results_combined)
-        raja_yoga_results_combined = raja_yoga_results
-    #print('Found',len(yoga_results_combined),'out of',len(msgs)*len(division_chart_factors),'yogas')
-    return raja_yoga_results_combined,len(raja_yoga_results_combined),len(msgs)*len(division_chart_factors)
+    from jhora.horoscope.chart import yoga_engine
+    dvfs = division_chart_factors if divisional_chart_factor==None else [divisional_chart_factor]
+    matrix = yoga_engine.yoga_chart_matrix(jd, place, divisional_chart_factors=dvfs)
+    return yoga_engine.get_engine(language).raja_yoga_details_for_all_charts(matrix)
 def get_raja_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
     """
         Get all the raja yoga information that are present in the requested divisional charts for a given julian day and place
@@ -97,33 +84,9 @@ def get_raja_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
             raja yoga_name in language
             raja yoga_details: [chart_ID, raja_yoga_name, raja_yoga_desription, raja_yoga_benfits] 
     """
-    #utils.set_language(language)
-    msgs = get_raja_yoga_resources(language=language)
-    res = utils.get_resource_messages()
-    ascendant_index = const._ascendant_symbol
-    planet_positions = drik.dhasavarga(jd,place,divisional_chart_factor)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor)
-    planet_positions += [[ascendant_index,(asc_house,asc_long)]]
-    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
-    h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
-    raja_yoga_results = {}
-    for raja_yoga_function,details in msgs.items():
-        details_str = 'D'+str(divisional_chart_factor)+'-'
-        raja_yoga_pairs = get_raja_yoga_pairs_from_planet_positions(planet_positions)
-        if raja_yoga_pairs:
-            rp_str = ''
-            for rp1,rp2 in raja_yoga_pairs:
-                raja_yoga_exists = eval(raja_yoga_function+'_from_planet_positions')(planet_positions,rp1,rp2)
-                if raja_yoga_exists:
-                    rp_str += ' '+'[' +utils.PLANET_NAMES[rp1]+'-'+utils.PLANET_NAMES[rp2]+'] '
-                    #details_str += rp_str
-            if rp_str != '':
-                details_str += res['raja_yoga_pairs'] + rp_str
-                details.insert(0,details_str)
-                raja_yoga_results[raja_yoga_function] = details
-    #print('Found',len(raja_yoga_results),'out of',len(msgs),'raja_yogas in D'+str(divisional_chart_factor),'chart')
-    return raja_yoga_results,len(raja_yoga_results),len(msgs)
+    from jhora.horoscope.chart import yoga_engine
+    matrix = yoga_engine.yoga_chart_matrix(jd, place, divisional_chart_factors=[divisional_chart_factor])
+    return yoga_engine.get_engine(language).raja_yoga_details(matrix, divisional_chart_factor)
 def _check_association(h_to_p,lord1,lord2):
     p_to_h = utils.get_planet_to_house_dict_from_chart(h_to_p)
     """ (1) The two lords are conjoined, """
@@ -452,7 +415,7 @@ def neecha_bhanga_raja_yoga_from_planet_positions(planet_positions,raja_yoga_pla
     chk3 = chk3_1 or chk3_2
     return chk3
 def check_other_raja_yoga_1(jd,place,divisional_chart_factor=1):
-    planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, divisional_chart_factor=divisional_chart_factor)
+    planet_positions = charts.divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor)
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
     chara_karakas = house.chara_karakas(planet_positions)
@@ -469,7 +432,7 @@ def check_other_raja_yoga_1(jd,place,divisional_chart_factor=1):
     chk2 = p_to_h[lagna_lord] == p_to_h[fifth_lord]
     return chk1 and chk2
 def check_other_raja_yoga_2(jd,place,divisional_chart_factor=1):
-    planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, divisional_chart_factor=divisional_chart_factor)
+    planet_positions = charts.divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor)
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
     chara_karakas = house.chara_karakas(planet_positions)
@@ -506,7 +469,7 @@ def check_other_raja_yoga_2(jd,place,divisional_chart_factor=1):
     chk4 = chk4_1 and chk4_2 and chk4_3 and chk4_4
     return chk1 and chk2 and (chk3 or chk4)
 def check_other_raja_yoga_3(jd,place,divisional_chart_factor=1):
-    planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, divisional_chart_factor=divisional_chart_factor)
+    planet_positions = charts.divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor)
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
     chara_karakas = house.chara_karakas(planet_positions)
@@ -32,7 +32,7 @@ def tri_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,varga
     _tri_sphuta = (moon_long+asc_long+gulika_long)%360
     return drik.dasavarga_from_long(_tri_sphuta, divisional_chart_factor=mixed_dvf)
     
-def tri_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,
+def tri_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,
                chart_method=1,years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -52,7 +52,7 @@ def chatur_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,va
     _tri_sphuta= tri_sphuta_mixed_chart(dob, tob, place,varga_factor_1,chart_method_1,varga_factor_2,chart_method_2)
     _chatur_sphuta = (sun_long+_tri_sphuta[0]*30+_tri_sphuta[1])%360
     return drik.dasavarga_from_long(_chatur_sphuta, divisional_chart_factor=mixed_dvf)
-def chatur_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,
+def chatur_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,
                chart_method=1,years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -71,7 +71,7 @@ def pancha_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,va
     _chatur_sphuta= chatur_sphuta_mixed_chart(dob, tob, place,varga_factor_1,chart_method_1,varga_factor_2,chart_method_2)
     _pancha_sphuta = (rahu_long+_chatur_sphuta[0]*30+_chatur_sphuta[1])%360
     return drik.dasavarga_from_long(_pancha_sphuta, divisional_chart_factor=mixed_dvf)    
-def pancha_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,
+def pancha_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,
                chart_method=1,years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -91,7 +91,7 @@ def prana_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,var
     gulika_long = gulika[0]*30+gulika[1]
     _prana_long = (asc_long*5 + gulika_long) %360
     return drik.dasavarga_from_long(_prana_long, divisional_chart_factor=mixed_dvf)
-def prana_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def prana_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                  years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -111,7 +111,7 @@ def deha_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,varg
     gulika_long = gulika[0]*30+gulika[1]
     _deha_long = (moon_long*8 + gulika_long) %360
     return drik.dasavarga_from_long(_deha_long, divisional_chart_factor=mixed_dvf)
-def deha_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def deha_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                 years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -131,7 +131,7 @@ def mrityu_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,va
     gulika_long = gulika[0]*30+gulika[1]
     _mrityu_long = (gulika_long*7 + sun_long) %360
     return drik.dasavarga_from_long(_mrityu_long, divisional_chart_factor=mixed_dvf)
-def mrityu_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def mrityu_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                   years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -151,7 +151,7 @@ def sookshma_tri_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_
     _mrityu_long = mrityu_sphuta_mixed_chart(dob, tob, place,varga_factor_1,chart_method_1,varga_factor_2,chart_method_2)
     _sookshma_long = (_prana_long[0]*30+_prana_long[1] + _deha_long[0]*30+_deha_long[1] + _mrityu_long[0]*30+_mrityu_long[1]) %360
     return drik.dasavarga_from_long(_sookshma_long, divisional_chart_factor=mixed_dvf)
-def sookshma_tri_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,
+def sookshma_tri_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,
                         chart_method=1,years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     _prana_long = prana_sphuta(dob, tob, place, ayanamsa_mode, divisional_chart_factor, chart_method,years, months, sixty_hours,
                                         base_rasi=base_rasi,count_from_end_of_sign=count_from_end_of_sign)
@@ -170,7 +170,7 @@ def beeja_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,var
     venus_long = planet_positions[6][1][0]*30+planet_positions[6][1][1]
     _beeja_long = (sun_long + jupiter_long + venus_long)%360
     return drik.dasavarga_from_long(_beeja_long, divisional_chart_factor=mixed_dvf)
-def beeja_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def beeja_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                  years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -191,7 +191,7 @@ def kshetra_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,v
     mars_long = planet_positions[3][1][0]*30+planet_positions[3][1][1]
     _kshetra_long = (moon_long + jupiter_long + mars_long)%360
     return drik.dasavarga_from_long(_kshetra_long, divisional_chart_factor=mixed_dvf)
-def kshetra_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def kshetra_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                    years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -211,7 +211,7 @@ def tithi_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,var
     sun_long = planet_positions[1][1][0]*30+planet_positions[1][1][1]
     _tithi_long = (moon_long - sun_long) %360
     return drik.dasavarga_from_long(_tithi_long, divisional_chart_factor=mixed_dvf)
-def tithi_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def tithi_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                  years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -232,7 +232,7 @@ def yoga_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,varg
     yogi_long = 93+20/60 if add_yogi_longitude else 0
     _yoga_long = (moon_long + sun_long + yogi_long) %360
     return drik.dasavarga_from_long(_yoga_long, divisional_chart_factor=mixed_dvf)
-def yoga_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def yoga_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                 years=1,months=1,sixty_hours=1,add_yogi_longitude=False,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -247,7 +247,7 @@ def yoga_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisi
 def yogi_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,varga_factor_2=1,chart_method_2=1):
     return yoga_sphuta_mixed_chart(dob, tob, place, varga_factor_1, chart_method_1, varga_factor_2, chart_method_2, 
                                    add_yogi_longitude=True)
-def yogi_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def yogi_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                 years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     return yoga_sphuta(dob,tob,place,ayanamsa_mode,divisional_chart_factor,chart_method,
                        years,months,sixty_hours,add_yogi_longitude=True,
@@ -257,7 +257,7 @@ def avayogi_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=1,v
     yl = yogi_sphuta_mixed_chart(dob, tob, place, varga_factor_1, chart_method_1, varga_factor_2, chart_method_2)
     ayl = (yl[0]*30+yl[1]+186+40/60)%360
     return drik.dasavarga_from_long(ayl, mixed_dvf)
-def avayogi_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def avayogi_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                    years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     yl = yogi_sphuta(dob,tob,place,ayanamsa_mode,divisional_chart_factor,chart_method,years,months,sixty_hours,
                                         base_rasi=base_rasi,count_from_end_of_sign=count_from_end_of_sign)
@@ -271,7 +271,7 @@ def rahu_tithi_sphuta_mixed_chart(dob,tob,place,varga_factor_1=1,chart_method_1=
     sun_long = planet_positions[1][1][0]*30+planet_positions[1][1][1]
     _tithi_long = (rahu_long - sun_long) %360
     return drik.dasavarga_from_long(_tithi_long, divisional_chart_factor=mixed_dvf)
-def rahu_tithi_sphuta(dob,tob,place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def rahu_tithi_sphuta(dob,tob,place, ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                       years=1,months=1,sixty_hours=1,base_rasi=None,count_from_end_of_sign=None):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=ayanamsa_mode, 
@@ -128,6 +128,82 @@ ujjain_epoch_table_for_planets = [
 kendras = lambda asc_house:[(asc_house+h-1)%12 for h in [1,4,7,10] ]
 panapharas = lambda asc_house:[(asc_house+h-1)%12 for h in [2,5,8,11] ]
 apoklimas = lambda asc_house:[(asc_house+h-1)%12 for h in [3,6,9,12] ]
+_SAPTHA_VARGAS = [1, 2, 3, 7, 9, 12, 30]
+
+class StrengthContext():
+    """
+        Intermediate values shared by the bala components of one chart (jd, place, ayanamsa_mode)
+        Charts, sunrise/sunset, bhava madhya, tithi etc are evaluated on first use and then reused by every bala.
+        Pass the same context to shad_bala, bhava_bala and the _xxx_bala functions to evaluate them only once.
+        @param ayanamsa_mode: Default: None => mode of the active calculation context (drik.active_ayanamsa_mode)
+            The chart methods called without ayanamsa_mode use this mode
+        NOTE: Do not mutate the returned lists - they are shared
+    """
+    def __init__(self,jd,place,ayanamsa_mode=None):
+        self.jd = jd
+        self.place = place
+        self.ayanamsa_mode = drik.active_ayanamsa_mode(ayanamsa_mode)
+        self._values = {}
+    def _get(self,key,fn,uses_ayanamsa=False):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if uses_ayanamsa:
+            drik.set_ayanamsa_mode(self.ayanamsa_mode)
+        value = self._values[key] = fn()
+        return value
+    def rasi_chart(self,ayanamsa_mode=None):
+        ayanamsa_mode = ayanamsa_mode or self.ayanamsa_mode
+        return self._get(('rasi_chart',ayanamsa_mode),lambda: charts.rasi_chart(self.jd, self.place,ayanamsa_mode=ayanamsa_mode))
+    def divisional_chart(self,divisional_chart_factor,ayanamsa_mode=None):
+        """ same as charts.divisional_chart - derived from the (shared) rasi chart """
+        ayanamsa_mode = ayanamsa_mode or self.ayanamsa_mode
+        if divisional_chart_factor == 1:
+            return self.rasi_chart(ayanamsa_mode)
+        return self._get(('divisional_chart',divisional_chart_factor,ayanamsa_mode),
+                         lambda: charts.divisional_positions_from_rasi_positions(self.rasi_chart(ayanamsa_mode),
+                                                                divisional_chart_factor=divisional_chart_factor))
+    def dhasavarga(self):
+        """ drik.dhasavarga(jd, place, divisional_chart_factor=1) """
+        return self._get('dhasavarga',lambda: drik.dhasavarga(self.jd, self.place, divisional_chart_factor=1),True)
+    def bhaava_madhya(self):
+        return self._get('bhaava_madhya',lambda: drik.bhaava_madhya(self.jd, self.place),True)
+    def declination_of_planets(self):
+        return self._get('declination_of_planets',lambda: drik.declination_of_planets(self.jd, self.place),True)
+    def bhava_chart_houses(self,ayanamsa_mode=None):
+        ayanamsa_mode = ayanamsa_mode or self.ayanamsa_mode
+        return self._get(('bhava_chart_houses',ayanamsa_mode),
+                         lambda: charts.bhava_chart_houses(self.jd, self.place,ayanamsa_mode=ayanamsa_mode))
+    def benefics_and_malefics(self,ayanamsa_mode=None):
+        ayanamsa_mode = ayanamsa_mode or self.ayanamsa_mode
+        return self._get(('benefics_and_malefics',ayanamsa_mode),
+                         lambda: charts.benefics_and_malefics(self.jd, self.place,ayanamsa_mode=ayanamsa_mode,
+                                                              exclude_rahu_ketu=True))
+    def sunrise(self):
+        return self._get('sunrise',lambda: drik.sunrise(self.jd, self.place)[0])
+    def sunset(self):
+        return self._get('sunset',lambda: drik.sunset(self.jd, self.place)[0])
+    def day_length(self):
+        return self._get('day_length',lambda: drik.day_length(self.jd, self.place))
+    def night_length(self):
+        return self._get('night_length',lambda: drik.night_length(self.jd, self.place))
+    def midnight(self):
+        return self._get('midnight',lambda: drik.midnight(self.jd, self.place))
+    def tithi(self):
+        return self._get('tithi',lambda: drik.tithi(self.jd, self.place)[0])
+    def vaara(self):
+        return self._get('vaara',lambda: drik.vaara(self.jd))
+    def time_of_birth(self):
+        return self._get('time_of_birth',lambda: utils.jd_to_gregorian(self.jd)[3])
+    def value(self,key,fn):
+        """ memo of any other value of this chart (e.g. the bala components) """
+        return self._get(key,fn)
+def _strength_context(jd,place,ayanamsa_mode=None,context=None):
+    """ context if it is for the ayanamsa_mode (None => any) else a new StrengthContext """
+    if context is not None and (ayanamsa_mode is None or context.ayanamsa_mode == ayanamsa_mode):
+        return context
+    return StrengthContext(jd,place,ayanamsa_mode)
 
 def harsha_bala(dob,tob,place,divisional_factor=1):
     """
@@ -194,14 +270,15 @@ def _sapthavargaja_bala(jd,place):
         svb.append(svbc)
     svb_sum = list(map(sum,zip(*svb)))
     return svb_sum
-def _sapthavargaja_bala1(jd,place,ayanamsa_mode='LAHIRI'):
-    sv = [1, 2, 3, 7, 9, 12, 30]
+def _sapthavargaja_bala1(jd,place,ayanamsa_mode='LAHIRI',context=None):
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
+    sv = _SAPTHA_VARGAS
     pp_sv = {}
-    planet_positions_in_rasi = charts.rasi_chart(jd, place,ayanamsa_mode=ayanamsa_mode)
+    planet_positions_in_rasi = ctx.rasi_chart(ayanamsa_mode)
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions_in_rasi)
     cr = house._get_compound_relationships_of_planets(h_to_p)
     for dcf in sv:
-        pp = charts.divisional_chart(jd, place,ayanamsa_mode=ayanamsa_mode,divisional_chart_factor=dcf) if dcf!=2 \
+        pp = ctx.divisional_chart(dcf,ayanamsa_mode) if dcf!=2 \
                 else charts.hora_chart(planet_positions_in_rasi, chart_method=2)
         pp_sv[dcf] = pp
     svb = []
@@ -211,15 +288,14 @@ def _sapthavargaja_bala1(jd,place,ayanamsa_mode='LAHIRI'):
     svb_sum = list(map(sum,zip(*svb)))
     svb_sum = [round(v,2) for v in svb_sum]
     return svb_sum
-def _sthana_bala(jd, place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
-    sv = [1, 2, 3, 7, 9, 12, 30]
-    pp_sv = {}
-    for dcf in sv:
-        pp = charts.divisional_chart(jd, place,ayanamsa_mode=ayanamsa_mode,divisional_chart_factor=dcf)
-        pp_sv[dcf] = pp
+def _sthana_bala(jd, place,ayanamsa_mode=None,context=None):
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
+    return ctx.value(('sthana_bala',ayanamsa_mode),lambda: __sthana_bala(ctx, ayanamsa_mode))
+def __sthana_bala(ctx,ayanamsa_mode):
+    pp_sv = {dcf:ctx.divisional_chart(dcf,ayanamsa_mode) for dcf in [1,9]}
     ub = _uchcha_bala(pp_sv[1])
     #print('uccha bala',ub)
-    svb = _sapthavargaja_bala1(jd, place,ayanamsa_mode=ayanamsa_mode)
+    svb = _sapthavargaja_bala1(ctx.jd, ctx.place,ayanamsa_mode=ayanamsa_mode,context=ctx)
     #print('_sapthavargaja_bala',svb)
     ob = _ojayugama_bala(pp_sv[1], pp_sv[9])
     #print('_ojayugama_bala',ob)
@@ -416,22 +492,24 @@ def dwadhasa_vargeeya_bala(jd,place):
                 dvp[p]+=1
     dvpd = {k:dvp[k] for k in range(7)}
     return dvpd
-def _dig_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
-    planet_positions = charts.rasi_chart(jd, place,ayanamsa_mode=ayanamsa_mode)
+def _dig_bala(jd,place,ayanamsa_mode=None,context=None):
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
+    planet_positions = ctx.rasi_chart(ayanamsa_mode)
     powerless_houses_of_planets = [3,9,3,6,6,9,0]#[4,10,4,7,7,10,1]
-    bm = drik.bhaava_madhya(jd, place)
+    bm = ctx.bhaava_madhya()
     dbf = [bm[p] for p in powerless_houses_of_planets]
     dbp = [0 for _ in range(7)]
     for p,(h,long) in planet_positions[1:const._pp_count_upto_saturn]:
         p_long = h*30+long
         dbp[p] = round(abs(dbf[p]-p_long)/3,2)
     return dbp
-def _divaratri_bala(jd,place):
-    return _nathonnath_bala(jd,place)
-def _nathonnath_bala(jd,place):
+def _divaratri_bala(jd,place,context=None):
+    return _nathonnath_bala(jd,place,context=context)
+def _nathonnath_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     nbp = [0 for _ in range(7)]
-    _,_,_,tobh = utils.jd_to_gregorian(jd)
-    mnhl = drik.midnight(jd, place)
+    tobh = ctx.time_of_birth()
+    mnhl = ctx.midnight()
     t_diff = (tobh - mnhl)*60/12 if tobh < 12.0 else (24.0 + mnhl - tobh)*60/12
     for p in [0,4,5]:
         nbp[p] = round(t_diff,2)
@@ -439,13 +517,14 @@ def _nathonnath_bala(jd,place):
         nbp[p] = round(60 - t_diff,2)
     nbp[3] = 60.0
     return nbp
-def _paksha_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
-    planet_positions = drik.dhasavarga(jd, place,divisional_chart_factor=1)
+def _paksha_bala(jd,place,ayanamsa_mode=None,context=None):
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
+    planet_positions = ctx.dhasavarga()
     sun_long = planet_positions[0][1][0]*30+planet_positions[0][1][1]
     moon_long = planet_positions[1][1][0]*30+planet_positions[1][1][1]
     pb = round(abs(sun_long - moon_long) / 3.0,2)
     pbp = [pb for _ in range(7)]
-    cht_benefics,cht_malefics = charts.benefics_and_malefics(jd, place,ayanamsa_mode=ayanamsa_mode,exclude_rahu_ketu=True)
+    cht_benefics,cht_malefics = ctx.benefics_and_malefics(ayanamsa_mode)
     #print(cht_benefics,cht_malefics)
     for p in cht_benefics:# const.natural_benefics:
         pbp[p] = pb
@@ -453,13 +532,14 @@ def _paksha_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
         pbp[p] = round(60.0 - pb,2)
     pbp[1] *=2 
     return pbp
-def _tribhaga_bala(jd,place):
+def _tribhaga_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     tbp = [0 for _ in range(7)]
-    _,_,_,tobh = utils.jd_to_gregorian(jd)
-    srh = drik.sunrise(jd, place)[0]
-    ssh = drik.sunset(jd, place)[0]
-    dl = drik.day_length(jd, place)
-    nl = drik.night_length(jd, place)
+    tobh = ctx.time_of_birth()
+    srh = ctx.sunrise()
+    ssh = ctx.sunset()
+    dl = ctx.day_length()
+    nl = ctx.night_length()
     dlinc = dl/3 ; nlinc = nl / 3
     tbp[4] = 60 # Guru/Jupiter
     if tobh >= srh and tobh < srh+dlinc:  # 1st part of day
@@ -523,7 +603,8 @@ def _masa_bala(jd,place):
     day = drik.vaara(jd)
     abp[day] = 30
     return abp
-def _vaaradhipathi(jd,place):
+def _vaaradhipathi(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     abp = [0 for _ in range(7)]
     _abda_weekdays = [2,3,4,5,6,0,1]
     ay,am,ad,bth = utils.jd_to_gregorian(jd)
@@ -531,24 +612,26 @@ def _vaaradhipathi(jd,place):
     _ahargana_days = _days_elapsed_since_base(ay-1, base_year=1827, base_days=244)+elpased_days_in_year
     #_ahargana_days = _days_elapsed_since_base(ay-1)+elpased_days_in_year if vaaradhipathi_method==1 \
     #                    else _days_elapsed_since_base(ay-1, base_year=1827, base_days=244)+elpased_days_in_year
-    if bth < drik.sunrise(jd, place)[0]: _ahargana_days -= 1
+    if bth < ctx.sunrise(): _ahargana_days -= 1
     day = int(_ahargana_days)%7 # Add 1 get 1st day of the next kali year
     abp[_abda_weekdays[day]] = 45
     return abp
-def _vaara_bala(jd,place):
+def _vaara_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     abp = [0 for _ in range(7)]
-    day = drik.vaara(jd)
-    _,_,_,tobh = utils.jd_to_gregorian(jd)
-    srise = drik.sunrise(jd, place)[0]
+    day = ctx.vaara()
+    tobh = ctx.time_of_birth()
+    srise = ctx.sunrise()
     if tobh < srise:
         day = (day-1)%7
     abp[day] = 45
     return abp
-def _hora_bala(jd,place):
+def _hora_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     abp = [0 for _ in range(7)]
-    day = drik.vaara(jd)
-    _,_,_,tobh = utils.jd_to_gregorian(jd)
-    srise = drik.sunrise(jd, place)[0]
+    day = ctx.vaara()
+    tobh = ctx.time_of_birth()
+    srise = ctx.sunrise()
     if tobh < srise:
         day = (day-1)%7
         tobh += 24.0
@@ -556,17 +639,19 @@ def _hora_bala(jd,place):
     hora = (int(tobh-srise)+day+1)%7
     abp[hora_order[hora]] = 60
     return abp
-def _ayana_bala(jd,place):
-    _declinations = drik.declination_of_planets(jd, place)
+def _ayana_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
+    _declinations = ctx.declination_of_planets()
     ab = [0 for _ in range(7)]
     for p in range(7):
         ab[p] = round((24.0 + _declinations[p])*1.25,2)
         if p==0:
             ab[p] *= 2
     return ab
-def _yuddha_bala(jd,place):
+def _yuddha_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     yb = [0 for _ in range(7)]
-    pp = drik.dhasavarga(jd, place, divisional_chart_factor=1)[:7]
+    pp = ctx.dhasavarga()[:7]
     p_longs = [h*30+long for _,(h,long) in pp]
     p_longs_copy = p_longs[:]
     ce = sorted(utils.closest_elements(p_longs, p_longs))
@@ -574,12 +659,12 @@ def _yuddha_bala(jd,place):
     if any([sm==i for sm in [0,1] for i in indices]):
         return yb # All Zero
     # Find Sum of balas upto hora bala
-    sb = _sthana_bala(jd, place)
-    dgb = _dig_bala(jd,place)
-    nb = _nathonnath_bala(jd, place)
-    pb = _paksha_bala(jd,place)
-    tb = _tribhaga_bala(jd, place)
-    hb = _hora_bala(jd, place)
+    sb = _sthana_bala(jd, place,context=ctx)
+    dgb = _dig_bala(jd,place,context=ctx)
+    nb = _nathonnath_bala(jd, place,context=ctx)
+    pb = _paksha_bala(jd,place,context=ctx)
+    tb = _tribhaga_bala(jd, place,context=ctx)
+    hb = _hora_bala(jd, place,context=ctx)
     bala_totals = [0 for _ in range(7)]
     for i in indices:
         bala_totals[i] += sb[i]
@@ -593,17 +678,18 @@ def _yuddha_bala(jd,place):
     y_bala = round(b_diff/dia_diff,2)
     yb[indices[0]] =  y_bala ; yb[indices[1]] =  -y_bala
     return yb
-def _kaala_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def _kaala_bala(jd,place,ayanamsa_mode=None,context=None):
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
     kb = [0 for _ in range(7)]
-    nb = _nathonnath_bala(jd, place)
-    pb = _paksha_bala(jd, place,ayanamsa_mode=ayanamsa_mode)
-    tb = _tribhaga_bala(jd, place)
+    nb = _nathonnath_bala(jd, place,context=ctx)
+    pb = _paksha_bala(jd, place,ayanamsa_mode=ayanamsa_mode,context=ctx)
+    tb = _tribhaga_bala(jd, place,context=ctx)
     ab = _abdadhipathi(jd,place)# _abda_bala(jd, place)
     mb = _masadhipathi(jd, place) # _masa_bala(jd, place)
-    vb = _vaaradhipathi(jd, place) # _vaara_bala(jd, place)
-    hb = _hora_bala(jd, place)
-    ayb = _ayana_bala(jd, place)
-    yb = _yuddha_bala(jd, place)
+    vb = _vaaradhipathi(jd, place,context=ctx) # _vaara_bala(jd, place)
+    hb = _hora_bala(jd, place,context=ctx)
+    ayb = _ayana_bala(jd, place,context=ctx)
+    yb = _yuddha_bala(jd, place,context=ctx)
     for p in range(7):
         kb[p] += nb[p]
         kb[p] += pb[p]
@@ -616,8 +702,9 @@ def _kaala_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
         kb[p] += yb[p]
     kb = [round(kbp,2) for kbp in kb]
     return kb
-def _ishta_phala(jd,place):
-    planet_positions = charts.rasi_chart(jd, place)
+def _ishta_phala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
+    planet_positions = ctx.rasi_chart()
     ip_score = {const._ADHIMITRA_GREATFRIEND:22,
                 const._MITHRA_FRIEND:15,const._SAMAM_NEUTRAL:8,const._ADHISATHRU_GREATENEMY:4,
                 const._SATHRU_ENEMY:2}
@@ -751,13 +838,14 @@ def planet_aspect_relationship_table(planet_positions,include_houses=False):
     import numpy as np
     dk = np.array(dk).T
     return dk.tolist()
-def _drik_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def _drik_bala(jd,place,ayanamsa_mode=None,context=None):
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
     dk = [[ 0 for _ in range(7)] for _ in range(7)]
-    pp = charts.rasi_chart(jd, place,ayanamsa_mode=ayanamsa_mode)
+    pp = ctx.rasi_chart(ayanamsa_mode)
     #planets_with_mercury = [p for p,(h,_) in pp[1:] if h==pp[4][1][0] and p != 3]
-    _tithi = drik.tithi(jd, place)[0]; waxing_moon = _tithi <= 15
+    _tithi = ctx.tithi(); waxing_moon = _tithi <= 15
     pp = pp[1:-2]
-    subha_grahas,asubha_grahas = charts.benefics_and_malefics(jd, place,ayanamsa_mode=ayanamsa_mode,exclude_rahu_ketu=True)
+    subha_grahas,asubha_grahas = ctx.benefics_and_malefics(ayanamsa_mode)
     #print(subha_grahas,asubha_grahas)
     for p1 in range(7): # Aspected Planet
         p1_long = pp[p1][1][0]*30+pp[p1][1][1]
@@ -779,24 +867,35 @@ def _drik_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
             dk_final[col] = round((dkp[col] - dkm[col])/4,2) 
     #print('drik bala values',dk_final)
     return dk_final
-def shad_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+def shad_bala(jd,place,ayanamsa_mode=None,context=None):
+    """
+        Computes shad bala
+        @param context: StrengthContext of the chart - to share charts, sunrise etc with other balas. Default: new
+        @return: [sthana, kaala, dig, cheshta, naisargika, drik, total, total in rupas, strength]
+    """
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
+    sb = ctx.value(('shad_bala',ayanamsa_mode),lambda: __shad_bala(ctx, ayanamsa_mode))
+    drik.set_ayanamsa_mode(ctx.ayanamsa_mode) # leave drik in the mode of the chart - as the chart functions do
+    return sb
+def __shad_bala(ctx,ayanamsa_mode):
+    jd = ctx.jd; place = ctx.place
     sb = []
-    stb = _sthana_bala(jd, place,ayanamsa_mode=ayanamsa_mode)
+    stb = _sthana_bala(jd, place,ayanamsa_mode=ayanamsa_mode,context=ctx)
     #print('_sthana_bala',stb)
     sb.append(stb)
-    kb = _kaala_bala(jd, place,ayanamsa_mode=ayanamsa_mode)
+    kb = _kaala_bala(jd, place,ayanamsa_mode=ayanamsa_mode,context=ctx)
     #print('_kaala_bala',kb)
     sb.append(kb)
-    dgb = _dig_bala(jd, place,ayanamsa_mode=ayanamsa_mode)
+    dgb = _dig_bala(jd, place,ayanamsa_mode=ayanamsa_mode,context=ctx)
     #print('_dig_bala',dgb)
     sb.append(dgb)
-    cb = _cheshta_bala_new(jd, place,use_epoch_table=True)
+    cb = _cheshta_bala_new(jd, place,use_epoch_table=True,context=ctx)
     #print('_cheshta_bala',cb)
     sb.append(cb)
     nb = _naisargika_bala(jd, place)
     #print('_naisargika_bala',nb)
     sb.append(nb)
-    dkb = _drik_bala(jd, place,ayanamsa_mode=ayanamsa_mode)
+    dkb = _drik_bala(jd, place,ayanamsa_mode=ayanamsa_mode,context=ctx)
     #print('_drik_bala',dkb)
     sb.append(dkb)
     import numpy as np
@@ -806,19 +905,21 @@ def shad_bala(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
     sb_req = [5,6,5,7,6.5,5.5,5]
     sb_strength = [round(sb_rupa[p]/sb_req[p],2) for p in range(7)]
     return [stb, kb, dgb, cb, nb, dkb, sb_sum, sb_rupa,sb_strength]
-def _bhava_adhipathi_bala(jd,place):
-    bhava_pp = charts.bhava_chart_houses(jd, place)
+def _bhava_adhipathi_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, drik.active_ayanamsa_mode(), context)
+    bhava_pp = ctx.bhava_chart_houses()
     asc_rasi = bhava_pp[const._ascendant_symbol][0]
     bb = []
-    sb_sum = shad_bala(jd, place)[6]
+    sb_sum = shad_bala(jd, place,context=ctx)[6]
     for h in range(12):
         r = (h+asc_rasi)%12
         owner = const.house_owners[r]
         bb.append(sb_sum[owner])
     return bb
-def _bhava_dig_bala(jd,place):
+def _bhava_dig_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     bdb = [0 for _ in range(12)]
-    bm = drik.bhaava_madhya(jd, place)
+    bm = ctx.bhaava_madhya()
     brl = {0:const.nara_rasi_longitudes,3:const.jalachara_rasi_longitudes,9:const.chatushpada_rasis,6:const.keeta_rasis}
     chk = []
     for k,v in brl.items():
@@ -858,12 +959,13 @@ def __bhava_drik_bala_calc_1(dk_p1_p2,p1):
     if p1 not in [3,4]:
         dk_p1_p2_new = round(dk_p1_p2_new*0.25,2)
     return dk_p1_p2_new
-def bhava_drishti_bala(jd,place):
+def bhava_drishti_bala(jd,place,context=None):
     """ TODO: Check if Bhava Drishi bala is same as Aspect Relationship Table??? """
-    return _bhava_drik_bala(jd, place)
-def _bhava_drik_bala(jd,place):
+    return _bhava_drik_bala(jd, place,context=context)
+def _bhava_drik_bala(jd,place,context=None):
+    ctx = _strength_context(jd, place, None, context)
     dk = [[ 0 for _ in range(7)] for _ in range(12)]
-    pp = charts.rasi_chart(jd, place)
+    pp = ctx.rasi_chart()
     house_planet_dict = utils.get_house_planet_list_from_planet_positions(pp)
     pp = pp[1:-2]
     subha_grahas = [1,3,4,5] ; asubha_grahas = [0,2,6]
@@ -884,7 +986,7 @@ def _bhava_drik_bala(jd,place):
     for planet in range(7):
         planet_house_aspects[planet] = sorted(list(set(ghp[planet]+rhp[planet])))
         planet_house_aspects[planet] = [int(p) for p in planet_house_aspects[planet] if p not in [const._ascendant_symbol,'7','8']]
-    bm = drik.bhaava_madhya(jd, place)
+    bm = ctx.bhaava_madhya()
     for h in range(12): # Aspected Planet
         h_mid = bm[h]
         for p in range(7): # Aspecting Planet
@@ -905,19 +1007,50 @@ def _bhava_drik_bala(jd,place):
                 dkm[row] += dk[row][col]
             dk_final[row] = round((dkp[row] - dkm[row])/4,2) 
     return dk_final
-def bhava_bala(jd,place):
+def bhava_bala(jd,place,context=None):
     """
         Computes bhava bala
+        @param context: StrengthContext of the chart (default ayanamsa mode) - to reuse the shad bala. Default: new
         Returns bhava bala as list of bhava bala followed by list of bhava bala in rupas
     """
-    bab = _bhava_adhipathi_bala(jd, place)
-    bdb = _bhava_dig_bala(jd, place)
-    bdrb = _bhava_drik_bala(jd, place)
+    ctx = _strength_context(jd, place, drik.active_ayanamsa_mode(), context)
+    bab = _bhava_adhipathi_bala(jd, place,context=ctx)
+    bdb = _bhava_dig_bala(jd, place,context=ctx)
+    bdrb = _bhava_drik_bala(jd, place,context=ctx)
     bb = list(map(sum,zip(*[bab,bdb,bdrb])))
     bb = [round(b,2) for b in bb]
     bb_rupas = [round(b/60,2) for b in bb]
     bb_strength = [round(b/const.minimum_bhava_bala_rupa,2) for b in bb_rupas]
     return [bb,bb_rupas,bb_strength]
+_varga_groups = {'dhasavarga':(const.dhasavarga_amsa_vimsopaka,const.dhasavarga_amsa_vaiseshikamsa),
+                 'shadvarga':(const.shadvarga_amsa_vimsopaka,const.shadvarga_amsa_vaiseshikamsa),
+                 'sapthavarga':(const.sapthavarga_amsa_vimsopaka,const.sapthavarga_amsa_vaiseshikamsa),
+                 'shodhasavarga':(const.shodhasa_varga_amsa_vimsopaka,const.shodhasa_varga_amsa_vaiseshikamsa)}
+def all_balas(jd,place,ayanamsa_mode=None,context=None):
+    """
+        Shad bala, bhava bala, vimsopaka bala and vaiseshikamsa bala of a chart in one pass
+        Charts, sunrise/sunset etc are evaluated once (StrengthContext) and shared by all the balas
+        @param jd: Julian Day Number
+        @param place: drik.Place struct: Place('place_name',latitude, longitude, timezone)
+        @param ayanamsa_mode: Default: None => mode of the active calculation context (bhava bala always uses that mode)
+        @param context: StrengthContext of the chart. Default: new
+        @return: {'shad_bala': shad_bala(), 'bhava_bala': bhava_bala(),
+                  'vimsopaka_bala': {varga_group:{planet:[count,charts,score]}},
+                  'vaiseshikamsa_bala': {varga_group:{planet:[count,charts,score]}}}
+            varga_group: dhasavarga, shadvarga, sapthavarga, shodhasavarga - as charts.vimsopaka_xxx_of_planets
+    """
+    ctx = _strength_context(jd, place, ayanamsa_mode, context)
+    sb = shad_bala(jd, place, ayanamsa_mode=ayanamsa_mode, context=ctx)
+    bb = bhava_bala(jd, place, context=ctx)
+    rasi_planet_positions = ctx.rasi_chart(ayanamsa_mode)
+    vimsopaka = {}; vaiseshikamsa = {}
+    for group,(amsa_vimsopaka,amsa_vaiseshikamsa) in _varga_groups.items():
+        vimsopaka[group] = charts._vimsopaka_bala_of_planets(jd, place, ctx.ayanamsa_mode, amsa_vimsopaka,
+                                                             rasi_planet_positions=rasi_planet_positions)
+        vaiseshikamsa[group] = charts._vaiseshikamsa_bala_of_planets(jd, place, ctx.ayanamsa_mode, amsa_vaiseshikamsa,
+                                                                     rasi_planet_positions=rasi_planet_positions)
+    drik.set_ayanamsa_mode(ctx.ayanamsa_mode)
+    return {'shad_bala':sb, 'bhava_bala':bb, 'vimsopaka_bala':vimsopaka, 'vaiseshikamsa_bala':vaiseshikamsa}
 def get_planet_mean_longitude_using_epoch_table(jd,place,planet_index=0):
     if planet_index == 1: return 0.0
     days_from_epoch = _DAYS_FROM_EPOCH(jd,place); year_jd = utils.jd_to_gregorian(jd)[0]
@@ -977,8 +1110,9 @@ def get_planet_mean_longitude(jd,place,planet_index=0):
                                     _planet_longitude_correction) % 360
     #print(days_from_epoch,planet_mean_positions_at_epoch_ujjain_1900[planet_index],_planet_longitude_correction,planet_speed_at_epoch,planet_mean_position_at_jd)
     return planet_mean_position_at_jd
-def _cheshta_bala_new(jd,place,use_epoch_table=False):
-    pp = drik.dhasavarga(jd, place, divisional_chart_factor=1)
+def _cheshta_bala_new(jd,place,use_epoch_table=False,context=None):
+    ctx = _strength_context(jd, place, None, context)
+    pp = ctx.dhasavarga()
     cb = [0 for _ in range(7)]
     sun_mean_long = get_planet_mean_longitude(jd, place, const._SUN)
     for p in [const._MARS, const._MERCURY, const._JUPITER, const._VENUS, const._SATURN]: #range(2,7):
@@ -65,29 +65,12 @@ def get_yoga_details_for_all_charts(jd,place,language='en',divisional_chart_fact
         @return: returns a 2D List of yoga_name, yoga_details
             yoga_name in language
             yoga_details: [chart_ID, yoga_name, yoga_desription, yoga_benfits] 
+        NOTE: Evaluated by yoga_engine from one chart matrix of all the varga charts
     """
-    global p_to_h_navamsa, h_to_p_navamsa, asc_house_navamsa,planet_positions
-    msgs = get_yoga_resources(language=language)
-    yoga_results_combined = {}
-    ascendant_index = const._ascendant_symbol
-    planet_positions_navamsa = drik.dhasavarga(jd,place,divisional_chart_factor=9)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house_navamsa,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor=9)
-    planet_positions_navamsa += [[ascendant_index,(asc_house_navamsa,asc_long)]]
-    p_to_h_navamsa = utils.get_planet_house_dictionary_from_planet_positions(planet_positions_navamsa)
-    h_to_p_navamsa = utils.get_house_planet_list_from_planet_positions(planet_positions_navamsa)
-    if divisional_chart_factor==None:
-        for dv in division_chart_factors:
-            yoga_results,_,_ = get_yoga_details(jd,place,divisional_chart_factor=dv,language=language)
-            yoga_results.update(yoga_results_combined)
-            yoga_results_combined = yoga_results
-    else:
-        yoga_results,_,_ = get_yoga_details(jd,place,divisional_chart_factor=divisional_chart_factor,language=language)
-        yoga_results.update(yoga_results_combined)
-        yoga_results_combined = yoga_results
-        
-    #print('Found',len(yoga_results_combined),'out of',len(msgs)*len(division_chart_factors),'yogas')
-    return yoga_results_combined,len(yoga_results_combined),len(msgs)*len(division_chart_factors)
+    from jhora.horoscope.chart import yoga_engine
+    dvfs = division_chart_factors if divisional_chart_factor==None else [divisional_chart_factor]
+    matrix = yoga_engine.yoga_chart_matrix(jd, place, divisional_chart_factors=dvfs)
+    return yoga_engine.get_engine(language).yoga_details_for_all_charts(matrix)
 def get_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
     """
         Get all the yoga information that are present in the requested divisional charts for a given julian day and place
@@ -99,40 +82,9 @@ def get_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
             yoga_name in language
             yoga_details: [chart_ID, yoga_name, yoga_desription, yoga_benfits] 
     """
-    global p_to_h, h_to_p, asc_house, planet_positions
-    msgs = get_yoga_resources(language=language)
-    ascendant_index = const._ascendant_symbol
-    planet_positions = drik.dhasavarga(jd,place,divisional_chart_factor)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor)
-    planet_positions = [[ascendant_index,(asc_house,asc_long)]] + planet_positions
-    planet_positions = planet_positions[:const._pp_count_upto_ketu]
-    p_to_h = { p:h for p,(h,_) in planet_positions}
-    h_to_p = ['' for h in range(12)] 
-    for sublist in planet_positions:
-        p = sublist[0]
-        h = sublist[1][0]
-        h_to_p[h] += str(p) + '/'
-    yoga_results = {}
-    for yoga_function,details in msgs.items():
-        # Resolve function safely instead of eval for security/performance.
-        func_name = yoga_function + '_from_planet_positions'
-        fn = globals().get(func_name)
-        if not callable(fn):
-            continue
-        try:
-            yoga_exists = fn(planet_positions)
-        except Exception:
-            yoga_exists = False
-        if yoga_exists:
-            # Insert chart identifier at index 0 (mutating copy of list from msgs json)
-            try:
-                details.insert(0,'D'+str(divisional_chart_factor))
-            except Exception:
-                pass
-            yoga_results[yoga_function] = details
-    #print('Found',len(yoga_results),'out of',len(msgs),'yogas in D'+str(divisional_chart_factor),'chart')
-    return yoga_results,len(yoga_results),len(msgs)
+    from jhora.horoscope.chart import yoga_engine
+    matrix = yoga_engine.yoga_chart_matrix(jd, place, divisional_chart_factors=[divisional_chart_factor])
+    return yoga_engine.get_engine(language).yoga_details(matrix, divisional_chart_factor)
 """Type & safety helpers
 
 The original implementation performs many nested index lookups directly on
@@ -855,7 +807,7 @@ def _owner(planet_positions, house_index: int) -> int:
         return _as_int(house.house_owner_from_planet_positions(planet_positions, house_index))
     except Exception:
         return -1
-def kalpadruma_yoga_from_planet_positions(planet_positions):
+def kalpadruma_yoga_from_planet_positions(planet_positions,p_to_h_navamsa=None):
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     """ Kalpadruma Yoga: Consider (1) lagna lord, (2) his dispositor, (3) the latter’s
         dispositor in rasi and (4) in navamsa. If all the four planets are all in quadrants, trines
@@ -875,7 +827,7 @@ def kalpadruma_yoga_from_planet_positions(planet_positions):
     lagna_lord = _as_int(house.house_owner_from_planet_positions(planet_positions,asc_house))
     depositor_1 = _as_int(house.house_owner_from_planet_positions(planet_positions,_planet_house(p_to_h, lagna_lord)))
     depositor_2 = _as_int(house.house_owner_from_planet_positions(planet_positions,_planet_house(p_to_h, depositor_1)))
-    p_to_h_navamsa = globals().get('p_to_h_navamsa', {})
+    p_to_h_navamsa = p_to_h_navamsa or {}
     if p_to_h_navamsa:
         try:
             depositor_3 = _as_int(house.house_owner_from_planet_positions(planet_positions,_planet_house(p_to_h_navamsa, depositor_1)))
@@ -951,7 +903,7 @@ def brahma_yoga_from_planet_positions(planet_positions):
     ly4_2 = p_to_h[3] in quadrants_of_the_house(_planet_house(p_to_h, tenth_lord))
     # BUGFIX: duplicated ly4_1 in OR; should combine ly4_1 or ly4_2
     return ly1 or (ly2 and ly3 and (ly4_1 or ly4_2))
-def vishnu_yoga_from_planet_positions(planet_positions):
+def vishnu_yoga_from_planet_positions(planet_positions,p_to_h_navamsa=None):
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     """ Vishnu Yoga: If (1) the 9th and 10th lords are in the 2nd house and (2) the lord of the
         sign occupied in navamsa by the 9th lord in rasi chart is also in the 2nd house """
@@ -962,7 +914,7 @@ def vishnu_yoga_from_planet_positions(planet_positions):
     vy1 = _planet_house(p_to_h, ninth_lord_in_rasi)==(asc_house+1)%12 and _planet_house(p_to_h, tenth_lord)==(asc_house+1)%12
     if not vy1:
         return False
-    navamsa_map = globals().get('p_to_h_navamsa', {})
+    navamsa_map = p_to_h_navamsa or {}
     if ninth_lord_in_rasi in navamsa_map:
         lord_of_ninth_in_navamsa = _as_int(house.house_owner_from_planet_positions(planet_positions, navamsa_map[ninth_lord_in_rasi]))
     else:
@@ -987,18 +939,18 @@ def trilochana_yoga_from_planet_positions(planet_positions):
     asc_house = p_to_h[const._ascendant_symbol]
     ty = p_to_h[1] in house.trines_of_the_raasi(p_to_h[0]) and p_to_h[2] in house.trines_of_the_raasi(p_to_h[0])
     return ty
-def gouri_yoga_from_planet_positions(planet_positions):
+def gouri_yoga_from_planet_positions(planet_positions,p_to_h_navamsa=None):
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     """ Gouri Yoga: If the lord of the sign occupied in navamsa by the 10th lord is exalted in
         the 10th house and lagna lord joins him """
     p_to_h = utils.get_planet_to_house_dict_from_chart(h_to_p)
     asc_house = p_to_h[const._ascendant_symbol]
-    asc_house_navamsa = globals().get('p_to_h_navamsa', {}).get(const._ascendant_symbol, asc_house)
+    asc_house_navamsa = (p_to_h_navamsa or {}).get(const._ascendant_symbol, asc_house)
     navamsa_lord = _as_int(house.house_owner_from_planet_positions(planet_positions,asc_house_navamsa))
     rasi_lord = _as_int(house.house_owner_from_planet_positions(planet_positions,asc_house))
     gy = _planet_house(p_to_h, rasi_lord) == (asc_house+9)%12 and _planet_house(p_to_h, navamsa_lord) == (asc_house+9)%12 and _hs(navamsa_lord, (asc_house+9)%12) > const._FRIEND 
     return gy
-def chandikaa_yoga_from_planet_positions(planet_positions):
+def chandikaa_yoga_from_planet_positions(planet_positions,p_to_h_navamsa=None):
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     """ Chandikaa Yoga: If (1) lagna is in a fixed sign aspected by 6th lord and (2) Sun
         joins the lords of the signs occupied in navamsa by 6th and 9th lords """
@@ -1010,7 +962,7 @@ def chandikaa_yoga_from_planet_positions(planet_positions):
     #cy1 = asc_house in const.fixed_signs and asc_house in house.aspected_rasis_of_the_planet(h_to_p, sixth_lord)
     cy1 = asc_house in const.fixed_signs and str(lagna_lord) in house.graha_drishti_of_the_planet(h_to_p, sixth_lord)
     #print('cy1',asc_house,const.fixed_signs,str(lagna_lord),house.graha_drishti_of_the_planet(h_to_p, sixth_lord))
-    navamsa_map = globals().get('p_to_h_navamsa', {})
+    navamsa_map = p_to_h_navamsa or {}
     if sixth_lord in navamsa_map:
         sixth_lord_owner_in_navamsa = _as_int(house.house_owner_from_planet_positions(planet_positions, navamsa_map[sixth_lord]))
     else:
@@ -1055,7 +1007,7 @@ def saarada_yoga_from_planet_positions(planet_positions):
     sy5 = p_to_h[2]==(asc_house+10)%12
     # BUGFIX: function previously returned None; return composite condition
     return sy1 and sy2 and sy3 and any(sy4) and sy5
-def bhaarathi_yoga_from_planet_positions(planet_positions):
+def bhaarathi_yoga_from_planet_positions(planet_positions,p_to_h_navamsa=None):
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
     """ Bhaarathi Yoga: If the lord of the sign occupied in navamsa by 2nd, 5th or 11th lord
         exalted and joins the 9th lord """
@@ -1065,7 +1017,7 @@ def bhaarathi_yoga_from_planet_positions(planet_positions):
     fifth_lord = _as_int(house.house_owner_from_planet_positions(planet_positions,(asc_house+4)%12))
     eleventh_lord = _as_int(house.house_owner_from_planet_positions(planet_positions,(asc_house+10)%12))
     ninth_lord = _as_int(house.house_owner_from_planet_positions(planet_positions,(asc_house+8)%12))
-    navamsa_map = globals().get('p_to_h_navamsa', {})
+    navamsa_map = p_to_h_navamsa or {}
     navamsa_lords = []
     for lord in [second_lord, fifth_lord, eleventh_lord]:
         if lord in navamsa_map:
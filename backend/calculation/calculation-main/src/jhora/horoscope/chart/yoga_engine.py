@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# pyright: ignore[reportArgumentType,reportCallIssue,reportGeneralTypeIssues]
+# -*- coding: UTF-8 -*-
+# Copyright (C) Open Astro Technologies, USA.
+# Modified by Sundar Sundaresan, USA. carnaticmusicguru2015@comcast.net
+# Downloaded from https://github.com/naturalstupid/PyJHora
+
+# This file is part of the "PyJHora" Python library
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+    Yoga engine - evaluates the yoga and raja yoga predicates of all divisional charts from one chart matrix
+
+    The planet longitudes and the ascendant are evaluated once and every varga of the yoga module
+    (drik.dasavarga_from_long) is derived from them in one vectorized step (yoga_chart_matrix).
+    Each chart row becomes a YogaChart holding the house of every planet and a bitmask of planets per house.
+    Nabhasa, Mahapurusha, Sankhya and similar yogas are compiled rules over those bitmasks (_RULES);
+    the other predicates of yoga.py / raja_yoga.py run unchanged on the chart's planet_positions.
+    Nothing is kept in module globals: YogaEngine instances are reentrant and charts can be evaluated
+    from several threads or processes.
+    Results are the same as yoga.get_yoga_details_for_all_charts / raja_yoga.get_raja_yoga_details_for_all_charts
+"""
+import copy
+import inspect
+import threading
+import numpy as np
+from jhora import const,utils
+from jhora.panchanga import drik
+from jhora.horoscope.chart import house, yoga, raja_yoga
+
+_L = 9 # bit / column of Lagna in YogaChart
+_ALL_PLANETS_MASK = (1 << 9) - 1
+_SEVEN_PLANETS = [*range(7)]
+_RULE, _PREDICATE, _NAVAMSA_PREDICATE = range(3)
+
+class YogaChartMatrix():
+    """
+        factors: divisional chart factors - one per row
+        planets: ['L',0,1,...] - Lagna followed by the active planets (outer planets if enabled)
+        signs: numpy int array of shape (len(factors),len(planets))
+        longitudes: numpy float array of the same shape - longitude within the raasi
+        navamsa: {planet:raasi} of the navamsa (D9) chart including Lagna - used by the yogas that refer to navamsa
+    """
+    def __init__(self,factors,planets,signs,longitudes,navamsa=None):
+        self.factors = list(factors)
+        self.planets = planets
+        self.signs = signs
+        self.longitudes = longitudes
+        self.navamsa = navamsa or {}
+    def planet_positions(self,divisional_chart_factor):
+        """ @return: [[planet,(raasi,longitude)],...] Lagna first - as used by yoga.get_yoga_details """
+        row = self.factors.index(divisional_chart_factor)
+        return [[p,(h,l)] for p,h,l in zip(self.planets,self.signs[row].tolist(),self.longitudes[row].tolist())]
+def dasavarga_from_longs(longitudes,divisional_chart_factors):
+    """
+        Vectorized drik.dasavarga_from_long
+        @param longitudes: sequence of longitudes
+        @param divisional_chart_factors: sequence of divisional chart factors
+        @return: (signs, longitudes within the raasi) numpy arrays of shape (len(factors),len(longitudes))
+    """
+    longs = np.asarray(longitudes,dtype=float)[None,:]
+    factors = np.asarray(divisional_chart_factors,dtype=float)[:,None]
+    one_pada = 360.0 / (12 * factors)
+    one_sign = 12.0 * one_pada
+    fraction_left = (longs / one_sign) % 1
+    signs = (fraction_left * 12).astype(int)
+    long_in_raasi = (longs - (signs*30)) % 30
+    wrap = (long_in_raasi+const.one_second_lontitude_in_degrees).astype(int) == 30
+    long_in_raasi = np.where(wrap,0.0,long_in_raasi)
+    signs = np.where(wrap,(signs+1)%12,signs)
+    return signs, long_in_raasi
+def yoga_chart_matrix(jd,place,divisional_chart_factors=None):
+    """
+        All divisional charts used by the yoga modules from a single ephemeris evaluation
+        @param jd: Julian day number
+        @param place: struct (plave name, latitude, longitude, timezone)
+        @param divisional_chart_factors: Default: const.division_chart_factors
+        @return: YogaChartMatrix
+    """
+    if divisional_chart_factors is None:
+        divisional_chart_factors = const.division_chart_factors
+    jd_utc = jd - place.timezone / 24.
+    planet_longitudes = drik.ephemeris_batch(jd_utc, drik.active_planet_list()).longitude[0].tolist()
+    ascendant_longitude = drik.ascendant(jd,place)[1]
+    all_longitudes = [ascendant_longitude]+planet_longitudes
+    signs, longitudes = dasavarga_from_longs(all_longitudes,divisional_chart_factors)
+    planets = [const._ascendant_symbol]+[*range(len(planet_longitudes))]
+    if 9 in divisional_chart_factors:
+        navamsa_signs = signs[list(divisional_chart_factors).index(9)]
+    else:
+        navamsa_signs = dasavarga_from_longs(all_longitudes,[9])[0][0]
+    navamsa = dict(zip(planets[1:]+planets[:1],navamsa_signs[1:].tolist()+navamsa_signs[:1].tolist()))
+    return YogaChartMatrix(divisional_chart_factors,planets,signs,longitudes,navamsa)
+
+class YogaChart():
+    """
+        One chart as used by the yoga predicates
+        houses[p]: raasi of planet p (0..8) and houses[9] of Lagna
+        masks[h]: bitmask of the planets in raasi h (bit p for planet p, bit 9 for Lagna)
+        occupied: bitmask of the raasis occupied by the nine planets (Lagna excluded)
+    """
+    __slots__ = ('planet_positions','houses','masks','occupied','asc')
+    def __init__(self,planet_positions):
+        self.planet_positions = planet_positions
+        houses = [0]*10; masks = [0]*12
+        for p,(h,_) in planet_positions:
+            bit = _L if p == const._ascendant_symbol else p
+            houses[bit] = h
+            masks[h] |= 1 << bit
+        self.houses = houses
+        self.masks = masks
+        self.occupied = 0
+        for p in range(9):
+            self.occupied |= 1 << houses[p]
+        self.asc = houses[_L]
+    def planets_in(self,houses):
+        """ bitmask of planets (and Lagna) in the given raasis """
+        m = 0
+        for h in houses:
+            m |= self.masks[h % 12]
+        return m
+
+def _mask(planets):
+    m = 0
+    for p in planets:
+        m |= 1 << p
+    return m
+def _houses_mask(houses):
+    m = 0
+    for h in houses:
+        m |= 1 << (h % 12)
+    return m
+_BENEFICS = _mask(const.natural_benefics)
+_MALEFICS = _mask(const.natural_malefics)
+_L_BIT = 1 << _L
+_count = lambda mask: bin(mask).count('1')
+
+def _other_than_in_house(c,from_planet,from_house,other_than_planet):
+    """ vesi/vosi/sunaphaa/anaphaa: the house has no other_than_planet and is not occupied by Lagna alone """
+    m = c.masks[(c.houses[from_planet]+from_house-1) % 12]
+    return not (m >> other_than_planet) & 1 and m != _L_BIT
+def _conjoined(c,p1,p2):
+    return c.houses[p1] == c.houses[p2]
+def _mahapurusha(c,planet,raasis):
+    h = c.houses[planet]
+    return h in raasis and (h - c.asc) % 3 == 0
+def _all_in(c,houses_from_lagna):
+    """ all nine planets are in the given houses (1=lagna) from lagna """
+    return c.occupied & ~_houses_mask([c.asc+h-1 for h in houses_from_lagna]) == 0
+def _occupy_exactly(c,houses_from_lagna):
+    return c.occupied == _houses_mask([c.asc+h-1 for h in houses_from_lagna])
+def _pair_count(c,planets_mask,houses_from_lagna):
+    return _count(c.planets_in([c.asc+h-1 for h in houses_from_lagna]) & planets_mask)
+def _distinct_houses_of_seven_planets(c):
+    return len(set(c.houses[p] for p in _SEVEN_PLANETS))
+
+""" Compiled rules - same result as <name>_from_planet_positions of yoga.py for the nine planets + Lagna """
+_RULES = {
+    'vesi_yoga': lambda c: _other_than_in_house(c,0,2,1),
+    'vosi_yoga': lambda c: _other_than_in_house(c,0,12,1),
+    'ubhayachara_yoga': lambda c: _other_than_in_house(c,0,2,1) and _other_than_in_house(c,0,12,1),
+    'nipuna_yoga': lambda c: _conjoined(c,0,3),
+    'budha_aaditya_yoga': lambda c: _conjoined(c,0,3),
+    'sunaphaa_yoga': lambda c: _other_than_in_house(c,1,2,0),
+    'anaphaa_yoga': lambda c: _other_than_in_house(c,1,12,0),
+    'duradhara_yoga': lambda c: _other_than_in_house(c,1,2,0) and _other_than_in_house(c,1,12,0),
+    'chandra_mangala_yoga': lambda c: _conjoined(c,1,2),
+    'ruchaka_yoga': lambda c: _mahapurusha(c,2,(0,7,9)),
+    'bhadra_yoga': lambda c: _mahapurusha(c,3,(2,5)),
+    'sasa_yoga': lambda c: _mahapurusha(c,6,(6,9,10)),
+    'maalavya_yoga': lambda c: _mahapurusha(c,5,(1,6,11)),
+    'hamsa_yoga': lambda c: _mahapurusha(c,4,(8,9,11)),
+    'rajju_yoga': lambda c: all(c.houses[p] in yoga.movable_signs for p in range(9)),
+    'musala_yoga': lambda c: all(c.houses[p] in yoga.fixed_signs for p in range(9)),
+    'nala_yoga': lambda c: all(c.houses[p] in yoga.dual_signs for p in range(9)),
+    'maalaa_yoga': lambda c: c.planets_in(house.quadrants_of_the_raasi(c.asc)) & _BENEFICS == _BENEFICS,
+    'sarpa_yoga': lambda c: _count(c.planets_in(house.quadrants_of_the_raasi(c.asc)) & _MALEFICS) > 2,
+    'gadaa_yoga': lambda c: any(_occupy_exactly(c,hs) for hs in [(1,4),(4,7),(7,10),(10,1)]),
+    'sakata_yoga': lambda c: _occupy_exactly(c,(1,7)),
+    'vihanga_yoga': lambda c: _occupy_exactly(c,(4,10)),
+    'sringaataka_yoga': lambda c: _occupy_exactly(c,(1,5,9)),
+    'hala_yoga': lambda c: any(_occupy_exactly(c,hs) for hs in [(2,6,10),(3,7,11),(4,8,12)]),
+    'vajra_yoga': lambda c: _pair_count(c,_BENEFICS,(1,7)) > 1 and _pair_count(c,_MALEFICS,(4,10)) > 1,
+    'yava_yoga': lambda c: _pair_count(c,_MALEFICS,(1,7)) > 1 and _pair_count(c,_BENEFICS,(4,10)) > 1,
+    'kamala_yoga': lambda c: _all_in(c,(1,4,7,10)),
+    'vaapi_yoga': lambda c: _all_in(c,(2,5,8,11)) or _all_in(c,(3,6,9,12)),
+    'yoopa_yoga': lambda c: _all_in(c,(1,2,3,4)),
+    'sara_yoga': lambda c: _all_in(c,(4,5,6,7)),
+    'sakti_yoga': lambda c: _all_in(c,(7,8,9,10)),
+    'danda_yoga': lambda c: _all_in(c,(10,11,12,13)),
+    'naukaa_yoga': lambda c: _all_in(c,[1+i for i in range(7)]),
+    'koota_yoga': lambda c: _all_in(c,[4+i for i in range(7)]),
+    'chatra_yoga': lambda c: _all_in(c,[7+i for i in range(7)]),
+    'chaapa_yoga': lambda c: _all_in(c,[10+i for i in range(7)]),
+    'ardha_chandra_yoga': lambda c: any(_all_in(c,[pa+i for i in range(7)]) for pa in [1,2,4,5,7,8,10,11]),
+    'chakra_yoga': lambda c: _all_in(c,(1,3,5,7,9,11)),
+    'samudra_yoga': lambda c: _all_in(c,(2,4,6,8,10,12)),
+    'veenaa_yoga': lambda c: _distinct_houses_of_seven_planets(c) == 7,
+    'daama_yoga': lambda c: _distinct_houses_of_seven_planets(c) == 6,
+    'paasa_yoga': lambda c: _distinct_houses_of_seven_planets(c) == 5,
+    'kedaara_yoga': lambda c: _distinct_houses_of_seven_planets(c) == 4,
+    'soola_yoga': lambda c: _distinct_houses_of_seven_planets(c) == 3,
+    'yuga_yoga': lambda c: _distinct_houses_of_seven_planets(c) == 2,
+    'gola_yoga': lambda c: _distinct_houses_of_seven_planets(c) == 1,
+    'subha_yoga': lambda c: _pair_count(c,_BENEFICS,(1,2,12)) > 0,
+    'asubha_yoga': lambda c: _pair_count(c,_MALEFICS,(1,2,12)) > 0,
+}
+
+_resources = {}
+_resources_lock = threading.Lock()
+def _language_resources(kind,language):
+    """ yoga / raja yoga resource json of the language - read once """
+    key = (kind,language)
+    with _resources_lock:
+        msgs = _resources.get(key)
+    if msgs is None:
+        msgs = yoga.get_yoga_resources(language) if kind == 'yoga' else raja_yoga.get_raja_yoga_resources(language)
+        with _resources_lock:
+            msgs = _resources.setdefault(key,msgs)
+    return msgs
+
+class YogaEngine():
+    """
+        Yoga and raja yoga evaluation for one language.
+        Predicates are resolved once: a compiled rule of _RULES when there is one, else the
+        <yoga>_from_planet_positions function of yoga.py (given the navamsa chart when it takes p_to_h_navamsa)
+        @param language: two letter language code (en, hi, ka, ta, te)
+        @param compiled: False to use the yoga.py predicates for all yogas (for verification)
+    """
+    def __init__(self,language='en',compiled=True):
+        self.language = language
+        self._yoga_msgs = _language_resources('yoga',language)
+        self._raja_yoga_msgs = _language_resources('raja_yoga',language)
+        self._yoga_predicates = []
+        for name in self._yoga_msgs:
+            rule = _RULES.get(name) if compiled else None
+            if rule is not None:
+                self._yoga_predicates.append((name,rule,_RULE))
+                continue
+            fn = getattr(yoga,name+'_from_planet_positions',None)
+            if callable(fn):
+                uses_navamsa = 'p_to_h_navamsa' in inspect.signature(fn).parameters
+                self._yoga_predicates.append((name,fn,_NAVAMSA_PREDICATE if uses_navamsa else _PREDICATE))
+        self._raja_yoga_predicates = [(name,fn) for name in self._raja_yoga_msgs
+                                      for fn in [getattr(raja_yoga,name+'_from_planet_positions',None)] if callable(fn)]
+    def yogas_of_chart(self,planet_positions,p_to_h_navamsa=None):
+        """
+            @param planet_positions: [[planet,(raasi,longitude)],...] Lagna first, planets up to Ketu
+            @param p_to_h_navamsa: {planet:raasi} of the navamsa chart (YogaChartMatrix.navamsa)
+            @return: names of the yogas present in the chart (in resource file order)
+        """
+        chart = YogaChart(planet_positions)
+        found = []
+        for name,predicate,kind in self._yoga_predicates:
+            try:
+                if kind == _RULE:
+                    exists = predicate(chart)
+                elif kind == _NAVAMSA_PREDICATE:
+                    exists = predicate(planet_positions,p_to_h_navamsa)
+                else:
+                    exists = predicate(planet_positions)
+            except Exception:
+                exists = False
+            if exists:
+                found.append(name)
+        return found
+    def raja_yogas_of_chart(self,planet_positions):
+        """
+            @param planet_positions: [[planet,(raasi,longitude)],...] planets first, Lagna last
+            @return: {raja_yoga_name: [[planet1,planet2],...]} raja yogas present and their planet pairs
+        """
+        pairs = raja_yoga.get_raja_yoga_pairs_from_planet_positions(planet_positions)
+        found = {}
+        if not pairs:
+            return found
+        for name,predicate in self._raja_yoga_predicates:
+            matched = [[p1,p2] for p1,p2 in pairs if predicate(planet_positions,p1,p2)]
+            if matched:
+                found[name] = matched
+        return found
+    def yoga_details(self,matrix,divisional_chart_factor):
+        """ Same as yoga.get_yoga_details for one row of the chart matrix """
+        planet_positions = matrix.planet_positions(divisional_chart_factor)[:const._pp_count_upto_ketu]
+        chart_id = 'D'+str(divisional_chart_factor)
+        results = {name:[chart_id]+copy.copy(self._yoga_msgs[name])
+                   for name in self.yogas_of_chart(planet_positions,matrix.navamsa)}
+        return results,len(results),len(self._yoga_msgs)
+    def raja_yoga_details(self,matrix,divisional_chart_factor,res=None):
+        """ Same as raja_yoga.get_raja_yoga_details for one row of the chart matrix """
+        rows = matrix.planet_positions(divisional_chart_factor)
+        planet_positions = rows[1:]+rows[:1]
+        res = utils.get_resource_messages() if res is None else res
+        results = {}
+        for name,pairs in self.raja_yogas_of_chart(planet_positions).items():
+            rp_str = ''.join(' '+'['+utils.PLANET_NAMES[p1]+'-'+utils.PLANET_NAMES[p2]+'] ' for p1,p2 in pairs)
+            details_str = 'D'+str(divisional_chart_factor)+'-'+res['raja_yoga_pairs']+rp_str
+            results[name] = [details_str]+copy.copy(self._raja_yoga_msgs[name])
+        return results,len(results),len(self._raja_yoga_msgs)
+    def _all_charts(self,details,matrix,total_per_chart):
+        combined = {}
+        for dvf in matrix.factors:
+            results,_,_ = details(matrix,dvf)
+            results.update(combined)
+            combined = results
+        return combined,len(combined),total_per_chart*len(const.division_chart_factors)
+    def yoga_details_for_all_charts(self,matrix):
+        """ Same as yoga.get_yoga_details_for_all_charts for the charts of the matrix """
+        return self._all_charts(self.yoga_details,matrix,len(self._yoga_msgs))
+    def raja_yoga_details_for_all_charts(self,matrix):
+        """ Same as raja_yoga.get_raja_yoga_details_for_all_charts for the charts of the matrix """
+        res = utils.get_resource_messages()
+        return self._all_charts(lambda m,dvf: self.raja_yoga_details(m,dvf,res),matrix,len(self._raja_yoga_msgs))
+
+_engines = {}
+def get_engine(language='en'):
+    """ @return: shared YogaEngine of the language """
+    engine = _engines.get(language)
+    if engine is None:
+        engine = _engines.setdefault(language,YogaEngine(language))
+    return engine
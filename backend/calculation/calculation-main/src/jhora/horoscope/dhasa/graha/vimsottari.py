@@ -22,6 +22,9 @@
 """
 Calculates Vimshottari (=120) Dasha-bhukthi-antara-sukshma-prana with 5 levels support
 """
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict as Dict
 from jhora import const,utils
 from jhora.panchanga import drik
@@ -285,6 +288,166 @@ def get_vimsottari_dhasa_bhukthi(jd,place,star_position_from_moon=1,use_tribhagi
                 dhasa_bukthi.append([dhasa_lord,date_str]) 
     return vim_bal,dhasa_bukthi
 
+_level_keys = ['antardasha','pratyantara','sookshma','prana']
+def _format_period_start(jd):
+    y, m, d, h = utils.jd_to_gregorian(jd)
+    return '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
+
+class VimsottariPeriodTable:
+    """
+        Vimsottari periods of one horoscope as flat arrays per level
+            level 0 = maha dhasa, 1 = antara (bhukthi), 2 = pratyantara, 3 = sookshma, 4 = prana
+        Level k holds 9**(k+1) periods in time order: lord ids in lords(k) and start julian days in starts(k).
+        The children of period i of level k are periods 9*i .. 9*i+8 of level k+1.
+        Levels are built on first use. Period lookups are binary searches on the start arrays and
+        dates are formatted only for the periods that are returned.
+    """
+    max_depth = 5
+    def __init__(self,maha_lords,maha_starts,antardhasa_option=1):
+        self.antardhasa_option = antardhasa_option
+        self._lords = [array('b',maha_lords)]
+        self._starts = [array('d',maha_starts)]
+        self.start = maha_starts[0]
+        self.end = maha_starts[-1] + vimsottari_dict[maha_lords[-1]] * year_duration
+        self._lock = threading.Lock()
+    def _ancestors(self,level,index):
+        """ lords of the period and of its ancestors, maha dhasa lord first """
+        return [self._lords[k][index // 9**(level-k)] for k in range(level+1)] if level < len(self._lords) else \
+            self._ancestors(level-1,index//9) + [None]
+    def _children(self,level,index,lords_path,start_date):
+        """ (lords, starts) of the 9 sub periods of the period at (level,index) whose lords (maha first) are lords_path
+            Same arithmetic as _vimsottari_bhukti/_antara/_pratyantara/... so the start dates match them """
+        maha_lord = lords_path[0]
+        if level == 0:
+            lord = maha_lord
+            if self.antardhasa_option in [3,4]:
+                lord = vimsottari_next_adhipati(lord, dir=1)
+            elif self.antardhasa_option in [5,6]:
+                lord = vimsottari_next_adhipati(lord, dir=-1)
+            dir = 1 if self.antardhasa_option in [1,3,5] else -1
+        else:
+            lord = lords_path[-1]; dir = 1
+        lords = []; starts = []
+        for _ in range(9):
+            lords.append(lord); starts.append(start_date)
+            if level == 0:
+                factor = vimsottari_dict[lord] * vimsottari_dict[maha_lord] / human_life_span_for_vimsottari_dhasa
+            else:
+                factor = vimsottari_dict[lord]
+                for parent_lord in lords_path:
+                    factor *= (vimsottari_dict[parent_lord] / human_life_span_for_vimsottari_dhasa)
+            start_date += factor * year_duration
+            lord = vimsottari_next_adhipati(lord,dir)
+        return lords, starts
+    def _build(self,level):
+        """ Build all levels up to `level` """
+        with self._lock:
+            while len(self._lords) <= level:
+                parent = len(self._lords)-1
+                lords = array('b'); starts = array('d')
+                for i in range(len(self._lords[parent])):
+                    path = [self._lords[k][i // 9**(parent-k)] for k in range(parent+1)]
+                    l, s = self._children(parent,i,path,self._starts[parent][i])
+                    lords.extend(l); starts.extend(s)
+                self._starts.append(starts); self._lords.append(lords)
+    def _check_level(self,level):
+        if level < 0 or level >= self.max_depth:
+            raise ValueError("level must be between 0 and "+str(self.max_depth-1))
+        if level >= len(self._lords):
+            self._build(level)
+    def lords(self,level=0):
+        """ @return: array of lord ids of all periods of the level in time order """
+        self._check_level(level)
+        return self._lords[level]
+    def starts(self,level=0):
+        """ @return: array of start julian days of all periods of the level """
+        self._check_level(level)
+        return self._starts[level]
+    def period(self,level,index):
+        """ @return: (lord, start_jd, end_jd) of the period """
+        starts = self.starts(level)
+        end = starts[index+1] if index+1 < len(starts) else self.end
+        return self._lords[level][index], starts[index], end
+    def period_index(self,jd,level=0):
+        """ @return: index of the period of the level running at julian day jd. None if jd is outside the 120 year cycle """
+        if jd < self.start or jd >= self.end:
+            return None
+        return bisect_right(self.starts(level),jd)-1
+    def periods_at(self,jd,depth=3):
+        """
+            @param jd: julian day
+            @param depth: number of levels 1..5 (3 = maha, antara and pratyantara)
+            @return: list of (lord, start_jd, end_jd) one per level running at julian day jd. [] if jd is outside the cycle
+            Only the sub periods along the path are computed when a level is not built yet
+        """
+        index = self.period_index(jd,0)
+        if index is None:
+            return []
+        result = [self.period(0,index)]
+        path = [result[0][0]]
+        for level in range(1,min(depth,self.max_depth)):
+            parent_start, parent_end = result[-1][1], result[-1][2]
+            if level < len(self._lords):
+                index = bisect_right(self._starts[level],jd,9*index,9*index+9)-1
+                lord, start, end = self.period(level,index)
+            else:
+                lords, starts = self._children(level-1,index,path,parent_start)
+                i = bisect_right(starts,jd)-1
+                index = 9*index+i
+                lord, start = lords[i], starts[i]
+                end = starts[i+1] if i < 8 else parent_end
+            result.append((lord,start,end)); path.append(lord)
+        return result
+    def periods_between(self,jd_from,jd_to,level=0):
+        """ @return: indices of the periods of the level that overlap [jd_from, jd_to) """
+        starts = self.starts(level)
+        first = max(bisect_right(starts,jd_from)-1,0)
+        last = bisect_left(starts,jd_to)
+        return range(first,last)
+    def to_nested(self,depth=2,limit=None):
+        """
+            @param depth: 1..5 levels
+            @param limit: number of maha dhasas to return (Default: all 9)
+            @return: same nested list of {'lord','start',<sub level key>:[...]} as get_vimsottari_dhasa_levels
+        """
+        if depth < 1 or depth > self.max_depth:
+            raise ValueError("Depth must be between 1 and 5")
+        self._check_level(depth-1)
+        def _entry(level,index):
+            entry = {'lord':self._lords[level][index], 'start':_format_period_start(self._starts[level][index])}
+            if level+1 < depth:
+                entry[_level_keys[level]] = [_entry(level+1,c) for c in range(9*index,9*index+9)]
+            return entry
+        count = len(self._lords[0]) if limit is None else min(max(int(limit),0),len(self._lords[0]))
+        return [_entry(0,i) for i in range(count)]
+
+""" Memo of period tables keyed by birth jd, place, ayanamsa and dhasa options """
+_PERIOD_TABLE_MEMO_SIZE = 256
+_period_table_memo = Dict()
+_period_table_lock = threading.Lock()
+def vimsottari_period_table(jd,place,antardhasa_option=1,**kwargs):
+    """
+        @param jd: Julian day for birthdate and birth time
+        @param place: Place as tuple (place name, latitude, longitude, timezone)
+        @param antardhasa_option: see get_vimsottari_dhasa_bhukthi (applies to the antara level)
+        @param kwargs: divisional_chart_factor, chart_method, star_position_from_moon, seed_star, dhasa_starting_planet
+        @return: VimsottariPeriodTable (shared; built once per horoscope and options)
+    """
+    key = (jd,tuple(place),drik._current_ayanamsa(use_default_mode=True),human_life_span_for_vimsottari_dhasa,
+           antardhasa_option,tuple(sorted(kwargs.items())))
+    with _period_table_lock:
+        table = _period_table_memo.get(key)
+        if table is not None:
+            _period_table_memo.move_to_end(key)
+            return table
+    dashas = vimsottari_mahadasa(jd, place, **kwargs)
+    table = VimsottariPeriodTable(list(dashas.keys()),list(dashas.values()),antardhasa_option=antardhasa_option)
+    with _period_table_lock:
+        table = _period_table_memo.setdefault(key,table)
+        if len(_period_table_memo) > _PERIOD_TABLE_MEMO_SIZE:
+            _period_table_memo.popitem(last=False)
+    return table
+
 def get_vimsottari_dhasa_levels(jd, place, depth=2, **kwargs):
     """
     Get Vimsottari Dasha with configurable depth (1-5 levels)
@@ -293,76 +456,7 @@ def get_vimsottari_dhasa_levels(jd, place, depth=2, **kwargs):
     """
     if depth < 1 or depth > 5:
         raise ValueError("Depth must be between 1 and 5")
-    
-    # Get mahadashas
-    dashas = vimsottari_mahadasa(jd, place, **kwargs)
-    result = []
-    
-    for maha_lord, maha_start in dashas.items():
-        y, m, d, h = utils.jd_to_gregorian(maha_start)
-        maha_entry = {
-            'lord': maha_lord,
-            'start': '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True),
-        }
-        
-        if depth >= 2:
-            # Add Antardashas
-            bhuktis = _vimsottari_bhukti(maha_lord, maha_start)
-            maha_entry['antardasha'] = []
-            
-            for bhukti_lord, bhukti_start in bhuktis.items():
-                y, m, d, h = utils.jd_to_gregorian(bhukti_start)
-                bhukti_entry = {
-                    'lord': bhukti_lord,
-                    'start': '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True),
-                }
-                
-                if depth >= 3:
-                    # Add Pratyantardashas
-                    antaras = _vimsottari_antara(maha_lord, bhukti_lord, bhukti_start)
-                    bhukti_entry['pratyantara'] = []
-                    
-                    for antara_lord, antara_start in antaras.items():
-                        y, m, d, h = utils.jd_to_gregorian(antara_start)
-                        antara_entry = {
-                            'lord': antara_lord,
-                            'start': '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True),
-                        }
-                        
-                        if depth >= 4:
-                            # Add Sookshmas
-                            pratyantaras = _vimsottari_pratyantara(maha_lord, bhukti_lord, antara_lord, antara_start)
-                            antara_entry['sookshma'] = []
-                            
-                            for pratyan_lord, pratyan_start in pratyantaras.items():
-                                y, m, d, h = utils.jd_to_gregorian(pratyan_start)
-                                pratyan_entry = {
-                                    'lord': pratyan_lord,
-                                    'start': '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True),
-                                }
-                                
-                                if depth >= 5:
-                                    # Add Pranas
-                                    sookshmas = _vimsottari_sookshma(maha_lord, bhukti_lord, antara_lord, pratyan_lord, pratyan_start)
-                                    pratyan_entry['prana'] = []
-                                    
-                                    for sookshma_lord, sookshma_start in sookshmas.items():
-                                        y, m, d, h = utils.jd_to_gregorian(sookshma_start)
-                                        sookshma_entry = {
-                                            'lord': sookshma_lord,
-                                            'start': '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True),
-                                        }
-                                        pratyan_entry['prana'].append(sookshma_entry)
-                                
-                                antara_entry['sookshma'].append(pratyan_entry)
-                        
-                        bhukti_entry['pratyantara'].append(antara_entry)
-                
-                maha_entry['antardasha'].append(bhukti_entry)
-        
-        result.append(maha_entry)
-    
-    return result
+    return vimsottari_period_table(jd, place, **kwargs).to_nested(depth)
 
 '------ main -----------'
 if __name__ == "__main__":
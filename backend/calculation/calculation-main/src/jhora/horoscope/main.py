@@ -121,6 +121,27 @@ class Horoscope():
         return utils.PLANET_NAMES,utils.PLANET_SHORT_NAMES
     def _get_raasi_list(self):
         return utils.RAASI_LIST,utils.RAASI_SHORT_LIST
+    def _get_rasi_positions(self,calculation_type='drik'):
+        """ Rasi chart of this horoscope - evaluated once and shared by all divisional charts """
+        key = (self.julian_day,self.ayanamsa_mode,self.years,self.months,self.sixty_hours,calculation_type,self.pravesha_type)
+        cache = self.__dict__.setdefault('_rasi_positions_cache',{})
+        if key not in cache:
+            place = drik.Place(self.place_name,self.latitude,self.longitude,self.timezone_offset)
+            cache[key] = charts.rasi_chart(self.julian_day, place, ayanamsa_mode=self.ayanamsa_mode,
+                                           years=self.years,months=self.months,sixty_hours=self.sixty_hours,
+                                           calculation_type=calculation_type,pravesha_type=self.pravesha_type)
+        return cache[key]
+    def get_varga_matrix(self,divisional_chart_factors=None,chart_methods=1,calculation_type='drik',
+                         base_rasi=None,count_from_end_of_sign=None):
+        """
+            All requested divisional charts of this horoscope from a single rasi chart evaluation
+            @param divisional_chart_factors: list of varga factors. Default: const.division_chart_factors
+            @param chart_methods: chart method for all factors or dict {divisional_chart_factor:chart_method}
+            @return: charts.VargaMatrix
+        """
+        return charts.varga_matrix_from_rasi_positions(self._get_rasi_positions(calculation_type),
+                    divisional_chart_factors, chart_methods, base_rasi=base_rasi,
+                    count_from_end_of_sign=count_from_end_of_sign)
     def _get_calendar_resource_strings(self):#, language='en'):
         list_file = _lang_path + 'list_values_'+self._language+'.txt'
         msg_file = _lang_path + 'msg_strings_'+self._language+'.txt'
@@ -333,11 +354,9 @@ class Horoscope():
                 dhasavarga_factor = const.division_chart_factors[chart_index]
         else:
             dhasavarga_factor = divisional_chart_factor
-        planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=self.ayanamsa_mode,
-                                            divisional_chart_factor=dhasavarga_factor,chart_method=chart_method,
-                                            years=self.years,months=self.months,sixty_hours=self.sixty_hours,
-                                            calculation_type='drik',pravesha_type=self.pravesha_type,
-                                            base_rasi=base_rasi,count_from_end_of_sign=count_from_end_of_sign)
+        planet_positions = self.get_varga_matrix([dhasavarga_factor],{dhasavarga_factor:chart_method},
+                                            calculation_type='drik',base_rasi=base_rasi,
+                                            count_from_end_of_sign=count_from_end_of_sign).chart(dhasavarga_factor)
         ascendant_navamsa = planet_positions[0][1]
         asc_house = ascendant_navamsa[0]
         #if dhasavarga_factor==9:
@@ -815,13 +834,11 @@ class Horoscope():
             horoscope_info[k]= utils.RAASI_LIST[v[0]] +' '+utils.to_dms(v[1],is_lat_long='plong')
         ## Dhasavarga Charts
         jd = self.julian_day  #V3.1.9
+        varga_matrix = self.get_varga_matrix(list(dhasavarga_dict.keys()),calculation_type=self.calculation_type)
         for dhasavarga_factor in dhasavarga_dict.keys():
             " planet_positions lost: [planet_id, planet_constellation, planet_longitude] " 
             chart_counter += 1
-            planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=self.ayanamsa_mode,
-                                                       divisional_chart_factor=dhasavarga_factor,
-                                                       years=self.years,months=self.months,sixty_hours=self.sixty_hours,
-                                                       calculation_type=self.calculation_type,pravesha_type=self.pravesha_type)
+            planet_positions = varga_matrix.chart(dhasavarga_factor)
             chara_karaka_dict = house.chara_karakas(planet_positions)
             ascendant_navamsa = planet_positions[0][1]
             asc_house = ascendant_navamsa[0]
@@ -1731,7 +1748,7 @@ class Horoscope():
             #print(key,value)
         _saham_menu_dict = {self.cal_key_list['saham_str']:_vl_chart}
         return _saham_menu_dict, _saham_info        
-def get_chara_karakas(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,years=1,months=1,sixty_hours=1,
+def get_chara_karakas(jd, place, ayanamsa_mode=None,years=1,months=1,sixty_hours=1,
                                             calculation_type='drik',pravesha_type=0):
     rasi_planet_positions = charts.rasi_chart(jd, place, ayanamsa_mode, years, months, sixty_hours, calculation_type, pravesha_type)
     return house.chara_karakas(rasi_planet_positions)
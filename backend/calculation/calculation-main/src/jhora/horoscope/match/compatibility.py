@@ -19,9 +19,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
+import csv
+import functools
 import string
 import numpy as np
-import pandas as pd 
 from jhora import const, utils
 # Column IDs in the match database
 _BOY_STAR_COL=0
@@ -592,20 +593,103 @@ def update_compatibility_database(method='North'):
                     #print(results, file=fp)
                     csv_writer.writerow(results)
     fp.close()
+_PAADHAM_COUNT = 27*4
+pada_index = lambda nakshatra_number,paadham_number: (nakshatra_number-1)*4+paadham_number-1
+""" (nakshatra number, paadham number) of the pada_index 0..107 """
+_pada_nakshatra = np.arange(_PAADHAM_COUNT)//4+1 ; _pada_paadham = np.arange(_PAADHAM_COUNT)%4+1
+class CompatibilityMatrix:
+    """
+        Ashtakoota results of all 108x108 (boy nakshatra-paadham, girl nakshatra-paadham) pairs of a method
+        Read once from the compatibility database (computed with Ashtakoota if the file does not exist)
+        table[pada_index(boy),pada_index(girl)] holds the columns _VARNA_COL.. of the database, which are
+        the values of Ashtakoota.compatibility_score() (booleans as 0/1)
+        @param method: 'North' or 'South'
+        @param db_file: compatibility database. Default: _DATABASE_FILE / _DATABASE_SOUTH_FILE
+    """
+    def __init__(self,method:str="North",db_file:str=None):
+        self.method = method
+        if db_file is None:
+            db_file = _DATABASE_SOUTH_FILE if 'south' in method.lower() else _DATABASE_FILE
+        if os.path.exists(db_file):
+            with open(db_file,encoding='utf-8') as fp:
+                rows = [row for row in csv.reader(fp) if row]
+        else:
+            rows = [[str(v) for v in [bn,bp,gn,gp]+Ashtakoota(bn,bp,gn,gp,method=method).compatibility_score()]
+                    for bn in range(1,28) for bp in range(1,5) for gn in range(1,28) for gp in range(1,5)]
+        values = np.array(rows)
+        # python type of each column - to return the same values as Ashtakoota/database
+        self.column_types = [bool if set(col) <= {'True','False'} else int if not any('.' in v for v in col) else float
+                             for col in values[:,_VARNA_COL:].T]
+        values[values=='True'] = '1' ; values[values=='False'] = '0'
+        keys = values[:,:_VARNA_COL].astype(int)
+        self.table = np.zeros((_PAADHAM_COUNT,_PAADHAM_COUNT,values.shape[1]-_VARNA_COL))
+        self.table[pada_index(keys[:,_BOY_STAR_COL],keys[:,_BOY_PAD_COL]),
+                   pada_index(keys[:,_GIRL_STAR_COL],keys[:,_GIRL_PAD_COL])] = values[:,_VARNA_COL:].astype(float)
+        self.table.flags.writeable = False
+        # views of the porutham components
+        self.ettu_porutham = self.table[:,:,:_SCORE_COL-_VARNA_COL]
+        self.score = self.table[:,:,_SCORE_COL-_VARNA_COL]
+        self.naalu_porutham = self.table[:,:,_MAHEN_COL-_VARNA_COL:] > 0
+    def _values(self,boy,girl,start_col=_VARNA_COL,end_col=None):
+        end_col = self.table.shape[2]+_VARNA_COL if end_col is None else end_col
+        return [t(v) for t,v in zip(self.column_types[start_col-_VARNA_COL:end_col-_VARNA_COL],
+                                    self.table[boy,girl,start_col-_VARNA_COL:end_col-_VARNA_COL])]
+    def compatibility_score(self,boy_nakshatra_number:int,boy_paadham_number:int,girl_nakshatra_number:int,girl_paadham_number:int):
+        """
+            Same as Ashtakoota(boy_nakshatra_number,...,method).compatibility_score() as an array lookup
+        """
+        return self._values(pada_index(boy_nakshatra_number,boy_paadham_number),
+                            pada_index(girl_nakshatra_number,girl_paadham_number))
+    def search(self,minimum_score,boy_nakshatra_number=None,boy_paadham_number=None,girl_nakshatra_number=None,
+               girl_paadham_number=None,naalu_porutham_checks=()):
+        """
+            (boy pada_index array, girl pada_index array) of the pairs with score >= minimum_score
+            Pairs are in the database order (boy nakshatra, boy paadham, girl nakshatra, girl paadham)
+            @param boy_nakshatra_number..girl_paadham_number: restrict the pairs to these. None = any
+            @param naalu_porutham_checks: column ids (_MAHEN_COL,_VEDHA_COL,_RAJJU_COL,_SHREE_COL) that must be True
+        """
+        mask = self.score >= minimum_score
+        boys = np.ones(_PAADHAM_COUNT,dtype=bool) ; girls = np.ones(_PAADHAM_COUNT,dtype=bool)
+        if boy_nakshatra_number is not None: boys &= _pada_nakshatra==boy_nakshatra_number
+        if boy_paadham_number is not None: boys &= _pada_paadham==boy_paadham_number
+        if girl_nakshatra_number is not None: girls &= _pada_nakshatra==girl_nakshatra_number
+        if girl_paadham_number is not None: girls &= _pada_paadham==girl_paadham_number
+        mask &= boys[:,None] & girls[None,:]
+        for col in naalu_porutham_checks:
+            mask &= self.table[:,:,col-_VARNA_COL] > 0
+        return np.nonzero(mask)
+    def rank(self,nakshatra_number:int,paadham_number:int,candidates,profile_is_boy:bool=True,minimum_score:float=None):
+        """
+            Rank candidate partners of one profile by compatibility score
+            @param nakshatra_number, paadham_number: birth star [1..27] and paadham [1..4] of the profile
+            @param candidates: list of (nakshatra_number, paadham_number) of the candidates
+            @param profile_is_boy: True if the profile is the boy (candidates are girls)
+            @param minimum_score: drop candidates scoring below this. Default: None (keep all)
+            @return [(position of candidate in candidates, score)] highest score first (ties in candidates order)
+        """
+        stars = np.asarray(candidates,dtype=int).reshape(-1,2)
+        if ((stars[:,0]<1) | (stars[:,0]>27) | (stars[:,1]<1) | (stars[:,1]>4)).any() or \
+                not (1 <= nakshatra_number <= 27 and 1 <= paadham_number <= 4):
+            raise ValueError('nakshatra number should be in [1..27] and paadham number in [1..4]')
+        profile = pada_index(nakshatra_number,paadham_number) ; others = pada_index(stars[:,0],stars[:,1])
+        scores = self.score[profile,others] if profile_is_boy else self.score[others,profile]
+        order = np.argsort(-scores,kind='stable')
+        if minimum_score is not None:
+            order = order[scores[order] >= minimum_score]
+        score_type = self.column_types[_SCORE_COL-_VARNA_COL]
+        return [(int(c),score_type(scores[c])) for c in order]
+@functools.lru_cache(maxsize=None)
+def compatibility_matrix(method:str="North"):
+    """ CompatibilityMatrix of the method - loaded once per process """
+    return CompatibilityMatrix('South' if 'south' in method.lower() else 'North')
 class Match:    
     def __init__(self,boy_nakshatra_number:int=None,boy_paadham_number:int=None,girl_nakshatra_number:int=None,girl_paadham_number:int=None, \
                  minimum_score:float=const.compatibility_minimum_score_north,check_for_mahendra_porutham:bool=False,check_for_vedha_porutham:bool=False,check_for_rajju_porutham:bool=False,\
                  check_for_shreedheerga_porutham:bool=False,method="North"):
-        db_file = _DATABASE_FILE
         self.minimum_score = minimum_score
         if 'south' in method.lower(): 
-            db_file = _DATABASE_SOUTH_FILE
             self.minimum_score = const.compatibility_minimum_score_south
-        if os.path.exists(db_file):
-            self.data_file = db_file
-        else:
-            Exception("database file:"+db_file+" not found.")
-        self.match_db=pd.read_csv(db_file,header=None,encoding='utf-8')
+        self.match_matrix = compatibility_matrix(method)
         self._gender = 'Female'
         self.boy_nakshatra_number = boy_nakshatra_number
         self.boy_paadham_number = boy_paadham_number
@@ -619,60 +703,44 @@ class Match:
     def get_matching_partners(self):
         boy_nak_given = self.boy_nakshatra_number != None and self.boy_nakshatra_number >=1 and self.boy_nakshatra_number <=27
         boy_pad_given = self.boy_paadham_number != None and self.boy_paadham_number >=1 and self.boy_paadham_number <=4
-        #boy_info_given = boy_nak_given or boy_pad_given 
         girl_nak_given = self.girl_nakshatra_number != None and self.girl_nakshatra_number >=1 and self.girl_nakshatra_number <=27
         girl_pad_given = self.girl_paadham_number != None and self.girl_paadham_number >=1 and self.girl_paadham_number<=4
-        #girl_info_given = girl_nak_given or girl_pad_given
-        #print(boy_nak_given,boy_pad_given,girl_nak_given,girl_pad_given,self.minimum_score,\
-        #      self.check_for_mahendra_porutham,self.check_for_vedha_porutham,self.check_for_rajju_porutham,self.check_for_shreedheerga_porutham)
-        search_criteria = (self.match_db[_SCORE_COL]>=self.minimum_score)
-        if boy_nak_given:
-            self._gender = 'Male'
-            search_criteria = search_criteria & (self.match_db[_BOY_STAR_COL]==self.boy_nakshatra_number)
-            if boy_pad_given:
-                search_criteria = search_criteria & (self.match_db[_BOY_PAD_COL]==self.boy_paadham_number)
-        if girl_nak_given:
-            self._gender = 'Female'
-            search_criteria = search_criteria & (self.match_db[_GIRL_STAR_COL]==self.girl_nakshatra_number)
-            if girl_pad_given:
-                search_criteria = search_criteria & (self.match_db[_GIRL_PAD_COL]==self.girl_paadham_number)
-        #print('search_results',self.match_db.index[search_criteria].tolist())
-        if self.check_for_mahendra_porutham==True:
-            search_criteria  = search_criteria & (self.match_db[_MAHEN_COL]==self.check_for_mahendra_porutham)
-            #print('mahen search_results',self.match_db.index[search_criteria].tolist())
-        if self.check_for_vedha_porutham==True:
-            search_criteria = search_criteria & (self.match_db[_VEDHA_COL]==self.check_for_vedha_porutham)
-            #print('vedha search_results',self.match_db.index[search_criteria].tolist())
-        if self.check_for_rajju_porutham==True:
-            search_criteria = search_criteria & (self.match_db[_RAJJU_COL]==self.check_for_rajju_porutham)
-            #print('rajju search_results',self.match_db.index[search_criteria].tolist())
-        if self.check_for_shreedheerga_porutham==True:
-            search_criteria = search_criteria & (self.match_db[_SHREE_COL]==self.check_for_shreedheerga_porutham)
-        temp_results = self.match_db.index[search_criteria].tolist()
-        #print('after shree dheerga temp_results',temp_results)
-        temp_partners = []
-        for n1 in temp_results:
-            if self._gender.lower()=='male':
-                p1 = self.match_db.iloc[n1][_GIRL_PAD_COL]
-                nak =  self.match_db.iloc[n1][_GIRL_STAR_COL]
-            else:
-                p1 = self.match_db.iloc[n1][_BOY_PAD_COL]
-                nak =  self.match_db.iloc[n1][_BOY_STAR_COL]
-            #if temp_partners and nak==temp_partners[-1][0]:
-            #    temp_partners[-1] = (temp_partners[-1][0],temp_partners[-1][1],p1,temp_partners[-1][3])
-            #else:
-            temp_partners.append((nak,p1,n1)) 
-        #print('temp_partners',temp_partners)
+        if boy_nak_given: self._gender = 'Male'
+        if girl_nak_given: self._gender = 'Female'
+        checks = [col for col,check in [(_MAHEN_COL,self.check_for_mahendra_porutham),(_VEDHA_COL,self.check_for_vedha_porutham),
+                                        (_RAJJU_COL,self.check_for_rajju_porutham),(_SHREE_COL,self.check_for_shreedheerga_porutham)]
+                  if check==True]
+        boys,girls = self.match_matrix.search(self.minimum_score,
+                            boy_nakshatra_number=self.boy_nakshatra_number if boy_nak_given else None,
+                            boy_paadham_number=self.boy_paadham_number if boy_nak_given and boy_pad_given else None,
+                            girl_nakshatra_number=self.girl_nakshatra_number if girl_nak_given else None,
+                            girl_paadham_number=self.girl_paadham_number if girl_nak_given and girl_pad_given else None,
+                            naalu_porutham_checks=checks)
+        partners = girls if self._gender.lower()=='male' else boys
         matching_partners = []
-        for nak,p1,idx in temp_partners:
-            ettu_porutham_results = list(self.match_db.iloc[idx][_VARNA_COL:_SCORE_COL])
-            compatibility_score = self.match_db.iloc[idx][_SCORE_COL]
-            naalu_porutham_results = list(self.match_db.iloc[idx][_MAHEN_COL:])
-            #print(nak,p1,naalu_porutham_results)
-            matching_partners.append((nak,p1,ettu_porutham_results,compatibility_score,naalu_porutham_results)) 
-        #print(len(matching_partners),' matching stars found for',self.boy_nakshatra_number,self.boy_paadham_number,self.girl_nakshatra_number,self.girl_paadham_number,\
-        #      self.check_for_mahendra_porutham,self.check_for_vedha_porutham,self.check_for_rajju_porutham,self.check_for_shreedheerga_porutham)
+        for b,g,p in zip(boys,girls,partners):
+            ettu_porutham_results = self.match_matrix._values(b,g,_VARNA_COL,_SCORE_COL)
+            compatibility_score = self.match_matrix._values(b,g,_SCORE_COL,_SCORE_COL+1)[0]
+            naalu_porutham_results = self.match_matrix._values(b,g,_MAHEN_COL)
+            matching_partners.append((int(_pada_nakshatra[p]),int(_pada_paadham[p]),ettu_porutham_results,
+                                      compatibility_score,naalu_porutham_results))
         return matching_partners
+    def rank_partners(self,candidates,minimum_score:float=None):
+        """
+            Rank candidate partners against the boy (if given) or else the girl of this match
+            @param candidates: list of (nakshatra_number, paadham_number) of the candidates
+            @param minimum_score: drop candidates scoring below this. Default: None (keep all)
+            @return [(position of candidate in candidates, score)] highest score first
+            @raise ValueError: if the nakshatra or paadham number of the profile is missing
+        """
+        profile_is_boy = self.boy_nakshatra_number is not None
+        if profile_is_boy:
+            nakshatra,paadham = self.boy_nakshatra_number,self.boy_paadham_number
+        else:
+            nakshatra,paadham = self.girl_nakshatra_number,self.girl_paadham_number
+        if nakshatra is None or paadham is None:
+            raise ValueError('ranking partners needs the nakshatra and paadham number of the '+('boy' if profile_is_boy else 'girl'))
+        return self.match_matrix.rank(nakshatra,paadham,candidates,profile_is_boy,minimum_score)
 if __name__ == "__main__":
     #m = Match(girl_nakshatra_number=15,girl_paadham_number=1,method='South')
     #print(m.get_matching_partners())
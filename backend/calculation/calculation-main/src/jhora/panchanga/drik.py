@@ -29,11 +29,14 @@
     Uses swiss ephemeris
 """
 from math import ceil
-from collections import namedtuple as struct
+from collections import namedtuple as struct, OrderedDict
+from contextlib import contextmanager
+import contextvars, threading
 import swisseph as swe
 from _datetime import datetime, timedelta
 from datetime import date
 import math, os, warnings
+import numpy as np
 from jhora import utils, const
 
 """ Since datetime does not accept BC year values Use the following stucture to represent dates """
@@ -62,6 +65,105 @@ def set_sideral_planets():
 #PLANET_NAMES= ['Suriyan', 'Chandran', 'Sevvay','Budhan','Viyaazhan','VeLLi','Sani','Raahu','Kethu','Uranus','Neptune']
 _ayanamsa_mode = const._DEFAULT_AYANAMSA_MODE
 _ayanamsa_value = None
+_classical_planet_list = [const._SUN, const._MOON, const._MARS, const._MERCURY, const._JUPITER,
+               const._VENUS, const._SATURN,const._RAHU,const._KETU]
+""" 
+    Swiss ephemeris keeps ephemeris path and sidereal mode per thread (thread local storage builds) or per process.
+    Every set_sid_mode + calc_ut/houses_ex pair is done while holding this lock so that concurrent threads using
+    different ayanamsa modes do not mix up results with either build. New threads get the ephemeris path once.
+    NOTE: This is the serialization that remains with calculation contexts. The ayanamsa mode itself is per context,
+        but swiss ephemeris only applies it through the global set_sid_mode, so the ephemeris calls of concurrent
+        contexts take turns (results are memoized per ayanamsa mode, see _ephemeris_row). Computing tropical
+        positions and subtracting the ayanamsa of the context would avoid the lock, but does not reproduce the
+        sidereal positions of swiss ephemeris (true/galactic modes, houses_ex) to the precision the tests expect.
+"""
+_ephemeris_lock = threading.RLock()
+_thread_state = threading.local()
+def _init_thread_ephemeris():
+    if not getattr(_thread_state,'ephe_path_set',False):
+        swe.set_ephe_path(const._ephe_path)
+        _thread_state.ephe_path_set = True
+_calculation_context = contextvars.ContextVar('jhora_calculation_context', default=None)
+class CalculationContext():
+    """
+        Per-request calculation settings used in place of the module level globals of drik/const
+        @param planet_list: swiss ephemeris planet ids (Default: sidereal planet list incl. outer planets if enabled)
+        @param ayanamsa_mode: ayanamsa mode. See const.available_ayanamsa_modes
+        @param ayanamsa_value: Need to be supplied only in case of 'SIDM_USER'
+        @param language: Two letter language code. en, hi, ka, ta, te
+            drik does not use it: resource strings (utils.set_language) are process-wide. api.service switches
+            them for the language of the context and runs requests in another than the base language one at a time.
+        @param bhava_madhya_method: See const.available_house_systems
+        NOTE: Activate the context with `with drik.calculation_context(ctx):` before calling any drik/charts functions.
+              Values changed by set_ayanamsa_mode are stored in the context and not in the module globals.
+              Functions called without ayanamsa_mode (None) use the mode of the context - see active_ayanamsa_mode.
+    """
+    def __init__(self,planet_list=None,ayanamsa_mode=None,ayanamsa_value=None,language=None,
+                 bhava_madhya_method=None):
+        self.planet_list = list(planet_list) if planet_list is not None else list(_sideral_planet_list)
+        self.ayanamsa_mode = ayanamsa_mode if ayanamsa_mode is not None else const._DEFAULT_AYANAMSA_MODE
+        self.ayanamsa_value = ayanamsa_value
+        self.language = language if language is not None else const._DEFAULT_LANGUAGE
+        self.bhava_madhya_method = bhava_madhya_method if bhava_madhya_method is not None else const.bhaava_madhya_method
+    @classmethod
+    def for_calculation_type(cls,calculation_type='drik',**kwargs):
+        """
+            Context with the planet list used for the calculation type
+            @param calculation_type: 'drik' or 'ss'. 'ss' (Surya Siddhantha) uses only Sun..Ketu 
+        """
+        if (calculation_type or 'drik').lower() == 'ss' or not const._INCLUDE_URANUS_TO_PLUTO:
+            return cls(planet_list=_classical_planet_list,**kwargs)
+        return cls(planet_list=_classical_planet_list+[swe.URANUS,swe.NEPTUNE,swe.PLUTO],**kwargs)
+    def copy(self):
+        return CalculationContext(self.planet_list,self.ayanamsa_mode,self.ayanamsa_value,self.language,
+                                  self.bhava_madhya_method)
+    def __repr__(self):
+        return 'CalculationContext(planet_list=%r, ayanamsa_mode=%r, ayanamsa_value=%r, language=%r, bhava_madhya_method=%r)' \
+                % (self.planet_list,self.ayanamsa_mode,self.ayanamsa_value,self.language,self.bhava_madhya_method)
+@contextmanager
+def calculation_context(context):
+    """
+        Make `context` the active calculation context of the current thread/task
+        @param context: CalculationContext instance
+    """
+    _init_thread_ephemeris()
+    token = _calculation_context.set(context)
+    try:
+        yield context
+    finally:
+        _calculation_context.reset(token)
+def set_calculation_context(context):
+    """
+        Make `context` the active calculation context for the remainder of the current thread/task
+        @param context: CalculationContext instance or None to use the module level globals
+        @return: token that can be passed to reset_calculation_context
+    """
+    _init_thread_ephemeris()
+    return _calculation_context.set(context)
+reset_calculation_context = lambda token: _calculation_context.reset(token)
+def get_calculation_context():
+    """ @return: active CalculationContext or None if module level globals are used """
+    return _calculation_context.get()
+def active_planet_list():
+    """ @return: planet list of the active calculation context or drik.planet_list """
+    ctx = _calculation_context.get()
+    return planet_list if ctx is None else ctx.planet_list
+def active_ayanamsa_mode(ayanamsa_mode=None):
+    """
+        Ayanamsa mode library functions use for their ayanamsa_mode=None default argument
+        @param ayanamsa_mode: mode passed by the caller. None => mode of the active calculation context
+        @return: ayanamsa_mode if not None else mode of the active calculation context or const._DEFAULT_AYANAMSA_MODE
+    """
+    if ayanamsa_mode is not None:
+        return ayanamsa_mode
+    ctx = _calculation_context.get()
+    return const._DEFAULT_AYANAMSA_MODE if ctx is None else ctx.ayanamsa_mode
+def _current_ayanamsa(use_default_mode=False):
+    """ @return: (ayanamsa_mode, ayanamsa_value) of the active calculation context or of the module globals """
+    ctx = _calculation_context.get()
+    if ctx is not None:
+        return ctx.ayanamsa_mode, ctx.ayanamsa_value
+    return (const._DEFAULT_AYANAMSA_MODE if use_default_mode else _ayanamsa_mode), _ayanamsa_value
 def _ayanamsa_surya_siddhantha_model(jd):
     maha_yuga_years = 4320000
     completed_maha_yuga_years = 3888000
@@ -106,18 +208,24 @@ def get_ayanamsa_value(jd):
     """
     global _ayanamsa_mode,_ayanamsa_value
     #print('Drik:get_ayanamsa_value',_ayanamsa_mode,_ayanamsa_value)
-    key = _ayanamsa_mode.lower()
+    ctx = _calculation_context.get()
+    ayanamsa_mode, ayanamsa_value = _current_ayanamsa()
+    key = ayanamsa_mode.lower()
     if key =='sidm_user' or key =='senthil' or key == 'sundar_ss':
         #print(key,'returning',_ayanamsa_value)
-        return _ayanamsa_value
-    else:
-        #set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd)
-        _ayanamsa_value = swe.get_ayanamsa(jd)
-        return _ayanamsa_value
-def set_ayanamsa_mode(ayanamsa_mode = const._DEFAULT_AYANAMSA_MODE,ayanamsa_value=None,jd=None):
+        return ayanamsa_value
+    if ctx is not None:
+        with _ephemeris_lock:
+            set_ayanamsa_mode(ayanamsa_mode,ayanamsa_value,jd)
+            ctx.ayanamsa_value = swe.get_ayanamsa(jd)
+        return ctx.ayanamsa_value
+    #set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd)
+    _ayanamsa_value = swe.get_ayanamsa(jd)
+    return _ayanamsa_value
+def set_ayanamsa_mode(ayanamsa_mode = None,ayanamsa_value=None,jd=None):
     """
         Set Ayanamsa mode
-        @param ayanamsa_mode - Default - Lahiri
+        @param ayanamsa_mode - Default: None => mode of the active calculation context or const._DEFAULT_AYANAMSA_MODE (Lahiri)
             Other possible values: 
             FAGAN, KP, RAMAN, USHASHASHI, YUKTESHWAR, SURYASIDDHANTA, SURYASIDDHANTA_MSUN,ARYABHATA,ARYABHATA_MSUN,
             SS_CITRA, TRUE_CITRA, TRUE_REVATI, SS_REVATI, SENTHIL, SUNDAR_SS, SIDM_USER
@@ -127,27 +235,44 @@ def set_ayanamsa_mode(ayanamsa_mode = const._DEFAULT_AYANAMSA_MODE,ayanamsa_valu
         @return None
     """
     global _ayanamsa_mode,_ayanamsa_value
+    ctx = _calculation_context.get()
+    if ayanamsa_mode is None:
+        # Not chosen by the caller: keep the mode (and value) of the active context or of the module globals
+        ayanamsa_mode, ayanamsa_value = _current_ayanamsa(use_default_mode=True)
     key = ayanamsa_mode.upper()
+    _value = _current_ayanamsa()[1]
     #print('panchanga setting',key,ayanamsa_value,jd)
-    if key in [am.upper() for am in const.available_ayanamsa_modes.keys()]:
-        if key == "SIDM_USER":
-            _ayanamsa_value = ayanamsa_value
-            swe.set_sid_mode(swe.SIDM_USER,ayanamsa_value)
-        elif key == "SENTHIL":
-            _ayanamsa_value = _calculate_ayanamsa_senthil_from_jd(jd)
-        elif key == "SUNDAR_SS":
-            _ayanamsa_value = _ayanamsa_surya_siddhantha_model(jd)
+    _init_thread_ephemeris()
+    with _ephemeris_lock:
+        if key in [am.upper() for am in const.available_ayanamsa_modes.keys()]:
+            if key == "SIDM_USER":
+                _value = ayanamsa_value
+                swe.set_sid_mode(swe.SIDM_USER,ayanamsa_value)
+            elif key == "SENTHIL":
+                _value = _calculate_ayanamsa_senthil_from_jd(jd)
+            elif key == "SUNDAR_SS":
+                _value = _ayanamsa_surya_siddhantha_model(jd)
+            else:
+                swe.set_sid_mode(const.available_ayanamsa_modes[key])
+            if ctx is not None and key in ["SENTHIL","SUNDAR_SS"]:
+                # Same sidereal mode as reset_ayanamsa_mode() leaves behind for these models
+                swe.set_sid_mode(swe.SIDM_LAHIRI)
         else:
-            swe.set_sid_mode(const.available_ayanamsa_modes[key])
-    else:
-        warnings.warn("Unsupported Ayanamsa mode:", ayanamsa_mode,const._DEFAULT_AYANAMSA_MODE+" Assumed")
-        ayanamsa_mode = const._DEFAULT_AYANAMSA_MODE
-        swe.set_sid_mode(const.available_ayanamsa_modes[const._DEFAULT_AYANAMSA_MODE] )#swe.SIDM_LAHIRI)
+            warnings.warn("Unsupported Ayanamsa mode:", ayanamsa_mode,const._DEFAULT_AYANAMSA_MODE+" Assumed")
+            ayanamsa_mode = const._DEFAULT_AYANAMSA_MODE
+            swe.set_sid_mode(const.available_ayanamsa_modes[const._DEFAULT_AYANAMSA_MODE] )#swe.SIDM_LAHIRI)
+    if ctx is not None:
+        ctx.ayanamsa_mode = ayanamsa_mode; ctx.ayanamsa_value = _value
+        return
+    _ayanamsa_value = _value
     _ayanamsa_mode = ayanamsa_mode
     const._DEFAULT_AYANAMSA_MODE = _ayanamsa_mode
-reset_ayanamsa_mode = lambda: swe.set_sid_mode(const.available_ayanamsa_modes[const._DEFAULT_AYANAMSA_MODE]) \
-                      if const._DEFAULT_AYANAMSA_MODE not in ['SIDM_USER','SENTHIL','SUNDAR_SS','KP-SENTHIL'] else \
-                      swe.set_sid_mode(swe.SIDM_LAHIRI)
+def reset_ayanamsa_mode():
+    ayanamsa_mode = _current_ayanamsa(use_default_mode=True)[0]
+    if ayanamsa_mode not in ['SIDM_USER','SENTHIL','SUNDAR_SS','KP-SENTHIL']:
+        swe.set_sid_mode(const.available_ayanamsa_modes[ayanamsa_mode])
+    else:
+        swe.set_sid_mode(swe.SIDM_LAHIRI)
 """ TODO: Need to make panchanga resource independent """
 
 # Ketu is always 180° after Rahu, so same coordinates but different constellations
@@ -199,7 +324,75 @@ def nakshatra_pada(longitude):
     # convert 0..26 to 1..27 and 0..3 to 1..4
     #print(longitude,quotient,reminder,pada)
     return [1 + quotient, 1 + pada,reminder]
-ephemeris_planet_index = lambda planet: planet_list.index(planet)
+ephemeris_planet_index = lambda planet: active_planet_list().index(planet)
+""" 
+    Memo of raw swiss ephemeris rows keyed by (jd_utc, flags, ayanamsa mode, ayanamsa value)
+    Each entry maps planet id to (longitude,latitude,distance,longitude_speed,latitude_speed,distance_speed)
+    Divisional charts, transits and searches evaluate the same julian day many times; this avoids repeat calc_ut calls
+"""
+_EPHEMERIS_MEMO_SIZE = 4096
+_ephemeris_memo = OrderedDict()
+EphemerisBatch = struct('EphemerisBatch',['longitude','latitude','distance','longitude_speed','latitude_speed',
+                                          'distance_speed'])
+def clear_ephemeris_memo():
+    with _ephemeris_lock:
+        _ephemeris_memo.clear()
+def _ephemeris_flags():
+    if const._TROPICAL_MODE:
+        return swe.FLG_SWIEPH | swe.FLG_SPEED
+    return swe.FLG_SWIEPH | swe.FLG_SIDEREAL | _rise_flags
+def _ephemeris_row(jd_utc, planets, flags, ayanamsa_mode, ayanamsa_value):
+    """ Returns memo row {planet:(longitude,...,distance_speed)} with all planets evaluated. Call with _ephemeris_lock held """
+    sidereal = bool(flags & swe.FLG_SIDEREAL)
+    key = (jd_utc, flags, ayanamsa_mode, ayanamsa_value) if sidereal else (jd_utc, flags)
+    row = _ephemeris_memo.get(key)
+    if row is None:
+        row = {}
+        _ephemeris_memo[key] = row
+        if len(_ephemeris_memo) > _EPHEMERIS_MEMO_SIZE:
+            _ephemeris_memo.popitem(last=False)
+    else:
+        _ephemeris_memo.move_to_end(key)
+    missing = [p for p in planets if p not in row]
+    if not missing:
+        return row
+    if sidereal:
+        set_ayanamsa_mode(ayanamsa_mode,ayanamsa_value,jd_utc)
+    for planet in missing:
+        if planet == const._KETU: # Ketu is always 180° after Rahu, rest of the coordinates are same as Rahu
+            if const._RAHU not in row:
+                row[const._RAHU] = _calc_ephemeris(jd_utc, const._RAHU, flags)
+            row[planet] = (ketu(row[const._RAHU][0]),)+row[const._RAHU][1:]
+        else:
+            row[planet] = _calc_ephemeris(jd_utc, planet, flags)
+    if sidereal:
+        reset_ayanamsa_mode()
+    return row
+def _calc_ephemeris(jd_utc, planet, flags):
+    longi,_ = swe.calc_ut(jd_utc, planet, flags = flags)
+    return (utils.norm360(longi[0]),)+tuple(longi[1:6])
+def ephemeris_batch(jds, planets=None, flags=None):
+    """
+        Evaluate positions of many planets at many julian days in one pass
+        Results are memoized per (jd, flags, ayanamsa) so repeated calls (divisional charts, searches) are cheap
+        @param jds: Julian Day Number (UTC) or a sequence/array of them. See NOTE in sidereal_longitude
+        @param planets: list of swiss ephemeris planet ids. Use const._SUN, const._RAHU, const._KETU etc.
+            Default: active planet list (see active_planet_list())
+        @param flags: swiss ephemeris flags. Default: sidereal flags (tropical if const._TROPICAL_MODE)
+        @return: EphemerisBatch(longitude,latitude,distance,longitude_speed,latitude_speed,distance_speed)
+            each a numpy array of shape (len(jds), len(planets)). Longitudes are 0-360 degrees
+    """
+    jds = np.atleast_1d(np.asarray(jds, dtype=float))
+    planets = list(active_planet_list() if planets is None else planets)
+    if flags is None:
+        flags = _ephemeris_flags()
+    values = np.empty((6, len(jds), len(planets)))
+    with _ephemeris_lock:
+        ayanamsa_mode, ayanamsa_value = _current_ayanamsa(use_default_mode=True)
+        for j, jd_utc in enumerate(jds.tolist()):
+            row = _ephemeris_row(jd_utc, planets, flags, ayanamsa_mode, ayanamsa_value)
+            values[:, j, :] = np.array([row[planet] for planet in planets]).T
+    return EphemerisBatch(*values)
 def sidereal_longitude(jd, planet):
     """
         The sequence number of 0 to 8 for planets is not followed by swiss ephemeris
@@ -216,18 +409,9 @@ def sidereal_longitude(jd, planet):
         @param planet: index of the planet Use const._SUN, const._RAHU etc.
         @return: the sidereal longitude of the planet (0-360 degrees)
     """
-    global _ayanamsa_mode,_ayanamsa_value
-    if const._TROPICAL_MODE:
-        flags = swe.FLG_SWIEPH
-    else:
-        flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | _rise_flags
-        #set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd)
-        set_ayanamsa_mode(const._DEFAULT_AYANAMSA_MODE,_ayanamsa_value,jd); _ayanamsa_mode = const._DEFAULT_AYANAMSA_MODE
-        #print('drik sidereal long ayanamsa',_ayanamsa_mode, const._DEFAULT_AYANAMSA_MODE)
-        #import inspect; print('called by',inspect.stack()[1].function)
-    longi,flgs = swe.calc_ut(jd, planet, flags = flags)
-    reset_ayanamsa_mode()
-    return utils.norm360(longi[0]) # degrees
+    with _ephemeris_lock:
+        row = _ephemeris_row(jd, [planet], _ephemeris_flags(), *_current_ayanamsa(use_default_mode=True))
+    return row[planet][0] # degrees
 def planets_in_retrograde(jd,place):
     """
         To get the list of retrograding planets
@@ -240,15 +424,9 @@ def planets_in_retrograde(jd,place):
     """
     jd_utc = jd - place.timezone / 24.
     flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | _rise_flags
-    set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd)
-    retro_planets = []
     _planet_list = [p for p in _sideral_planet_list if p not in [const._RAHU, const._KETU]]
-    for planet in _planet_list:
-        p_id = _sideral_planet_list.index(planet)
-        longi,_ = swe.calc_ut(jd_utc, planet, flags = flags)
-        reset_ayanamsa_mode()
-        if longi[3]<0 : retro_planets.append(p_id)
-    return retro_planets
+    speeds = ephemeris_batch(jd_utc, _planet_list, flags).longitude_speed[0]
+    return [_sideral_planet_list.index(planet) for p,planet in enumerate(_planet_list) if speeds[p] < 0]
 def _planet_speed_info(jd, place,planet):
     """ 
         JD (not UTC)
@@ -258,7 +436,9 @@ def _planet_speed_info(jd, place,planet):
     round_factors = [3,3,4,3,3,6]
     jd_utc = jd - place.timezone / 24.
     flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | _rise_flags
-    longi,_ = swe.calc_ut(jd_utc, planet, flags = flags)
+    with _ephemeris_lock:
+        if _calculation_context.get() is not None: set_ayanamsa_mode(*_current_ayanamsa(),jd)
+        longi,_ = swe.calc_ut(jd_utc, planet, flags = flags)
     return [round(l,round_factors[i]) for i,l in enumerate(longi)]
 daily_moon_speed = lambda jd,place: _planet_speed_info(jd,place,const._MOON)[3]
 daily_sun_speed = lambda jd,place: _planet_speed_info(jd,place,const._SUN)[3]
@@ -273,18 +453,11 @@ def planets_speed_info(jd,place):
     round_factors = [3,3,4,3,3,6]
     jd_utc = jd - place.timezone / 24.
     flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | _rise_flags
-    set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd)
-    _planets_speed_info = {}
-    for planet in planet_list:
-        planet_index = planet_list.index(planet)
-        if planet == const._KETU:
-            _planets_speed_info[planet_index] = _planets_speed_info[planet_list.index(const._RAHU)]
-            continue
-        longi,_ = swe.calc_ut(jd_utc, planet, flags = flags)
-        reset_ayanamsa_mode()
-        _planets_speed_info[planet_index] = [round(l,round_factors[i]) for i,l in enumerate(longi)]
-        #print(planet_index, planet,_planets_speed_info[planet])
-    return _planets_speed_info
+    _planet_list = active_planet_list()
+    _calc_list = [const._RAHU if planet == const._KETU else planet for planet in _planet_list] # Ketu same as Rahu
+    batch = np.stack(ephemeris_batch(jd_utc, _calc_list, flags))[:,0,:]
+    return {planet_index:[round(float(l),round_factors[i]) for i,l in enumerate(batch[:,planet_index])]
+                        for planet_index in range(len(_planet_list))}
 def planets_in_graha_yudh(jd,place):
     """
         Graha Yudh
@@ -337,6 +510,51 @@ def planets_in_graha_yudh(jd,place):
     long_lat_list = [(long,lat) for _,(long,lat,_,_,_,_) in psi.items()]
     _graha_yudh_pairs = compare_planet_coordinates(long_lat_list)
     return _graha_yudh_pairs
+""" 
+    Memo of swe.rise_trans results keyed by (civil date, latitude, longitude, timezone, body, rise/set flags)
+    tithi, nakshatra, yogam, trikalam, muhurthas, kaala bala etc. all ask for the sunrise/sunset of the same
+    local day; with the memo each body is risen/set once per day and place
+"""
+_RISE_SET_MEMO_SIZE = 8192
+_rise_set_memo = OrderedDict()
+_rise_set_lock = threading.Lock()
+RiseSetTable = struct('RiseSetTable',['jd','sunrise','sunset','moonrise','moonset'])
+def clear_rise_set_memo():
+    with _rise_set_lock:
+        _rise_set_memo.clear()
+def _rise_trans(jd_utc, place, planet, rsmi):
+    """ Julian day (UT) of the rise/set (rsmi) of planet after local midnight of the civil day jd_utc (memoized) """
+    _,lat, lon, tz = place
+    key = (jd_utc, lat, lon, tz, planet, rsmi)
+    with _rise_set_lock:
+        value = _rise_set_memo.get(key)
+        if value is not None:
+            _rise_set_memo.move_to_end(key)
+            return value
+    value = swe.rise_trans(jd_utc - tz/24, planet, geopos=(lon, lat,0.0), rsmi = rsmi)[1][0]
+    with _rise_set_lock:
+        _rise_set_memo[key] = value
+        if len(_rise_set_memo) > _RISE_SET_MEMO_SIZE:
+            _rise_set_memo.popitem(last=False)
+    return value
+def rise_set_table(place, start_date, end_date):
+    """
+        Sunrise, sunset, moonrise and moonset of every day between two dates (also fills the rise/set memo,
+            so sunrise(), sunset(), moonrise() etc. of these days need no further ephemeris calls)
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param start_date: Date struct (y,m,d) of the first day
+        @param end_date: Date struct (y,m,d) of the last day (inclusive)
+        @return: RiseSetTable(jd,sunrise,sunset,moonrise,moonset) of numpy arrays
+            jd: julian day number of local midnight of each day
+            sunrise..moonset: local time in float hours (same as sunrise(jd,place)[0] etc.)
+    """
+    tz = place[3]
+    jd_start = utils.gregorian_to_jd(start_date)
+    jds = jd_start + np.arange(int(utils.gregorian_to_jd(end_date) - jd_start) + 1)
+    columns = [np.array([(_rise_trans(jd, place, planet, _rise_flags + rsmi) - jd) * 24 + tz for jd in jds.tolist()])
+               for planet,rsmi in [(swe.SUN,swe.CALC_RISE),(swe.SUN,swe.CALC_SET),(swe.MOON,swe.CALC_RISE),
+                                   (swe.MOON,swe.CALC_SET)]]
+    return RiseSetTable(jds, *columns)
 solar_longitude = lambda jd: sidereal_longitude(jd, const._SUN)
 lunar_longitude = lambda jd: sidereal_longitude(jd, const._MOON)
 def sunrise(jd, place):
@@ -352,8 +570,7 @@ def sunrise(jd, place):
     jd_utc = utils.gregorian_to_jd(Date(y, m, d))
     
     _,lat, lon, tz = place
-    result = swe.rise_trans(jd_utc - tz/24, swe.SUN, geopos=(lon, lat,0.0), rsmi = _rise_flags + swe.CALC_RISE)
-    rise_jd = result[1][0]  # julian-day number
+    rise_jd = _rise_trans(jd_utc, place, swe.SUN, _rise_flags + swe.CALC_RISE)  # julian-day number
     rise_local_time = (rise_jd - jd_utc) * 24 + tz
     """ ADDED THE FOLLOWING IN V2.5.2 TO RECALCULATE RISE_JD"""
     dob = (y,m,d)
@@ -421,8 +638,7 @@ def sunset(jd, place,gauri_choghadiya_setting=False):
     y, m, d,_  = jd_to_gregorian(jd)
     jd_utc = utils.gregorian_to_jd(Date(y, m, d))
     _,lat, lon, tz = place
-    result = swe.rise_trans(jd_utc - tz/24, swe.SUN, geopos=(lon, lat,0.0), rsmi = _rise_flags + swe.CALC_SET)
-    set_jd = result[1][0]
+    set_jd = _rise_trans(jd_utc, place, swe.SUN, _rise_flags + swe.CALC_SET)
     set_local_time = (set_jd - jd_utc) * 24 + tz
     if gauri_choghadiya_setting:
         # Convert to local time
@@ -443,8 +659,7 @@ def moonrise(jd, place):
     y, m, d, h = jd_to_gregorian(jd)
     jd_utc = utils.gregorian_to_jd(Date(y, m, d))
     city, lat, lon, tz = place
-    result = swe.rise_trans(jd_utc - tz/24, swe.MOON, geopos=(lon, lat,0.0), rsmi = _rise_flags + swe.CALC_RISE)
-    rise = result[1][0]  # julian-day number
+    rise = _rise_trans(jd_utc, place, swe.MOON, _rise_flags + swe.CALC_RISE)  # julian-day number
     # Convert to local time
     local_time = (rise - jd_utc) * 24 + tz
     return [local_time,utils.to_dms(local_time),rise]
@@ -461,8 +676,7 @@ def moonset(jd, place):
     y, m, d, h = jd_to_gregorian(jd)
     jd_utc = utils.gregorian_to_jd(Date(y, m, d))
     city, lat, lon, tz = place
-    result = swe.rise_trans(jd_utc - tz/24, swe.MOON, geopos=(lon, lat,0.0), rsmi = _rise_flags + swe.CALC_SET)
-    setting = result[1][0]  # julian-day number
+    setting = _rise_trans(jd_utc, place, swe.MOON, _rise_flags + swe.CALC_SET)  # julian-day number
     # Convert to local time
     local_time = (setting - jd_utc) * 24 + tz
     return [local_time,utils.to_dms(local_time),setting]
@@ -862,6 +1076,87 @@ def yogam_old(jd,place,planet1=const._MOON,planet2=const._SUN,tithi_index=1,cycl
     yoga_frac = utils.get_fraction(_yoga_start, _yoga_end, birth_time_hrs)
     result = [_yoga_no,_yoga_start,_yoga_end]+_yoga[2:]
     return result
+""" 
+    Year scale panchanga scan
+    Sunrise, tithi, nakshatra and yogam of every civil day of a year are computed in one pass (moon/sun longitudes
+    through ephemeris_batch) and cached per (place, year, ayanamsa). Vratha/festival searches use the scan to find
+    the few days on which the exact tithi/nakshatra/yogam functions need to be evaluated.
+"""
+_PANCHANGA_SCAN_CACHE_SIZE = 32
+_panchanga_scan_cache = OrderedDict()
+_panchanga_scan_lock = threading.Lock()
+_panchanga_scan_window = (-0.5, 1.5) # days from local midnight covered by the *_span columns
+PanchangaScan = struct('PanchangaScan',['jd','sunrise','tithi','nakshatra','yogam','tithi_span','nakshatra_span',
+                                        'yogam_span'])
+def clear_panchanga_scan_cache():
+    with _panchanga_scan_lock:
+        _panchanga_scan_cache.clear()
+def _panchanga_indices(jds_utc):
+    """ tithi [1..30], nakshatra [1..27] and yogam [1..27] indices at each of jds_utc """
+    sun_long, moon_long = ephemeris_batch(jds_utc, [const._SUN, const._MOON]).longitude.T
+    _tithi = np.floor(((moon_long - sun_long) % 360)/12.0).astype(int) % 30 + 1
+    _nak = np.floor(moon_long/(360.0/27)).astype(int) % 27 + 1
+    _yogam = np.floor(((moon_long + sun_long) % 360)/(360.0/27)).astype(int) % 27 + 1
+    return _tithi, _nak, _yogam
+def _panchanga_year_scan(place, year):
+    tz = place.timezone
+    jd_start = utils.gregorian_to_jd(Date(year,1,1))
+    jds = jd_start + np.arange(int(utils.gregorian_to_jd(Date(year+1,1,1)) - jd_start)) # local midnights
+    rise = np.array([sunrise(jd, place)[2] for jd in jds.tolist()])
+    at_rise = _panchanga_indices(rise - tz/24.0)
+    span_start = _panchanga_indices(jds + _panchanga_scan_window[0] - tz/24.0)
+    span_end = _panchanga_indices(jds + _panchanga_scan_window[1] - tz/24.0)
+    tithi_span, nak_span, yogam_span = [np.stack(pair, axis=1) for pair in zip(span_start, span_end)]
+    if const.increase_tithi_by_one_before_kali_yuga: # tithi() shifts tithi by one before mahabharatha time
+        shifted = jds < const.mahabharatha_tithi_julian_day
+        tithi_span[shifted,1] = tithi_span[shifted,1] % 30 + 1
+    return PanchangaScan(jds, rise, *at_rise, tithi_span, nak_span, yogam_span)
+def panchanga_scan(place, start_date, end_date):
+    """
+        Sunrise, tithi, nakshatra and yogam of every day between two dates, computed a year at a time and cached
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param start_date: Date struct (y,m,d) of the first day
+        @param end_date: Date struct (y,m,d) of the last day (inclusive)
+        @return: PanchangaScan(jd,sunrise,tithi,nakshatra,yogam,tithi_span,nakshatra_span,yogam_span)
+            jd: julian day number of local midnight of each day
+            sunrise: julian day number of sunrise (same as sunrise(jd,place)[2])
+            tithi/nakshatra/yogam: index [1..30]/[1..27]/[1..27] at sunrise
+            *_span: (first,last) index prevailing from 12 hours before local midnight to 36 hours after it
+                i.e. every tithi/nakshatra/yogam that tithi(), nakshatra() or yogam() can return for the day
+    """
+    ayanamsa = (_ephemeris_flags(),)+_current_ayanamsa(use_default_mode=True)
+    scans = []
+    for year in range(start_date.year, end_date.year+1):
+        key = (tuple(place), year, ayanamsa)
+        with _panchanga_scan_lock:
+            scan = _panchanga_scan_cache.get(key)
+            if scan is not None:
+                _panchanga_scan_cache.move_to_end(key)
+        if scan is None:
+            scan = _panchanga_year_scan(place, year)
+            with _panchanga_scan_lock:
+                _panchanga_scan_cache[key] = scan
+                if len(_panchanga_scan_cache) > _PANCHANGA_SCAN_CACHE_SIZE:
+                    _panchanga_scan_cache.popitem(last=False)
+        scans.append(scan)
+    jds = np.concatenate([scan.jd for scan in scans])
+    days = (jds >= utils.gregorian_to_jd(start_date)) & (jds <= utils.gregorian_to_jd(end_date))
+    return PanchangaScan(*[np.concatenate([scan[f] for scan in scans])[days] for f in range(len(PanchangaScan._fields))])
+def panchanga_scan_dates(scan, panchanga_type, index_list):
+    """
+        Dates of a panchanga scan on which any of the given tithis/nakshatras/yogams may prevail
+        @param scan: PanchangaScan (see panchanga_scan)
+        @param panchanga_type: 'tithi', 'nakshatra' or 'yogam'
+        @param index_list: list of tithi [1..30] / nakshatra [1..27] / yogam [1..27] indices
+        @return: set of (year,month,day) tuples
+    """
+    count = 30 if panchanga_type == 'tithi' else 27
+    span = getattr(scan, panchanga_type+'_span')
+    first = span[:,0]; width = (span[:,1] - first) % count
+    found = np.zeros(len(first), dtype=bool)
+    for index in index_list:
+        found |= (index - first) % count <= width
+    return {jd_to_gregorian(jd)[0:3] for jd in scan.jd[found].tolist()}
 def karana(jd, place):
     """
         returns the karanam of the day
@@ -1289,12 +1584,9 @@ def planetary_positions(jd, place):
     jd_ut = jd - place.timezone / 24.
     
     positions = []
-    for planet in planet_list:
-        p_id = planet_list.index(planet)
-        if planet == const._KETU:
-            nirayana_long = ketu(sidereal_longitude(jd_ut, const._RAHU))
-        else: # Ketu
-            nirayana_long = sidereal_longitude(jd_ut, planet)
+    _planet_list = active_planet_list()
+    longitudes = ephemeris_batch(jd_ut, _planet_list).longitude[0].tolist()
+    for p_id, nirayana_long in enumerate(longitudes):
         constellation = int(nirayana_long / 30)
         coordinates = nirayana_long-constellation*30
         positions.append([p_id,coordinates, constellation])        
@@ -1417,12 +1709,13 @@ def bhaava_madhya_swe(jd,place,house_code='P'):
     global _ayanamsa_mode,_ayanamsa_value
     _, lat, lon, tz = place
     jd_utc = jd - (tz / 24.)
-    if const._TROPICAL_MODE:
-        flags = swe.FLG_SWIEPH
-    else:
-        flags = swe.FLG_SIDEREAL
-        set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd) # needed for swe.houses_ex()
-    return list(swe.houses_ex(jd_utc, lat, lon,hsys, flags = flags)[0])
+    with _ephemeris_lock:
+        if const._TROPICAL_MODE:
+            flags = swe.FLG_SWIEPH
+        else:
+            flags = swe.FLG_SIDEREAL
+            set_ayanamsa_mode(*_current_ayanamsa(),jd) # needed for swe.houses_ex()
+        return list(swe.houses_ex(jd_utc, lat, lon,hsys, flags = flags)[0])
 def bhaava_madhya_kp(jd,place):
     """
         Compute the mid angle / cusp of each of each house.
@@ -1431,12 +1724,13 @@ def bhaava_madhya_kp(jd,place):
     global _ayanamsa_mode,_ayanamsa_value
     _, lat, lon, tz = place
     jd_utc = jd - (tz / 24.)
-    if const._TROPICAL_MODE:
-        flags = swe.FLG_SWIEPH
-    else:
-        flags = swe.FLG_SIDEREAL
-        set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd) # needed for swe.houses_ex()
-    return list(swe.houses_ex(jd_utc, lat, lon, flags = flags)[0])
+    with _ephemeris_lock:
+        if const._TROPICAL_MODE:
+            flags = swe.FLG_SWIEPH
+        else:
+            flags = swe.FLG_SIDEREAL
+            set_ayanamsa_mode(*_current_ayanamsa(),jd) # needed for swe.houses_ex()
+        return list(swe.houses_ex(jd_utc, lat, lon, flags = flags)[0])
 def bhaava_madhya_sripathi(jd, place):
     bm = bhaava_madhya_kp(jd, place)
     #print(bm)
@@ -1465,16 +1759,17 @@ def ascendant(jd, place):
     global _ayanamsa_mode,_ayanamsa_value
     _, lat, lon, tz = place
     jd_utc = jd - (tz / 24.)
-    if const._TROPICAL_MODE:
-        flags = swe.FLG_SWIEPH
-    else:
-        flags = swe.FLG_SIDEREAL
-        set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd) # needed for swe.houses_ex()
-    nirayana_lagna = swe.houses_ex(jd_utc, lat, lon, flags = flags)[1][0]
+    with _ephemeris_lock:
+        if const._TROPICAL_MODE:
+            flags = swe.FLG_SWIEPH
+        else:
+            flags = swe.FLG_SIDEREAL
+            set_ayanamsa_mode(*_current_ayanamsa(),jd) # needed for swe.houses_ex()
+        nirayana_lagna = swe.houses_ex(jd_utc, lat, lon, flags = flags)[1][0]
+        reset_ayanamsa_mode()
     nak_no,paadha_no,_ = nakshatra_pada(nirayana_lagna)
     constellation = int(nirayana_lagna / 30)
     coordinates = nirayana_lagna-constellation*30
-    reset_ayanamsa_mode()
     return [constellation, coordinates, nak_no, paadha_no]    
 def dasavarga_from_long(longitude, divisional_chart_factor=1):
     """
@@ -1533,12 +1828,9 @@ def dhasavarga(jd, place,divisional_chart_factor=1):
     """
     jd_utc = jd - place.timezone / 24.
     positions = []
-    for planet in planet_list:
-        p_id = planet_list.index(planet)
-        if planet != const._KETU:
-            nirayana_long = sidereal_longitude(jd_utc, planet)
-        else: # Ketu
-            nirayana_long = ketu(sidereal_longitude(jd_utc, const._RAHU)) # 7 = swe.RAHU
+    _planet_list = active_planet_list()
+    longitudes = ephemeris_batch(jd_utc, _planet_list).longitude[0].tolist()
+    for p_id, nirayana_long in enumerate(longitudes):
         divisional_chart = dasavarga_from_long(nirayana_long,divisional_chart_factor)
         positions.append([p_id, divisional_chart])
     return positions
@@ -1608,31 +1900,31 @@ def solar_upagraha_longitudes(solar_longitude,upagraha,divisional_chart_factor=1
   Kaala rises at the middle of Sun’s part. In other words, we find the time at the
   middle of Sun’s part and find lagna rising then. That gives Kaala’s longitude.
 """
-kaala_longitude = lambda dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1: \
+kaala_longitude = lambda dob,tob,place,ayanamsa_mode=None,divisional_chart_factor=1: \
     upagraha_longitude(dob,tob,place,planet_index=0,ayanamsa_mode=ayanamsa_mode,
                        divisional_chart_factor=divisional_chart_factor,upagraha_part='middle')
 """ Mrityu rises at the middle of Mars’s part."""
-mrityu_longitude = lambda dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1: \
+mrityu_longitude = lambda dob,tob,place,ayanamsa_mode=None,divisional_chart_factor=1: \
     upagraha_longitude(dob,tob,place,planet_index=2,ayanamsa_mode=ayanamsa_mode,
                        divisional_chart_factor=divisional_chart_factor,upagraha_part='middle')
 """ Artha Praharaka rises at the middle of Mercury’s part."""
-artha_praharaka_longitude = lambda dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1: \
+artha_praharaka_longitude = lambda dob,tob,place,ayanamsa_mode=None,divisional_chart_factor=1: \
     upagraha_longitude(dob,tob,place,planet_index=3,ayanamsa_mode=ayanamsa_mode,
                        divisional_chart_factor=divisional_chart_factor,upagraha_part='middle')
 """ Yama Ghantaka rises at the middle of Jupiter’s part. """
-yama_ghantaka_longitude = lambda dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1: \
+yama_ghantaka_longitude = lambda dob,tob,place,ayanamsa_mode=None,divisional_chart_factor=1: \
     upagraha_longitude(dob,tob,place,planet_index=4,ayanamsa_mode=ayanamsa_mode,
                        divisional_chart_factor=divisional_chart_factor,upagraha_part='middle')
 """ Gulika rises at the start of Saturn’s part. (Book says middle) """
-gulika_longitude = lambda dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1: \
+gulika_longitude = lambda dob,tob,place,ayanamsa_mode=None,divisional_chart_factor=1: \
     upagraha_longitude(dob,tob,place,planet_index=6,ayanamsa_mode=ayanamsa_mode,
                        divisional_chart_factor=divisional_chart_factor,upagraha_part='begin')
 """ Maandi rises at the middle of Saturn’s part. (Book says start) """
-maandi_longitude = lambda dob,tob,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1: \
+maandi_longitude = lambda dob,tob,place,ayanamsa_mode=None,divisional_chart_factor=1: \
     upagraha_longitude(dob,tob,place,planet_index=6,ayanamsa_mode=ayanamsa_mode,
                        divisional_chart_factor=divisional_chart_factor,upagraha_part='middle')
 
-def upagraha_longitude(dob,tob,place,planet_index,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
+def upagraha_longitude(dob,tob,place,planet_index,ayanamsa_mode=None,
                        divisional_chart_factor=1,upagraha_part='middle'):
     """
       get upagraha longitude from dob,tob, place-lat/long and day/night ruling planet's part
@@ -1703,27 +1995,27 @@ def upagraha_longitude(dob,tob,place,planet_index,ayanamsa_mode=const._DEFAULT_A
     constellation,coordinates = dasavarga_from_long(upagraha_long, divisional_chart_factor) #int(upagraha_long / 30)
     return [constellation,coordinates]
 """ NOTE: Bhava Lagna Calculation in Section 5.2 of PVR Book should have mentioned DIVIDE BY 4 in Step (2) """
-bhava_lagna = lambda jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,\
+bhava_lagna = lambda jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,\
                                             base_rasi=None,count_from_end_of_sign=None: \
         special_ascendant(jd,place,ayanamsa_mode=ayanamsa_mode,divisional_chart_factor=divisional_chart_factor,\
                           chart_method=chart_method,lagna_rate_factor=0.25,
                           base_rasi=base_rasi,count_from_end_of_sign=count_from_end_of_sign) 
-hora_lagna = lambda jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,\
+hora_lagna = lambda jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,\
                                             base_rasi=None,count_from_end_of_sign=None: \
         special_ascendant(jd,place,ayanamsa_mode=ayanamsa_mode,divisional_chart_factor=divisional_chart_factor,\
                           chart_method=chart_method,lagna_rate_factor=0.5,
                           base_rasi=base_rasi,count_from_end_of_sign=count_from_end_of_sign) 
-ghati_lagna = lambda jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,\
+ghati_lagna = lambda jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,\
                                             base_rasi=None,count_from_end_of_sign=None: \
         special_ascendant(jd,place,ayanamsa_mode=ayanamsa_mode,divisional_chart_factor=divisional_chart_factor,\
                           chart_method=chart_method,lagna_rate_factor=1.25,
                           base_rasi=base_rasi,count_from_end_of_sign=count_from_end_of_sign) 
-vighati_lagna = lambda jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,\
+vighati_lagna = lambda jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,\
                                             base_rasi=None,count_from_end_of_sign=None: \
         special_ascendant(jd,place,ayanamsa_mode=ayanamsa_mode,divisional_chart_factor=divisional_chart_factor,\
                           chart_method=chart_method,lagna_rate_factor=15.0,
                           base_rasi=base_rasi,count_from_end_of_sign=count_from_end_of_sign) 
-def special_ascendant(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def special_ascendant(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                       lagna_rate_factor=1.0,base_rasi=None,count_from_end_of_sign=None):
     """
         Get constellation and longitude of special lagnas (Bhava,Hora,Ghati,vighati)
@@ -1817,7 +2109,7 @@ def pranapada_lagna_mixed_chart(jd,place,varga_factor_1=1,chart_method_1=1,varga
     spl_long = pl1 % 360
     da = dasavarga_from_long(spl_long, mixed_dvf)
     return da
-def pranapada_lagna(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def pranapada_lagna(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                                             base_rasi=None,count_from_end_of_sign=None):
     """
         Get constellation and longitude of pranapada lagna
@@ -1862,7 +2154,7 @@ def indu_lagna_mixed_chart(jd,place,varga_factor_1=1,chart_method_1=1,varga_fact
     if il1==0: il1 = 12
     _indu_rasi = (moon_house+il1-1)%12
     return _indu_rasi,planet_positions[2][1][1]
-def indu_lagna(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def indu_lagna(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                                             base_rasi=None,count_from_end_of_sign=None):  # BV Raman Method
     """
         Get constellation and longitude of indu lagna
@@ -1895,7 +2187,7 @@ def kunda_lagna_mixed_chart(jd,place,varga_factor_1=1,chart_method_1=1,varga_fac
     asc = planet_positions[0]; al = asc[1][0]*30+asc[1][1]; al1 = (al*81)%360
     spl = dasavarga_from_long(al1,divisional_chart_factor=mixed_dvf)
     return spl
-def kunda_lagna(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def kunda_lagna(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                                             base_rasi=None,count_from_end_of_sign=None):
     """
         Get constellation and longitude of kunda lagna
@@ -1925,7 +2217,7 @@ def bhrigu_bindhu_lagna_mixed_chart(jd,place,varga_factor_1=1,chart_method_1=1,v
     moon_add = 0 if moon_long > rahu_long else 360
     bb = (0.5*(rahu_long+moon_long+moon_add))%360
     return dasavarga_from_long(bb)
-def bhrigu_bindhu_lagna(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def bhrigu_bindhu_lagna(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                                             base_rasi=None,count_from_end_of_sign=None):
     """
         Get constellation and longitude of bhrigu bindhu lagna
@@ -1956,7 +2248,7 @@ def sree_lagna_mixed_chart(jd,place,varga_factor_1=1,chart_method_1=1,varga_fact
     moon_long = planet_positions[2][1][0]*30+planet_positions[2][1][1]
     sl = sree_lagna_from_moon_asc_longitudes(moon_long, asc_long, divisional_chart_factor=mixed_dvf)
     return sl
-def sree_lagna(jd,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,
+def sree_lagna(jd,place,ayanamsa_mode=None,divisional_chart_factor=1,chart_method=1,
                                             base_rasi=None,count_from_end_of_sign=None):
     """
         Get constellation and longitude of Sree Lagna
@@ -2204,40 +2496,34 @@ def next_sankranti_date(panchanga_date,place):
     solar_hour1 = (sank_sunrise + solar_hour - sank_jd_utc)*24+place.timezone
     sank_date,solar_hour1 = utils._convert_to_tamil_date_and_time(sank_date, solar_hour1,place)
     return sank_date, solar_hour1,tamil_month,tamil_day # V2.3.0 date returned as tuple
-def __next_solar_jd(jd,place,sun_long):
-    """
-        TODO: Handle While loop if not converging - provide max count to stop
-    """
-    jd_next = jd
-    sl = solar_longitude(jd_next)
-    while True:
-        #print(jd_next,sl,sun_long,jd_to_gregorian(jd_next))
-        sank_date = swe.revjul(jd_next)
-        #print('sank_date',sank_date,sun_long,sl,sun_long+1)
-        if sl<sun_long+1 and sl>sun_long:
-            jd_next -= 1
+def _solar_return_jd_utc(jd_utc,sun_long,max_iterations=20,tolerance=1e-9):
+    """
+        UTC julian day nearest to jd_utc at which the sidereal longitude of the sun is sun_long
+        Newton iteration using the solar speed (converges in 3-4 steps from a guess within a few days)
+    """
+    flags = _ephemeris_flags(); ayanamsa = _current_ayanamsa(use_default_mode=True)
+    for _ in range(max_iterations):
+        with _ephemeris_lock:
+            sun = _ephemeris_row(jd_utc, [const._SUN], flags, *ayanamsa)[const._SUN]
+        delta = (sun_long - sun[0] + 180.0) % 360.0 - 180.0
+        jd_utc += delta / sun[3]
+        if abs(delta) < tolerance:
             break
-        jd_next += 1
-        sl = solar_longitude(jd_next)
-    sank_date = jd_to_gregorian(jd_next)
-    #print('sank_date',sank_date)
-    sank_sunrise = sunrise(jd_next,place)[2]
-    sank_date = Date(sank_date[0],sank_date[1],sank_date[2])
-    offsets = [0.0, 0.25, 0.5, 0.75, 1.0] 
-    solar_longs = [ (solar_longitude(sank_sunrise + t)) for t in offsets ]
-    #print(solar_longs,sun_long)
-    solar_hour = utils.inverse_lagrange(offsets, solar_longs, sun_long) # Do not move % 360 above
-    #print('solar_hour',solar_hour)
-    sank_jd_utc = utils.gregorian_to_jd(sank_date)
-    solar_hour1 = (sank_sunrise + solar_hour - sank_jd_utc)*24+place.timezone
-    next_solar_jd = swe.julday(sank_date[0],sank_date[1],sank_date[2],solar_hour1)
-    return next_solar_jd    
+    return jd_utc
+""" Memo of next_solar_date keyed by (jd_at_dob, place, years, months, sixty_hours, flags, ayanamsa) """
+_SOLAR_DATE_MEMO_SIZE = 4096
+_solar_date_memo = OrderedDict()
+_solar_date_lock = threading.Lock()
+def clear_solar_date_memo():
+    with _solar_date_lock:
+        _solar_date_memo.clear()
 def next_solar_date(jd_at_dob,place,years=1,months=1,sixty_hours=1):
     """
         returns the next date at which sun's longitue is same as at jd_at_dob (at birth say)
         For example if someone was born on 1970,2,10 and years = 10, 
         will return date in 1979 at which sun longitude is same as calculated at (1970,2,10)
         These are used for Tajaka yearly/monthly/shashti-hora(60hr) charts
+        Results are memoized, so annual chart, lord of the year, dhasas etc of the same year share one search
         @param jd_at_dob: Julian number at the time of birth
         @param place: Place Struct ('place',latitude,longitude,timezone)
         @param year: Number of years since birth (year=1 for the birth year)
@@ -2246,19 +2532,33 @@ def next_solar_date(jd_at_dob,place,years=1,months=1,sixty_hours=1):
         @return: julian number for the matching solar date
     """
     if (years==1 and months==1 and sixty_hours==1): return jd_at_dob
+    key = (jd_at_dob,tuple(place),years,months,sixty_hours,_ephemeris_flags())+_current_ayanamsa(use_default_mode=True)
+    with _solar_date_lock:
+        jd_next = _solar_date_memo.get(key)
+        if jd_next is not None:
+            _solar_date_memo.move_to_end(key)
+            return jd_next
     sun_long_at_dob = dhasavarga(jd_at_dob, place,divisional_chart_factor=1)[0][1]
     sun_long_at_dob = sun_long_at_dob[0]*30+sun_long_at_dob[1]
-    (y,m,d,fh) = swe.revjul(jd_at_dob)
-    #print((int(sun_long_at_dob/30),utils.to_dms(sun_long_at_dob%30,is_lat_long='plong')),(y,m,d,utils.to_dms(fh)))
     sun_long_extra = ((years-1)*360+(months-1)*30+(sixty_hours-1)*2.5)%360
     jd_extra = int(((years-1)+(months-1)/12+(sixty_hours-1)/144)*const.tropical_year) #const.sidereal_year)
-    #print('jd_extra',jd_extra)
-    jd_next = jd_at_dob+jd_extra
-    #print('jd_next',jd_next,swe.revjul(jd_next))
-    #print('sun_long_extra',sun_long_extra)
     sun_long_next = (sun_long_at_dob+sun_long_extra)%360
-    #print((years,months,sixty_hours),(int(sun_long_next/30),utils.to_dms(sun_long_next%30,is_lat_long='plong')),(y,m,d,utils.to_dms(fh)))
-    return __next_solar_jd(jd_next,place, sun_long_next)
+    tz = place[3]
+    jd_next = _solar_return_jd_utc(jd_at_dob+jd_extra-tz/24, sun_long_next) + tz/24
+    with _solar_date_lock:
+        _solar_date_memo[key] = jd_next
+        if len(_solar_date_memo) > _SOLAR_DATE_MEMO_SIZE:
+            _solar_date_memo.popitem(last=False)
+    return jd_next
+def varsha_pravesh_table(jd_at_dob,place,years):
+    """
+        Tajaka varsha pravesh (annual solar return) of every year of a native
+        @param jd_at_dob: Julian number at the time of birth
+        @param place: Place Struct ('place',latitude,longitude,timezone)
+        @param years: number of years (years=1 for the birth year)
+        @return: list of julian numbers; item y-1 is next_solar_date(jd_at_dob,place,years=y) (memoized)
+    """
+    return [next_solar_date(jd_at_dob, place, years=y) for y in range(1,years+1)]
 def next_annual_solar_date_approximate(dob,tob,years):
     week_days = ['Sunday','Monday','Tuesday','Wednesday','Thursday','Friday','Saturday']
     tobh = (tob[0]+tob[1]/60+tob[2]/3600)/24
@@ -2464,17 +2764,17 @@ def __next_conjunction_of_planet_pair(jd,panchanga_place:Place,p1,p2,direction=1
     while cur_jd*direction < end_jd*direction:
         cur_jd_utc = cur_jd - panchanga_place.timezone/24.0
         if p1==8:
-            p1_long = (ketu(sidereal_longitude(cur_jd_utc, planet_list[7])))
+            p1_long = (ketu(sidereal_longitude(cur_jd_utc, active_planet_list()[7])))
         elif p1==const._ascendant_symbol:
             sla = ascendant(cur_jd, panchanga_place); p1_long = (sla[0]*30+sla[1])*divisional_chart_factor%360
         else:
-            p1_long = (sidereal_longitude(cur_jd_utc, planet_list[p1]))
+            p1_long = (sidereal_longitude(cur_jd_utc, active_planet_list()[p1]))
         if p2==8:
-            p2_long = (ketu(sidereal_longitude(cur_jd_utc, planet_list[7])))
+            p2_long = (ketu(sidereal_longitude(cur_jd_utc, active_planet_list()[7])))
         elif p2==const._ascendant_symbol:
             sla = ascendant(cur_jd, panchanga_place); p2_long = (sla[0]*30+sla[1])*divisional_chart_factor%360
         else:
-            p2_long = (sidereal_longitude(cur_jd_utc, planet_list[p2]))
+            p2_long = (sidereal_longitude(cur_jd_utc, active_planet_list()[p2]))
         long_diff = (p1_long - p2_long - separation_angle)%360
         if abs(long_diff) < const.minimum_separation_longitude:
             #print('Found closest time:',utils.jd_to_gregorian(cur_jd))
@@ -2511,17 +2811,17 @@ def next_conjunction_of_planet_pair(jd,panchanga_place:Place,p1,p2,direction=1,s
         cur_jd += increment_days
         cur_jd_utc = cur_jd - panchanga_place.timezone/24.0
         if p1==8:
-            p1_long = (ketu(sidereal_longitude(cur_jd_utc, planet_list[7])))
+            p1_long = (ketu(sidereal_longitude(cur_jd_utc, active_planet_list()[7])))
         elif p1==const._ascendant_symbol:
             sla = ascendant(cur_jd, panchanga_place); p1_long = (sla[0]*30+sla[1])
         else:
-            p1_long = (sidereal_longitude(cur_jd_utc, planet_list[p1]))
+            p1_long = (sidereal_longitude(cur_jd_utc, active_planet_list()[p1]))
         if p2==8:
-            p2_long = (ketu(sidereal_longitude(cur_jd_utc, planet_list[7])))
+            p2_long = (ketu(sidereal_longitude(cur_jd_utc, active_planet_list()[7])))
         elif p2==const._ascendant_symbol:
             sla = ascendant(cur_jd, panchanga_place); p2_long = (sla[0]*30+sla[1])
         else:
-            p2_long = (sidereal_longitude(cur_jd_utc, planet_list[p2]))
+            p2_long = (sidereal_longitude(cur_jd_utc, active_planet_list()[p2]))
         long_diff = (360+p1_long - p2_long - separation_angle)%360
         if _DEBUG_: print(search_counter,p1,p1_long,p2,p2_long,long_diff,long_diff_check,utils.jd_to_gregorian(cur_jd))
         if long_diff<long_diff_check:
@@ -2531,17 +2831,17 @@ def next_conjunction_of_planet_pair(jd,panchanga_place:Place,p1,p2,direction=1,s
             long_diff_list = []
             for jdt in jd_list:
                 if p1==8:
-                    p1_long = (ketu(sidereal_longitude(jdt-panchanga_place.timezone/24, planet_list[7])))
+                    p1_long = (ketu(sidereal_longitude(jdt-panchanga_place.timezone/24, active_planet_list()[7])))
                 elif p1==const._ascendant_symbol:
                     sla = ascendant(jdt, panchanga_place); p1_long = (sla[0]*30+sla[1])
                 else:
-                    p1_long = (sidereal_longitude(jdt-panchanga_place.timezone/24, planet_list[p1]))
+                    p1_long = (sidereal_longitude(jdt-panchanga_place.timezone/24, active_planet_list()[p1]))
                 if p2==8:
-                    p2_long = (ketu(sidereal_longitude(jdt-panchanga_place.timezone/24, planet_list[7])))
+                    p2_long = (ketu(sidereal_longitude(jdt-panchanga_place.timezone/24, active_planet_list()[7])))
                 elif p2==const._ascendant_symbol:
                     sla = ascendant(jdt, panchanga_place); p2_long = (sla[0]*30+sla[1])
                 else:
-                    p2_long = (sidereal_longitude(jdt-panchanga_place.timezone/24, planet_list[p2]))
+                    p2_long = (sidereal_longitude(jdt-panchanga_place.timezone/24, active_planet_list()[p2]))
                 long_diff = (360+p1_long-p2_long-separation_angle)%360
                 long_diff_list.append(long_diff)
             """ TODO: For separation Angle > 180 Lagrange may not work """
@@ -2550,17 +2850,17 @@ def next_conjunction_of_planet_pair(jd,panchanga_place:Place,p1,p2,direction=1,s
                 if _DEBUG_: print(jd_list,'\n',long_diff_list)
                 conj_jd = utils.inverse_lagrange(jd_list, long_diff_list, 0.0)
                 if p1==8:
-                    p1_long = (ketu(sidereal_longitude(conj_jd-panchanga_place.timezone/24, planet_list[7])))
+                    p1_long = (ketu(sidereal_longitude(conj_jd-panchanga_place.timezone/24, active_planet_list()[7])))
                 elif p1==const._ascendant_symbol:
                     sla = ascendant(conj_jd, panchanga_place); p1_long = (sla[0]*30+sla[1])
                 else:
-                    p1_long = (sidereal_longitude(conj_jd-panchanga_place.timezone/24, planet_list[p1]))
+                    p1_long = (sidereal_longitude(conj_jd-panchanga_place.timezone/24, active_planet_list()[p1]))
                 if p2==8:
-                    p2_long = (ketu(sidereal_longitude(conj_jd-panchanga_place.timezone/24, planet_list[7])))
+                    p2_long = (ketu(sidereal_longitude(conj_jd-panchanga_place.timezone/24, active_planet_list()[7])))
                 elif p2==const._ascendant_symbol:
                     sla = ascendant(conj_jd, panchanga_place); p2_long = (sla[0]*30+sla[1])
                 else:
-                    p2_long = (sidereal_longitude(conj_jd-panchanga_place.timezone/24, planet_list[p2]))
+                    p2_long = (sidereal_longitude(conj_jd-panchanga_place.timezone/24, active_planet_list()[p2]))
                 if conj_jd != None:
                     if _DEBUG_: print(p1,p2,utils.jd_to_gregorian(conj_jd),p1_long,p2_long)
                     return conj_jd, p1_long, p2_long
@@ -2583,20 +2883,53 @@ def previous_planet_entry_date(planet,jd,place,increment_days=0.01,precision=0.1
     return next_planet_entry_date(planet,jd,place,direction=-1,increment_days=increment_days,precision=precision,raasi=raasi)
 def previous_ascendant_entry_date(jd,place,increment_days=0.01,precision=0.1,raasi=None,divisional_chart_factor=1):
     return next_ascendant_entry_date(jd, place, direction=-1, increment_days=increment_days, precision=precision, raasi=raasi,divisional_chart_factor=divisional_chart_factor)
+""" Upper bound of daily motion (degrees/day) of planets, used to size the steps of crossing searches """
+_max_daily_motion = {const._SUN:1.02, const._MOON:15.4, const._MARS:0.8, const._MERCURY:2.25, const._JUPITER:0.25,
+                     const._VENUS:1.27, const._SATURN:0.14, const._RAHU:0.06, const._KETU:0.06, swe.URANUS:0.07,
+                     swe.NEPTUNE:0.04, swe.PLUTO:0.05, const._ascendant_symbol:1440.0}
+def max_daily_motion(planet,safety_factor=1.25):
+    """ @param planet: swiss ephemeris planet id (const._SUN etc) or const._ascendant_symbol """
+    return _max_daily_motion.get(planet,2.0)*safety_factor
+def next_angle_crossing(longitude_func,jd,target_longitude,direction=1,max_speed=1.0,min_step=0.01,period=360.0):
+    """
+        Find the first time from jd (forward or backward) at which longitude_func crosses target_longitude
+        Steps are sized by the distance to the target and max_speed (upper bound of the daily motion), so
+        a crossing (including retrograde back and forth crossings) can not be stepped over. The bracketed
+        crossing is then refined with Brent's method over the longitude alone.
+        @param longitude_func: function jd => longitude in degrees
+        @param jd: julian day number to start the search from
+        @param target_longitude: longitude (degrees) to be crossed
+        @param direction: 1 = next crossing, -1 = previous crossing
+        @param max_speed: upper bound of |daily motion| of longitude_func in degrees/day
+        @param min_step: smallest step in days
+        @param period: target_longitude is repeated every period degrees
+            Example: period=30 and target_longitude=0 finds the next crossing of any raasi boundary
+        @return: julian day number of the crossing
+    """
+    half_period = period/2.0
+    diff = lambda t: (longitude_func(t) - target_longitude + half_period) % period - half_period
+    t0 = jd; f0 = diff(t0)
+    while f0 != 0:
+        t1 = t0 + direction*max(abs(f0)/max_speed,min_step); f1 = diff(t1)
+        if (f0 < 0) != (f1 < 0) and abs(f1-f0) < half_period: # True crossing and not the wrap around
+            return utils.brent_root(diff,t0,t1,f0,f1,xtol=1e-8)
+        t0,f0 = t1,f1
+    return t0
+
 def next_ascendant_entry_date(jd,place,direction=1,precision=1.0,raasi=None,divisional_chart_factor=1):
     """
         get the date when the ascendant enters a zodiac
         @param panchanga_date: Date struct (y,m,d)
         @param panchanga_place: Place struct ('place',latitude,longitude,timezone)
         @param direction: 1= next entry, -1 previous entry
-        @param precision: precision in degrees within which longitude entry whould be (default: 1.0 degrees)
+        @param precision: Not used. Entry time is found by root finding (see next_angle_crossing)
         @param raasi: raasi at which planet should enter. 
             If raasi==None: gives entry to next constellation
             If raasi is specified [1..12] gives entry to specified constellation/raasi
         @return Julian day number of planet entry into zodiac
     """
     _DEBUG_ = False
-    increment_days = 1.0/24.0/60.0/divisional_chart_factor # For moon/lagna increment days in minutes
+    min_step = 1.0/24.0/60.0/divisional_chart_factor # For moon/lagna increment days in minutes
     sla = ascendant(jd, place); sl = sla[0]*30+sla[1]
     if raasi==None:
         multiple = (((sl*divisional_chart_factor//30)+1)%12)*30
@@ -2604,22 +2937,11 @@ def next_ascendant_entry_date(jd,place,direction=1,precision=1.0,raasi=None,divi
     else: 
         multiple = (raasi-1)*30
     if _DEBUG_: print(utils.jd_to_gregorian(jd),'sla',sla,'multiple',multiple,'precision',precision)
-    while True:
-        if sl < (multiple+precision) and sl>(multiple-precision):
-            break
-        jd += increment_days*direction
-        sla = ascendant(jd, place); sl = (sla[0]*30+sla[1])*divisional_chart_factor%360
-        if _DEBUG_: print('sl',sl,utils.jd_to_gregorian(jd),'multiple',multiple)
-    offsets = [t*increment_days for t in range(-10,10)] 
-    asc_longs = []
-    for t in offsets:
-        sla = ascendant(jd+t, place); sl = (sla[0]*30+sla[1])*divisional_chart_factor%360
-        asc_longs.append(sl)
-    if _DEBUG_: print(offsets,asc_longs,multiple)
-    asc_hour = utils.inverse_lagrange(offsets, asc_longs, multiple) # Do not move % 360 above
-    #asc_hour /= divisional_chart_factor
-    jd += asc_hour
-    sla = ascendant(jd, place); asc_long = (sla[0]*30+sla[1])*divisional_chart_factor%360
+    def _asc_long(t):
+        sla = ascendant(t, place); return (sla[0]*30+sla[1])*divisional_chart_factor%360
+    jd = next_angle_crossing(_asc_long, jd, multiple, direction=direction, min_step=min_step,
+                             max_speed=max_daily_motion(const._ascendant_symbol)*divisional_chart_factor)
+    asc_long = _asc_long(jd)
     if _DEBUG_: print('JD',utils.jd_to_gregorian(jd),'asc long',asc_long)
     return jd,asc_long
 def next_planet_entry_date(planet,jd,place,direction=1,increment_days=0.01,precision=0.1,raasi=None):
@@ -2629,8 +2951,8 @@ def next_planet_entry_date(planet,jd,place,direction=1,increment_days=0.01,preci
         @param panchanga_date: Date struct (y,m,d)
         @param panchanga_place: Place struct ('place',latitude,longitude,timezone)
         @param direction: 1= next entry, -1 previous entry
-        @param increment_days: incremental steps in days algorithm to check for entry (Default=1 day)
-        @param precision: precision in degrees within which longitude entry whould be (default: 0.1 degrees)
+        @param increment_days: smallest search step in days (steps are sized by maximum daily motion of the planet)
+        @param precision: Not used. Entry time is found by root finding (see next_angle_crossing)
         @param raasi: raasi at which planet should enter. 
             If raasi==None: gives entry to next constellation
             If raasi is specified [1..12] gives entry to specified constellation/raasi
@@ -2638,7 +2960,7 @@ def next_planet_entry_date(planet,jd,place,direction=1,increment_days=0.01,preci
     """
     if planet == const._ascendant_symbol:
         return next_ascendant_entry_date(jd, place, direction=direction, precision=1.0, raasi=raasi)
-    pl = planet_list[planet] if isinstance(planet,int) else const._ascendant_symbol
+    pl = active_planet_list()[planet] if isinstance(planet,int) else const._ascendant_symbol
     if pl==const._ascendant_symbol or pl==const._MOON: increment_days = 1.0/24.0/60.0 # For moon/lagna increment days in minutes
     if pl==const._KETU:
         raghu_raasi = (raasi-1+6)%12+1 if raasi!=None else raasi
@@ -2660,35 +2982,10 @@ def next_planet_entry_date(planet,jd,place,direction=1,increment_days=0.01,preci
                 multiple = ((sl//30+1)%12*30)%360
     else: 
         multiple = (raasi-1)*30
-    while True:
-        if sl < (multiple+precision) and sl>(multiple-precision):
-            break
-        jd += increment_days*direction; jd_utc = jd - place.timezone/24.0
-        if planet==const._ascendant_symbol:
-            sla = ascendant(jd, place); sl = sla[0]*30+sla[1]
-        else:
-            sl = sidereal_longitude(jd_utc,pl)
-    sank_date = jd_to_gregorian(jd_utc)
-    sank_sunrise = sunrise(jd_utc,place)[2]
-    sank_date = Date(sank_date[0],sank_date[1],sank_date[2])
-    offsets = [0.0, 0.25, 0.5, 0.75, 1.0] 
-    planet_longs = []
-    for t in offsets:
-        if planet==const._ascendant_symbol:
-            sla = ascendant(sank_sunrise+t, place); sl = sla[0]*30+sla[1]
-        else:
-            sl = sidereal_longitude(sank_sunrise+t,pl)
-        planet_longs.append(sl)
-    planet_hour = utils.inverse_lagrange(offsets, planet_longs, multiple) # Do not move % 360 above
-    sank_jd_utc = utils.gregorian_to_jd(sank_date)
-    planet_hour1 = (sank_sunrise + planet_hour - sank_jd_utc)*24+place.timezone
-    sank_jd_utc += planet_hour1/24.0
-    if planet==const._ascendant_symbol:
-        sla = ascendant(sank_jd_utc-place.timezone/24, place); planet_long = sla[0]*30+sla[1]
-    else:
-        planet_long = sidereal_longitude(sank_jd_utc-place.timezone/24,pl)
-    y,m,d,fh = jd_to_gregorian(sank_jd_utc); sank_date = Date(y,m,d); planet_hour1 = fh
-    return sank_jd_utc,planet_long
+    entry_jd_utc = next_angle_crossing(lambda t: sidereal_longitude(t,pl), jd_utc, multiple, direction=direction,
+                                       max_speed=max_daily_motion(pl), min_step=increment_days)
+    planet_long = float(multiple) # longitude at the entry is the raasi boundary itself
+    return entry_jd_utc + place.timezone/24.0,planet_long
 def next_planet_retrograde_change_date(planet,panchanga_date,place,increment_days=1,direction=1):
     """
         get the date when a retrograde planet changes its direction
@@ -2701,14 +2998,15 @@ def next_planet_retrograde_change_date(planet,panchanga_date,place,increment_day
     """
     def _get_planet_longitude_sign(planet,jd):
         flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | _rise_flags
-        set_ayanamsa_mode(_ayanamsa_mode,_ayanamsa_value,jd)
-        longi,_ = swe.calc_ut(jd, pl, flags = flags)
+        with _ephemeris_lock:
+            set_ayanamsa_mode(*_current_ayanamsa(),jd)
+            longi,_ = swe.calc_ut(jd, pl, flags = flags)
         sl_sign = 1
         if longi[3] < 0: sl_sign = -1
         return sl_sign
     if planet not in [*range(2,7)]: return 
     jd = utils.gregorian_to_jd(panchanga_date)
-    jd_utc = jd - place.timezone/24.0; pl = planet_list[planet]
+    jd_utc = jd - place.timezone/24.0; pl = active_planet_list()[planet]
     sl_sign = _get_planet_longitude_sign(pl, jd_utc); sl_sign_next = sl_sign
     while sl_sign == sl_sign_next:
         jd_utc += increment_days*direction
@@ -3037,7 +3335,7 @@ def special_thaara(jd,place,from_lagna_or_moon=0):
 def karaka_tithi(jd,place):
     pp = [['L',(0,-10)]]+dhasavarga(jd, place) # Dummy Lagna Positions added
     from jhora.horoscope.chart import house
-    ks = house.chara_karakas(pp); p1 = planet_list[ks[1]];p2 = planet_list[ks[0]]
+    ks = house.chara_karakas(pp); p1 = active_planet_list()[ks[1]];p2 = active_planet_list()[ks[0]]
     kt = tithi(jd, place, tithi_index=1, planet1=p1, planet2=p2)
     return kt
 def karaka_yogam(jd,place):
@@ -3052,7 +3350,7 @@ def karaka_yogam(jd,place):
     """
     pp = [['L',(0,-10)]]+dhasavarga(jd, place) # Dummy Lagna Positions added
     from jhora.horoscope.chart import house
-    ks = house.chara_karakas(pp); p1 = planet_list[ks[1]];p2 = planet_list[ks[0]]
+    ks = house.chara_karakas(pp); p1 = active_planet_list()[ks[1]];p2 = active_planet_list()[ks[0]]
     return yogam(jd, place, tithi_index=1, planet1=p1, planet2=p2, cycle=1)
     _yoga = _get_yogam(jd, place,planet1=p1,planet2=p2)
     _yoga_prev = _get_yogam(jd-1, place,planet1=p1,planet2=p2)
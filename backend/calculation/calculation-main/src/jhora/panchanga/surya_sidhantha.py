@@ -175,7 +175,7 @@ def ascendant(jd, place:drik.Place, sun_long):
         flags = swe.FLG_SWIEPH
     else:
         flags = swe.FLG_SIDEREAL
-        drik.set_ayanamsa_mode(drik._ayanamsa_mode,drik._ayanamsa_value,jd) # needed for swe.houses_ex()
+        drik.set_ayanamsa_mode(*drik._current_ayanamsa(),jd) # needed for swe.houses_ex()
     nak_no,paadha_no,_ = drik.nakshatra_pada(asc_long)
     return [const._ascendant_symbol,[asc_rasi,asc_coordinates]]#,nak_no,paadha_no]
 def _mandaphala_planet_new(jd,planet):
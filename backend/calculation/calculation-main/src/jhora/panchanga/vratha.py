@@ -160,6 +160,14 @@ def pradosham_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None
         if panchanga_end_date==None:
             return special_vratha_dates
     return special_vratha_dates
+def _scan_dates(panchanga_place,start_date,end_date,panchanga_type,index_list,panchanga_end_date):
+    """ Dates between start_date and end_date on which any of the indices may prevail (see panchanga.panchanga_scan)
+        None when only the next date is searched (panchanga_end_date=None): that is usually found within a month
+        by checking every day, while the scan computes whole years """
+    if panchanga_end_date is None:
+        return None
+    scan = panchanga.panchanga_scan(panchanga_place, start_date, end_date)
+    return panchanga.panchanga_scan_dates(scan, panchanga_type, index_list)
 def tithi_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,tithi_index_list=None,tag_t=''):
     """ TODO For Amavasya select Date that has amavasya spreads in the afternoon """ 
     jd = utils.julian_day_number(panchanga_start_date, (6.5,0,0))
@@ -178,9 +186,13 @@ def tithi_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,tit
     skip_days = 14
     if len(tithi_index_list) > 1:
         skip_days = 1
+    scan_dates = _scan_dates(panchanga_place, _start_date, _end_date, 'tithi', tithi_index_list, panchanga_end_date)
     while cur_jd < end_jd:
-        cur_tithi = panchanga.tithi(cur_jd, panchanga_place)
         cur_date = panchanga.jd_to_gregorian(cur_jd)[0:3]
+        if scan_dates is not None and cur_date not in scan_dates: # None of the tithis prevail on this day
+            cur_jd += 1
+            continue
+        cur_tithi = panchanga.tithi(cur_jd, panchanga_place)
         if cur_tithi[0] in tithi_index_list:
             #print('cur tithi',cur_date,cur_tithi,len(cur_tithi))
             starts_at = cur_tithi[1]
@@ -219,9 +231,13 @@ def nakshathra_dates(panchanga_place,panchanga_start_date,panchanga_end_date=Non
     skip_days = 26
     if len(nakshathra_index_list) > 1:
         skip_days = 1
+    scan_dates = _scan_dates(panchanga_place, _start_date, _end_date, 'nakshatra', nakshathra_index_list, panchanga_end_date)
     while cur_jd < end_jd:
-        current_nakshathra = panchanga.nakshatra(cur_jd, panchanga_place)
         cur_date = panchanga.jd_to_gregorian(cur_jd)[0:3]
+        if scan_dates is not None and cur_date not in scan_dates: # None of the nakshathras prevail on this day
+            cur_jd += 1
+            continue
+        current_nakshathra = panchanga.nakshatra(cur_jd, panchanga_place)
         if current_nakshathra[0] in nakshathra_index_list and cur_date not in special_vratha_dates:
             starts_at = current_nakshathra[1]
             ends_at = current_nakshathra[2]
@@ -252,9 +268,13 @@ def yoga_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,yoga
     skip_days = 26
     if len(yoga_index_list) > 0:
         skip_days = 1
+    scan_dates = _scan_dates(panchanga_place, _start_date, _end_date, 'yogam', yoga_index_list, panchanga_end_date)
     while cur_jd < end_jd:
-        cur_yoga = panchanga.yogam(cur_jd, panchanga_place)
         cur_date = panchanga.jd_to_gregorian(cur_jd)[0:3]
+        if scan_dates is not None and cur_date not in scan_dates: # None of the yogas prevail on this day
+            cur_jd += 1
+            continue
+        cur_yoga = panchanga.yogam(cur_jd, panchanga_place)
         if cur_yoga[0] in yoga_index_list:
             ends_at = cur_yoga[1]; tag = utils.YOGAM_LIST[cur_yoga[0]-1] +' '+res['yogam_str']
             if tag_y not in tag: tag += tag_y
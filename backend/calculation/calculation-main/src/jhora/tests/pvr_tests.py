@@ -2979,7 +2979,7 @@ def planet_transit_tests():
     expected_results = [[(1996,12,15),'17:38:13 PM','240° 0’ 0"',8,'17:38:10 PM'],[(1996,12,9),'03:46:39 AM','210° 0’ 0"',7,'03:46:39 AM'],
                         [(1996,12,17),'17:37:35 PM','150° 0’ 0"',5,'17:37:27 PM'],[(1997,2,5),'01:17:28 AM','270° 0’ 0"',9,'01:17:26 AM'],
                         [(1996,12,26),'07:08:27 AM','270° 0’ 0"',9,'07:08:12 AM'],[(1996,12,12),'11:44:47 AM','210° 0’ 0"',7,'11:44:44 AM'],
-                        [(1998,4,17),'11:40:07 AM','360° 0’ 0"',0,'11:39:41 AM'],[(1997,6,24),'14:21:37 PM','150° 0’ 0"',5,'14:22:40 PM'],
+                        [(1998,4,17),'11:40:07 AM','0° 0’ 0"',0,'11:39:41 AM'],[(1997,6,24),'14:21:37 PM','150° 0’ 0"',5,'14:22:40 PM'],
                         [(1997,6,24),'14:21:37 PM','330° 0’ 0"',11,'14:22:40 PM']]
     for planet in range(9):
         p_str = "Next transit of "+utils.PLANET_NAMES[planet]
@@ -3011,13 +3011,13 @@ def planet_transit_tests():
     exercise = "Entry to specific rasi "
     exp_results = {0: {1: [((1997, 4, 13), '22:42:10 PM'), ((1996, 4, 13), '16:35:29 PM')], 2: [((1997, 5, 14), '19:37:59 PM'), ((1996, 5, 14), '13:30:14 PM')], 3: [((1997, 6, 15), '02:17:42 AM'), ((1996, 6, 14), '20:08:52 PM')], 4: [((1997, 7, 16), '13:12:18 PM'), ((1996, 7, 16), '07:02:33 AM')], 5: [((1997, 8, 16), '21:36:52 PM'), ((1996, 8, 16), '15:26:34 PM')], 6: [((1997, 9, 16), '21:32:20 PM'), ((1996, 9, 16), '15:21:37 PM')], 7: [((1997, 10, 17), '09:28:58 AM'), ((1996, 10, 17), '03:17:07 AM')], 8: [((1997, 11, 16), '09:16:41 AM'), ((1996, 11, 16), '03:02:36 AM')], 9: [((1996, 12, 15), '17:38:13 PM'), ((1995, 12, 16), '11:35:10 AM')], 10: [((1997, 1, 14), '04:19:20 AM'), ((1996, 1, 14), '22:15:18 PM')], 11: [((1997, 2, 12), '17:16:54 PM'), ((1996, 2, 13), '11:11:54 AM')], 12: [((1997, 3, 14), '14:09:54 PM'), ((1996, 3, 14), '08:04:04 AM')]}, 
                    1: {1: [((1996, 12, 19), '16:31:11 PM'), ((1996, 11, 22), '10:44:21 AM')], 2: [((1996, 12, 21), '23:16:27 PM'), ((1996, 11, 24), '16:30:37 PM')], 3: [((1996, 12, 24), '07:50:15 AM'), ((1996, 11, 27), '00:18:17 AM')], 4: [((1996, 12, 26), '18:20:18 PM'), ((1996, 11, 29), '10:39:34 AM')], 5: [((1996, 12, 29), '06:39:56 AM'), ((1996, 12, 1), '23:06:44 PM')], 6: [((1996, 12, 31), '19:36:03 PM'), ((1996, 12, 4), '11:38:54 AM')], 7: [((1997, 1, 3), '06:46:03 AM'), ((1996, 12, 6), '21:39:25 PM')], 8: [((1996, 12, 9), '03:46:39 AM'), ((1996, 11, 11), '18:08:36 PM')], 9: [((1996, 12, 11), '06:32:45 AM'), ((1996, 11, 13), '21:45:29 PM')], 10: [((1996, 12, 13), '07:38:24 AM'), ((1996, 11, 16), '00:19:21 AM')], 11: [((1996, 12, 15), '08:54:37 AM'), ((1996, 11, 18), '02:58:23 AM')], 12: [((1996, 12, 17), '11:41:54 AM'), ((1996, 11, 20), '06:20:53 AM')]}, 
-                   2: {1: [((1998, 4, 5), '00:54:59 AM'), ((1996, 4, 24), '18:41:06 PM')], 2: [((1998, 5, 15), '18:03:16 PM'), ((1996, 6, 4), '05:24:24 AM')], 3: [((1998, 6, 27), '12:36:52 PM'), ((1996, 7, 16), '20:49:43 PM')], 4: [((1998, 8, 11), '12:06:25 PM'), ((1996, 8, 31), '06:28:45 AM')], 5: [((1998, 9, 27), '17:23:29 PM'), ((1996, 10, 19), '13:41:23 PM')], 6: [((1996, 12, 17), '17:37:35 PM'), ((1995, 7, 10), '21:44:27 PM')], 7: [((1997, 8, 4), '07:51:28 AM'), ((1995, 8, 29), '00:42:52 AM')], 8: [((1997, 9, 20), '05:01:59 AM'), ((1995, 10, 12), '08:35:42 AM')], 9: [((1997, 11, 1), '04:26:54 AM'), ((1995, 11, 22), '13:42:32 PM')], 10: [((1997, 12, 10), '13:44:34 PM'), ((1995, 12, 31), '17:52:36 PM')], 11: [((1998, 1, 17), '18:54:20 PM'), ((1996, 2, 7), '21:01:04 PM')], 12: [((1998, 2, 24), '23:03:20 PM'), ((1996, 3, 16), '22:06:55 PM')]}, 
-                   3: {1: [((1997, 3, 28), '19:42:38 PM'), ((1996, 4, 5), '06:54:39 AM')], 2: [((1997, 6, 5), '11:48:45 AM'), ((1996, 6, 7), '16:13:46 PM')], 3: [((1997, 6, 21), '05:52:11 AM'), ((1996, 6, 29), '10:23:45 AM')], 4: [((1997, 7, 5), '06:48:53 AM'), ((1996, 7, 13), '16:29:45 PM')], 5: [((1997, 7, 22), '17:00:52 PM'), ((1996, 7, 29), '04:25:17 AM')], 6: [((1997, 9, 29), '00:04:22 AM'), ((1996, 10, 4), '18:10:34 PM')], 7: [((1997, 10, 16), '00:29:51 AM'), ((1996, 10, 23), '14:24:39 PM')], 8: [((1997, 11, 3), '20:13:15 PM'), ((1996, 11, 10), '22:52:48 PM')], 9: [((1997, 11, 25), '04:26:36 AM'), ((1996, 11, 30), '13:41:10 PM')], 10: [((1997, 2, 5), '01:17:28 AM'), ((1996, 2, 9), '05:11:13 AM')], 11: [((1997, 2, 24), '18:15:05 PM'), ((1996, 3, 3), '19:09:13 PM')], 12: [((1997, 3, 13), '06:20:21 AM'), ((1996, 3, 21), '07:53:10 AM')]}, 
+                   2: {1: [((1998, 4, 5), '00:56:33 AM'), ((1996, 4, 24), '18:41:05 PM')], 2: [((1998, 5, 15), '18:03:16 PM'), ((1996, 6, 4), '05:24:24 AM')], 3: [((1998, 6, 27), '12:36:52 PM'), ((1996, 7, 16), '20:49:43 PM')], 4: [((1998, 8, 11), '12:06:25 PM'), ((1996, 8, 31), '06:28:45 AM')], 5: [((1998, 9, 27), '17:23:29 PM'), ((1996, 10, 19), '13:41:23 PM')], 6: [((1996, 12, 17), '17:37:35 PM'), ((1995, 7, 10), '21:44:27 PM')], 7: [((1997, 8, 4), '07:51:28 AM'), ((1995, 8, 29), '00:42:52 AM')], 8: [((1997, 9, 20), '05:01:59 AM'), ((1995, 10, 12), '08:35:42 AM')], 9: [((1997, 11, 1), '04:26:54 AM'), ((1995, 11, 22), '13:42:32 PM')], 10: [((1997, 12, 10), '13:44:34 PM'), ((1995, 12, 31), '17:52:36 PM')], 11: [((1998, 1, 17), '18:54:20 PM'), ((1996, 2, 7), '21:01:04 PM')], 12: [((1998, 2, 24), '23:03:20 PM'), ((1996, 3, 16), '22:06:55 PM')]}, 
+                   3: {1: [((1997, 3, 28), '19:42:31 PM'), ((1996, 4, 5), '06:54:39 AM')], 2: [((1997, 6, 5), '11:48:45 AM'), ((1996, 6, 7), '16:13:46 PM')], 3: [((1997, 6, 21), '05:52:11 AM'), ((1996, 6, 29), '10:23:45 AM')], 4: [((1997, 7, 5), '06:48:53 AM'), ((1996, 7, 13), '16:29:45 PM')], 5: [((1997, 7, 22), '17:00:52 PM'), ((1996, 7, 29), '04:25:17 AM')], 6: [((1997, 9, 29), '00:04:22 AM'), ((1996, 10, 4), '18:10:34 PM')], 7: [((1997, 10, 16), '00:29:51 AM'), ((1996, 10, 23), '14:24:39 PM')], 8: [((1997, 11, 3), '20:13:15 PM'), ((1996, 11, 10), '22:52:48 PM')], 9: [((1997, 11, 25), '04:26:36 AM'), ((1996, 11, 30), '13:41:10 PM')], 10: [((1997, 2, 5), '01:17:28 AM'), ((1996, 2, 9), '05:11:13 AM')], 11: [((1997, 2, 24), '18:15:05 PM'), ((1996, 3, 3), '19:09:13 PM')], 12: [((1997, 3, 13), '06:20:21 AM'), ((1996, 3, 21), '07:53:10 AM')]}, 
                    4: {1: [((1999, 5, 26), '15:43:55 PM'), ((1988, 2, 3), '01:52:00 AM')], 2: [((2000, 6, 2), '18:12:29 PM'), ((1988, 6, 19), '22:16:53 PM')], 3: [((2001, 6, 16), '06:35:20 AM'), ((1989, 7, 2), '04:48:35 AM')], 4: [((2002, 7, 5), '11:30:09 AM'), ((1990, 7, 20), '22:51:07 PM')], 5: [((2003, 7, 30), '11:03:33 AM'), ((1991, 8, 14), '14:45:51 PM')], 6: [((2004, 8, 27), '22:45:35 PM'), ((1992, 9, 11), '17:54:36 PM')], 7: [((2005, 9, 28), '04:41:51 AM'), ((1993, 10, 12), '17:35:21 PM')], 8: [((2006, 10, 27), '21:26:38 PM'), ((1994, 11, 11), '11:23:40 AM')], 9: [((2007, 11, 22), '04:12:29 AM'), ((1995, 12, 7), '06:04:36 AM')], 10: [((1996, 12, 26), '07:08:27 AM'), ((1985, 1, 10), '13:45:55 PM')], 11: [((1998, 1, 8), '15:03:03 PM'), ((1986, 1, 25), '06:11:36 AM')], 12: [((1998, 5, 26), '03:34:14 AM'), ((1987, 2, 3), '00:20:49 AM')]}, 
-                   5: {1: [((1997, 4, 11), '15:08:35 PM'), ((1996, 2, 29), '19:23:33 PM')], 2: [((1997, 5, 5), '22:06:36 PM'), ((1996, 3, 28), '14:05:46 PM')], 3: [((1997, 5, 30), '08:24:28 AM'), ((1996, 7, 30), '15:59:18 PM')], 4: [((1997, 6, 23), '22:00:40 PM'), ((1996, 9, 1), '13:04:37 PM')], 5: [((1997, 7, 18), '15:39:10 PM'), ((1996, 9, 28), '23:25:03 PM')], 6: [((1997, 8, 12), '15:20:07 PM'), ((1996, 10, 24), '13:47:36 PM')], 7: [((1997, 9, 7), '00:33:47 AM'), ((1996, 11, 18), '06:18:39 AM')], 8: [((1996, 12, 12), '11:44:47 AM'), ((1995, 10, 29), '16:00:57 PM')], 9: [((1997, 1, 5), '12:16:00 PM'), ((1995, 11, 22), '18:57:34 PM')], 10: [((1997, 1, 29), '11:14:26 AM'), ((1995, 12, 16), '23:24:18 PM')], 11: [((1997, 2, 22), '10:32:10 AM'), ((1996, 1, 10), '08:03:44 AM')], 12: [((1997, 3, 18), '11:28:51 AM'), ((1996, 2, 4), '02:49:58 AM')]}, 
-                   6: {1: [((1998, 4, 17), '11:40:07 AM'), ((1969, 3, 7), '14:07:15 PM')], 2: [((2000, 6, 6), '23:34:39 PM'), ((1971, 4, 28), '08:59:08 AM')], 3: [((2002, 7, 23), '06:47:53 AM'), ((1973, 6, 10), '17:56:30 PM')], 4: [((2004, 9, 6), '03:13:41 AM'), ((1975, 7, 23), '15:17:52 PM')], 5: [((2006, 11, 1), '05:55:32 AM'), ((1906, 12, 5), '15:56:32 PM')], 6: [((2009, 9, 9), '22:34:07 PM'), ((1980, 7, 27), '08:05:16 AM')], 7: [((2011, 11, 15), '08:44:25 AM'), ((1982, 10, 6), '05:01:28 AM')], 8: [((2014, 11, 2), '19:24:10 PM'), ((1985, 9, 17), '03:44:18 AM')], 9: [((2017, 1, 26), '18:01:45 PM'), ((1987, 12, 17), '01:20:28 AM')], 10: [((2020, 1, 24), '08:24:53 AM'), ((1990, 12, 14), '23:38:09 PM')], 11: [((2022, 4, 29), '06:29:37 AM'), ((1993, 11, 10), '03:56:55 AM')], 12: [((2025, 3, 29), '20:17:12 PM'), ((1996, 2, 16), '16:53:11 PM')]}, 
-                   7: {1: [((2005, 3, 25), '05:07:48 AM'), ((1986, 8, 18), '17:42:01 PM')], 2: [((2003, 9, 6), '02:10:30 AM'), ((1985, 1, 29), '14:45:01 PM')], 3: [((2002, 2, 16), '23:13:15 PM'), ((1983, 7, 13), '11:48:03 AM')], 4: [((2000, 7, 30), '20:16:01 PM'), ((1981, 12, 24), '08:51:07 AM')], 5: [((1999, 1, 11), '17:18:48 PM'), ((1980, 6, 6), '05:54:11 AM')], 6: [((1997, 6, 24), '14:21:37 PM'), ((1978, 11, 18), '02:57:17 AM')], 7: [((2014, 7, 12), '22:51:57 PM'), ((1995, 12, 6), '11:24:28 AM')], 8: [((2012, 12, 23), '19:54:32 PM'), ((1994, 5, 19), '08:27:20 AM')], 9: [((2011, 6, 6), '16:57:09 PM'), ((1992, 10, 30), '05:30:14 AM')], 10: [((2009, 11, 17), '13:59:46 PM'), ((1991, 4, 13), '02:33:09 AM')], 11: [((2008, 4, 30), '11:02:25 AM'), ((1989, 9, 23), '23:36:05 PM')], 12: [((2006, 10, 12), '08:05:06 AM'), ((1988, 3, 6), '20:39:03 PM')]},
-                   8: {7: [((2005, 3, 25), '05:07:48 AM'), ((1986, 8, 18), '17:42:01 PM')], 8: [((2003, 9, 6), '02:10:30 AM'), ((1985, 1, 29), '14:45:01 PM')], 9: [((2002, 2, 16), '23:13:15 PM'), ((1983, 7, 13), '11:48:03 AM')], 10: [((2000, 7, 30), '20:16:01 PM'), ((1981, 12, 24), '08:51:07 AM')], 11: [((1999, 1, 11), '17:18:48 PM'), ((1980, 6, 6), '05:54:11 AM')], 12: [((1997, 6, 24), '14:21:37 PM'), ((1978, 11, 18), '02:57:17 AM')], 1: [((2014, 7, 12), '22:51:57 PM'), ((1995, 12, 6), '11:24:28 AM')], 2: [((2012, 12, 23), '19:54:32 PM'), ((1994, 5, 19), '08:27:20 AM')], 3: [((2011, 6, 6), '16:57:09 PM'), ((1992, 10, 30), '05:30:14 AM')], 4: [((2009, 11, 17), '13:59:46 PM'), ((1991, 4, 13), '02:33:09 AM')], 5: [((2008, 4, 30), '11:02:25 AM'), ((1989, 9, 23), '23:36:05 PM')], 6: [((2006, 10, 12), '08:05:06 AM'), ((1988, 3, 6), '20:39:03 PM')]}
+                   5: {1: [((1997, 4, 11), '15:08:35 PM'), ((1996, 2, 29), '19:23:32 PM')], 2: [((1997, 5, 5), '22:06:36 PM'), ((1996, 3, 28), '14:05:46 PM')], 3: [((1997, 5, 30), '08:24:28 AM'), ((1996, 7, 30), '15:59:18 PM')], 4: [((1997, 6, 23), '22:00:40 PM'), ((1996, 9, 1), '13:04:37 PM')], 5: [((1997, 7, 18), '15:39:10 PM'), ((1996, 9, 28), '23:25:03 PM')], 6: [((1997, 8, 12), '15:20:07 PM'), ((1996, 10, 24), '13:47:36 PM')], 7: [((1997, 9, 7), '00:33:47 AM'), ((1996, 11, 18), '06:18:39 AM')], 8: [((1996, 12, 12), '11:44:47 AM'), ((1995, 10, 29), '16:00:57 PM')], 9: [((1997, 1, 5), '12:16:00 PM'), ((1995, 11, 22), '18:57:34 PM')], 10: [((1997, 1, 29), '11:14:26 AM'), ((1995, 12, 16), '23:24:18 PM')], 11: [((1997, 2, 22), '10:32:10 AM'), ((1996, 1, 10), '08:03:44 AM')], 12: [((1997, 3, 18), '11:28:51 AM'), ((1996, 2, 4), '02:49:58 AM')]}, 
+                   6: {1: [((1998, 4, 17), '11:40:07 AM'), ((1969, 3, 7), '14:07:15 PM')], 2: [((2000, 6, 6), '23:34:39 PM'), ((1971, 4, 28), '08:59:08 AM')], 3: [((2002, 7, 23), '06:47:53 AM'), ((1973, 6, 10), '17:56:30 PM')], 4: [((2004, 9, 6), '03:13:41 AM'), ((1975, 7, 23), '15:17:52 PM')], 5: [((2006, 11, 1), '05:55:33 AM'), ((1977, 9, 7), '09:51:20 AM')], 6: [((2009, 9, 9), '22:34:07 PM'), ((1980, 7, 27), '08:05:16 AM')], 7: [((2011, 11, 15), '08:44:25 AM'), ((1982, 10, 6), '05:01:28 AM')], 8: [((2014, 11, 2), '19:24:10 PM'), ((1985, 9, 17), '03:44:18 AM')], 9: [((2017, 1, 26), '18:01:45 PM'), ((1987, 12, 17), '01:20:28 AM')], 10: [((2020, 1, 24), '08:24:53 AM'), ((1990, 12, 14), '23:38:09 PM')], 11: [((2022, 4, 29), '06:29:37 AM'), ((1993, 11, 10), '03:46:35 AM')], 12: [((2025, 3, 29), '20:17:12 PM'), ((1996, 2, 16), '16:53:11 PM')]}, 
+                   7: {1: [((2005, 3, 25), '05:07:48 AM'), ((1986, 8, 18), '17:42:01 PM')], 2: [((2003, 9, 6), '02:10:30 AM'), ((1985, 1, 29), '14:45:01 PM')], 3: [((2002, 2, 16), '23:13:15 PM'), ((1983, 7, 13), '11:48:03 AM')], 4: [((2000, 7, 30), '20:16:01 PM'), ((1981, 12, 24), '08:51:06 AM')], 5: [((1999, 1, 11), '17:18:48 PM'), ((1980, 6, 6), '05:54:11 AM')], 6: [((1997, 6, 24), '14:21:37 PM'), ((1978, 11, 18), '02:57:17 AM')], 7: [((2014, 7, 12), '22:51:57 PM'), ((1995, 12, 6), '11:24:28 AM')], 8: [((2012, 12, 23), '19:54:32 PM'), ((1994, 5, 19), '08:27:20 AM')], 9: [((2011, 6, 6), '16:57:09 PM'), ((1992, 10, 30), '05:30:14 AM')], 10: [((2009, 11, 17), '13:59:46 PM'), ((1991, 4, 13), '02:33:09 AM')], 11: [((2008, 4, 30), '11:02:25 AM'), ((1989, 9, 23), '23:36:05 PM')], 12: [((2006, 10, 12), '08:05:06 AM'), ((1988, 3, 6), '20:39:03 PM')]},
+                   8: {7: [((2005, 3, 25), '05:07:48 AM'), ((1986, 8, 18), '17:42:01 PM')], 8: [((2003, 9, 6), '02:10:30 AM'), ((1985, 1, 29), '14:45:01 PM')], 9: [((2002, 2, 16), '23:13:15 PM'), ((1983, 7, 13), '11:48:03 AM')], 10: [((2000, 7, 30), '20:16:01 PM'), ((1981, 12, 24), '08:51:06 AM')], 11: [((1999, 1, 11), '17:18:48 PM'), ((1980, 6, 6), '05:54:11 AM')], 12: [((1997, 6, 24), '14:21:37 PM'), ((1978, 11, 18), '02:57:17 AM')], 1: [((2014, 7, 12), '22:51:57 PM'), ((1995, 12, 6), '11:24:28 AM')], 2: [((2012, 12, 23), '19:54:32 PM'), ((1994, 5, 19), '08:27:20 AM')], 3: [((2011, 6, 6), '16:57:09 PM'), ((1992, 10, 30), '05:30:14 AM')], 4: [((2009, 11, 17), '13:59:46 PM'), ((1991, 4, 13), '02:33:09 AM')], 5: [((2008, 4, 30), '11:02:25 AM'), ((1989, 9, 23), '23:36:05 PM')], 6: [((2006, 10, 12), '08:05:06 AM'), ((1988, 3, 6), '20:39:03 PM')]}
                 }
 
     for planet in range(9):
@@ -355,8 +355,18 @@ def get_planet_to_house_dict_from_chart(house_to_planet_list):
                 Example: {0:0, 1:1,2:1,...} Sun in Aries, Moon in Tarus, Mars in Gemini etc
                 Last element will be 'L' for Lagna
     """
-    p_to_h = {p:h for p in [*range(9)]+[const._ascendant_symbol] for h,planets in enumerate(house_to_planet_list) if str(p) in planets }
-    return p_to_h
+    house_of = {}
+    for h,planets in enumerate(house_to_planet_list):
+        for token in planets.split('/'):
+            if len(token) != 1:
+                if token == '':
+                    continue
+                # multi character ids (e.g. outer planets) match by substring - use the generic form
+                return {p:h for p in _p_to_h_keys for h,planets in enumerate(house_to_planet_list) if str(p) in planets }
+            house_of[token] = h
+    return {p:house_of[key] for p,key in zip(_p_to_h_keys,_p_to_h_tokens) if key in house_of}
+_p_to_h_keys = [*range(9)]+[const._ascendant_symbol]
+_p_to_h_tokens = [str(p) for p in _p_to_h_keys]
 def get_planet_house_dictionary_from_planet_positions(planet_positions):
     """ 
         Get Planet_to_House Dictionary {p:h}  from Planet_Positions {p:(h,long)}
@@ -636,6 +646,45 @@ def _bisection_search(func, start, stop):
 
   return (right + left) / 2
 
+def brent_root(func, a, b, fa=None, fb=None, xtol=1E-9, max_iter=100):
+  """
+    Brent's method - root of func within the bracket [a,b]
+    func(a) and func(b) must have opposite signs (or one of them is zero)
+    Combines bisection with secant / inverse quadratic interpolation steps
+  """
+  fa = func(a) if fa is None else fa
+  fb = func(b) if fb is None else fb
+  if fa == 0: return a
+  if fb == 0: return b
+  if fa * fb > 0:
+    raise ValueError('brent_root: root is not bracketed by [a,b]')
+  if abs(fa) < abs(fb):
+    a, b, fa, fb = b, a, fb, fa
+  c, fc = a, fa
+  d = e = b - a
+  for _ in range(max_iter):
+    if fb == 0 or abs(b - a) <= xtol: break
+    if fa != fc and fb != fc: # inverse quadratic interpolation
+      s = a*fb*fc/((fa-fb)*(fa-fc)) + b*fa*fc/((fb-fa)*(fb-fc)) + c*fa*fb/((fc-fa)*(fc-fb))
+    else: # secant
+      s = b - fb*(b-a)/(fb-fa)
+    bisect = (not ((3*a+b)/4 < s < b or b < s < (3*a+b)/4)) or \
+             (abs(s-b) >= abs(e)/2) or (abs(e) < xtol)
+    if bisect:
+      s = (a + b) / 2
+      e = d = b - a
+    else:
+      e, d = d, b - s
+    fs = func(s)
+    c, fc = b, fb
+    if fa * fs < 0:
+      b, fb = s, fs
+    else:
+      a, fa = s, fs
+    if abs(fa) < abs(fb):
+      a, b, fa, fb = b, a, fb, fa
+  return b
+
 def inverse_lagrange(x, y, ya):
   """Given two lists x and y, find the value of x = xa when y = ya, i.e., f(xa) = ya"""
   assert(len(x) == len(y))
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from api import agent, events
+
+
+class _StubWebhook:
+    """Local webhook answering 500 to the first `failures` posts of each request id, 200 afterwards"""
+    def __init__(self, failures=1, delay=0.05):
+        self.failures, self.delay = failures, delay
+        self.posts = {}
+        self.active = self.max_active = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                    count = stub.posts[body['rid']] = stub.posts.get(body['rid'], 0) + 1
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.active -= 1
+                self.send_response(500 if count <= stub.failures else 200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/hook'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _dispatcher(url, store, **kwargs):
+    options = dict(workers=4, target_concurrency=2, target_rate=0, base_backoff=0.01, retry_poll=0.02, store=store)
+    options.update(kwargs)
+    return agent.AgentDispatcher(url, **options)
+
+
+def test_dispatcher_limits_target_concurrency_and_retries_from_events_db(tmp_path):
+    stub = _StubWebhook(failures=1)
+    store = events.EventStore(str(tmp_path / 'events.db'))
+    dispatcher = _dispatcher(stub.url, store)
+
+    async def run():
+        try:
+            return await asyncio.gather(*[dispatcher.dispatch(f'req-{i}', {'rid': f'req-{i}'}) for i in range(6)])
+        finally:
+            await dispatcher.stop()
+
+    results = asyncio.run(run())
+    stub.close()
+    assert all(r.success and r.attempts == 2 for r in results)
+    assert stub.max_active <= 2 and all(count == 2 for count in stub.posts.values())
+    listed = store.list_events(limit=10)
+    assert sorted(e['requestId'] for e in listed) == [f'req-{i}' for i in range(6)]
+    assert {(e['status'], e['attempts']) for e in listed} == {('delivered', 2)}
+    assert dispatcher.stats()['retriesScheduled'] == 6
+    store.close()
+
+
+def test_dispatcher_gives_up_after_max_attempts(tmp_path):
+    stub = _StubWebhook(failures=10, delay=0)
+    store = events.EventStore(str(tmp_path / 'events.db'))
+    dispatcher = _dispatcher(stub.url, store, max_attempts=3)
+
+    async def run():
+        try:
+            return await dispatcher.dispatch('req-x', {'rid': 'req-x'})
+        finally:
+            await dispatcher.stop()
+
+    result = asyncio.run(run())
+    stub.close()
+    assert not result.success and result.attempts == 3 and result.detail.startswith('status 500')
+    assert stub.posts == {'req-x': 3}
+    assert [(e['status'], e['attempts']) for e in store.list_events()] == [('failed', 3)]
+    store.close()
+
+
+def test_retries_persisted_before_a_restart_are_resumed(tmp_path):
+    stub = _StubWebhook(failures=0, delay=0)
+    path = str(tmp_path / 'events.db')
+    store = events.EventStore(path)
+    store.record_event('req-r', {'rid': 'req-r'})
+    store.schedule_retry('req-r', 'error', 'status 502', 1, time.time())
+    store.close()
+
+    store = events.EventStore(path)
+    dispatcher = _dispatcher(stub.url, store)
+
+    async def run():
+        await dispatcher.start()
+        for _ in range(200):
+            if dispatcher.stats()['delivered']:
+                break
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+    asyncio.run(run())
+    stub.close()
+    assert stub.posts == {'req-r': 1}
+    assert [(e['status'], e['attempts']) for e in store.list_events()] == [('delivered', 2)]
+    assert store.claim_due_retries() == []
+    store.close()
+
+
+class _FlakyStore(events.EventStore):
+    """Event store whose first `failures` calls of `method` raise"""
+    def __init__(self, path, method, failures):
+        super().__init__(path)
+        self.method, self.failures = method, failures
+
+    def _maybe_fail(self):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError('database is locked')
+
+    def update_event(self, *args):
+        if self.method == 'update_event':
+            self._maybe_fail()
+        super().update_event(*args)
+
+    def claim_due_retries(self, *args):
+        if self.method == 'claim_due_retries':
+            self._maybe_fail()
+        return super().claim_due_retries(*args)
+
+
+def test_unexpected_error_resolves_the_waiters_and_schedules_a_retry(tmp_path):
+    stub = _StubWebhook(failures=0, delay=0)
+    store = _FlakyStore(str(tmp_path / 'events.db'), 'update_event', failures=1)
+    dispatcher = _dispatcher(stub.url, store, retry_poll=0.01)
+
+    async def run():
+        try:
+            first = await asyncio.wait_for(dispatcher.dispatch('req-e', {'rid': 'req-e'}), timeout=5)
+            for _ in range(300):
+                if dispatcher.stats()['delivered']:
+                    break
+                await asyncio.sleep(0.01)
+            return first
+        finally:
+            await dispatcher.stop()
+
+    first = asyncio.run(run())
+    stub.close()
+    assert not first.success and 'database is locked' in first.detail and 'retry scheduled' in first.detail
+    assert stub.posts == {'req-e': 2}
+    assert [(e['status'], e['attempts']) for e in store.list_events()] == [('delivered', 2)]
+    store.close()
+
+
+def test_retry_scheduler_survives_claim_errors(tmp_path):
+    stub = _StubWebhook(failures=0, delay=0)
+    path = str(tmp_path / 'events.db')
+    store = _FlakyStore(path, 'claim_due_retries', failures=3)
+    store.record_event('req-c', {'rid': 'req-c'})
+    store.schedule_retry('req-c', 'error', 'status 502', 1, time.time())
+    dispatcher = _dispatcher(stub.url, store, retry_poll=0.01)
+
+    async def run():
+        await dispatcher.start()
+        for _ in range(300):
+            if dispatcher.stats()['delivered']:
+                break
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+    asyncio.run(run())
+    stub.close()
+    assert store.failures == 0 and stub.posts == {'req-c': 1}
+    assert [(e['status'], e['attempts']) for e in store.list_events()] == [('delivered', 2)]
+    store.close()
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import pathlib
 import sys
 from httpx import AsyncClient
@@ -7,15 +6,14 @@ from httpx import AsyncClient
 sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / 'src'))
 
 from api.app import app
-from api import service
+from api import service, store
 
 
 def test_concurrent_requests_and_persistence(tmp_path, monkeypatch):
     # Isolate persistence to a temp location so tests do not mutate real artifacts
-    persist_path = tmp_path / "horo_requests.json"
-    monkeypatch.setattr(service, "PERSIST_PATH", persist_path)
+    request_store = store.RequestStore(tmp_path / "horo_requests.db")
+    monkeypatch.setattr(service, "_request_store", request_store)
     service._store.clear()
-    service._persisted_requests.clear()
 
     async def _run():
         payload = {
@@ -42,13 +40,14 @@ def test_concurrent_requests_and_persistence(tmp_path, monkeypatch):
             assert etags and len(set(etags)) == 1
 
             async def _writer(idx: int):
-                service.upsert_persisted_request(f"req-{idx}", {"idx": idx})
-                await service.persist_requests()
+                await asyncio.to_thread(service.upsert_persisted_request, f"req-{idx}", {"idx": idx})
 
             await asyncio.gather(*[_writer(i) for i in range(5)])
-            # Final flush to capture all entries after concurrent writes
-            await service.persist_requests()
-
-    asyncio.run(_run())
-    saved = json.loads(persist_path.read_text())
-    assert all(f"req-{i}" in saved for i in range(5))
+            return rid
+
+    rid = asyncio.run(_run())
+    request_store.close()
+    saved = store.RequestStore(tmp_path / "horo_requests.db")
+    assert saved.keys()[0] == rid
+    assert set(saved.keys()) == {rid, *[f"req-{i}" for i in range(5)]}
+    assert all(saved.get(f"req-{i}") == {"idx": i} for i in range(5))
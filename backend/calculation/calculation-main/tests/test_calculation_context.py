@@ -0,0 +1,75 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from datetime import datetime
+
+from jhora import const, utils
+from jhora.horoscope.chart import charts
+from jhora.horoscope.dhasa.raasi import narayana
+from jhora.panchanga import drik
+from src.api import service, models
+
+_JD = utils.julian_day_number(drik.Date(1990, 1, 1), (12, 0, 0))
+_PLACE = drik.Place('Chennai,IN', 13.0827, 80.2707, 5.5)
+_MODES = ['LAHIRI', 'RAMAN', 'KP', 'TRUE_CITRA']
+
+
+def _positions(mode):
+    with drik.calculation_context(drik.CalculationContext(ayanamsa_mode=mode)):
+        drik.set_ayanamsa_mode(mode)
+        return drik.dhasavarga(_JD, _PLACE), drik.ascendant(_JD, _PLACE)
+
+
+def test_context_does_not_touch_module_globals():
+    prev_mode = const._DEFAULT_AYANAMSA_MODE
+    prev_list = list(drik.planet_list)
+    ctx = drik.CalculationContext.for_calculation_type('ss', ayanamsa_mode='RAMAN')
+    with drik.calculation_context(ctx):
+        drik.set_ayanamsa_mode('KP')
+        assert drik.active_planet_list() == ctx.planet_list
+        assert len(drik.planetary_positions(_JD, _PLACE)) == 9
+    assert ctx.ayanamsa_mode == 'KP'
+    assert const._DEFAULT_AYANAMSA_MODE == prev_mode
+    assert drik.planet_list == prev_list
+    assert drik.get_calculation_context() is None
+
+
+def test_library_default_mode_follows_the_context():
+    prev_mode = const._DEFAULT_AYANAMSA_MODE
+    ctx = drik.CalculationContext(ayanamsa_mode='TRUE_CITRA')
+    with drik.calculation_context(ctx):
+        assert drik.active_ayanamsa_mode() == 'TRUE_CITRA' and drik.active_ayanamsa_mode('KP') == 'KP'
+        lagna = charts.rasi_chart(_JD, _PLACE, 'TRUE_CITRA')[0]
+        # dhasa modules call charts.divisional_chart without an ayanamsa_mode
+        narayana.narayana_dhasa_for_rasi_chart(drik.Date(1990, 1, 1), (12, 0, 0), _PLACE)
+        assert ctx.ayanamsa_mode == 'TRUE_CITRA'
+        assert charts.divisional_chart(_JD, _PLACE)[0] == lagna
+        # ayanamsa_mode=None must not switch the context back to the module default
+        drik.set_ayanamsa_mode()
+        assert charts.rasi_chart(_JD, _PLACE)[0] == lagna
+        assert ctx.ayanamsa_mode == 'TRUE_CITRA'
+    assert const._DEFAULT_AYANAMSA_MODE == prev_mode == drik.active_ayanamsa_mode()
+    assert charts.rasi_chart(_JD, _PLACE, prev_mode)[0] != lagna
+
+
+def test_concurrent_contexts_match_sequential_results():
+    expected = {mode: _positions(mode) for mode in _MODES}
+    assert expected['LAHIRI'] != expected['RAMAN']
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_positions, _MODES * 10))
+    for mode, result in zip(_MODES * 10, results):
+        assert result == expected[mode]
+
+
+def test_compute_horoscope_keeps_request_ayanamsa():
+    prev_mode = const._DEFAULT_AYANAMSA_MODE
+    loc = models.LocationIn(place='Chennai,IN', latitude=13.0827, longitude=80.2707, tzOffset=5.5)
+    req = models.HoroscopeRequest(birthDateTime=datetime(1985, 6, 15, 8, 30, 0), location=loc,
+                                  ayanamsaMode='RAMAN', divisionalFactors=[1, 9])
+    stored = service.compute_horoscope(req)
+    assert stored.calculationContext.ayanamsa_mode == 'RAMAN'
+    assert const._DEFAULT_AYANAMSA_MODE == prev_mode
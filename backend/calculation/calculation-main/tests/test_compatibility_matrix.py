@@ -0,0 +1,67 @@
+import csv
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+import pytest
+
+from jhora.horoscope.match import compatibility
+
+
+def test_matrix_lookups_match_ashtakoota():
+    rng = random.Random(5)
+    for method in ('North', 'South'):
+        matrix = compatibility.compatibility_matrix(method)
+        assert matrix is compatibility.compatibility_matrix(method)
+        assert matrix.table.shape[:2] == (108, 108)
+        for _ in range(200):
+            stars = [rng.randint(1, 27), rng.randint(1, 4), rng.randint(1, 27), rng.randint(1, 4)]
+            assert matrix.compatibility_score(*stars) == \
+                compatibility.Ashtakoota(*stars, method=method).compatibility_score()
+
+
+def test_matrix_without_database_is_computed(tmp_path):
+    computed = compatibility.CompatibilityMatrix('South', db_file=str(tmp_path / 'missing.csv'))
+    loaded = compatibility.compatibility_matrix('South')
+    assert np.array_equal(computed.table, loaded.table) and computed.column_types == loaded.column_types
+
+
+def test_matching_partners_match_database_rows():
+    with open(compatibility._DATABASE_FILE, encoding='utf-8') as fp:
+        rows = [r for r in csv.reader(fp) if r]
+    expected = [(int(r[0]), int(r[1]), float(r[12])) for r in rows
+                if r[2:4] == ['9', '2'] and float(r[12]) >= 20 and r[15] == 'True']
+    partners = compatibility.Match(girl_nakshatra_number=9, girl_paadham_number=2, minimum_score=20,
+                                   check_for_rajju_porutham=True).get_matching_partners()
+    assert [(nak, pad, score) for nak, pad, _, score, _ in partners] == expected
+    assert all(naalu[2] is True and len(ettu) == 8 for _, _, ettu, _, naalu in partners)
+
+
+def test_rank_candidates_against_one_profile():
+    matrix = compatibility.compatibility_matrix('North')
+    candidates = [(n, p) for n in range(1, 28) for p in range(1, 5)]
+    ranked = matrix.rank(4, 3, candidates)
+    scores = [score for _, score in ranked]
+    assert len(ranked) == 108 and scores == sorted(scores, reverse=True)
+    assert all(score == matrix.compatibility_score(4, 3, *candidates[c])[8] for c, score in ranked)
+    girls_view = matrix.rank(4, 3, candidates, profile_is_boy=False, minimum_score=25)
+    assert all(score >= 25 and score == matrix.compatibility_score(*candidates[c], 4, 3)[8] for c, score in girls_view)
+    assert compatibility.Match(boy_nakshatra_number=4, boy_paadham_number=3).rank_partners(candidates) == ranked
+
+
+def test_rank_partners_requires_the_paadham_of_the_profile():
+    candidates = [(1, 1), (2, 2)]
+    with pytest.raises(ValueError, match='paadham number of the boy'):
+        compatibility.Match(boy_nakshatra_number=4).rank_partners(candidates)
+    with pytest.raises(ValueError, match='paadham number of the girl'):
+        compatibility.Match(girl_nakshatra_number=4).rank_partners(candidates)
+    with pytest.raises(ValueError):
+        compatibility.Match().rank_partners(candidates)
+    matrix = compatibility.compatibility_matrix('North')
+    assert compatibility.Match(girl_nakshatra_number=4, girl_paadham_number=2).rank_partners(candidates) == \
+        matrix.rank(4, 2, candidates, profile_is_boy=False)
@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import math
+import pytest
+
+from jhora import utils
+from jhora.panchanga import drik
+
+_JD = utils.julian_day_number(drik.Date(1996, 12, 7), (10, 34, 0))
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+
+
+def test_brent_root():
+    root = utils.brent_root(lambda x: math.cos(x) - x, 0.0, 1.0, xtol=1e-12)
+    assert abs(root - 0.7390851332151607) < 1e-10
+    with pytest.raises(ValueError):
+        utils.brent_root(lambda x: x * x + 1, -1.0, 1.0)
+
+
+def test_next_angle_crossing_handles_wrap_around():
+    speed = 13.0
+    longitude = lambda jd: (350.0 + speed * (jd - 100.0)) % 360.0
+    jd = drik.next_angle_crossing(longitude, 100.0, 0.0, max_speed=speed)
+    assert abs(jd - (100.0 + 10.0 / speed)) < 1e-7
+    jd = drik.next_angle_crossing(longitude, 100.0, 0.0, direction=-1, max_speed=speed, period=30.0)
+    assert abs(jd - (100.0 - 20.0 / speed)) < 1e-7
+
+
+@pytest.mark.parametrize('planet', [0, 1, 5, 6])
+def test_next_planet_entry_date_lands_on_sign_boundary(planet):
+    tz, p_id = _PLACE.timezone, drik.planet_list[planet]
+    for direction in (1, -1):
+        jd_entry, longitude = drik.next_planet_entry_date(planet, _JD, _PLACE, direction=direction)
+        assert (jd_entry - _JD) * direction > 0
+        before = drik.sidereal_longitude(jd_entry - tz / 24 - 1e-4, p_id)
+        after = drik.sidereal_longitude(jd_entry - tz / 24 + 1e-4, p_id)
+        assert int(before / 30) != int(after / 30)
+        assert min(longitude % 30, 30 - longitude % 30) < 1e-4
+
+
+def test_next_ascendant_entry_date_lands_on_sign_boundary():
+    jd_entry, _ = drik.next_ascendant_entry_date(_JD, _PLACE)
+    assert 0 < jd_entry - _JD < 0.25
+    assert drik.ascendant(jd_entry - 1e-5, _PLACE)[0] != drik.ascendant(jd_entry + 1e-5, _PLACE)[0]
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import pytest
+import swisseph as swe
+
+from jhora import const
+from jhora.panchanga import drik
+
+_PLANETS = [const._SUN, const._MOON, const._MARS, const._SATURN, const._RAHU, const._KETU]
+
+
+def _direct(jd_utc, planet):
+    flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | drik._rise_flags
+    drik.set_ayanamsa_mode('LAHIRI', None, jd_utc)
+    body = const._RAHU if planet == const._KETU else planet
+    longi, _ = swe.calc_ut(jd_utc, body, flags=flags)
+    lon = (longi[0] + 180) % 360 if planet == const._KETU else longi[0] % 360
+    return lon, longi[3]
+
+
+def test_batch_matches_direct_calc_ut():
+    jds = [2447893.0 + 0.37 * i for i in range(25)]
+    with drik.calculation_context(drik.CalculationContext(ayanamsa_mode='LAHIRI')):
+        batch = drik.ephemeris_batch(jds, _PLANETS)
+        assert batch.longitude.shape == (len(jds), len(_PLANETS))
+        for j, jd in enumerate(jds):
+            for p, planet in enumerate(_PLANETS):
+                lon, speed = _direct(jd, planet)
+                assert batch.longitude[j, p] == pytest.approx(lon, abs=1e-9)
+                assert batch.longitude_speed[j, p] == pytest.approx(speed, abs=1e-9)
+                assert drik.sidereal_longitude(jd, planet) == pytest.approx(lon, abs=1e-9)
+
+
+def test_memo_is_keyed_by_ayanamsa():
+    jd = 2451545.0
+    drik.clear_ephemeris_memo()
+    with drik.calculation_context(drik.CalculationContext(ayanamsa_mode='LAHIRI')):
+        lahiri = drik.ephemeris_batch(jd, [const._SUN]).longitude[0, 0]
+        assert drik.ephemeris_batch([jd], [const._SUN]).longitude[0, 0] == lahiri
+    with drik.calculation_context(drik.CalculationContext(ayanamsa_mode='RAMAN')):
+        raman = drik.ephemeris_batch(jd, [const._SUN]).longitude[0, 0]
+    assert len(drik._ephemeris_memo) == 2
+    assert raman != pytest.approx(lahiri, abs=1e-3)
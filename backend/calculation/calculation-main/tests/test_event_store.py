@@ -0,0 +1,106 @@
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from api import events
+
+
+def test_writes_are_batched_and_reads_see_them(tmp_path):
+    store = events.EventStore(str(tmp_path / 'events.db'), batch_size=64)
+    for i in range(200):
+        store.record_event(f'req-{i % 20}', {'full': {}, 'idx': i})
+    store.update_event('req-3', 'delivered', 'ok', 2)
+    store.delete_events('req-4')
+    # reads wait for the writes queued before them
+    assert store.get_payload('req-3') == {'full': {}, 'idx': 183}
+    assert store.get_payload('req-4') is None
+    latest = store.list_events(limit=3)
+    assert [e['requestId'] for e in latest] == ['req-19', 'req-18', 'req-17']
+    assert all(e['status'] == 'delivered' and e['attempts'] == 2 for e in store.list_events(300)
+               if e['requestId'] == 'req-3')
+    assert store.get_payload_info('req-5')['modeDetected'] == 'full'
+    stats = store.stats()
+    assert stats['pendingWrites'] == 0 and stats['errors'] == 0 and stats['batches'] < 203
+    store.close()
+
+    reopened = events.EventStore(str(tmp_path / 'events.db'))
+    assert len(reopened.list_events(limit=1000)) == 190
+    reopened.close()
+
+
+def test_latest_payload_lookup_uses_request_index(tmp_path):
+    path = tmp_path / 'events.db'
+    store = events.EventStore(str(path))
+    store.init_db()
+    conn = sqlite3.connect(str(path))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    plan = ' '.join(str(r) for r in conn.execute('EXPLAIN QUERY PLAN ' + events._LATEST_PAYLOAD_SQL, ('x',)))
+    assert 'idx_agent_events_request_id' in plan and 'TEMP B-TREE' not in plan
+    conn.close()
+    store.close()
+
+
+def test_async_accessors(tmp_path, monkeypatch):
+    store = events.EventStore(str(tmp_path / 'events.db'))
+    monkeypatch.setattr(events, '_store', store)
+
+    async def run():
+        await events.arecord_event('req-a', {'summary': 1})
+        await events.aupdate_event('req-a', 'failed', 'status 500', 5)
+        assert await events.aflush()
+        return await events.alist_events(), await events.aget_payload('req-a'), await events.aget_payload_info('req-a')
+
+    listed, payload, info = asyncio.run(run())
+    assert [(e['requestId'], e['status'], e['attempts']) for e in listed] == [('req-a', 'failed', 5)]
+    assert payload == {'summary': 1} and info['modeDetected'] == 'summary'
+    store.close()
+
+
+def test_writes_are_accounted_when_the_database_cannot_be_opened(tmp_path, monkeypatch):
+    store = events.EventStore(str(tmp_path / 'events.db'))
+    store.record_event('req-a', {'summary': 1})
+    assert store.flush(5)
+
+    def unavailable():
+        raise sqlite3.OperationalError('unable to open database file')
+
+    with store._lock:
+        store._conn.close()
+        store._conn = None
+    monkeypatch.setattr(store, '_connection', unavailable)
+    store.update_event('req-a', 'delivered', 'ok', 1)
+    assert store.flush(5)
+    assert store.stats()['errors'] == 1 and 'unable to open' in store.stats()['lastError']
+    assert store._writer.is_alive()
+    monkeypatch.undo()
+    store.update_event('req-a', 'delivered', 'ok', 2)
+    assert [(e['status'], e['attempts']) for e in store.list_events()] == [('delivered', 2)]
+    store.close()
+
+
+def test_flush_restarts_a_dead_writer_and_reads_time_out(tmp_path):
+    store = events.EventStore(str(tmp_path / 'events.db'), read_timeout=0.2)
+    store.record_event('req-a', {'summary': 1})
+    assert store.flush(5)
+    writer = store._writer
+    store._queue.put(None)  # the writer thread exits
+    writer.join(5)
+    with store._applied:  # a write queued after the writer died
+        store._queued_count += 1
+        store._queue.put((events._UPDATE_SQL, ('failed', 'status 500', 3, 0.0, None, 'req-a')))
+    assert store.flush(5) and store._writer is not writer
+    assert [(e['status'], e['attempts']) for e in store.list_events()] == [('failed', 3)]
+
+    with store._lock:  # holding the connection keeps the writer from applying the next write
+        store.update_event('req-a', 'delivered', 'ok', 4)
+        assert not store.flush(0.05)
+        try:
+            store.list_events()
+            assert False, 'read did not time out'
+        except TimeoutError:
+            pass
+    assert store.list_events()[0]['status'] == 'delivered'
+    store.close()
@@ -0,0 +1,72 @@
+import asyncio
+import pickle
+import sys
+import threading
+from pathlib import Path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'src'))
+
+from datetime import datetime
+
+from src.api import engine, models, service, store
+
+
+def _request(year):
+    loc = models.LocationIn(place='Chennai,IN', latitude=13.0827, longitude=80.2707, tzOffset=5.5)
+    return models.HoroscopeRequest(birthDateTime=datetime(year, 6, 15, 8, 30, 0), location=loc,
+                                   ayanamsaMode='RAMAN', divisionalFactors=[1, 9])
+
+
+def test_process_engine_matches_in_process_result(monkeypatch, tmp_path):
+    monkeypatch.setattr(service, '_request_store', store.RequestStore(tmp_path / 'horo_requests.db'))
+    horo_engine = engine.HoroscopeEngine(workers=2)
+
+    async def _run():
+        await horo_engine.start()
+        try:
+            return await asyncio.gather(horo_engine.compute(_request(1961)), horo_engine.compute(_request(1961)),
+                                        horo_engine.compute(_request(1962)))
+        finally:
+            horo_engine.shutdown()
+
+    first, same, other = asyncio.run(_run())
+    assert first is same
+    assert horo_engine.stats()['completed'] == 2
+    rhash = first.response.meta['requestId']
+    assert service.get_cached(rhash) is first
+    assert first.internalHoroscope is not None
+    assert first.calculationContext.ayanamsa_mode == 'RAMAN'
+    with service._store_lock:
+        service._store.pop(rhash, None)
+    local = service.build_stored_horoscope(_request(1961))
+    assert first.response.rasiChart == local.response.rasiChart
+    assert first.response.divisionalCharts == local.response.divisionalCharts
+    assert other.response.meta['requestId'] != rhash
+
+
+def test_results_are_stored_off_the_event_loop(monkeypatch, tmp_path):
+    monkeypatch.setattr(service, '_request_store', store.RequestStore(tmp_path / 'horo_requests.db'))
+    register_stored, threads, sizes = service.register_stored, [], []
+
+    def recording_register_stored(rhash, stored, size=None):
+        threads.append(threading.get_ident())
+        sizes.append(size)
+        return register_stored(rhash, stored, size)
+
+    monkeypatch.setattr(service, 'register_stored', recording_register_stored)
+    horo_engine = engine.HoroscopeEngine(workers=1)
+
+    async def _run():
+        await horo_engine.start()
+        try:
+            stored = await horo_engine.compute(_request(1963))
+            return stored, threading.get_ident()
+        finally:
+            horo_engine.shutdown()
+
+    stored, loop_thread = asyncio.run(_run())
+    assert service.get_cached(stored.response.meta['requestId']) is stored
+    assert len(threads) == 1 and threads[0] != loop_thread
+    # the size of the pickle received from the worker, not measured again in the API process
+    assert len(sizes) == 1 and abs(sizes[0] - len(pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL))) < sizes[0] / 100
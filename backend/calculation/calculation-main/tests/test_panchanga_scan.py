@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from jhora import utils
+from jhora.panchanga import drik, vratha
+
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+
+
+def test_scan_spans_cover_exact_panchanga():
+    start, end = drik.Date(2023, 12, 1), drik.Date(2024, 2, 29)
+    scan = drik.panchanga_scan(_PLACE, start, end)
+    assert len(scan.jd) == 91
+    for day, jd in enumerate(scan.jd.tolist()):
+        date = drik.jd_to_gregorian(jd)[0:3]
+        _tithi = drik.tithi(jd + 7 / 24, _PLACE)
+        assert date in drik.panchanga_scan_dates(scan, 'tithi', [_tithi[0]])
+        if len(_tithi) > 3:
+            assert date in drik.panchanga_scan_dates(scan, 'tithi', [_tithi[3]])
+        _nak = drik.nakshatra(jd, _PLACE)
+        assert date in drik.panchanga_scan_dates(scan, 'nakshatra', [_nak[0], _nak[4]])
+        assert date in drik.panchanga_scan_dates(scan, 'yogam', [drik.yogam(jd, _PLACE)[0]])
+        assert abs(scan.sunrise[day] - drik.sunrise(jd, _PLACE)[2]) < 1e-9
+
+
+def test_scan_is_cached_per_place_and_year():
+    drik.clear_panchanga_scan_cache()
+    drik.panchanga_scan(_PLACE, drik.Date(2024, 3, 1), drik.Date(2024, 3, 31))
+    assert len(drik._panchanga_scan_cache) == 1
+    scan = drik.panchanga_scan(_PLACE, drik.Date(2024, 1, 1), drik.Date(2025, 1, 10))
+    assert len(drik._panchanga_scan_cache) == 2
+    assert len(scan.jd) == 366 + 10
+
+
+def test_vratha_dates_found_from_scan():
+    utils.set_language('en')
+    start, end = drik.Date(2024, 1, 1), drik.Date(2024, 12, 31)
+    pournami = vratha.pournami_dates(_PLACE, start, end)
+    assert len(pournami) == 12
+    for date, _, _, _ in pournami:
+        jd = utils.julian_day_number(date, (0, 0, 0))
+        assert 15 in drik.tithi(jd + drik.sunrise(jd, _PLACE)[0] / 24 + 0.5 / 24, _PLACE)[0::3]
+
+
+def test_next_date_search_does_not_scan_the_year():
+    utils.set_language('en')
+    start = drik.Date(2031, 5, 3)
+    drik.clear_panchanga_scan_cache()
+    next_ekadhashi = vratha.tithi_dates(_PLACE, start, None, tithi_index_list=[11, 26])
+    next_rohini = vratha.nakshathra_dates(_PLACE, start, None, nakshathra_index_list=[4])
+    next_siddhi = vratha.yoga_dates(_PLACE, start, None, yoga_index_list=[16])
+    assert len(drik._panchanga_scan_cache) == 0
+    end = drik.Date(2031, 12, 31)
+    assert next_ekadhashi == vratha.tithi_dates(_PLACE, start, end, tithi_index_list=[11, 26])[:1]
+    assert next_rohini == vratha.nakshathra_dates(_PLACE, start, end, nakshathra_index_list=[4])[:1]
+    assert next_siddhi == vratha.yoga_dates(_PLACE, start, end, yoga_index_list=[16])[:1]
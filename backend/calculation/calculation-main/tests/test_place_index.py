@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from api import places
+
+_ROWS = [
+    ['India', 'Chennai', '13.0878385', '80.2784729', 'Asia/Kolkata', '5.5'],
+    ['India', 'Hyderabad', '17.3752778', '78.4744415', 'Asia/Kolkata', '5.5'],
+    ['Pakistan', 'Hyderabad', '25.3666667', '68.3666687', 'Asia/Karachi', '5.0'],
+    ['United States', 'New York City', '40.7142691', '-74.0059738', 'America/New_York', '-4.0'],
+    ['China', 'Chengdu', '30.6666667', '104.0666656', 'Asia/Shanghai', '8.0'],
+    ['Austria', 'Neunkirchen', '47.7166667', '16.083334', 'Europe/Vienna', '1.0'],
+    ['India', 'Port Chennai Road', '13.1', '80.3', 'Asia/Kolkata', ''],
+]
+
+
+def test_place_search_ranks_exact_then_prefix_then_substring():
+    index = places.PlaceIndex.from_rows(_ROWS)
+    assert [p['label'] for p in index.search('chennai')] == ['Chennai, India', 'Port Chennai Road, India']
+    assert [p['label'] for p in index.search('che')] == ['Chennai, India', 'Chengdu, China',
+                                                          'Port Chennai Road, India', 'Neunkirchen, Austria']
+    assert [p['label'] for p in index.search('kirch')] == ['Neunkirchen, Austria']
+    assert [p['label'] for p in index.search('ne', limit=1)] == ['New York City, United States']
+    assert index.search('zzz') == [] and index.search('Port', 5)[0]['tzOffsetHours'] is None
+
+
+def test_city_lookup_prefers_timezone_then_country():
+    index = places.PlaceIndex.from_rows(_ROWS)
+    assert index.lookup('Hyderabad, Pakistan') == (25.3666667, 68.3666687, 5.0)
+    assert index.lookup('Hyderabad, IN') == (17.3752778, 78.4744415, 5.5)
+    assert index.lookup('hyderabad', 5.1) == (25.3666667, 68.3666687, 5.0)
+    assert index.lookup('New York City, US')[0] == 40.7142691
+    assert index.lookup('Atlantis') is None
+
+
+def test_binary_index_round_trip_and_rebuild_on_source_change(tmp_path):
+    csv_path = tmp_path / 'cities.csv'
+    csv_path.write_text('\n'.join(','.join(r) for r in _ROWS) + '\n', encoding='utf-8')
+    index_path = tmp_path / 'places.bin'
+    built = places.load_place_index(csv_path, index_path)
+    loaded = places.load_place_index(csv_path, index_path)
+    assert loaded is not built and loaded.labels == built.labels
+    assert loaded.search('hyd') == built.search('hyd') and loaded.lookup('Chengdu') == built.lookup('Chengdu')
+    csv_path.write_text(csv_path.read_text() + 'India,Madurai,9.93,78.12,Asia/Kolkata,5.5\n', encoding='utf-8')
+    assert places.PlaceIndex.load(index_path, csv_path.stat().st_size) is None
+    assert places.load_place_index(csv_path, index_path).lookup('Madurai, India') == (9.93, 78.12, 5.5)
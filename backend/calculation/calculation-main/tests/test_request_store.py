@@ -0,0 +1,106 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from api import store
+
+
+def test_store_upserts_incrementally_and_survives_reopen(tmp_path):
+    path = tmp_path / 'horo_requests.db'
+    requests = store.RequestStore(path)
+    for i in range(50):
+        requests.put(f'req-{i}', {'idx': i})
+    requests.put('req-3', {'idx': 3, 'language': 'ta'})
+    assert len(requests) == 50
+    assert requests.delete('req-10') and not requests.delete('req-10')
+    requests.close()
+
+    reopened = store.RequestStore(path)
+    assert 'req-10' not in reopened and 'req-11' in reopened
+    assert reopened.get('req-3') == {'idx': 3, 'language': 'ta'}
+    assert reopened.keys(limit=4) == ['req-0', 'req-1', 'req-2', 'req-3']
+    assert reopened.keys(limit=2, offset=9) == ['req-9', 'req-11']
+    assert reopened.get('missing') is None
+
+
+def test_legacy_snapshot_is_imported_once(tmp_path):
+    legacy = tmp_path / 'horo_requests.json'
+    legacy.write_text(json.dumps({'a': {'idx': 1}, 'b': {'idx': 2}}), encoding='utf-8')
+    requests = store.RequestStore(tmp_path / 'horo_requests.db', legacy_snapshot=legacy)
+    assert requests.keys() == ['a', 'b']
+    requests.delete('a')
+    requests.close()
+    # the snapshot is not imported again, so deletes stick
+    requests = store.RequestStore(tmp_path / 'horo_requests.db', legacy_snapshot=legacy)
+    assert requests.keys() == ['b']
+
+
+def test_compact_reclaims_deleted_requests(tmp_path):
+    requests = store.RequestStore(tmp_path / 'horo_requests.db')
+    for i in range(2000):
+        requests.put(f'req-{i}', {'idx': i, 'pad': 'x' * 200})
+    for i in range(1900):
+        requests.delete(f'req-{i}')
+    before = requests.stats()
+    assert requests.compact()
+    after = requests.stats()
+    assert after['requests'] == 100
+    assert after['sizeBytes'] < before['sizeBytes']
+    assert not requests.compact()
+
+
+def test_memory_store_bounds_entries_bytes_and_idle_time():
+    now = [0.0]
+    memory = store.MemoryStore(max_entries=3, max_bytes=100, ttl=60, sizeof=len, clock=lambda: now[0])
+    for key in 'abc':
+        memory[key] = 'x' * 20
+    assert memory.get('a') is not None  # a becomes most recently used
+    memory['d'] = 'x' * 20
+    assert 'b' not in memory and list(memory) == ['c', 'a', 'd']
+    memory['e'] = 'x' * 70  # c goes for the entry count, a for the 130 bytes
+    assert list(memory) == ['d', 'e'] and memory.bytes == 90
+    now[0] = 30.0
+    memory['f'] = 'y'
+    now[0] = 80.0
+    assert memory.get('e') is None and memory.get('f') == 'y'
+    assert list(memory) == ['f']  # d expired as well, it is dropped on the next insert
+    stats = memory.stats()
+    assert stats['evictions'] == {'lru': 2, 'size': 1, 'ttl': 1}
+    assert stats['hits'] == 2 and stats['misses'] == 1 and stats['entries'] == 2
+
+
+def test_memory_store_takes_known_sizes_and_samples_the_others():
+    measured = []
+
+    def sizeof(value):
+        measured.append(value)
+        return len(value)
+
+    memory = store.MemoryStore(max_entries=0, max_bytes=0, ttl=0, sizeof=sizeof, size_sample_every=4)
+    memory.set('known', 'x' * 10, size=100)
+    for i in range(8):
+        memory[f'k{i}'] = 'y' * (i + 1)
+    # values 4 and 8 are measured; the others get the mean of the sizes known so far
+    assert measured == ['y' * 4, 'y' * 8]
+    assert memory.bytes == 100 + 100 * 3 + 4 + 52 * 3 + 8
+    exact = store.MemoryStore(sizeof=len)
+    exact['a'] = 'abc'
+    exact.set('b', 'abcdef', size=2)
+    assert exact.bytes == 5
+
+
+def test_compute_horoscope_survives_an_entry_expiring_under_it(monkeypatch):
+    from api import service
+
+    # stored at 0 and read at 1; any second lookup of the same call would run at 3, after the entry expired
+    ticks = iter([0, 1] + [3] * 10)
+    memory = store.MemoryStore(ttl=1.5, sizeof=lambda value: 1, clock=lambda: next(ticks))
+    memory['h'] = 'old'
+    monkeypatch.setattr(service, '_store', memory)
+    monkeypatch.setattr(service, 'prepare_request', lambda req: 'h')
+    monkeypatch.setattr(service, 'build_stored_horoscope', lambda req, rhash: 'fresh')
+    monkeypatch.setattr(service, 'register_stored', lambda rhash, stored: stored)
+    assert service.compute_horoscope(None) == 'old'
+    assert service.compute_horoscope(None) == 'fresh'
@@ -0,0 +1,46 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from api import cache
+
+
+def test_response_cache_expires_evicts_and_bounds_bytes():
+    now = [0.0]
+    responses = cache.ResponseCache(max_entries=3, max_bytes=100, ttl=60, shards=1, sizeof=len,
+                                    clock=lambda: now[0])
+    for key in 'abc':
+        responses.set(key, 'x' * 20)
+    assert responses.get('a') is not None  # a becomes most recently used
+    responses.set('d', 'x' * 20)
+    assert 'b' not in responses and responses.get('c') and responses.get('d')
+    assert not responses.set('big', 'x' * 101)  # larger than the byte budget: not stored
+    responses.set('e', 'x' * 70)  # a goes for the entry count, c for the 110 bytes
+    assert 'a' not in responses and 'c' not in responses and len(responses) == 2
+    now[0] = 30.0
+    responses.set('f', 'y', ttl=5)
+    responses.set('g', 'z', ttl=0)  # never expires; d goes for the entry count
+    now[0] = 36.0
+    assert responses.get('f') is None and responses.get('e')
+    now[0] = 1000.0
+    assert responses.get('g') == 'z' and len(responses) == 1
+    stats = responses.stats()
+    assert stats['evictions'] == {'lru': 3, 'size': 1, 'ttl': 2}
+    assert stats['entries'] == 1 and stats['bytes'] == 1
+
+
+def test_response_cache_is_safe_across_threads():
+    responses = cache.ResponseCache(max_entries=64, max_bytes=0, ttl=60, shards=4)
+    calls = []
+
+    def work(i):
+        key = ('dasha', f'req-{i % 16}')
+        return responses.get_or_set(key, lambda: calls.append(key) or {'key': key})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(work, range(400)))
+    assert all(r['key'] == ('dasha', f'req-{i % 16}') for i, r in enumerate(results))
+    assert len(responses) == 16 and len(calls) >= 16
+    assert responses.delete_matching(lambda key: key[1] == 'req-3') == 1 and len(responses) == 15
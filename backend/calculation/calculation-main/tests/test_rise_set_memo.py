@@ -0,0 +1,45 @@
+import sys
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from jhora import utils
+from jhora.panchanga import drik
+
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+
+
+def test_rise_set_table_matches_daily_functions():
+    drik.clear_rise_set_memo()
+    table = drik.rise_set_table(_PLACE, drik.Date(2024, 2, 27), drik.Date(2024, 3, 2))
+    assert len(table.jd) == 5
+    for day, jd in enumerate(table.jd.tolist()):
+        jd_noon = jd + 0.5
+        assert table.sunrise[day] == drik.sunrise(jd_noon, _PLACE)[0]
+        assert table.sunset[day] == drik.sunset(jd_noon, _PLACE)[0]
+        assert table.moonrise[day] == drik.moonrise(jd_noon, _PLACE)[0]
+        assert table.moonset[day] == drik.moonset(jd_noon, _PLACE)[0]
+
+
+def test_panchanga_of_a_day_rises_each_body_once_per_day(monkeypatch):
+    calls = Counter()
+    rise_trans = drik.swe.rise_trans
+
+    def counting_rise_trans(jd, planet, *args, **kwargs):
+        calls[(round(jd, 6), planet, kwargs.get('rsmi'))] += 1
+        return rise_trans(jd, planet, *args, **kwargs)
+
+    jd = utils.julian_day_number(drik.Date(2024, 3, 15), (10, 0, 0))
+    expected = [drik.tithi(jd, _PLACE), drik.nakshatra(jd, _PLACE), drik.yogam(jd, _PLACE),
+                drik.trikalam(jd, _PLACE), drik.gauri_choghadiya(jd, _PLACE), drik.durmuhurtam(jd, _PLACE),
+                drik.day_length(jd, _PLACE), drik.night_length(jd, _PLACE), drik.midday(jd, _PLACE)]
+    drik.clear_rise_set_memo()
+    monkeypatch.setattr(drik.swe, 'rise_trans', counting_rise_trans)
+    for _ in range(3):
+        assert [drik.tithi(jd, _PLACE), drik.nakshatra(jd, _PLACE), drik.yogam(jd, _PLACE),
+                drik.trikalam(jd, _PLACE), drik.gauri_choghadiya(jd, _PLACE), drik.durmuhurtam(jd, _PLACE),
+                drik.day_length(jd, _PLACE), drik.night_length(jd, _PLACE), drik.midday(jd, _PLACE)] == expected
+    assert calls and max(calls.values()) == 1
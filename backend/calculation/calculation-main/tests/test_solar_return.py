@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from jhora import const, utils
+from jhora.panchanga import drik
+
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+_JD = utils.julian_day_number(drik.Date(1996, 12, 7), (10, 34, 0))
+
+
+def _sun_long_at_birth():
+    sign, long_in_sign = drik.dhasavarga(_JD, _PLACE, divisional_chart_factor=1)[0][1]
+    return sign * 30 + long_in_sign
+
+
+def test_solar_return_lands_on_the_birth_solar_longitude():
+    sun_long = _sun_long_at_birth()
+    for years, months, sixty_hours in [(2, 1, 1), (30, 1, 1), (74, 6, 1), (13, 9, 10)]:
+        jd_next = drik.next_solar_date(_JD, _PLACE, years, months, sixty_hours)
+        expected = (sun_long + (years - 1) * 360 + (months - 1) * 30 + (sixty_hours - 1) * 2.5) % 360
+        solar_long = drik.solar_longitude(jd_next - _PLACE.timezone / 24)
+        assert abs((solar_long - expected + 180) % 360 - 180) < 1e-6
+        # the return nearest to the estimate, never a year late
+        estimate = _JD + ((years - 1) + (months - 1) / 12 + (sixty_hours - 1) / 144) * const.sidereal_year
+        assert abs(jd_next - estimate) < 5
+
+
+def test_varsha_pravesh_table_is_memoized(monkeypatch):
+    drik.clear_solar_date_memo()
+    table = drik.varsha_pravesh_table(_JD, _PLACE, 40)
+    assert table[0] == _JD and len(table) == 40
+    assert all(360 < b - a < 370 for a, b in zip(table, table[1:]))
+    monkeypatch.setattr(drik, '_solar_return_jd_utc', lambda *args: (_ for _ in ()).throw(AssertionError))
+    assert [drik.next_solar_date(_JD, _PLACE, years=y) for y in range(1, 41)] == table
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from jhora import const, utils
+from jhora.panchanga import drik
+from jhora.horoscope.chart import charts, strength
+
+_JD = utils.julian_day_number(drik.Date(1996, 12, 7), (10, 34, 0))
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+
+
+def test_context_matches_standalone_balas():
+    context = strength.StrengthContext(_JD, _PLACE)
+    assert strength.shad_bala(_JD, _PLACE, context=context) == strength.shad_bala(_JD, _PLACE)
+    assert strength.bhava_bala(_JD, _PLACE, context=context) == strength.bhava_bala(_JD, _PLACE)
+    assert strength._ishta_phala(_JD, _PLACE, context=context) == strength._ishta_phala(_JD, _PLACE)
+    # the second call is served from the context memo
+    assert strength.shad_bala(_JD, _PLACE, context=context) is strength.shad_bala(_JD, _PLACE, context=context)
+
+
+def test_all_balas_matches_separate_calls():
+    balas = strength.all_balas(_JD, _PLACE)
+    assert balas['shad_bala'] == strength.shad_bala(_JD, _PLACE)
+    assert balas['bhava_bala'] == strength.bhava_bala(_JD, _PLACE)
+    assert balas['vimsopaka_bala']['shodhasavarga'] == charts.vimsopaka_shodhasavarga_of_planets(_JD, _PLACE)
+    assert balas['vimsopaka_bala']['dhasavarga'] == charts.vimsopaka_dhasavarga_of_planets(_JD, _PLACE)
+    assert balas['vaiseshikamsa_bala']['sapthavarga'] == charts.vaiseshikamsa_sapthavarga_of_planets(_JD, _PLACE)
+    assert balas['vaiseshikamsa_bala']['shadvarga'] == charts.vaiseshikamsa_shadvarga_of_planets(_JD, _PLACE)
+
+
+def test_all_balas_in_another_ayanamsa_keeps_bhava_bala_in_default_mode():
+    default_mode = const._DEFAULT_AYANAMSA_MODE
+    try:
+        balas = strength.all_balas(_JD, _PLACE, 'RAMAN')
+        assert balas['shad_bala'] == strength.shad_bala(_JD, _PLACE, 'RAMAN')
+        assert balas['bhava_bala'] == strength.bhava_bala(_JD, _PLACE)
+    finally:
+        drik.set_ayanamsa_mode(default_mode)
+    assert const._DEFAULT_AYANAMSA_MODE == default_mode
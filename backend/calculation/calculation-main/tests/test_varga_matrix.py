@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from jhora import const, utils
+from jhora.panchanga import drik
+from jhora.horoscope.chart import charts
+
+_JD = utils.julian_day_number(drik.Date(1996, 12, 7), (10, 34, 0))
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+
+
+def test_varga_matrix_matches_divisional_chart_for_all_methods():
+    methods = {dvf: list(range(1, const.varga_option_dict[dvf][0] + 1)) for dvf in const.division_chart_factors[1:]}
+    for method_index in range(6):
+        chart_methods = {dvf: opts[min(method_index, len(opts) - 1)] for dvf, opts in methods.items()}
+        matrix = charts.varga_matrix(_JD, _PLACE, chart_methods=chart_methods)
+        assert matrix.signs.shape == (len(const.division_chart_factors), len(charts.rasi_chart(_JD, _PLACE)))
+        for dvf in const.division_chart_factors:
+            expected = charts.divisional_chart(_JD, _PLACE, divisional_chart_factor=dvf,
+                                               chart_method=chart_methods.get(dvf, 1))
+            actual = matrix.chart(dvf)
+            assert [(p, int(pos[0])) for p, pos in expected] == [(p, pos[0]) for p, pos in actual]
+            assert all(abs(e[1][1] - a[1][1]) < 1e-9 for e, a in zip(expected, actual))
+
+
+def test_varga_matrix_custom_charts():
+    rasi = charts.rasi_chart(_JD, _PLACE)
+    for base_rasi in (None, 0, 1):
+        for chart_method in range(0, 10):
+            matrix = charts.varga_matrix_from_rasi_positions(rasi, [13, 57, 150], chart_method, base_rasi=base_rasi)
+            for dvf in (13, 57, 150):
+                expected = charts.custom_divisional_chart(rasi, dvf, chart_method=chart_method, base_rasi=base_rasi)
+                assert [pos[0] for _, pos in expected] == [pos[0] for _, pos in matrix.chart(dvf)]
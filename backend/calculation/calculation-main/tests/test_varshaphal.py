@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from fastapi.testclient import TestClient
+
+from api import varshaphal
+from api.app import app
+from jhora import utils
+from jhora.panchanga import drik
+
+client = TestClient(app)
+
+
+def _create_request() -> str:
+    payload = {
+        "birthDateTime": "1990-01-01T12:00:00",
+        "location": {"place": "Chennai,IN", "latitude": 13.0827, "longitude": 80.2707, "tzOffset": 5.5},
+        "ayanamsaMode": "TRUE_CITRA",
+    }
+    resp = client.post('/api/horoscope', json=payload)
+    assert resp.status_code == 200, resp.text
+    return resp.json()['meta']['requestId']
+
+
+def test_batch_matches_single_year_endpoints():
+    rid = _create_request()
+    resp = client.get(f'/api/tajaka/varshaphal?request_id={rid}&start_year=1&end_year=12')
+    assert resp.status_code == 200, resp.text
+    years = resp.json()['years']
+    assert [y['yearOffset'] for y in years] == list(range(1, 13))
+    for year in (2, 7, 12):
+        entry = years[year - 1]
+        assert 'errors' not in entry and len(entry['sahams']) == 36
+        annual = client.get(f'/api/tajaka/annual?request_id={rid}&year={year}').json()
+        assert entry['annual'] == {k: v for k, v in annual.items() if k not in ('requestId', 'year', 'yearOffset')}
+        assert entry['yogas'] == client.get(f'/api/tajaka/yogas?request_id={rid}&year={year}').json()['yogas']
+        for system in ('mudda', 'patyayini'):
+            single = client.get(f'/api/dhasa/annual/{system}?request_id={rid}&year={year}').json()
+            assert entry[system] == single['periods']
+
+
+def test_calendar_years_sections_and_validation():
+    rid = _create_request()
+    resp = client.get(f'/api/tajaka/varshaphal?request_id={rid}&start_year=2020&end_year=2022&sections=mudda')
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert (data['startYearOffset'], data['endYearOffset']) == (30, 32)
+    assert [y['year'] for y in data['years']] == [2020, 2021, 2022]
+    assert all(set(y) == {'year', 'yearOffset', 'chartStartJd', 'mudda'} for y in data['years'])
+    assert client.get(f'/api/tajaka/varshaphal?request_id={rid}&start_year=5&end_year=2').status_code == 400
+    assert client.get(f'/api/tajaka/varshaphal?request_id={rid}&sections=annual,bogus').status_code == 400
+    limit = varshaphal.VARSHAPHAL_MAX_YEARS
+    assert client.get(f'/api/tajaka/varshaphal?request_id={rid}&end_year={limit + 1}').status_code == 400
+
+
+def test_years_do_not_depend_on_the_range_they_are_computed_in():
+    place = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+    jd = utils.julian_day_number(drik.Date(1990, 1, 1), (12, 0, 0))
+    context = drik.CalculationContext.for_calculation_type('drik', ayanamsa_mode='TRUE_CITRA')
+    batch = varshaphal.years_data(jd, place, range(1, 8), ('annual', 'patyayini'), context)
+    assert batch[-1] == varshaphal.years_data(jd, place, [7], ('annual', 'patyayini'), context)[0]
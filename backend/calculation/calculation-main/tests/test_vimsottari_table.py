@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from jhora import utils
+from jhora.panchanga import drik
+from jhora.horoscope.dhasa.graha import vimsottari
+
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+_JD = utils.julian_day_number(drik.Date(1996, 12, 7), (10, 34, 0))
+
+
+def test_period_table_matches_recursive_sub_periods():
+    table = vimsottari.vimsottari_period_table(_JD, _PLACE)
+    assert vimsottari.vimsottari_period_table(_JD, _PLACE) is table
+    mahas = vimsottari.vimsottari_mahadasa(_JD, _PLACE)
+    assert list(zip(table.lords(0), table.starts(0))) == list(mahas.items())
+    maha, start = next(iter(mahas.items()))
+    bhuktis = vimsottari._vimsottari_bhukti(maha, start)
+    assert list(zip(table.lords(1)[:9], table.starts(1)[:9])) == list(bhuktis.items())
+    bhukti, b_start = list(bhuktis.items())[1]
+    antaras = vimsottari._vimsottari_antara(maha, bhukti, b_start)
+    assert list(zip(table.lords(2)[9:18], table.starts(2)[9:18])) == list(antaras.items())
+    nested = table.to_nested(3, limit=2)
+    assert len(nested) == 2 and nested[0]['antardasha'][1]['lord'] == bhukti
+    assert len(nested[0]['antardasha'][1]['pratyantara']) == 9
+
+
+def test_periods_at_agrees_with_built_levels():
+    table = vimsottari.vimsottari_period_table(_JD, _PLACE)
+    at = _JD + 30.3 * vimsottari.year_duration
+    fresh = vimsottari.VimsottariPeriodTable(list(table.lords(0)), list(table.starts(0)))
+    current = fresh.periods_at(at, 5)  # sub periods computed along the path only
+    assert current == table.periods_at(at, 5)
+    for level, (lord, start, end) in enumerate(current):
+        index = table.period_index(at, level)
+        assert table.period(level, index) == (lord, start, end) and start <= at < end
+    assert table.periods_at(table.end + 1) == []
+    assert list(table.periods_between(current[0][1], current[0][2], 0)) == [table.period_index(at, 0)]
@@ -0,0 +1,78 @@
+import inspect
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from jhora import const, utils
+from jhora.panchanga import drik
+from jhora.horoscope.chart import yoga, yoga_engine
+
+_JD = utils.julian_day_number(drik.Date(1996, 12, 7), (10, 34, 0))
+_PLACE = drik.Place('Chennai', 13.0878, 80.2785, 5.5)
+
+
+def test_dasavarga_from_longs_matches_drik():
+    rng = random.Random(7)
+    longitudes = [rng.uniform(0, 360) for _ in range(200)] + [0.0, 29.99999, 359.99999, 120.0]
+    signs, long_in_raasi = yoga_engine.dasavarga_from_longs(longitudes, const.division_chart_factors)
+    for row, dvf in enumerate(const.division_chart_factors):
+        for col, long in enumerate(longitudes):
+            assert (signs[row, col], long_in_raasi[row, col]) == drik.dasavarga_from_long(long, dvf)
+
+
+def test_compiled_rules_match_yoga_predicates():
+    rng = random.Random(11)
+    compiled = yoga_engine.YogaEngine('en')
+    reference = yoga_engine.YogaEngine('en', compiled=False)
+    for _ in range(300):
+        planet_positions = [[const._ascendant_symbol, (rng.randrange(12), 1.0)]] + \
+                           [[p, (rng.randrange(12), rng.uniform(0, 30))] for p in range(9)]
+        assert compiled.yogas_of_chart(planet_positions) == reference.yogas_of_chart(planet_positions)
+
+
+def _varga_chart(jd, place, dvf):
+    """Chart of one varga straight from drik (no chart matrix): Lagna first, up to Ketu"""
+    asc = drik.dasavarga_from_long(drik.ascendant(jd, place)[1], dvf)
+    return ([[const._ascendant_symbol, asc]] + drik.dhasavarga(jd, place, dvf))[:const._pp_count_upto_ketu]
+
+
+def _per_rule_yogas(jd, place):
+    """{yoga: 'D<n>' of the first varga it occurs in}: every <yoga>_from_planet_positions rule of yoga.py
+    evaluated on its own, on varga charts computed one at a time (the path before the yoga engine)"""
+    navamsa = {p: h for p, (h, _) in _varga_chart(jd, place, 9)}
+    found = {}
+    for dvf in const.division_chart_factors:
+        planet_positions = _varga_chart(jd, place, dvf)
+        for name in yoga.get_yoga_resources('en'):
+            fn = getattr(yoga, name + '_from_planet_positions', None)
+            if not callable(fn) or name in found:
+                continue
+            args = (planet_positions, navamsa) if 'p_to_h_navamsa' in inspect.signature(fn).parameters \
+                else (planet_positions,)
+            try:
+                exists = fn(*args)
+            except Exception:
+                exists = False
+            if exists:
+                found[name] = 'D' + str(dvf)
+    return found
+
+
+def test_all_charts_use_one_matrix_and_the_navamsa_chart():
+    matrix = yoga_engine.yoga_chart_matrix(_JD, _PLACE)
+    assert matrix.factors == list(const.division_chart_factors)
+    d9 = matrix.planet_positions(9)
+    assert matrix.navamsa == {p: h for p, (h, _) in d9}
+    signs = lambda chart: {p: h for p, (h, _) in chart[:const._pp_count_upto_ketu]}
+    assert signs(d9) == signs(_varga_chart(_JD, _PLACE, 9))
+    results, count, total = yoga.get_yoga_details_for_all_charts(_JD, _PLACE)
+    assert {name: details[0] for name, details in results.items()} == _per_rule_yogas(_JD, _PLACE)
+    assert count == len(results) > 0
+    assert total == len(yoga.get_yoga_resources('en')) * len(const.division_chart_factors)
+    # navamsa yogas no longer depend on module state left behind by an earlier call
+    pp = matrix.planet_positions(1)[:const._pp_count_upto_ketu]
+    assert yoga.bhaarathi_yoga_from_planet_positions(pp) == yoga.bhaarathi_yoga_from_planet_positions(pp, {})
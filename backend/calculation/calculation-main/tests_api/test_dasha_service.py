@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+from api import dashas
+from api.app import app, _DASHAS
+
+client = TestClient(app)
+
+def _make_request(birth="1985-11-02T06:40:00"):
+    body = {
+        "birthDateTime": birth,
+        "location": {"place": "Chennai,IN", "tzOffset": 5.5},
+        "language": "en",
+        "divisionalFactors": [1]
+    }
+    r = client.post('/api/horoscope', json=body)
+    assert r.status_code == 200, r.text
+    return r.json()['meta']['requestId']
+
+def test_multi_dasha_matches_single_system_endpoints():
+    rid = _make_request()
+    r = client.get(f'/api/dhasa/multi?request_id={rid}&systems=yogini,sthira,chara&limit=7')
+    assert r.status_code == 200, r.text
+    systems = r.json()['systems']
+    assert list(systems) == ['yogini', 'sthira', 'chara']
+    single = client.get(f'/api/dhasa/graha/yogini?request_id={rid}&limit=7').json()
+    assert systems['yogini']['periods'] == single['periods']
+    single = client.get(f'/api/dhasa/sthira?request_id={rid}&limit=7').json()
+    assert systems['sthira']['periods'] == single['periods'] and systems['sthira']['returned'] == 7
+
+def test_dasha_service_memoizes_per_request_and_options():
+    rid = _make_request()
+    computed = _DASHAS.computed
+    for limit in (3, 5, 9):
+        assert client.get(f'/api/dhasa/graha/yogini?request_id={rid}&limit={limit}').status_code == 200
+    assert _DASHAS.computed - computed <= 1
+    assert client.get(f'/api/dhasa/multi?request_id={rid}&systems=yogini,nope').status_code == 404
+    assert client.get(f'/api/dhasa/graha/sthira?request_id={rid}').status_code == 404
+    client.delete(f'/api/horoscope/{rid}')
+    assert _DASHAS.invalidate(rid) == 0
+
+def test_every_system_resolves_to_a_dasha_function():
+    for name in dashas.SYSTEMS:
+        config, fn = dashas._periods_function(name)
+        assert callable(fn), name
+
+def test_remapped_rasi_systems_return_periods():
+    rid = _make_request()
+    r = client.get(f'/api/dhasa/multi?request_id={rid}&systems=drig,sudasa,kalachakra,kendraadhi_rasi,shoola&limit=5')
+    assert r.status_code == 200, r.text
+    for name, result in r.json()['systems'].items():
+        assert 'error' not in result and result['returned'] == 5, (name, result)
+
+def test_missing_dasha_function_is_not_implemented(monkeypatch):
+    rid = _make_request("1979-03-14T21:05:00")  # not memoized by the other tests
+    monkeypatch.setitem(dashas.SYSTEMS, 'drig', dashas.SYSTEMS['drig']._replace(function='no_such_function'))
+    r = client.get(f'/api/dhasa/drig?request_id={rid}&limit=5')
+    assert r.status_code == 501 and 'no_such_function' in r.json()['detail']
+
+def test_dasha_functions_keep_their_own_defaults():
+    from api import service
+    from jhora.horoscope.dhasa.graha import ashtottari, yogini
+    from jhora.horoscope.dhasa.raasi import navamsa
+    rid = _make_request("1972-07-21T04:15:00")
+    stored = service._store.get(rid)
+    ctx = dashas.birth_context(stored)
+    assert _DASHAS.compute(rid, stored, 'ashtottari') == ashtottari.get_ashtottari_dhasa_bhukthi(ctx.jd, ctx.place)
+    assert _DASHAS.compute(rid, stored, 'yogini') == yogini.get_dhasa_bhukthi(ctx.dob, ctx.tob, ctx.place)
+    assert _DASHAS.compute(rid, stored, 'navamsa') == navamsa.get_dhasa_antardhasa(ctx.dob, ctx.tob, ctx.place)
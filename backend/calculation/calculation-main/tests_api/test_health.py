@@ -8,3 +8,8 @@ def test_health():
     r = client.get('/api/health')
     assert r.status_code == 200
     assert r.json()['status']=='ok'
+
+def test_health_reports_store_metrics():
+    data = client.get('/api/health').json()
+    assert set(data['horoscopeStore']) >= {'entries', 'bytes', 'hitRate', 'evictions', 'rehydrations'}
+    assert 'requests' in data['requestStore']
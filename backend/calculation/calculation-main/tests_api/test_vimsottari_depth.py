@@ -32,3 +32,12 @@ def test_vimsottari_depth5():
     for p in data['periods']:
         # Ensure sookshma and prana keys present
         assert 'sookshmaLord' in p and 'pranaLord' in p
+
+def test_vimsottari_current_periods():
+    rid = _make_request()
+    r = client.get(f'/api/dhasa/vimsottari/current?request_id={rid}&dateTime=2024-06-01T12:00:00&depth=3')
+    assert r.status_code == 200, r.text
+    periods = r.json()['periods']
+    assert [p['level'] for p in periods] == ['maha', 'antara', 'pratyantara']
+    for outer, inner in zip(periods, periods[1:]):
+        assert outer['start'] <= inner['start'] < inner['end'] <= outer['end']
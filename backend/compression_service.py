@@ -4,8 +4,16 @@ Converts full horoscope output into compressed two-layer format
 """
 import json
 import re
+import struct
+import zlib
+from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
+try:
+    import zstandard as _zstd  # optional: better ratio and speed than zlib
+except ImportError:
+    _zstd = None
+
 # Planet and Sign Mappings
 PLANET_NAMES = {
     0: "Sun", 1: "Moon", 2: "Mars", 3: "Merc", 4: "Jup", 
@@ -243,3 +251,237 @@ def split_into_chunks(compressed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         })
     
     return chunks
+
+
+# ---------------------------------------------------------------------------
+# Binary chunk encoding
+#
+# Chunk payloads are stored as one binary blob:
+#   b"HC" | format version (u8) | codec (u8) | layout (u8) | compressed body
+# Charts (lagna / divisional) are a string table plus one fixed-width row per
+# planet (name, house, sign, centi-degrees, nakshatra, flag bits). Dasha tables
+# are a string table plus lords and delta-encoded start times (seconds). Other
+# chunks (meta) are compact JSON. A payload that does not round-trip exactly
+# through its layout falls back to JSON, or is stored unchanged.
+# ---------------------------------------------------------------------------
+
+CHUNK_FORMAT_VERSION = 1
+_CHUNK_MAGIC = b"HC"
+_FRAME = struct.Struct("<2sBBB")
+
+CODEC_NONE, CODEC_ZLIB, CODEC_ZSTD = 0, 1, 2
+LAYOUT_JSON, LAYOUT_CHART, LAYOUT_DASHA = 0, 1, 2
+
+_NO_STRING = 0xFFFF
+_CHART_HEAD = struct.Struct("<HHiH")      # label, asc sign, asc centi-degrees, planet count
+_PLANET_ROW = struct.Struct("<HhHiHB")    # name, house (-1: none), sign, centi-degrees, nakshatra, flags
+_DASHA_HEAD = struct.Struct("<HH")        # system, mahadasha count
+_PERIOD_ROW = struct.Struct("<HiH")       # lord, start delta (seconds), antardasha count
+_SUB_PERIOD_ROW = struct.Struct("<Hi")    # lord, start delta (seconds)
+_FIRST_START = struct.Struct("<q")
+_PLANET_FLAGS = ("retrograde", "combust", "exalted", "debilitated", "own_sign", "moolatrikona", "vargottama")
+_START_FORMAT = "%Y-%m-%d %H:%M:%S"
+_EPOCH = datetime(1, 1, 1)
+
+
+class _StringTable:
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings = strings or []
+        self._index = {v: i for i, v in enumerate(self.strings)}
+
+    def ref(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        if not isinstance(value, str):
+            raise TypeError("not a string")
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.strings)
+            if idx >= _NO_STRING:
+                raise ValueError("string table full")
+            self.strings.append(value)
+        return idx
+
+    def get(self, idx: int) -> Optional[str]:
+        return None if idx == _NO_STRING else self.strings[idx]
+
+    def pack(self) -> bytes:
+        out = [struct.pack("<H", len(self.strings))]
+        for value in self.strings:
+            raw = value.encode("utf-8")
+            out.append(struct.pack("<H", len(raw)) + raw)
+        return b"".join(out)
+
+    @classmethod
+    def unpack(cls, body: bytes, pos: int):
+        (count,) = struct.unpack_from("<H", body, pos)
+        pos += 2
+        strings = []
+        for _ in range(count):
+            (n,) = struct.unpack_from("<H", body, pos)
+            strings.append(body[pos + 2:pos + 2 + n].decode("utf-8"))
+            pos += 2 + n
+        return cls(strings), pos
+
+
+def _centi(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError("not a number")
+    return int(round(value * 100))
+
+
+def _encode_chart(chart: Dict[str, Any]) -> bytes:
+    strings = _StringTable()
+    planets = chart["planets"]
+    head = _CHART_HEAD.pack(strings.ref(chart["label"]), strings.ref(chart["asc_sign"]),
+                            _centi(chart["asc_deg"]), len(planets))
+    rows = []
+    for p in planets:
+        house = p.get("house")
+        flags = 0
+        for bit, key in enumerate(_PLANET_FLAGS):
+            if p.get(key):
+                flags |= 1 << bit
+        rows.append(_PLANET_ROW.pack(strings.ref(p["name"]), -1 if house is None else house,
+                                     strings.ref(p["sign"]), _centi(p["deg"]), strings.ref(p.get("nak")), flags))
+    return strings.pack() + head + b"".join(rows)
+
+
+def _decode_chart(body: bytes) -> Dict[str, Any]:
+    strings, pos = _StringTable.unpack(body, 0)
+    label, asc_sign, asc_deg, count = _CHART_HEAD.unpack_from(body, pos)
+    pos += _CHART_HEAD.size
+    planets = []
+    for _ in range(count):
+        name, house, sign, deg, nak, flags = _PLANET_ROW.unpack_from(body, pos)
+        pos += _PLANET_ROW.size
+        p = {"name": strings.get(name), "house": None if house < 0 else house,
+             "sign": strings.get(sign), "deg": deg / 100}
+        if nak != _NO_STRING:
+            p["nak"] = strings.get(nak)
+        for bit, key in enumerate(_PLANET_FLAGS):
+            if flags & (1 << bit):
+                p[key] = True
+        planets.append(p)
+    return {"label": strings.get(label), "asc_sign": strings.get(asc_sign), "asc_deg": asc_deg / 100,
+            "planets": planets}
+
+
+def _start_seconds(start: str) -> int:
+    delta = datetime.strptime(start, _START_FORMAT) - _EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def _start_string(seconds: int) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime(_START_FORMAT)
+
+
+def _encode_dasha(dasha: Dict[str, Any]) -> bytes:
+    strings = _StringTable()
+    periods = dasha["periods"]
+    out = [_DASHA_HEAD.pack(strings.ref(dasha["system"]), len(periods))]
+    previous = None
+    for md in periods:
+        start = _start_seconds(md["start"])
+        if previous is None:
+            out.append(_FIRST_START.pack(start))
+            previous = start
+        subs = md["antardasha"]
+        out.append(_PERIOD_ROW.pack(strings.ref(md["lord"]), start - previous, len(subs)))
+        previous = start
+        for ad in subs:
+            start = _start_seconds(ad["start"])
+            out.append(_SUB_PERIOD_ROW.pack(strings.ref(ad["lord"]), start - previous))
+            previous = start
+    return strings.pack() + b"".join(out)
+
+
+def _decode_dasha(body: bytes) -> Dict[str, Any]:
+    strings, pos = _StringTable.unpack(body, 0)
+    system, count = _DASHA_HEAD.unpack_from(body, pos)
+    pos += _DASHA_HEAD.size
+    periods = []
+    previous = None
+    for _ in range(count):
+        if previous is None:
+            (previous,) = _FIRST_START.unpack_from(body, pos)
+            pos += _FIRST_START.size
+        lord, delta, n_sub = _PERIOD_ROW.unpack_from(body, pos)
+        pos += _PERIOD_ROW.size
+        previous += delta
+        md = {"lord": strings.get(lord), "start": _start_string(previous), "antardasha": []}
+        for _ in range(n_sub):
+            sub_lord, sub_delta = _SUB_PERIOD_ROW.unpack_from(body, pos)
+            pos += _SUB_PERIOD_ROW.size
+            previous += sub_delta
+            md["antardasha"].append({"lord": strings.get(sub_lord), "start": _start_string(previous)})
+        periods.append(md)
+    return {"system": strings.get(system), "periods": periods}
+
+
+def _encode_json(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _decode_json(body: bytes) -> Any:
+    return json.loads(body.decode("utf-8"))
+
+
+_LAYOUTS = {
+    LAYOUT_JSON: (_encode_json, _decode_json),
+    LAYOUT_CHART: (_encode_chart, _decode_chart),
+    LAYOUT_DASHA: (_encode_dasha, _decode_dasha),
+}
+_CHUNK_LAYOUT = {"lagna": LAYOUT_CHART, "divisional": LAYOUT_CHART, "dasha": LAYOUT_DASHA}
+
+
+def _compress(body: bytes) -> tuple:
+    if _zstd is not None:
+        return CODEC_ZSTD, _zstd.ZstdCompressor(level=10).compress(body)
+    return CODEC_ZLIB, zlib.compress(body, 9)
+
+
+def _decompress(codec: int, body: bytes) -> bytes:
+    if codec == CODEC_NONE:
+        return body
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(body)
+    if codec == CODEC_ZSTD:
+        if _zstd is None:
+            raise RuntimeError("chunk is zstd compressed but the zstandard package is not installed")
+        return _zstd.ZstdDecompressor().decompress(body)
+    raise ValueError(f"unknown chunk codec {codec}")
+
+
+def encode_chunk_data(chunk_type: Optional[str], data: Any) -> Any:
+    """
+    Encode a chunk payload (output of split_into_chunks) into the binary chunk format.
+    Returns the payload unchanged if it cannot be represented losslessly.
+    """
+    if data is None:
+        return None
+    for layout in dict.fromkeys((_CHUNK_LAYOUT.get(chunk_type, LAYOUT_JSON), LAYOUT_JSON)):
+        encode, decode = _LAYOUTS[layout]
+        try:
+            body = encode(data)
+            if decode(body) != data:
+                continue
+        except (KeyError, TypeError, ValueError, OverflowError, struct.error):
+            continue
+        codec, packed = _compress(body)
+        return _FRAME.pack(_CHUNK_MAGIC, CHUNK_FORMAT_VERSION, codec, layout) + packed
+    return data
+
+
+def decode_chunk_data(data: Any) -> Any:
+    """
+    Decode a chunk payload written by encode_chunk_data.
+    Payloads stored before the binary format (plain documents) are returned as they are.
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        return data
+    raw = bytes(data)
+    magic, version, codec, layout = _FRAME.unpack_from(raw, 0)
+    if magic != _CHUNK_MAGIC or version != CHUNK_FORMAT_VERSION or layout not in _LAYOUTS:
+        raise ValueError(f"unsupported chunk format (magic={magic!r}, version={version}, layout={layout})")
+    return _LAYOUTS[layout][1](_decompress(codec, raw[_FRAME.size:]))
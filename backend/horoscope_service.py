@@ -2,14 +2,147 @@
 Horoscope Service
 Manages the complete flow: Calculation → Compression → MongoDB Storage
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime
 from mongo import mongo_db
-from compression_service import compress_horoscope, split_into_chunks
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from compression_service import compress_horoscope, split_into_chunks, encode_chunk_data, decode_chunk_data
+import asyncio
+import copy
 import logging
+import os
+import uuid
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Cleanup tasks of superseded chunk sets; referenced here so they are not garbage collected mid-run
+_cleanup_tasks: set = set()
+
+def _chunk_documents(
+    user_email: str,
+    request_id: str,
+    version: str,
+    chunks: List[Dict[str, Any]],
+    now: datetime
+) -> List[Dict[str, Any]]:
+    """Build the horoscope_chunks documents of one chunk set"""
+    return [
+        {
+            "user_email": user_email,
+            "request_id": request_id,
+            "version": version,
+            "chunk_index": idx,
+            "chunk_type": chunk.get("chunk_type"),
+            "chart_name": chunk.get("chart_name"),  # For divisional charts
+            "data": encode_chunk_data(chunk.get("chunk_type"), chunk.get("data")),
+            "created_at": now,
+            "updated_at": now
+        }
+        for idx, chunk in enumerate(chunks)
+    ]
+
+def _active_chunks_filter(index: Dict[str, Any]) -> Dict[str, Any]:
+    """Query for the chunks of the chunk set the index entry points at.
+    Entries written before chunk sets were versioned have no active_version; their chunks have no version."""
+    return {
+        "user_email": index["user_email"],
+        "request_id": index["request_id"],
+        "version": index.get("active_version")
+    }
+
+async def _delete_stale_chunks(user_email: str, request_id: str) -> None:
+    """Remove every chunk set of the horoscope other than the active one that was written before it:
+    the replaced set, unversioned legacy chunks, orphans of failed writes and sets of writes still in
+    flight that already lost. The pointer swap only ever moves to a newer set, so none of these can
+    become active again; sets of pending writes newer than the active one are left alone."""
+    try:
+        index = await mongo_db.db.horoscopes.find_one(
+            {"user_email": user_email, "request_id": request_id},
+            projection={"active_version": 1, "updated_at": 1}
+        )
+        if not index or index.get("active_version") is None or index.get("updated_at") is None:
+            return
+        # updated_at of the index entry is the created_at of the chunk set it points at
+        result = await mongo_db.db.horoscope_chunks.delete_many({
+            "user_email": user_email,
+            "request_id": request_id,
+            "version": {"$ne": index["active_version"]},
+            "created_at": {"$lt": index["updated_at"]}
+        })
+        if result.deleted_count:
+            logger.info(f"Removed {result.deleted_count} stale chunks of horoscope {request_id}")
+    except Exception as e:
+        # Stale sets are invisible to readers; the next store of this horoscope retries the cleanup
+        logger.warning(f"Failed to remove stale chunks of horoscope {request_id}: {e}")
+
+def _schedule_chunk_cleanup(user_email: str, request_id: str) -> None:
+    task = asyncio.get_running_loop().create_task(_delete_stale_chunks(user_email, request_id))
+    _cleanup_tasks.add(task)
+    task.add_done_callback(_cleanup_tasks.discard)
+
+async def _swap_active_version(index_doc: Dict[str, Any], upsert: bool) -> Optional[Dict[str, Any]]:
+    """Point the index entry at the chunk set of index_doc unless it already points at a newer one.
+    Returns the entry before the swap, None if there was none (upsert) or it was newer (no upsert)."""
+    return await mongo_db.db.horoscopes.find_one_and_update(
+        {
+            "user_email": index_doc["user_email"],
+            "request_id": index_doc["request_id"],
+            "$or": [{"updated_at": {"$lt": index_doc["updated_at"]}}, {"updated_at": {"$exists": False}}]
+        },
+        {"$set": index_doc},
+        projection={"active_version": 1},
+        upsert=upsert,
+        return_document=ReturnDocument.BEFORE
+    )
+
+# Sections that get_horoscope_sections can return; divisional charts are selected by chart name
+HOROSCOPE_SECTIONS = ("meta", "lagna", "dasha")
+SECTION_CACHE_USERS = int(os.getenv("HOROSCOPE_SECTION_CACHE_USERS", "256"))
+SECTION_CACHE_PER_USER = int(os.getenv("HOROSCOPE_SECTION_CACHE_PER_USER", "32"))
+
+class _SectionCache:
+    """
+    Per-user LRU of decoded horoscope sections keyed by (request_id, version, chunk_type, chart_name).
+    Keys carry the chunk set version, so a re-stored horoscope never serves stale sections.
+    Sections are copied in and out, so callers may modify what they get without corrupting the cache.
+    Only touched from the event loop thread, so no locking is needed.
+    """
+    def __init__(self, max_users: int, per_user: int):
+        self.max_users = max_users
+        self.per_user = per_user
+        self._users: "OrderedDict[str, OrderedDict]" = OrderedDict()
+    
+    def get(self, user_email: str, key: tuple) -> Any:
+        sections = self._users.get(user_email)
+        if sections is None or key not in sections:
+            return _MISSING
+        self._users.move_to_end(user_email)
+        sections.move_to_end(key)
+        return copy.deepcopy(sections[key])
+    
+    def put(self, user_email: str, key: tuple, data: Any) -> None:
+        if self.max_users <= 0 or self.per_user <= 0:
+            return
+        sections = self._users.setdefault(user_email, OrderedDict())
+        self._users.move_to_end(user_email)
+        sections[key] = copy.deepcopy(data)
+        sections.move_to_end(key)
+        while len(sections) > self.per_user:
+            sections.popitem(last=False)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+    
+    def invalidate(self, user_email: str, request_id: str) -> None:
+        sections = self._users.get(user_email)
+        if sections:
+            for key in [k for k in sections if k[0] == request_id]:
+                del sections[key]
+
+_MISSING = object()
+_section_cache = _SectionCache(SECTION_CACHE_USERS, SECTION_CACHE_PER_USER)
+
 async def compress_and_store_horoscope(
     user_email: str,
     horoscope_data: Dict[str, Any],
@@ -88,53 +221,58 @@ async def compress_and_store_horoscope(
         # Step 2: Split into chunks
         chunks = split_into_chunks(compressed)
         
-        # Step 3: Delete existing chunks for this horoscope (if any)
-        await mongo_db.db.horoscope_chunks.delete_many({
-            "user_email": user_email,
-            "request_id": request_id
-        })
-        
-        # Step 4: Store chunks in MongoDB
-        stored_chunks = []
-        for idx, chunk in enumerate(chunks):
-            doc = {
-                "user_email": user_email,
-                "request_id": request_id,
-                "chunk_index": idx,
-                "chunk_type": chunk.get("chunk_type"),
-                "chart_name": chunk.get("chart_name"),  # For divisional charts
-                "data": chunk.get("data"),
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }
-            
-            result = await mongo_db.db.horoscope_chunks.insert_one(doc)
-            stored_chunks.append(str(result.inserted_id))
+        # Step 3: Write the chunks as a new chunk set in one round trip. Readers keep using the
+        # previous set (horoscopes.active_version) until the pointer swap below, so a crash
+        # mid-write never exposes a partial horoscope; it only leaves an orphan set behind.
+        version = uuid.uuid4().hex
+        now = datetime.utcnow()
+        docs = _chunk_documents(user_email, request_id, version, chunks, now)
+        result = await mongo_db.db.horoscope_chunks.insert_many(docs, ordered=False)
+        stored_chunks = [str(_id) for _id in result.inserted_ids]
         
-        # Step 5: Create or update horoscope index entry
+        # Step 4: Atomically point the horoscope index entry at the new chunk set
         index_doc = {
             "user_email": user_email,
             "request_id": request_id,
+            "active_version": version,
             "chunks_count": len(chunks),
             "chunk_ids": stored_chunks,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
+            "created_at": now,
+            "updated_at": now,
             "status": "complete"
         }
         
-        # Use update_one with upsert to handle duplicates
-        await mongo_db.db.horoscopes.update_one(
-            {"user_email": user_email, "request_id": request_id},
-            {"$set": index_doc},
-            upsert=True
-        )
+        # Upsert handles first stores. If the entry already points at a newer set the upsert hits the
+        # unique (user_email, request_id) index instead: a concurrent store started after ours won.
+        superseded = False
+        try:
+            await _swap_active_version(index_doc, upsert=True)
+        except DuplicateKeyError:
+            # Either a newer store won, or a concurrent first store created the entry before us
+            superseded = await _swap_active_version(index_doc, upsert=False) is None
+        
+        _section_cache.invalidate(user_email, request_id)
+        
+        # Step 5: Drop the superseded chunk sets (ours if a newer store won) off the request path
+        _schedule_chunk_cleanup(user_email, request_id)
         
-        logger.info(f"Stored horoscope {request_id} for user {user_email} in {len(chunks)} chunks")
+        if superseded:
+            logger.info(f"Stored horoscope {request_id} for user {user_email} was superseded by a newer store (version {version})")
+            return {
+                "status": "superseded",
+                "chunks_count": len(chunks),
+                "chunk_ids": [],
+                "version": version,
+                "request_id": request_id
+            }
+        
+        logger.info(f"Stored horoscope {request_id} for user {user_email} in {len(chunks)} chunks (version {version})")
         
         return {
             "status": "success",
             "chunks_count": len(chunks),
             "chunk_ids": stored_chunks,
+            "version": version,
             "request_id": request_id
         }
     
@@ -169,11 +307,10 @@ async def get_user_horoscope(
         if not index:
             return None
         
-        # Get all chunks
-        chunks_cursor = mongo_db.db.horoscope_chunks.find({
-            "user_email": user_email,
-            "request_id": request_id
-        }).sort("chunk_index", 1)
+        # Get the chunks of the active chunk set
+        chunks_cursor = mongo_db.db.horoscope_chunks.find(
+            _active_chunks_filter(index)
+        ).sort("chunk_index", 1)
         
         chunks = await chunks_cursor.to_list(length=None)
         
@@ -191,7 +328,7 @@ async def get_user_horoscope(
         
         for chunk in chunks:
             chunk_type = chunk.get("chunk_type")
-            data = chunk.get("data")
+            data = decode_chunk_data(chunk.get("data"))
             
             logger.debug(f"[HOROSCOPE] Processing chunk: type='{chunk_type}', data_present={data is not None}")
             
@@ -216,6 +353,84 @@ async def get_user_horoscope(
         logger.error(f"Failed to retrieve horoscope: {e}")
         raise
 
+async def get_horoscope_sections(
+    user_email: str,
+    request_id: str,
+    sections: Iterable[str] = HOROSCOPE_SECTIONS,
+    charts: Iterable[str] = ()
+) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve only the requested parts of a stored horoscope
+    
+    Args:
+        user_email: User's email
+        request_id: Horoscope request ID
+        sections: Any of "meta", "lagna", "dasha"
+        charts: Divisional chart names, e.g. ["D9", "D10"]
+    
+    Returns:
+        Horoscope in the get_user_horoscope shape holding only the requested parts
+        (missing ones are None / absent from d_series), or None if there is no such horoscope
+    """
+    if mongo_db.db is None:
+        raise Exception("Database not initialized")
+    
+    sections = [s for s in dict.fromkeys(sections) if s in HOROSCOPE_SECTIONS]
+    charts = list(dict.fromkeys(charts))
+    
+    try:
+        index = await mongo_db.db.horoscopes.find_one(
+            {"user_email": user_email, "request_id": request_id},
+            projection={"user_email": 1, "request_id": 1, "active_version": 1}
+        )
+        if not index:
+            return None
+        version = index.get("active_version")
+        
+        wanted = [(section, None) for section in sections] + [("divisional", name) for name in charts]
+        found: Dict[tuple, Any] = {}
+        missing = []
+        for chunk_type, chart_name in wanted:
+            data = _section_cache.get(user_email, (request_id, version, chunk_type, chart_name))
+            if data is _MISSING:
+                missing.append((chunk_type, chart_name))
+            else:
+                found[(chunk_type, chart_name)] = data
+        
+        if missing:
+            # One query on the (user_email, request_id, chunk_type, chart_name) index for the cache misses
+            clauses = []
+            missing_sections = [t for t, _ in missing if t != "divisional"]
+            missing_charts = [name for t, name in missing if t == "divisional"]
+            if missing_sections:
+                clauses.append({"chunk_type": {"$in": missing_sections}})
+            if missing_charts:
+                clauses.append({"chunk_type": "divisional", "chart_name": {"$in": missing_charts}})
+            query = _active_chunks_filter(index)
+            query["$or"] = clauses
+            chunks = await mongo_db.db.horoscope_chunks.find(
+                query,
+                projection={"_id": 0, "chunk_type": 1, "chart_name": 1, "data": 1}
+            ).to_list(length=None)
+            for chunk in chunks:
+                chunk_type = chunk.get("chunk_type")
+                key = (chunk_type, chunk.get("chart_name") if chunk_type == "divisional" else None)
+                found[key] = decode_chunk_data(chunk.get("data"))
+            for key in missing:
+                # Absent sections are cached too, so a horoscope without dasha does not query every time
+                _section_cache.put(user_email, (request_id, version) + key, found.get(key))
+        
+        horoscope: Dict[str, Any] = {section: found.get((section, None)) for section in sections}
+        horoscope["d_series"] = {
+            name: found[("divisional", name)] for name in charts if found.get(("divisional", name)) is not None
+        }
+        logger.info(f"[HOROSCOPE] Sections {sections + charts} of {request_id}: {len(missing)} fetched, {len(wanted) - len(missing)} cached")
+        return horoscope
+    
+    except Exception as e:
+        logger.error(f"Failed to retrieve horoscope sections: {e}")
+        raise
+
 async def list_user_horoscopes(
     user_email: str,
     limit: int = 50,
@@ -270,14 +485,16 @@ async def delete_user_horoscope(
         raise Exception("Database not initialized")
     
     try:
-        # Delete chunks
-        await mongo_db.db.horoscope_chunks.delete_many({
+        _section_cache.invalidate(user_email, request_id)
+        
+        # Delete index first so readers stop resolving the horoscope before its chunks go
+        result = await mongo_db.db.horoscopes.delete_one({
             "user_email": user_email,
             "request_id": request_id
         })
         
-        # Delete index
-        result = await mongo_db.db.horoscopes.delete_one({
+        # Delete chunks (all chunk sets)
+        await mongo_db.db.horoscope_chunks.delete_many({
             "user_email": user_email,
             "request_id": request_id
         })
@@ -75,6 +75,8 @@ class MongoDB:
             await self.db.horoscopes.create_index("user_email")
             await self.db.horoscopes.create_index("created_at")
             await self.db.horoscope_chunks.create_index([("user_email", 1), ("request_id", 1), ("chunk_index", 1)])
+            await self.db.horoscope_chunks.create_index([("user_email", 1), ("request_id", 1), ("version", 1), ("chunk_index", 1)])
+            await self.db.horoscope_chunks.create_index([("user_email", 1), ("request_id", 1), ("chunk_type", 1), ("chart_name", 1), ("version", 1)])
             await self.db.horoscope_chunks.create_index("request_id")
             
             # Deva Agent conversation indexes
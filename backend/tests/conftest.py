@@ -0,0 +1,145 @@
+import asyncio
+import copy
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+# Backend modules are imported top-level (`from mongo import mongo_db`)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _matches(doc, query):
+    for key, cond in query.items():
+        if key == '$or':
+            if not any(_matches(doc, clause) for clause in cond):
+                return False
+            continue
+        present, value = key in doc, doc.get(key)
+        if isinstance(cond, dict) and any(k.startswith('$') for k in cond):
+            for op, arg in cond.items():
+                if op == '$ne' and value == arg:
+                    return False
+                if op == '$lt' and not (present and value < arg):
+                    return False
+                if op == '$in' and value not in arg:
+                    return False
+                if op == '$exists' and present != arg:
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return copy.deepcopy(doc)
+    keys = [k for k, v in projection.items() if v]
+    out = {k: copy.deepcopy(doc[k]) for k in keys if k in doc}
+    if projection.get('_id', 1) and '_id' in doc:
+        out['_id'] = doc['_id']
+    return out
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, key, direction=1):
+        self._docs.sort(key=lambda d: d.get(key), reverse=direction < 0)
+        return self
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(0)
+        return self._docs if length is None else self._docs[:length]
+
+
+class FakeCollection:
+    """In-memory stand-in for the Motor collection methods the backend services use. Every call yields to
+    the event loop once, so concurrent writers interleave at each database round trip."""
+
+    def __init__(self, unique=None):
+        self.docs = []
+        self.unique = unique
+        self.calls = []
+        self.finds = []  # (query, projection) of every find()
+        self.insert_hooks = []  # awaited by the next insert_many calls, after their documents are written
+        self._ids = itertools.count(1)
+
+    def _check_unique(self, doc):
+        if self.unique and any(all(d.get(k) == doc.get(k) for k in self.unique) for d in self.docs):
+            from pymongo.errors import DuplicateKeyError
+            raise DuplicateKeyError('duplicate key')
+
+    async def insert_many(self, docs, ordered=True):
+        await asyncio.sleep(0)
+        self.calls.append('insert_many')
+        ids = []
+        for doc in docs:
+            doc = dict(doc, _id=next(self._ids))
+            self.docs.append(doc)
+            ids.append(doc['_id'])
+        if self.insert_hooks:
+            await self.insert_hooks.pop(0)()
+        return type('InsertManyResult', (), {'inserted_ids': ids})()
+
+    async def find_one(self, query, projection=None):
+        await asyncio.sleep(0)
+        self.calls.append('find_one')
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        return None if doc is None else _project(doc, projection)
+
+    def find(self, query, projection=None):
+        self.calls.append('find')
+        self.finds.append((query, projection))
+        return _Cursor([_project(d, projection) for d in self.docs if _matches(d, query)])
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=False):
+        await asyncio.sleep(0)
+        self.calls.append('find_one_and_update')
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return None
+            new = {k: v for k, v in query.items() if not k.startswith('$')}
+            new.update(update.get('$set', {}))
+            self._check_unique(new)
+            self.docs.append(dict(new, _id=next(self._ids)))
+            return None
+        before = _project(doc, projection)
+        doc.update(copy.deepcopy(update.get('$set', {})))
+        return _project(doc, projection) if return_document else before
+
+    async def delete_many(self, query):
+        await asyncio.sleep(0)
+        self.calls.append('delete_many')
+        keep = [d for d in self.docs if not _matches(d, query)]
+        deleted, self.docs[:] = len(self.docs) - len(keep), keep
+        return type('DeleteResult', (), {'deleted_count': deleted})()
+
+    async def delete_one(self, query):
+        await asyncio.sleep(0)
+        self.calls.append('delete_one')
+        doc = next((d for d in self.docs if _matches(d, query)), None)
+        if doc is not None:
+            self.docs.remove(doc)
+        return type('DeleteResult', (), {'deleted_count': int(doc is not None)})()
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.horoscopes = FakeCollection(unique=('user_email', 'request_id'))
+        self.horoscope_chunks = FakeCollection()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """horoscope_service with mongo_db.db replaced by a FakeDatabase"""
+    import horoscope_service
+    db = FakeDatabase()
+    monkeypatch.setattr(horoscope_service.mongo_db, 'db', db)
+    monkeypatch.setattr(horoscope_service, '_section_cache',
+                        horoscope_service._SectionCache(horoscope_service.SECTION_CACHE_USERS,
+                                                        horoscope_service.SECTION_CACHE_PER_USER))
+    return db
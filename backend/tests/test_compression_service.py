@@ -0,0 +1,91 @@
+import zlib
+
+import pytest
+
+import compression_service as cs
+
+CHART = {
+    'label': 'D-9 Navamsa', 'asc_sign': 'Ari', 'asc_deg': 12.5,
+    'planets': [
+        {'name': 'Asc', 'house': 1, 'sign': 'Ari', 'deg': 12.5},
+        {'name': 'Sun', 'house': 10, 'sign': 'Cap', 'deg': 16.25, 'nak': 'Shravana-2', 'retrograde': True,
+         'vargottama': True},
+        {'name': 'Rahu', 'house': None, 'sign': 'Aqu', 'deg': 0.0, 'nak': 'Dhanishta'},
+    ],
+}
+DASHA = {
+    'system': 'Vimsottari',
+    'periods': [
+        {'lord': 'Moon', 'start': '1990-01-01 00:00:00',
+         'antardasha': [{'lord': 'Moon', 'start': '1990-01-01 00:00:00'},
+                        {'lord': 'Mars', 'start': '1990-11-01 06:30:00'}]},
+        {'lord': 'Mars', 'start': '2000-01-01 00:00:00', 'antardasha': []},
+    ],
+}
+META = {'name': 'Test', 'calendar': {'tithi': 'Shukla Panchami', 'vaara': 'Monday'}, 'tags': [1, 2.5, None, True]}
+
+
+def _frame(blob: bytes):
+    magic, version, codec, layout = cs._FRAME.unpack_from(blob, 0)
+    assert (magic, version) == (cs._CHUNK_MAGIC, cs.CHUNK_FORMAT_VERSION)
+    return codec, layout
+
+
+def test_chart_chunks_round_trip_through_the_chart_layout():
+    for chunk_type in ('lagna', 'divisional'):
+        blob = cs.encode_chunk_data(chunk_type, CHART)
+        assert isinstance(blob, bytes) and _frame(blob)[1] == cs.LAYOUT_CHART
+        assert cs.decode_chunk_data(blob) == CHART
+
+
+def test_dasha_chunks_round_trip_through_the_dasha_layout():
+    blob = cs.encode_chunk_data('dasha', DASHA)
+    assert _frame(blob)[1] == cs.LAYOUT_DASHA
+    assert cs.decode_chunk_data(blob) == DASHA
+
+
+def test_other_chunks_round_trip_as_compressed_json():
+    blob = cs.encode_chunk_data('meta', META)
+    assert _frame(blob)[1] == cs.LAYOUT_JSON
+    assert cs.decode_chunk_data(blob) == META
+    assert cs.decode_chunk_data(cs.encode_chunk_data('meta', {})) == {}
+
+
+def test_payloads_the_binary_layouts_cannot_hold_fall_back_to_json():
+    # An extra key, a degree with more than two decimals and a non-standard start time would be lost
+    chart = dict(CHART, extra='kept')
+    precise = dict(CHART, asc_deg=12.345)
+    dasha = {'system': 'Vimsottari', 'periods': [{'lord': 'Moon', 'start': '1990-01-01', 'antardasha': []}]}
+    for chunk_type, data in (('lagna', chart), ('divisional', precise), ('dasha', dasha)):
+        blob = cs.encode_chunk_data(chunk_type, data)
+        assert _frame(blob)[1] == cs.LAYOUT_JSON
+        assert cs.decode_chunk_data(blob) == data
+
+
+def test_payloads_json_cannot_hold_are_stored_unchanged():
+    data = {'when': cs.datetime(2020, 1, 1), 'items': {1, 2}}
+    assert cs.encode_chunk_data('meta', data) is data
+    assert cs.decode_chunk_data(data) is data
+    assert cs.encode_chunk_data('lagna', None) is None
+
+
+def test_legacy_uncompressed_chunks_pass_through():
+    for legacy in (CHART, DASHA, META, None, 'text', 3):
+        assert cs.decode_chunk_data(legacy) is legacy
+
+
+def test_zlib_codec_is_used_and_read_without_zstandard(monkeypatch):
+    monkeypatch.setattr(cs, '_zstd', None)
+    blob = cs.encode_chunk_data('dasha', DASHA)
+    assert _frame(blob)[0] == cs.CODEC_ZLIB
+    assert cs.decode_chunk_data(bytearray(blob)) == DASHA
+    raw = cs._FRAME.pack(cs._CHUNK_MAGIC, cs.CHUNK_FORMAT_VERSION, cs.CODEC_NONE, cs.LAYOUT_JSON) + b'{"a":1}'
+    assert cs.decode_chunk_data(memoryview(raw)) == {'a': 1}
+    assert zlib.decompress(blob[cs._FRAME.size:])
+
+
+def test_unknown_chunk_formats_are_rejected():
+    future = cs._FRAME.pack(cs._CHUNK_MAGIC, cs.CHUNK_FORMAT_VERSION + 1, cs.CODEC_NONE, cs.LAYOUT_JSON) + b'{}'
+    for blob in (future, b'XX\x01\x00\x00{}'):
+        with pytest.raises(ValueError):
+            cs.decode_chunk_data(blob)
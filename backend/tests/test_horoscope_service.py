@@ -0,0 +1,213 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('pymongo')
+pytest.importorskip('motor')
+
+import horoscope_service  # noqa: E402
+
+USER, REQUEST = 'user@example.com', 'req-1'
+
+
+def _horoscope(asc_sign: str, asc_number: int) -> dict:
+    planets = [{'name': 'Ascendant', 'house': 1, 'sign': asc_sign, 'rawLongitudeDeg': 12.5},
+               {'name': 'Sun', 'house': 10, 'sign': 'Capricorn', 'rawLongitudeDeg': 16.25,
+                'nakshatra': 'Shravana', 'nakshatraPada': 2}]
+    return {
+        'meta': {'name': 'Test', 'requestId': REQUEST},
+        'rasiChart': {'label': 'Raasi', 'ascendantSignNumber': asc_number, 'ascendantRawLongitudeDeg': 12.5,
+                      'planets': planets},
+        'dasha': {'vimsottari': {'periods': [
+            {'lord': 'Moon', 'start': '1990-01-01 00:00:00',
+             'antardasha': [{'lord': 'Moon', 'start': '1990-01-01 00:00:00'},
+                            {'lord': 'Mars', 'start': '1990-11-01 00:00:00'}]}]}},
+        'divisionalCharts': [{'label': 'D-9 Navamsa', 'ascendantSignNumber': asc_number,
+                              'ascendantRawLongitudeDeg': 3.0, 'planets': planets}],
+    }
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing utcnow(), so every store of a test gets its own timestamp"""
+    class Clock(datetime):
+        current = datetime(2026, 1, 1)
+
+        @classmethod
+        def utcnow(cls):
+            cls.current += timedelta(seconds=1)
+            return cls.current
+    monkeypatch.setattr(horoscope_service, 'datetime', Clock)
+    return Clock
+
+
+async def _store(data: dict) -> dict:
+    return await horoscope_service.compress_and_store_horoscope(USER, data, REQUEST)
+
+
+async def _drain_cleanup() -> None:
+    await asyncio.gather(*list(horoscope_service._cleanup_tasks))
+
+
+def _versions(db) -> set:
+    return {doc.get('version') for doc in db.horoscope_chunks.docs}
+
+
+def test_store_writes_one_chunk_set_and_points_the_index_at_it(fake_db, clock):
+    async def run():
+        result = await _store(_horoscope('Aries', 1))
+        await _drain_cleanup()
+        return result, await horoscope_service.get_user_horoscope(USER, REQUEST)
+
+    result, horoscope = asyncio.run(run())
+    assert result['status'] == 'success' and result['chunks_count'] == 4
+    [index] = fake_db.horoscopes.docs
+    assert index['active_version'] == result['version']
+    assert _versions(fake_db) == {result['version']}
+    assert fake_db.horoscope_chunks.calls.count('insert_many') == 1
+    assert horoscope['lagna']['asc_sign'] == 'Ari'
+    assert horoscope['dasha']['periods'][0]['antardasha'][1]['lord'] == 'Mars'
+    assert set(horoscope['d_series']) == {'D9'}
+
+
+def test_restore_swaps_to_the_new_set_and_removes_the_replaced_one(fake_db, clock):
+    async def run():
+        first = await _store(_horoscope('Aries', 1))
+        await _drain_cleanup()
+        second = await _store(_horoscope('Taurus', 2))
+        await _drain_cleanup()
+        return first, second, await horoscope_service.get_user_horoscope(USER, REQUEST)
+
+    first, second, horoscope = asyncio.run(run())
+    assert first['version'] != second['version']
+    assert len(fake_db.horoscopes.docs) == 1
+    assert fake_db.horoscopes.docs[0]['active_version'] == second['version']
+    assert _versions(fake_db) == {second['version']}
+    assert horoscope['lagna']['asc_sign'] == 'Tau'
+
+
+def test_cleanup_removes_older_sets_but_not_newer_pending_ones(fake_db, clock):
+    def chunk(version, created_at):
+        doc = {'user_email': USER, 'request_id': REQUEST, 'chunk_index': 0, 'chunk_type': 'meta',
+               'data': {}, 'created_at': created_at}
+        if version is not None:
+            doc['version'] = version
+        return doc
+
+    async def run():
+        # Unversioned legacy chunks and an orphan of a crashed write, both older than the store below
+        legacy_time, orphan_time = clock.utcnow(), clock.utcnow()
+        await fake_db.horoscope_chunks.insert_many([chunk(None, legacy_time), chunk('orphan', orphan_time)])
+        result = await _store(_horoscope('Aries', 1))
+        # A slower write started after ours that has not swapped the pointer yet
+        await fake_db.horoscope_chunks.insert_many([chunk('pending', clock.current + timedelta(seconds=5))])
+        await horoscope_service._delete_stale_chunks(USER, REQUEST)
+        await _drain_cleanup()
+        return result
+
+    result = asyncio.run(run())
+    assert _versions(fake_db) == {result['version'], 'pending'}
+
+
+@pytest.mark.parametrize('newer_finishes_first', [False, True])
+def test_concurrent_writers_leave_the_newest_set_active(fake_db, clock, newer_finishes_first):
+    chunks = fake_db.horoscope_chunks
+
+    async def run():
+        older_gate, newer_gate = asyncio.Event(), asyncio.Event()
+        chunks.insert_hooks = [older_gate.wait, newer_gate.wait]
+        # Both writers have written their chunk set and are stuck before the pointer swap
+        older = asyncio.create_task(_store(_horoscope('Aries', 1)))
+        while len(chunks.insert_hooks) > 1:
+            await asyncio.sleep(0)
+        newer = asyncio.create_task(_store(_horoscope('Taurus', 2)))
+        while chunks.insert_hooks:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        first, first_gate, second, second_gate = (newer, newer_gate, older, older_gate) if newer_finishes_first \
+            else (older, older_gate, newer, newer_gate)
+        first_gate.set()
+        first_result = await first
+        await _drain_cleanup()
+        # The newer set is still pending when the older write cleans up after itself
+        if not newer_finishes_first:
+            assert len(_versions(fake_db)) == 2
+        second_gate.set()
+        second_result = await second
+        await _drain_cleanup()
+        results = {id(first): first_result, id(second): second_result}
+        return results[id(older)], results[id(newer)], await horoscope_service.get_user_horoscope(USER, REQUEST)
+
+    older_result, newer_result, horoscope = asyncio.run(run())
+    assert newer_result['status'] == 'success'
+    assert older_result['status'] == ('superseded' if newer_finishes_first else 'success')
+    assert fake_db.horoscopes.docs[0]['active_version'] == newer_result['version']
+    assert _versions(fake_db) == {newer_result['version']}
+    assert horoscope['lagna']['asc_sign'] == 'Tau'
+
+
+def test_concurrent_first_stores_keep_one_index_entry(fake_db, clock):
+    async def run():
+        results = await asyncio.gather(_store(_horoscope('Aries', 1)), _store(_horoscope('Taurus', 2)))
+        await _drain_cleanup()
+        return results
+
+    results = asyncio.run(run())
+    assert _versions(fake_db) == {results[1]['version']}
+    [index] = fake_db.horoscopes.docs
+    assert index['active_version'] == results[1]['version']
+    assert [r['status'] for r in results] == ['success', 'success']
+
+
+def test_sections_fetch_only_the_requested_chunks(fake_db, clock):
+    async def run():
+        await _store(_horoscope('Aries', 1))
+        return await horoscope_service.get_horoscope_sections(USER, REQUEST, sections=['lagna', 'bogus'],
+                                                              charts=['D9', 'D60'])
+
+    sections = asyncio.run(run())
+    assert set(sections) == {'lagna', 'd_series'}
+    assert sections['lagna']['asc_sign'] == 'Ari' and set(sections['d_series']) == {'D9'}
+    [(query, projection)] = fake_db.horoscope_chunks.finds
+    assert query['version'] == fake_db.horoscopes.docs[0]['active_version']
+    assert query['$or'] == [{'chunk_type': {'$in': ['lagna']}},
+                            {'chunk_type': 'divisional', 'chart_name': {'$in': ['D9', 'D60']}}]
+    assert projection == {'_id': 0, 'chunk_type': 1, 'chart_name': 1, 'data': 1}
+    assert asyncio.run(horoscope_service.get_horoscope_sections(USER, 'unknown')) is None
+
+
+def test_cached_sections_skip_the_chunk_query_and_are_returned_as_copies(fake_db, clock):
+    async def run():
+        await _store(_horoscope('Aries', 1))
+        first = await horoscope_service.get_horoscope_sections(USER, REQUEST, sections=['lagna', 'dasha'],
+                                                               charts=['D9'])
+        first['lagna']['planets'].clear()
+        first['d_series']['D9']['asc_sign'] = 'changed'
+        second = await horoscope_service.get_horoscope_sections(USER, REQUEST, sections=['lagna', 'dasha'],
+                                                                charts=['D9'])
+        second['dasha']['periods'].clear()
+        third = await horoscope_service.get_horoscope_sections(USER, REQUEST, sections=['dasha'])
+        return second, third
+
+    second, third = asyncio.run(run())
+    assert len(fake_db.horoscope_chunks.finds) == 1
+    assert len(second['lagna']['planets']) == 2 and second['d_series']['D9']['asc_sign'] == 'Ari'
+    assert len(third['dasha']['periods']) == 1
+
+
+def test_storing_a_horoscope_invalidates_its_cached_sections(fake_db, clock):
+    async def run():
+        await _store(_horoscope('Aries', 1))
+        before = await horoscope_service.get_horoscope_sections(USER, REQUEST, sections=['lagna'])
+        await _store(_horoscope('Taurus', 2))
+        after = await horoscope_service.get_horoscope_sections(USER, REQUEST, sections=['lagna'])
+        await _drain_cleanup()
+        return before, after
+
+    before, after = asyncio.run(run())
+    assert (before['lagna']['asc_sign'], after['lagna']['asc_sign']) == ('Ari', 'Tau')
+    assert len(fake_db.horoscope_chunks.finds) == 2
+    active = fake_db.horoscopes.docs[0]['active_version']
+    assert {key[1] for key in horoscope_service._section_cache._users[USER]} == {active}
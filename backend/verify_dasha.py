@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from mongo import connect_to_mongo, mongo_db
+from compression_service import decode_chunk_data
 
 async def verify_dasha():
     await connect_to_mongo()
@@ -31,6 +32,7 @@ async def verify_dasha():
     )
     
     if dasha_chunk:
+        dasha_chunk['data'] = decode_chunk_data(dasha_chunk.get('data'))
         print("Sample dasha chunk found:")
         print(f"  Chunk type: {dasha_chunk['chunk_type']}")
         if 'data' in dasha_chunk and 'system' in dasha_chunk['data']: